@@ -11,6 +11,10 @@
 # SPDX-License-Identifier: MIT
 ###############################################################################
 
+import asyncio
+
+import gdaltest
+import pytest
 
 from osgeo import gdal
 
@@ -50,3 +54,120 @@ def test_asyncreader_1():
         assert csum == expected_cs[i], "did not get expected checksum for band %d" % (
             i + 1
         )
+
+
+###############################################################################
+# Test iterating over the updated regions of an AsyncReader
+
+
+def test_asyncreader_iter():
+
+    ds = gdal.Open("data/rgbsmall.tif")
+    asyncreader = ds.BeginAsyncReader(0, 0, ds.RasterXSize, ds.RasterYSize)
+    try:
+        windows = list(asyncreader)
+        buf = asyncreader.GetBuffer()
+    finally:
+        ds.EndAsyncReader(asyncreader)
+
+    assert windows == [(0, 0, ds.RasterXSize, ds.RasterYSize)]
+    assert isinstance(buf, bytearray)
+    assert bytes(buf) == ds.ReadRaster()
+
+
+###############################################################################
+# Test that the buffer stays exported until EndAsyncReader()
+
+
+def test_asyncreader_buffer_kept_exported():
+
+    ds = gdal.Open("data/rgbsmall.tif")
+    buf = bytearray(ds.RasterXSize * ds.RasterYSize * ds.RasterCount)
+    asyncreader = ds.BeginAsyncReader(0, 0, ds.RasterXSize, ds.RasterYSize, buf_obj=buf)
+    try:
+        with pytest.raises(BufferError):
+            buf.extend(b"x" * 1000000)
+        for _ in asyncreader:
+            pass
+    finally:
+        ds.EndAsyncReader(asyncreader)
+
+    assert bytes(buf) == ds.ReadRaster()
+    buf.extend(b"x")
+
+
+###############################################################################
+# Test async iteration over the updated regions of an AsyncReader
+
+
+def test_asyncreader_aiter():
+
+    ds = gdal.Open("data/rgbsmall.tif")
+
+    async def collect(asyncreader):
+        return [window async for window in asyncreader]
+
+    asyncreader = ds.BeginAsyncReader(0, 0, ds.RasterXSize, ds.RasterYSize)
+    try:
+        windows = asyncio.run(collect(asyncreader))
+        buf = asyncreader.GetBuffer()
+    finally:
+        ds.EndAsyncReader(asyncreader)
+
+    assert windows == [(0, 0, ds.RasterXSize, ds.RasterYSize)]
+    assert bytes(buf) == ds.ReadRaster()
+
+
+###############################################################################
+# Test reading into a NumPy array
+
+
+def test_asyncreader_numpy_buffer():
+
+    np = pytest.importorskip("numpy")
+    gdaltest.importorskip_gdal_array()
+
+    ds = gdal.Open("data/rgbsmall.tif")
+    buf = np.zeros((ds.RasterCount, 10, 20), dtype=np.uint16)
+    asyncreader = ds.BeginAsyncReader(5, 6, 20, 10, buf_obj=buf)
+    try:
+        for _ in asyncreader:
+            pass
+        assert asyncreader.GetBuffer() is buf
+    finally:
+        ds.EndAsyncReader(asyncreader)
+
+    np.testing.assert_array_equal(buf, ds.ReadAsArray(5, 6, 20, 10))
+
+    with pytest.raises(Exception):
+        ds.BeginAsyncReader(0, 0, 20, 10, buf_obj=buf[:, :, ::2])
+
+
+###############################################################################
+# Test Dataset.read_async()
+
+
+@pytest.mark.parametrize(
+    "open_flags", [gdal.OF_RASTER, gdal.OF_RASTER | gdal.OF_THREAD_SAFE]
+)
+def test_asyncreader_dataset_read_async(open_flags):
+
+    np = pytest.importorskip("numpy")
+    gdaltest.importorskip_gdal_array()
+
+    ds = gdal.OpenEx("data/rgbsmall.tif", open_flags)
+    windows = [(0, y, ds.RasterXSize, 10) for y in range(0, ds.RasterYSize, 10)]
+    # another proxy of the same dataset, whose reads must be serialized with ds
+    other_ds = ds.GetRasterBand(1).GetDataset()
+
+    async def read_all():
+        return await asyncio.gather(
+            *[(ds, other_ds)[i % 2].read_async(*w) for i, w in enumerate(windows)]
+        )
+
+    arrays = asyncio.run(read_all())
+    assert not gdal._dataset_locks
+
+    assert len(arrays) == len(windows)
+    for array, window in zip(arrays, windows):
+        np.testing.assert_array_equal(array, ds.ReadAsArray(*window))
@@ -1108,3 +1108,110 @@ def test_basic_block_windows(tmp_vsimem):
         assert windows[8].yoff == 512
         assert windows[8].xsize == 1050 - 1024
         assert windows[8].ysize == 600 - 512
+
+
+@pytest.mark.parametrize("num_threads", [1, 4])
+@pytest.mark.parametrize("window_size", [None, (100, 70)])
+def test_basic_map_blocks(tmp_path, num_threads, window_size):
+
+    np = pytest.importorskip("numpy")
+    gdaltest.importorskip_gdal_array()
+
+    src_filename = str(tmp_path / "src.tif")
+    with gdal.GetDriverByName("GTiff").Create(
+        src_filename,
+        1050,
+        600,
+        eType=gdal.GDT_UInt16,
+        options={"TILED": True, "BLOCKXSIZE": 512, "BLOCKYSIZE": 256},
+    ) as ds:
+        src_array = (np.arange(1050 * 600) % 65000).astype(np.uint16).reshape(600, 1050)
+        ds.GetRasterBand(1).WriteArray(src_array)
+
+    with gdal.Open(src_filename) as src_ds, gdal.GetDriverByName("MEM").Create(
+        "", 1050, 600, 1, gdal.GDT_Float32
+    ) as dst_ds:
+        src_band = src_ds.GetRasterBand(1)
+        dst_band = dst_ds.GetRasterBand(1)
+
+        seen = []
+
+        def func(array, window):
+            assert array.shape == (window.ysize, window.xsize)
+            seen.append(window)
+            return array * 0.5
+
+        progress = []
+
+        def callback(pct, msg, user_data):
+            progress.append(pct)
+            return 1
+
+        assert (
+            src_band.map_blocks(
+                func,
+                dst_band,
+                num_threads=num_threads,
+                window_size=window_size,
+                callback=callback,
+            )
+            is None
+        )
+        np.testing.assert_array_equal(dst_band.ReadAsArray(), src_array * 0.5)
+        assert progress[-1] == 1.0
+        assert progress == sorted(progress)
+
+        expected_windows = (
+            list(src_band.BlockWindows())
+            if window_size is None
+            else [
+                (xoff, yoff, min(100, 1050 - xoff), min(70, 600 - yoff))
+                for yoff in range(0, 600, 70)
+                for xoff in range(0, 1050, 100)
+            ]
+        )
+        assert sorted(tuple(w) for w in seen) == sorted(
+            tuple(w) for w in expected_windows
+        )
+
+        # Without destination band: results are returned in window order
+        sums = src_band.map_blocks(
+            lambda a, w: int(a.sum(dtype=np.uint64)), num_threads=num_threads
+        )
+        assert sums == [
+            int(src_array[w.yoff : w.yoff + w.ysize, w.xoff : w.xoff + w.xsize].sum())
+            for w in src_band.BlockWindows()
+        ]
+
+        # Returning the input array itself
+        arrays = src_band.map_blocks(lambda a, w: a, num_threads=num_threads)
+        for array, w in zip(arrays, src_band.BlockWindows()):
+            np.testing.assert_array_equal(
+                array, src_array[w.yoff : w.yoff + w.ysize, w.xoff : w.xoff + w.xsize]
+            )
+
+
+def test_basic_map_blocks_in_place_and_interrupt():
+
+    np = pytest.importorskip("numpy")
+    gdaltest.importorskip_gdal_array()
+
+    with gdal.GetDriverByName("MEM").Create("", 100, 50, 1, gdal.GDT_Int16) as ds:
+        band = ds.GetRasterBand(1)
+        band.Fill(3)
+
+        def func(array, window):
+            array += 1
+            return array
+
+        band.map_blocks(func, band, num_threads=2, window_size=(30, 20))
+        assert np.all(band.ReadAsArray() == 4)
+
+        with pytest.raises(RuntimeError, match="Interrupted by user"):
+            band.map_blocks(
+                lambda a, w: a,
+                band,
+                num_threads=2,
+                window_size=(30, 20),
+                callback=lambda pct, msg, user_data: 0,
+            )
@@ -223,3 +223,142 @@ def test_gdal_fsspec_usable_by_pyarrow_dataset(tmp_vsimem):
     assert ds.dataset(tmp_vsimem_file, filesystem=fs_vsimem) is not None
 
     assert ds.dataset(str(tmp_vsimem), filesystem=fs_vsimem) is not None
+
+
+def test_gdal_fsspec_ls_no_detail():
+
+    fs = fsspec.filesystem("gdalvsi")
+    ret = fs.ls("data", detail=False)
+    assert "data/byte.tif" in ret
+
+
+def test_gdal_fsspec_find(tmp_vsimem):
+
+    gdal.FileFromMemBuffer(str(tmp_vsimem / "a.bin"), b"a")
+    gdal.FileFromMemBuffer(str(tmp_vsimem / "subdir" / "b.bin"), b"bb")
+    gdal.FileFromMemBuffer(str(tmp_vsimem / "subdir" / "subsubdir" / "c.bin"), b"ccc")
+
+    fs = fsspec.filesystem("gdalvsi")
+    root = str(tmp_vsimem)
+    assert fs.find(root) == [
+        root + "/a.bin",
+        root + "/subdir/b.bin",
+        root + "/subdir/subsubdir/c.bin",
+    ]
+    assert fs.find(root, maxdepth=1) == [root + "/a.bin"]
+    assert fs.find(root, maxdepth=2, withdirs=True) == [
+        root,
+        root + "/a.bin",
+        root + "/subdir",
+        root + "/subdir/b.bin",
+        root + "/subdir/subsubdir",
+    ]
+    ret = fs.find(root, detail=True)
+    assert ret[root + "/subdir/subsubdir/c.bin"]["size"] == 3
+    assert ret[root + "/subdir/subsubdir/c.bin"]["type"] == "file"
+
+    assert fs.find(root + "/a.bin") == [root + "/a.bin"]
+    assert fs.find(root + "/i_do_not_exist") == []
+
+
+def test_gdal_fsspec_listings_cache(tmp_vsimem):
+
+    gdal.FileFromMemBuffer(str(tmp_vsimem / "a.bin"), b"a")
+
+    fs = fsspec.filesystem("gdalvsi", use_listings_cache=True)
+    root = str(tmp_vsimem)
+    assert fs.ls(root, detail=False) == [root + "/a.bin"]
+
+    # info() is served from the listing
+    gdal.FileFromMemBuffer(str(tmp_vsimem / "a.bin"), b"abc")
+    assert fs.info(root + "/a.bin")["size"] == 1
+
+    # Writes through the file system invalidate the listing
+    with fs.open(root + "/b.bin", "wb") as f:
+        f.write(b"b")
+    assert fs.info(root + "/a.bin")["size"] == 3
+    assert sorted(fs.ls(root, detail=False)) == [root + "/a.bin", root + "/b.bin"]
+    fs.rm(root + "/b.bin")
+    with pytest.raises(FileNotFoundError):
+        fs.info(root + "/b.bin")
+
+
+def test_gdal_fsspec_cat_file(tmp_vsimem):
+
+    gdal.FileFromMemBuffer(str(tmp_vsimem / "a.bin"), b"0123456789")
+
+    fs = fsspec.filesystem("gdalvsi")
+    path = str(tmp_vsimem / "a.bin")
+    assert fs.cat_file(path) == b"0123456789"
+    assert fs.cat_file(path, start=2, end=5) == b"234"
+    assert fs.cat_file(path, start=-3) == b"789"
+    assert fs.cat_file(path, start=1, end=-7) == b"12"
+
+    with pytest.raises(FileNotFoundError):
+        fs.cat_file(str(tmp_vsimem / "i_do_not_exist"))
+
+
+@pytest.mark.parametrize("num_threads", [1, 4])
+def test_gdal_fsspec_cat_ranges(tmp_vsimem, num_threads):
+
+    gdal.FileFromMemBuffer(str(tmp_vsimem / "a.bin"), b"0123456789")
+    gdal.FileFromMemBuffer(str(tmp_vsimem / "b.bin"), b"abcdefghij")
+
+    fs = fsspec.filesystem("gdalvsi")
+    a = str(tmp_vsimem / "a.bin")
+    b = str(tmp_vsimem / "b.bin")
+    missing = str(tmp_vsimem / "i_do_not_exist")
+    ret = fs.cat_ranges(
+        [a, b, a, missing, a, b],
+        [5, 0, 0, 0, 3, -2],
+        [8, 3, 2, 1, 6, None],
+        num_threads=num_threads,
+    )
+    assert ret[0:3] == [b"567", b"abc", b"01"]
+    assert isinstance(ret[3], FileNotFoundError)
+    assert ret[4:] == [b"345", b"ij"]
+
+    # Ranges past the end of the file are truncated, as with cat_file()
+    ret = fs.cat_ranges(
+        [a, a, b, a],
+        [8, 12, 0, 0],
+        [15, 20, 3, 1],
+        on_error="raise",
+        num_threads=num_threads,
+    )
+    assert ret == [b"89", b"", b"abc", b"0"]
+
+    with pytest.raises(FileNotFoundError):
+        fs.cat_ranges([missing], [0], [1], on_error="raise")
+
+
+@pytest.mark.parametrize("num_threads", [1, 4])
+def test_gdal_fsspec_get_put(tmp_vsimem, tmp_path, num_threads):
+
+    gdal.FileFromMemBuffer(str(tmp_vsimem / "src" / "a.bin"), b"a")
+    gdal.FileFromMemBuffer(str(tmp_vsimem / "src" / "subdir" / "b.bin"), b"bb")
+
+    fs = fsspec.filesystem("gdalvsi")
+    fs.get(
+        str(tmp_vsimem / "src"),
+        str(tmp_path / "local"),
+        recursive=True,
+        num_threads=num_threads,
+    )
+    assert open(tmp_path / "local" / "a.bin", "rb").read() == b"a"
+    assert open(tmp_path / "local" / "subdir" / "b.bin", "rb").read() == b"bb"
+
+    fs.put(
+        str(tmp_path / "local"),
+        str(tmp_vsimem / "dst"),
+        recursive=True,
+        num_threads=num_threads,
+    )
+    assert fs.cat_file(str(tmp_vsimem / "dst" / "a.bin")) == b"a"
+    assert fs.cat_file(str(tmp_vsimem / "dst" / "subdir" / "b.bin")) == b"bb"
+
+    fs.get_file(str(tmp_vsimem / "src" / "a.bin"), str(tmp_path / "single.bin"))
+    assert open(tmp_path / "single.bin", "rb").read() == b"a"
+
+    with pytest.raises(FileNotFoundError):
+        fs.get_file(str(tmp_vsimem / "i_do_not_exist"), str(tmp_path / "x.bin"))
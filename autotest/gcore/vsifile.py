@@ -12,6 +12,7 @@
 # SPDX-License-Identifier: MIT
 ###############################################################################
 
+import io
 import os
 import sys
 import time
@@ -1747,6 +1748,80 @@ def test_vsifile_class_append(tmp_vsimem):
         assert f.read() == "abcdef"
 
 
+@pytest.mark.parametrize("read_ahead", [0, 5, 10, 1000])
+def test_vsifile_class_readinto(tmp_vsimem, read_ahead):
+
+    fname = str(tmp_vsimem / "test.bin")
+    content = bytes(range(256)) * 4
+    gdal.FileFromMemBuffer(fname, content)
+
+    with gdal.VSIFile(fname, "rb", read_ahead=read_ahead) as f:
+        buf = bytearray(3)
+        assert f.readinto(buf) == 3
+        assert buf == content[0:3]
+        assert f.tell() == 3
+
+        buf = bytearray(10)
+        assert f.readinto(memoryview(buf)[2:]) == 8
+        assert buf[2:] == content[3:11]
+        assert f.tell() == 11
+
+        assert f.read(4) == content[11:15]
+        assert f.seek(-2, 1) == 13
+        assert f.read(3) == content[13:16]
+        assert f.seek(1000) == 1000
+        assert f.read(100) == content[1000:]
+        assert f.read(1) == b""
+        assert f.seek(-10, 2) == len(content) - 10
+        assert f.read() == content[-10:]
+
+        f.seek(100)
+        for line in f:
+            pass
+        assert f.tell() == len(content)
+
+    with gdal.VSIFile(fname, "rb", read_ahead=read_ahead) as f:
+        with io.BufferedReader(f, buffer_size=64) as bf:
+            assert bf.read(7) == content[0:7]
+            assert bf.read() == content[7:]
+
+    # Seek back after a read done directly into the caller buffer, that must
+    # not be mistaken for a seek within the data read ahead
+    with gdal.VSIFile(fname, "rb", read_ahead=read_ahead) as f:
+        assert f.read(4) == content[0:4]
+        assert f.read(20) == content[4:24]
+        assert f.seek(15) == 15
+        assert f.read(1) == content[15:16]
+        assert f.tell() == 16
+
+
+def test_vsifile_class_read_ranges(tmp_vsimem):
+
+    fname = str(tmp_vsimem / "test.bin")
+    content = bytes(range(256)) * 4
+    gdal.FileFromMemBuffer(fname, content)
+
+    with gdal.VSIFile(fname, "rb", read_ahead=16) as f:
+        assert f.read(2) == content[0:2]
+
+        assert f.read_ranges([]) == []
+
+        ranges = [(500, 10), (3, 5), (100, 1), (5, 10), (1020, 4)]
+        res = f.read_ranges(ranges)
+        assert [bytes(x) for x in res] == [
+            content[offset : offset + size] for offset, size in ranges
+        ]
+
+        # Position is preserved
+        assert f.tell() == 2
+        assert f.read(3) == content[2:5]
+
+    f = gdal.VSIFile(fname, "rb")
+    f.close()
+    with pytest.raises(ValueError, match="closed file"):
+        f.read_ranges([(0, 1)])
+
+
 def test_vsifile_stat_directory_trailing_slash():
 
     res = gdal.VSIStatL("data/")
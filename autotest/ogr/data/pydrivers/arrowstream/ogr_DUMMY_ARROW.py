@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# This code is in the public domain, so as to serve as a template for
+# real-world plugins.
+# or, at the choice of the licensee,
+# Copyright 2025 Even Rouault
+# SPDX-License-Identifier: MIT
+
+# gdal: DRIVER_NAME = "DUMMY_ARROW"
+# gdal: DRIVER_SUPPORTED_API_VERSION = [1]
+# gdal: DRIVER_DCAP_VECTOR = "YES"
+# gdal: DRIVER_DMD_LONGNAME = "plugin exposing an Arrow stream"
+
+from gdal_python_driver import BaseDataset, BaseDriver, BaseLayer
+
+POINT_WKB = b"\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00@\x00\x00\x00\x00\x00\x80H@"
+
+
+class Layer(BaseLayer):
+    def __init__(self):
+        self.name = "my_layer"
+        self.fid_name = "my_fid"
+        self.fields = [
+            {"name": "int32Field", "type": "Integer"},
+            {"name": "strField", "type": "String"},
+        ]
+        self.geometry_fields = [
+            {"name": "geomField", "type": "Point", "srs": "EPSG:4326"}
+        ]
+        self.count = 5
+
+    # No __iter__() method: features are built by GDAL from the Arrow stream
+    def arrow_stream(self, options):
+        import pyarrow as pa
+
+        schema = pa.schema(
+            [
+                pa.field("my_fid", pa.int64()),
+                pa.field("int32Field", pa.int32()),
+                pa.field("strField", pa.string()),
+                pa.field(
+                    "geomField",
+                    pa.binary(),
+                    metadata={"ARROW:extension:name": "ogc.wkb"},
+                ),
+            ]
+        )
+        batch_size = int(options.get("MAX_FEATURES_IN_BATCH", 65536))
+
+        def batches():
+            for start in range(0, self.count, batch_size):
+                ids = range(start, min(start + batch_size, self.count))
+                yield pa.record_batch(
+                    [
+                        pa.array([i + 1 for i in ids], pa.int64()),
+                        pa.array([i + 2 for i in ids], pa.int32()),
+                        pa.array(["foo" if i % 2 == 0 else None for i in ids]),
+                        pa.array([POINT_WKB for i in ids], pa.binary()),
+                    ],
+                    schema=schema,
+                )
+
+        return pa.RecordBatchReader.from_batches(schema, batches())
+
+
+class Dataset(BaseDataset):
+    def __init__(self):
+        self.layers = [Layer()]
+
+
+class Driver(BaseDriver):
+    def identify(self, filename, first_bytes, open_flags, open_options={}):
+        return filename == "DUMMY_ARROW:"
+
+    def open(self, filename, first_bytes, open_flags, open_options={}):
+        if not self.identify(filename, first_bytes, open_flags):
+            return None
+        return Dataset()
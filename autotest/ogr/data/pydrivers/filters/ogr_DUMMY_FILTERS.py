@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# This code is in the public domain, so as to serve as a template for
+# real-world plugins.
+# or, at the choice of the licensee,
+# Copyright 2025 Even Rouault
+# SPDX-License-Identifier: MIT
+
+# gdal: DRIVER_NAME = "DUMMY_FILTERS"
+# gdal: DRIVER_SUPPORTED_API_VERSION = [1]
+# gdal: DRIVER_DCAP_VECTOR = "YES"
+# gdal: DRIVER_DMD_LONGNAME = "plugin receiving structured filters"
+
+from gdal_python_driver import BaseDataset, BaseDriver, BaseLayer
+
+
+class Layer(BaseLayer):
+    def __init__(self):
+        self.name = "my_layer"
+        self.fid_name = "my_fid"
+        self.fields = [{"name": "intField", "type": "Integer"}]
+        self.geometry_fields = [{"name": "geomField", "type": "Point"}]
+        self.count = 10
+        # Used by the test to check what the plugin received
+        self.metadata = {}
+
+    def _feature(self, fid):
+        return {
+            "type": "OGRFeature",
+            "id": fid,
+            "fields": {"intField": fid * 10},
+            "geometry_fields": {"geomField": "POINT (%d %d)" % (fid, fid)},
+        }
+
+    def __iter__(self):
+        self.metadata["iterated"] = "YES"
+        for fid in range(1, self.count + 1):
+            yield self._feature(fid)
+
+    def features_by_ids(self, fids):
+        self.metadata["features_by_ids"] = repr(fids)
+        return [self._feature(fid) if 1 <= fid <= self.count else None for fid in fids]
+
+    def attribute_filter_changed(self):
+        self.metadata.pop("iterated", None)
+        self.metadata["attribute_filter_expr"] = repr(self.attribute_filter_expr)
+
+    def spatial_filter_changed(self):
+        self.metadata["spatial_filter_extent"] = repr(self.spatial_filter_extent)
+        self.metadata["spatial_filter_geometry_field"] = repr(
+            self.spatial_filter_geometry_field
+        )
+
+
+class Dataset(BaseDataset):
+    def __init__(self):
+        self.layers = [Layer()]
+
+
+class Driver(BaseDriver):
+    def identify(self, filename, first_bytes, open_flags, open_options={}):
+        return filename == "DUMMY_FILTERS:"
+
+    def open(self, filename, first_bytes, open_flags, open_options={}):
+        if not self.identify(filename, first_bytes, open_flags):
+            return None
+        return Dataset()
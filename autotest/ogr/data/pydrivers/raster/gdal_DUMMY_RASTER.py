@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# This code is in the public domain, so as to serve as a template for
+# real-world plugins.
+# or, at the choice of the licensee,
+# Copyright 2025 Even Rouault
+# SPDX-License-Identifier: MIT
+
+# gdal: DRIVER_NAME = "DUMMY_RASTER"
+# gdal: DRIVER_SUPPORTED_API_VERSION = [1]
+# gdal: DRIVER_DCAP_RASTER = "YES"
+# gdal: DRIVER_DMD_LONGNAME = "raster plugin"
+
+import array
+
+from gdal_python_driver import BaseDataset, BaseDriver
+
+
+def pixel_value(band, x, y):
+    return band * 1000 + y * 50 + x
+
+
+class Dataset(BaseDataset):
+    def __init__(self, options):
+        self.options = options
+        self.width = 50
+        self.height = 30
+        self.band_count = 2
+        self.data_type = "UInt16"
+        self.block_width = 16
+        self.block_height = 16
+        self.geotransform = [2, 0.1, 0, 49, 0, -0.1]
+        self.srs = "EPSG:4326"
+        self.nodata = 65535
+        self.metadata = {"foo": "bar"}
+
+    def read_block(self, band, block_x, block_y):
+        x0 = block_x * self.block_width
+        y0 = block_y * self.block_height
+        # Edge blocks may be returned either with their full size, or with
+        # only their valid part
+        xsize = min(self.block_width, self.width - x0)
+        ysize = min(self.block_height, self.height - y0)
+        if self.options.get("BAD_SIZE") == "YES":
+            xsize -= 1
+        values = array.array("H")
+        for y in range(ysize):
+            values.extend(pixel_value(band, x0 + x, y0 + y) for x in range(xsize))
+        return values
+
+
+class Driver(BaseDriver):
+    def identify(self, filename, first_bytes, open_flags, open_options={}):
+        return filename == "DUMMY_RASTER:"
+
+    def open(self, filename, first_bytes, open_flags, open_options={}):
+        if not self.identify(filename, first_bytes, open_flags):
+            return None
+        return Dataset(open_options)
@@ -747,6 +747,62 @@ def test_ogr_basic_dataset_getitem():
         ds[3]
 
 
+def test_ogr_basic_layer_getitem():
+
+    ds = ogr.Open("data/poly.shp")
+    lyr = ds.GetLayer(0)
+
+    assert lyr[3].GetFID() == 3
+    with pytest.raises(IndexError):
+        lyr[10]
+
+    assert [f.GetFID() for f in lyr[2:5]] == [2, 3, 4]
+    assert [f.GetFID() for f in lyr[:3]] == [0, 1, 2]
+    assert [f.GetFID() for f in lyr[7:]] == [7, 8, 9]
+    assert [f.GetFID() for f in lyr[-2:]] == [8, 9]
+    assert [f.GetFID() for f in lyr[::-3]] == [9, 6, 3, 0]
+    assert [f.GetFID() for f in lyr[1:8:3]] == [1, 4, 7]
+    # Stops at the first missing feature
+    assert [f.GetFID() for f in lyr[8:20]] == [8, 9]
+    assert len(lyr[:]) == 10
+    assert lyr[4:5][0].GetField("EAS_ID") == lyr.GetFeature(4).GetField("EAS_ID")
+
+
+def test_ogr_basic_layer_get_features():
+
+    ds = ogr.Open("data/poly.shp")
+    lyr = ds.GetLayer(0)
+
+    features = lyr.GetFeatures([5, 100, 0, -1, 5])
+    assert len(features) == 5
+    assert features[0].GetFID() == 5
+    assert features[1] is None
+    assert features[2].GetFID() == 0
+    assert features[3] is None
+    assert features[4].GetFID() == 5
+    assert features[0].Equal(lyr.GetFeature(5))
+    assert gdal.GetLastErrorType() == gdal.CE_None
+
+    assert lyr.GetFeatures([]) == []
+
+
+def test_ogr_basic_layer_get_features_as_pyarrow():
+
+    pytest.importorskip("pyarrow")
+
+    ds = ogr.Open("data/poly.shp")
+    lyr = ds.GetLayer(0)
+
+    table = lyr.GetFeatures([7, 100, 2], as_pyarrow=True)
+    assert table.num_rows == 2
+    assert table["OGC_FID"].to_pylist() == [7, 2]
+    assert table["EAS_ID"].to_pylist() == [
+        lyr.GetFeature(7)["EAS_ID"],
+        lyr.GetFeature(2)["EAS_ID"],
+    ]
+    assert "wkb_geometry" in table.column_names
+
+
 def test_ogr_basic_feature_iterator():
 
     ds = ogr.Open("data/poly.shp")
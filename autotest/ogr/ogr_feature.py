@@ -1003,3 +1003,111 @@ def test_ogr_feature_list_to_json():
     assert dst_f["field_integer64list"] == "[ 123456789012345, 2 ]"
     assert dst_f["field_reallist"] == "[ 1.5, 2.5 ]"
     assert dst_f["field_stringlist"] == '[ "a", "b" ]'
+
+
+###############################################################################
+# Test Feature.to_dict() and Feature.set_from_dict()
+
+
+def test_ogr_feature_to_dict():
+
+    feat = mk_src_feature()
+
+    d = feat.to_dict()
+    assert list(d.keys()) == feat.keys()
+    for key, value in d.items():
+        assert value == feat.GetField(key), key
+    assert d["field_integer"] == 17
+    assert d["field_integer64"] == 9876543210
+    assert d["field_real"] == 18.4
+    assert d["field_string"] == "abc def"
+    assert d["field_integerlist"] == [10, 20, 30]
+    assert d["field_integer64list"] == [9876543210]
+    assert d["field_reallist"] == [123.5, 567.0]
+    assert d["field_stringlist"] == ["abc", "def"]
+    assert feat.items() == d
+
+    feat.SetFieldNull("field_integer")
+    feat.UnsetField("field_real")
+    d = feat.to_dict()
+    assert d["field_integer"] is None
+    assert d["field_real"] is None
+
+    with pytest.raises(KeyError):
+        feat.GetField(feat.GetFieldCount())
+    with pytest.raises(KeyError):
+        feat.GetField(-1)
+
+
+def test_ogr_feature_to_dict_boolean():
+
+    feat_def = ogr.FeatureDefn("src")
+    field_def = ogr.FieldDefn("b", ogr.OFTInteger)
+    field_def.SetSubType(ogr.OFSTBoolean)
+    feat_def.AddFieldDefn(field_def)
+    field_def = ogr.FieldDefn("bl", ogr.OFTIntegerList)
+    field_def.SetSubType(ogr.OFSTBoolean)
+    feat_def.AddFieldDefn(field_def)
+
+    feat = ogr.Feature(feat_def)
+    feat["b"] = True
+    feat["bl"] = [True, False]
+    assert feat.to_dict() == {"b": True, "bl": [True, False]}
+    assert feat.b is True
+
+
+def test_ogr_feature_set_from_dict():
+
+    src_feature = mk_src_feature()
+
+    # Binary fields are returned as hexadecimal strings, which are not
+    # converted back
+    values = src_feature.to_dict()
+    del values["field_binary"]
+
+    feat = ogr.Feature(src_feature.GetDefnRef())
+    feat.set_from_dict(values)
+    assert feat.to_dict() == dict(values, field_binary=None)
+
+    feat.set_from_dict(
+        {
+            "field_integer": None,
+            "FIELD_INTEGER64": 1,
+            "field_real": 1,
+            2: 2.5,
+            "field_string": 123,
+            "field_binary": b"\x01\x02",
+            "field_integerlist": [4, 5],
+        }
+    )
+    assert feat.IsFieldNull("field_integer")
+    assert feat["field_integer64"] == 1
+    assert feat["field_real"] == 2.5
+    assert feat["field_string"] == "123"
+    assert feat.GetFieldAsBinary("field_binary") == b"\x01\x02"
+    assert feat["field_integerlist"] == [4, 5]
+
+    feat.set_from_dict([("field_string", "xyz")])
+    assert feat["field_string"] == "xyz"
+
+    with pytest.raises(KeyError):
+        feat.set_from_dict({"i_do_not_exist": 1})
+
+
+def test_ogr_feature_field_index_exact_case_first():
+
+    feat_def = ogr.FeatureDefn("src")
+    feat_def.AddFieldDefn(ogr.FieldDefn("Name", ogr.OFTString))
+    feat_def.AddFieldDefn(ogr.FieldDefn("name", ogr.OFTString))
+
+    feat = ogr.Feature(feat_def)
+    feat["name"] = "lower"
+    feat["Name"] = "upper"
+    assert feat.GetField(1) == "lower"
+    assert feat.GetField(0) == "upper"
+    assert feat["NAME"] == "upper"
+    assert feat.name == "lower"
+
+    feat.set_from_dict({"name": "a", "NAME": "b"})
+    assert feat.GetField(1) == "a"
+    assert feat.GetField(0) == "b"
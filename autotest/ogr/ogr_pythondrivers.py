@@ -11,6 +11,7 @@
 # SPDX-License-Identifier: MIT
 ###############################################################################
 
+import struct
 
 import gdaltest
 import pytest
@@ -145,3 +146,176 @@ def test_pythondrivers_missing_identify():
 
     with gdaltest.config_option("GDAL_SKIP", "MISSING_IDENTIFY"):
         gdal.AllRegister()
+
+
+def test_pythondrivers_arrow_stream():
+    pa = pytest.importorskip("pyarrow")
+    if not hasattr(pa.RecordBatchReader, "__arrow_c_stream__"):
+        pytest.skip("pyarrow >= 14 required")
+
+    with gdaltest.config_option(
+        "GDAL_PYTHON_DRIVER_PATH", "data/pydrivers/arrowstream"
+    ):
+        gdal.AllRegister()
+    assert ogr.GetDriverByName("DUMMY_ARROW")
+
+    try:
+        ds = ogr.Open("DUMMY_ARROW:")
+        lyr = ds.GetLayer(0)
+        assert lyr.GetFIDColumn() == "my_fid"
+
+        # Features are built from the record batches
+        count = 0
+        for f in lyr:
+            assert f.GetFID() == count + 1
+            assert f["int32Field"] == count + 2
+            assert f["strField"] == ("foo" if count % 2 == 0 else None)
+            g = f.GetGeometryRef()
+            assert g.ExportToIsoWkt() == "POINT (2 49)"
+            assert g.GetSpatialReference().GetAuthorityCode(None) == "4326"
+            count += 1
+        assert count == 5
+        assert lyr.GetFeatureCount() == 5
+        assert lyr.GetFeature(3)["int32Field"] == 4
+
+        # The stream of the plugin is directly forwarded
+        assert lyr.TestCapability(ogr.OLCFastGetArrowStream)
+        stream = lyr.GetArrowStreamAsPyArrow(["MAX_FEATURES_IN_BATCH=2"])
+        batches = [batch for batch in stream]
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert sum([batch.field("my_fid").to_pylist() for batch in batches], []) == [
+            1,
+            2,
+            3,
+            4,
+            5,
+        ]
+
+        # Attribute filter not honoured by the plugin: evaluated by GDAL
+        lyr.SetAttributeFilter("int32Field >= 5")
+        assert not lyr.TestCapability(ogr.OLCFastGetArrowStream)
+        assert [f.GetFID() for f in lyr] == [4, 5]
+        batches = [batch for batch in lyr.GetArrowStreamAsPyArrow()]
+        assert sum([batch.field("my_fid").to_pylist() for batch in batches], []) == [
+            4,
+            5,
+        ]
+        lyr.SetAttributeFilter(None)
+
+        # Spatial filter not honoured by the plugin: evaluated by GDAL
+        lyr.SetSpatialFilterRect(-100, -100, -99, -99)
+        assert lyr.GetFeatureCount() == 0
+        lyr.SetSpatialFilter(None)
+    finally:
+        ds = None
+        with gdaltest.config_option("GDAL_SKIP", "DUMMY_ARROW"):
+            gdal.AllRegister()
+
+
+def test_pythondrivers_raster():
+    with gdaltest.config_option("GDAL_PYTHON_DRIVER_PATH", "data/pydrivers/raster"):
+        gdal.AllRegister()
+    assert gdal.GetDriverByName("DUMMY_RASTER")
+
+    try:
+        ds = gdal.Open("DUMMY_RASTER:")
+        assert ds.RasterXSize == 50
+        assert ds.RasterYSize == 30
+        assert ds.RasterCount == 2
+        assert ds.GetGeoTransform() == (2, 0.1, 0, 49, 0, -0.1)
+        assert ds.GetSpatialRef().GetAuthorityCode(None) == "4326"
+        assert ds.GetMetadata() == {"foo": "bar"}
+        assert ds.GetLayerCount() == 0
+        for band_number in (1, 2):
+            band = ds.GetRasterBand(band_number)
+            assert band.DataType == gdal.GDT_UInt16
+            assert band.GetBlockSize() == [16, 16]
+            assert band.GetNoDataValue() == 65535
+
+            data = struct.unpack("H" * (50 * 30), band.ReadRaster())
+            assert data == tuple(
+                band_number * 1000 + y * 50 + x for y in range(30) for x in range(50)
+            )
+
+        # Window in the partial block at the bottom-right corner
+        data = struct.unpack("H" * 2, ds.GetRasterBand(2).ReadRaster(47, 29, 2, 1))
+        assert data == (2000 + 29 * 50 + 47, 2000 + 29 * 50 + 48)
+        ds = None
+
+        ds = gdal.OpenEx("DUMMY_RASTER:", open_options=["BAD_SIZE=YES"])
+        with pytest.raises(Exception, match="read_block"):
+            with gdaltest.enable_exceptions():
+                ds.GetRasterBand(1).ReadRaster()
+        ds = None
+
+        # Raster-only drivers are not used when opening in vector mode
+        assert gdal.OpenEx("DUMMY_RASTER:", gdal.OF_VECTOR) is None
+    finally:
+        ds = None
+        with gdaltest.config_option("GDAL_SKIP", "DUMMY_RASTER"):
+            gdal.AllRegister()
+
+
+def test_pythondrivers_filters():
+    with gdaltest.config_option("GDAL_PYTHON_DRIVER_PATH", "data/pydrivers/filters"):
+        gdal.AllRegister()
+    assert ogr.GetDriverByName("DUMMY_FILTERS")
+
+    try:
+        ds = ogr.Open("DUMMY_FILTERS:")
+        lyr = ds.GetLayer(0)
+
+        # Parsed attribute filter
+        lyr.SetAttributeFilter("intField >= 20 AND NOT (intField IS NULL)")
+        assert lyr.GetMetadataItem("attribute_filter_expr") == repr(
+            (
+                "AND",
+                (">=", ("column", "intField"), 20),
+                ("NOT", ("IS NULL", ("column", "intField"))),
+            )
+        )
+        assert lyr.GetFeatureCount() == 9
+        assert lyr.GetMetadataItem("iterated") == "YES"
+        assert lyr.GetMetadataItem("features_by_ids") is None
+
+        # FID filters are fetched with features_by_ids()
+        for filter in ("my_fid IN (7, 3, 100, 3)", "FID IN (7, 3, 100, 3)"):
+            lyr.SetAttributeFilter(filter)
+            assert lyr.GetMetadataItem("attribute_filter_expr") == repr(
+                ("IN", ("column", "FID"), 7, 3, 100, 3)
+            )
+            assert [f.GetFID() for f in lyr] == [3, 7]
+            assert lyr.GetMetadataItem("features_by_ids") == "[3, 7, 100]"
+            assert lyr.GetMetadataItem("iterated") is None
+
+        lyr.SetAttributeFilter("FID = 5")
+        assert [f["intField"] for f in lyr] == [50]
+        assert lyr.GetMetadataItem("features_by_ids") == "[5]"
+
+        # The attribute filter is still evaluated by GDAL
+        lyr.SetAttributeFilter("FID IN (1, 2) AND intField = 20")
+        assert [f.GetFID() for f in lyr] == [2]
+        assert lyr.GetMetadataItem("iterated") == "YES"
+
+        lyr.SetAttributeFilter(None)
+        assert lyr.GetMetadataItem("attribute_filter_expr") == "None"
+        assert lyr.GetFeatureCount() == 10
+
+        # Random read falls back to features_by_ids()
+        assert lyr.GetFeature(4)["intField"] == 40
+        assert lyr.GetMetadataItem("features_by_ids") == "[4]"
+        assert lyr.GetFeature(11) is None
+
+        # Spatial filter
+        lyr.SetSpatialFilterRect(1.5, 1.5, 3.5, 3.5)
+        assert lyr.GetMetadataItem("spatial_filter_extent") == repr(
+            [1.5, 1.5, 3.5, 3.5]
+        )
+        assert lyr.GetMetadataItem("spatial_filter_geometry_field") == "'geomField'"
+        assert [f.GetFID() for f in lyr] == [2, 3]
+        lyr.SetSpatialFilter(None)
+        assert lyr.GetMetadataItem("spatial_filter_geometry_field") == "None"
+    finally:
+        ds = None
+        with gdaltest.config_option("GDAL_SKIP", "DUMMY_FILTERS"):
+            gdal.AllRegister()
@@ -833,3 +833,283 @@ def test_gdal2tiles_py_jpeg_1band_input(
             got_stats_14,
             got_stats_13,
         )
+
+
+def _get_checksums(ds):
+    return [ds.GetRasterBand(i + 1).Checksum() for i in range(ds.RasterCount)]
+
+
+def _get_tile_checksums(tile_dir):
+    """Return a dictionary mapping the tz/tx/ty.png path of the tiles of
+    tile_dir to the checksums of their bands"""
+
+    return {
+        os.path.relpath(filename, tile_dir): _get_checksums(gdal.Open(filename))
+        for filename in glob.glob(tile_dir + "/*/*/*.png")
+    }
+
+
+def _get_archive_tile_checksums(conn, excluded_tiles=()):
+    """Same as _get_tile_checksums() for the tiles of a MBTiles archive"""
+
+    checksums = {}
+    for tz, tx, ty, data in conn.execute(
+        "SELECT zoom_level, tile_column, tile_row, tile_data FROM tiles"
+    ):
+        if (tz, tx, ty) in excluded_tiles:
+            continue
+        gdal.FileFromMemBuffer("/vsimem/tile.png", bytes(data))
+        try:
+            checksums[os.path.join(str(tz), str(tx), f"{ty}.png")] = _get_checksums(
+                gdal.Open("/vsimem/tile.png")
+            )
+        finally:
+            gdal.Unlink("/vsimem/tile.png")
+    return checksums
+
+
+@pytest.fixture(scope="module")
+def uniform_tif(tmp_path_factory):
+
+    # Raster mostly filled with a single colour, except its upper left corner
+    input_file = str(tmp_path_factory.mktemp("tmp") / "uniform.tif")
+    ds = gdal.GetDriverByName("GTiff").Create(input_file, 2048, 2048, 3)
+    ds.SetGeoTransform([0, 10, 0, 20480, 0, -10])
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(3857)
+    ds.SetSpatialRef(srs)
+    for i, value in enumerate((10, 20, 30)):
+        ds.GetRasterBand(i + 1).Fill(value)
+    ds.WriteRaster(0, 0, 256, 256, bytes(range(256)) * 256 * 3)
+    ds = None
+    return input_file
+
+
+###############################################################################
+# Test that optimized modes generate the same tiles as the default mode
+
+
+@pytest.mark.require_driver("PNG")
+@pytest.mark.parametrize(
+    "input_name,zoom,extra_options",
+    [
+        ("small_world", "0-3", "--in-memory-pyramid"),
+        ("small_world", "0-3", "--in-memory-pyramid --in-memory-pyramid-max-size=1"),
+        ("small_world", "0-3", "--in-memory-pyramid --processes=2"),
+        ("small_world", "0-4", "--subtree-partitioning"),
+        ("small_world", "0-4", "--subtree-partitioning --processes=2"),
+        (
+            "small_world",
+            "0-4",
+            "--subtree-partitioning --in-memory-pyramid --processes=2",
+        ),
+        ("uniform", "11-14", "--uniform-tiles=copy"),
+        ("uniform", "11-14", "--uniform-tiles=hardlink"),
+        ("uniform", "11-14", "--uniform-tiles=symlink"),
+        ("uniform", "11-14", "--uniform-tiles=copy --processes=2"),
+        ("uniform", "11-14", "--uniform-tiles=copy --subtree-partitioning"),
+    ],
+)
+def test_gdal2tiles_py_same_tiles(
+    script_path, tmp_path, uniform_tif, input_name, zoom, extra_options
+):
+
+    if input_name == "uniform":
+        input_file = uniform_tif
+    else:
+        input_file = test_py_scripts.get_data_path("gdrivers") + "small_world.tif"
+    ref_dir = str(tmp_path / "ref")
+    out_dir = str(tmp_path / "out")
+
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q -z {zoom} -w none {input_file} {ref_dir}",
+    )
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q -z {zoom} -w none {extra_options} {input_file} {out_dir}",
+    )
+
+    ref_checksums = _get_tile_checksums(ref_dir)
+    assert ref_checksums
+    assert _get_tile_checksums(out_dir) == ref_checksums
+
+
+###############################################################################
+# Test that overview tiles are built from the cached pixels of their children
+
+
+@pytest.mark.require_driver("PNG")
+@pytest.mark.parametrize(
+    "extra_options,expect_reads",
+    [
+        ("", True),
+        ("--in-memory-pyramid", False),
+        ("--in-memory-pyramid --in-memory-pyramid-max-size=1", True),
+    ],
+)
+def test_gdal2tiles_py_in_memory_pyramid_cache(
+    tmp_path, monkeypatch, extra_options, expect_reads
+):
+
+    from osgeo_utils import gdal2tiles
+
+    # Count the tiles read back from the output
+    read_tiles = []
+    open_tile = gdal2tiles.open_tile
+
+    def counting_open_tile(tile_job_info, tilefilename, tz, tx, ty_tms):
+        read_tiles.append((tz, tx, ty_tms))
+        return open_tile(tile_job_info, tilefilename, tz, tx, ty_tms)
+
+    monkeypatch.setattr(gdal2tiles, "open_tile", counting_open_tile)
+
+    input_file = test_py_scripts.get_data_path("gdrivers") + "small_world.tif"
+    gdal2tiles.main(
+        ["gdal2tiles", "-q", "-z", "0-3", "-w", "none"]
+        + extra_options.split()
+        + [input_file, str(tmp_path / "out")]
+    )
+
+    if expect_reads:
+        assert read_tiles
+    else:
+        assert read_tiles == []
+
+
+###############################################################################
+# Test the MBTiles output and resuming it
+
+
+@pytest.mark.require_driver("PNG")
+@pytest.mark.parametrize(
+    "extra_options",
+    ["", "--processes=2", "--subtree-partitioning --processes=2"],
+)
+def test_gdal2tiles_py_mbtiles(script_path, tmp_path, extra_options):
+
+    import sqlite3
+
+    input_file = test_py_scripts.get_data_path("gdrivers") + "small_world.tif"
+    ref_dir = str(tmp_path / "ref")
+    out_filename = str(tmp_path / "out.mbtiles")
+
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q -z 0-3 -w none {input_file} {ref_dir}",
+    )
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q -z 0-3 --mbtiles {extra_options} {input_file} {out_filename}",
+    )
+
+    assert not os.path.exists(str(tmp_path / "out.mbtiles.aux.xml"))
+
+    ref_checksums = _get_tile_checksums(ref_dir)
+    assert ref_checksums
+
+    with sqlite3.connect(out_filename) as conn:
+        metadata = dict(conn.execute("SELECT name, value FROM metadata").fetchall())
+        assert metadata["format"] == "png"
+        assert metadata["minzoom"] == "0"
+        assert metadata["maxzoom"] == "3"
+
+        assert _get_archive_tile_checksums(conn) == ref_checksums
+
+        # Each distinct tile is stored once, and referenced by all its copies
+        assert (
+            conn.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+            == conn.execute("SELECT COUNT(DISTINCT tile_id) FROM map").fetchone()[0]
+        )
+
+    # Resume from the index of the archive, after removing a base tile and an
+    # overview tile, and replacing the content of another base tile
+    marker_tile = (3, 7, 7)
+    with sqlite3.connect(out_filename) as conn:
+        for tile in [(3, 0, 0), (2, 1, 1)]:
+            conn.execute(
+                "DELETE FROM map WHERE zoom_level = ? AND tile_column = ? AND "
+                "tile_row = ?",
+                tile,
+            )
+        conn.execute(
+            "INSERT INTO images (tile_data, tile_id) VALUES (?, 'marker')",
+            (b"marker",),
+        )
+        conn.execute(
+            "UPDATE map SET tile_id = 'marker' WHERE zoom_level = ? AND "
+            "tile_column = ? AND tile_row = ?",
+            marker_tile,
+        )
+
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q -e -z 0-3 --mbtiles {extra_options} {input_file} {out_filename}",
+    )
+    with sqlite3.connect(out_filename) as conn:
+        # Existing tiles are skipped
+        assert (
+            conn.execute(
+                "SELECT tile_data FROM tiles WHERE zoom_level = ? AND "
+                "tile_column = ? AND tile_row = ?",
+                marker_tile,
+            ).fetchone()[0]
+            == b"marker"
+        )
+        # Missing tiles are generated again
+        del ref_checksums[os.path.join("3", "7", "7.png")]
+        assert (
+            _get_archive_tile_checksums(conn, excluded_tiles=[marker_tile])
+            == ref_checksums
+        )
+
+
+###############################################################################
+# Test that uniform tiles are written once, and then linked
+
+
+@pytest.mark.require_driver("PNG")
+@pytest.mark.parametrize("mode", ["copy", "hardlink", "symlink"])
+def test_gdal2tiles_py_uniform_tiles(script_path, tmp_path, uniform_tif, mode):
+
+    if mode == "symlink" and sys.platform == "win32":
+        pytest.skip("symbolic links may require privileges")
+
+    out_dir = str(tmp_path / "out")
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q -z 11-14 -w none --uniform-tiles={mode} {uniform_tif} {out_dir}",
+    )
+
+    # Tiles of the colour of the raster, at all zoom levels
+    colour_ds = gdal.GetDriverByName("MEM").Create("", 256, 256, 4)
+    for i, value in enumerate((10, 20, 30, 255)):
+        colour_ds.GetRasterBand(i + 1).Fill(value)
+    colour_checksums = _get_checksums(colour_ds)
+    uniform_tiles = [
+        os.path.join(out_dir, tile)
+        for tile, checksums in _get_tile_checksums(out_dir).items()
+        if checksums == colour_checksums
+    ]
+    assert {
+        os.path.relpath(tile, out_dir).split(os.sep)[0] for tile in uniform_tiles
+    } == {"12", "13", "14"}
+
+    if mode == "copy":
+        assert not any(os.path.islink(tile) for tile in uniform_tiles)
+        assert all(os.stat(tile).st_nlink == 1 for tile in uniform_tiles)
+    elif mode == "hardlink":
+        # All tiles are the same file
+        assert len({os.stat(tile).st_ino for tile in uniform_tiles}) == 1
+    else:
+        # All tiles but the first written one link to it
+        assert len({os.path.realpath(tile) for tile in uniform_tiles}) == 1
+        assert sum(os.path.islink(tile) for tile in uniform_tiles) == (
+            len(uniform_tiles) - 1
+        )
@@ -198,3 +198,58 @@ def test_gdal2xyz_py_vsistdout(script_path, tmp_path):
     with gdal.Open(out_filename) as ds:
         assert ds.GetGeoTransform() == (440720.0, 60.0, 0.0, 3751320.0, 0.0, -60.0)
         assert ds.GetRasterBand(1).Checksum() == 4672
+
+
+###############################################################################
+# Test that the output does not depend on the size of the processed windows
+
+
+@pytest.mark.parametrize("skip", [1, 3])
+def test_gdal2xyz_py_windows(tmp_vsimem, skip):
+
+    src_ds = gdal.Open(test_py_scripts.get_data_path("gcore") + "rgbsmall.tif")
+
+    outputs = []
+    arrays = []
+    for window_pixels in (1, 100, 1 << 20):
+        out_filename = str(tmp_vsimem / f"out_{window_pixels}.xyz")
+        gdal2xyz.gdal2xyz(
+            src_ds,
+            out_filename,
+            skip=skip,
+            band_nums=[1, 2, 3],
+            src_nodata=0,
+            dst_nodata=255,
+            progress_callback=None,
+            window_pixels=window_pixels,
+        )
+        with gdal.VSIFile(out_filename, "rb") as f:
+            outputs.append(f.read())
+
+        arrays.append(
+            gdal2xyz.gdal2xyz(
+                src_ds,
+                skip=skip,
+                band_nums=[1, 2, 3],
+                src_nodata=0,
+                skip_nodata=True,
+                return_np_arrays=True,
+                pre_allocate_np_arrays=window_pixels != 100,
+                progress_callback=None,
+                window_pixels=window_pixels,
+            )
+        )
+
+    assert outputs[0] == outputs[1] == outputs[2]
+    lines = outputs[0].decode("UTF-8").splitlines()
+    assert len(lines) == len(range(0, src_ds.RasterXSize, skip)) * len(
+        range(0, src_ds.RasterYSize, skip)
+    )
+    assert lines[0].startswith("-44.838604 -22.9343 ")
+
+    for geo_x, geo_y, data, nodata in arrays:
+        assert nodata is None
+        np.testing.assert_array_equal(geo_x, arrays[0][0])
+        np.testing.assert_array_equal(geo_y, arrays[0][1])
+        np.testing.assert_array_equal(data, arrays[0][2])
+        assert not np.any(np.all(data == 0, axis=0))
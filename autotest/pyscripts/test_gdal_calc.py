@@ -844,3 +844,153 @@ def test_gdal_calc_py_hidenodata(tmp_vsimem):
     out_arr = out_ds.GetRasterBand(1).ReadAsMaskedArray()
     assert not np.any(out_arr.mask)
     np.testing.assert_array_equal(out_arr, data + 1)
+
+
+@pytest.mark.parametrize("threads", [2, 4])
+def test_gdal_calc_py_threads(tmp_vsimem, threads):
+
+    input_a = tmp_vsimem / "a.tif"
+    input_b = tmp_vsimem / "b.tif"
+    data_a = np.arange(100 * 90, dtype=np.int16).reshape(90, 100) % 17
+    data_b = np.arange(100 * 90, dtype=np.int16).reshape(90, 100) % 13
+
+    # Small strips so that there are many blocks in flight
+    with gdal.GetDriverByName("GTiff").Create(
+        input_a, 100, 90, 1, gdal.GDT_Int16, options=["BLOCKYSIZE=4"]
+    ) as ds:
+        ds.GetRasterBand(1).WriteArray(data_a)
+        ds.GetRasterBand(1).SetNoDataValue(3)
+    with gdal.GetDriverByName("GTiff").Create(
+        input_b, 100, 90, 1, gdal.GDT_Int16, options=["BLOCKYSIZE=4"]
+    ) as ds:
+        ds.GetRasterBand(1).WriteArray(data_b)
+
+    ref_ds = gdal_calc.Calc(
+        A=input_a, B=input_b, calc="A*B+1", format="MEM", quiet=True
+    )
+    out_ds = gdal_calc.Calc(
+        A=input_a,
+        B=input_b,
+        calc="A*B+1",
+        format="MEM",
+        quiet=True,
+        threads=threads,
+    )
+    np.testing.assert_array_equal(out_ds.ReadAsArray(), ref_ds.ReadAsArray())
+    np.testing.assert_array_equal(
+        out_ds.GetRasterBand(1).ReadAsMaskedArray().mask, data_a == 3
+    )
+
+
+def test_gdal_calc_py_threads_command_line(script_path, tmp_path, stefan_full_rgba):
+
+    infile = stefan_full_rgba
+    out = tmp_path / "out.tif"
+
+    test_py_scripts.run_py_script(
+        script_path,
+        "gdal_calc",
+        f"-A {infile} --calc=A --threads=4 --overwrite --outfile {out}",
+    )
+
+    check_file(out, input_checksum[0])
+
+
+def test_gdal_calc_py_get_window_size():
+
+    # Whole width, as many rows of blocks as fit
+    assert gdal_calc.get_window_size([(1000, 1)], (1000, 500), 4, 4000 * 10) == (
+        1000,
+        10,
+    )
+    # Aligned on the least common multiple of block heights
+    assert gdal_calc.get_window_size(
+        [(1000, 1), (256, 256), (1000, 16)], (1000, 1000), 1, 1000 * 600
+    ) == (1000, 512)
+    # Row of blocks too large: narrow the windows
+    assert gdal_calc.get_window_size([(256, 256)], (10000, 10000), 1, 1024 * 256) == (
+        1024,
+        256,
+    )
+    # Never larger than the raster
+    assert gdal_calc.get_window_size([(256, 256)], (100, 50), 1, 1e9) == (100, 50)
+
+
+@pytest.mark.parametrize("threads", [0, 2])
+def test_gdal_calc_py_window_memory(tmp_vsimem, threads):
+
+    input_a = tmp_vsimem / "a.tif"
+    input_b = tmp_vsimem / "b.tif"
+    data = np.arange(300 * 200, dtype=np.float32).reshape(200, 300)
+
+    with gdal.GetDriverByName("GTiff").Create(
+        input_a, 300, 200, 1, gdal.GDT_Float32
+    ) as ds:
+        ds.GetRasterBand(1).WriteArray(data)
+        ds.GetRasterBand(1).SetNoDataValue(5)
+    with gdal.GetDriverByName("GTiff").Create(
+        input_b,
+        300,
+        200,
+        1,
+        gdal.GDT_Byte,
+        options=["TILED=YES", "BLOCKXSIZE=32", "BLOCKYSIZE=32"],
+    ) as ds:
+        ds.GetRasterBand(1).WriteArray(data.astype(np.uint8))
+
+    ref_ds = gdal_calc.Calc(
+        A=input_a, B=input_b, calc="A+B", format="MEM", quiet=True
+    )
+    out_ds = gdal_calc.Calc(
+        A=input_a,
+        B=input_b,
+        calc="A+B",
+        format="MEM",
+        quiet=True,
+        threads=threads,
+        window_memory=0.1,
+    )
+    np.testing.assert_array_equal(out_ds.ReadAsArray(), ref_ds.ReadAsArray())
+
+
+@pytest.mark.parametrize("threads", [0, 2])
+def test_gdal_calc_py_nodata_propagation(tmp_vsimem, threads):
+
+    inputs = []
+    rng = np.random.default_rng(0)
+    for i in range(4):
+        data = rng.integers(0, 5, size=(100, 150)).astype(np.float32)
+        data[0, i] = np.nan
+        inputs.append(data)
+        with gdal.GetDriverByName("GTiff").Create(
+            tmp_vsimem / f"in{i}.tif", 150, 100, 1, gdal.GDT_Float32
+        ) as ds:
+            ds.GetRasterBand(1).WriteArray(data)
+            ds.GetRasterBand(1).SetNoDataValue(i)
+
+    kwargs = {c: tmp_vsimem / f"in{i}.tif" for i, c in enumerate("ABCD")}
+
+    # Nodata pixels of any input get the output nodata value, even if the
+    # calculation produces NaN there
+    out_ds = gdal_calc.Calc(
+        calc="A+B+C+D",
+        format="MEM",
+        type="Byte",
+        NoDataValue=255,
+        quiet=True,
+        threads=threads,
+        **kwargs,
+    )
+    mask = np.zeros((100, 150), dtype=bool)
+    for i, data in enumerate(inputs):
+        mask |= data == i
+    expected = np.where(mask, 255, sum(inputs))
+    valid = ~np.isnan(expected)
+    np.testing.assert_array_equal(out_ds.ReadAsArray()[valid], expected[valid])
+    assert out_ds.GetRasterBand(1).GetNoDataValue() == 255
+
+    # Scalar result
+    out_ds = gdal_calc.Calc(
+        calc="1", format="MEM", NoDataValue=-1, quiet=True, threads=threads, **kwargs
+    )
+    np.testing.assert_array_equal(out_ds.ReadAsArray(), np.where(mask, -1, 1))
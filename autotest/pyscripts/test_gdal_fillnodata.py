@@ -161,3 +161,55 @@ def test_gdal_fillnodata_nearest(script_path, tmp_path):
     ds = gdal.Open(result_tif)
     assert struct.unpack("B" * 9, ds.GetRasterBand(1).ReadRaster()) == expected_data
     ds = None
+
+
+###############################################################################
+# Test tiled mode
+
+
+@pytest.mark.parametrize("interpolation", ["inv_dist", "nearest"])
+def test_gdal_fillnodata_tiled(script_path, tmp_path, interpolation):
+
+    input_tif = str(tmp_path / "test_gdal_fillnodata_tiled_in.tif")
+
+    # Holes of nodata crossing the edges of 16x16 tiles
+    ds = gdal.GetDriverByName("GTiff").Create(input_tif, 50, 40)
+    ds.GetRasterBand(1).SetNoDataValue(0)
+    ds.GetRasterBand(1).WriteRaster(
+        0,
+        0,
+        50,
+        40,
+        bytes(
+            0 if (x // 5 + y // 4) % 3 == 0 else 1 + (x * 7 + y * 13) % 250
+            for y in range(40)
+            for x in range(50)
+        ),
+    )
+    ds = None
+
+    options = (
+        f"-q -md 5 -si 1 -interp {interpolation} "
+        "-co TILED=YES -co BLOCKXSIZE=16 -co BLOCKYSIZE=16"
+    )
+
+    ref_tif = str(tmp_path / "test_gdal_fillnodata_tiled_ref.tif")
+    test_py_scripts.run_py_script(
+        script_path, "gdal_fillnodata", f"{options} {input_tif} {ref_tif}"
+    )
+
+    ds = gdal.Open(ref_tif)
+    ref_data = ds.GetRasterBand(1).ReadRaster()
+    ds = None
+
+    for args in ("-tile_size 16", "-tile_size 16 -threads 3"):
+        result_tif = str(tmp_path / "test_gdal_fillnodata_tiled.tif")
+        test_py_scripts.run_py_script(
+            script_path,
+            "gdal_fillnodata",
+            f"{options} {args} {input_tif} {result_tif}",
+        )
+
+        ds = gdal.Open(result_tif)
+        assert ds.GetRasterBand(1).ReadRaster() == ref_data
+        ds = None
@@ -260,3 +260,163 @@ def test_gdal_merge_5(script_path, tmp_path):
         assert ds.GetRasterBand(2).Checksum() == cs, "Wrong checksum"
         assert ds.GetRasterBand(3).Checksum() == 0, "Wrong checksum"
         assert ds.GetRasterBand(4).Checksum() == cs, "Wrong checksum"
+
+
+###############################################################################
+# Test splitting copies in chunks aligned on the blocks of the output
+
+
+def test_gdal_merge_get_chunk_edges():
+
+    from osgeo_utils.gdal_merge import get_chunk_edges
+
+    assert get_chunk_edges(0, 100, 256) == [(0, 100)]
+    assert get_chunk_edges(0, 100, 32) == [(0, 32), (32, 32), (64, 32), (96, 4)]
+    assert get_chunk_edges(10, 60, 32) == [(10, 22), (32, 32), (64, 6)]
+
+
+###############################################################################
+# Test merging with nodata and mask in chunks using little memory
+
+
+@pytest.mark.parametrize("threads", [None, 3])
+@pytest.mark.parametrize("use_mask", [False, True])
+def test_gdal_merge_chunks(script_path, tmp_path, use_mask, threads):
+    np = pytest.importorskip("numpy")
+    gdaltest.importorskip_gdal_array()
+
+    drv = gdal.GetDriverByName("GTiff")
+    srs = osr.SpatialReference()
+    srs.SetWellKnownGeogCS("WGS84")
+    wkt = srs.ExportToWkt()
+
+    data1 = np.arange(200 * 300, dtype=np.int16).reshape(200, 300) % 100
+    data2 = (np.arange(200 * 300, dtype=np.int16).reshape(200, 300) * 7) % 50
+    input1_tif = str(tmp_path / "in1.tif")
+    with drv.Create(input1_tif, 300, 200, 1, gdal.GDT_Int16) as ds:
+        ds.SetProjection(wkt)
+        ds.SetGeoTransform([2, 0.1, 0, 49, 0, -0.1])
+        ds.GetRasterBand(1).WriteArray(data1)
+
+    input2_tif = str(tmp_path / "in2.tif")
+    with drv.Create(input2_tif, 300, 200, 1, gdal.GDT_Int16) as ds:
+        ds.SetProjection(wkt)
+        ds.SetGeoTransform([12, 0.1, 0, 49, 0, -0.1])
+        ds.GetRasterBand(1).WriteArray(data2)
+        if use_mask:
+            ds.GetRasterBand(1).SetNoDataValue(0)
+
+    output_tif = str(tmp_path / "out.tif")
+    options = "-co TILED=YES -co BLOCKXSIZE=32 -co BLOCKYSIZE=32 -wm 0.01"
+    if not use_mask:
+        options += " -n 0"
+    if threads:
+        options += f" -threads {threads}"
+    test_py_scripts.run_py_script(
+        script_path,
+        "gdal_merge",
+        f"{options} -o {output_tif} {input1_tif} {input2_tif}",
+    )
+
+    expected = np.zeros((200, 400), dtype=np.int16)
+    expected[:, :300] = data1
+    expected[:, 100:] = np.where(data2 == 0, expected[:, 100:], data2)
+    with gdal.Open(output_tif) as ds:
+        np.testing.assert_array_equal(ds.GetRasterBand(1).ReadAsArray(), expected)
+
+
+###############################################################################
+# Test that compositing tiles in parallel gives the same result as copying
+# files one after the other
+
+
+@pytest.mark.parametrize("separate", [False, True])
+def test_gdal_merge_threads(script_path, tmp_path, sample_tifs, separate):
+    gdaltest.importorskip_gdal_array()
+
+    options = "-co BLOCKYSIZE=3 "
+    options += "-separate" if separate else "-init 255 -n 63"
+    checksums = []
+    for threads in ("", "-threads ALL_CPUS"):
+        output_tif = str(tmp_path / f"test_gdal_merge_threads{len(checksums)}.tif")
+        test_py_scripts.run_py_script(
+            script_path,
+            "gdal_merge",
+            f"{options} {threads} -o {output_tif} {' '.join(sample_tifs)}",
+        )
+        with gdal.Open(output_tif) as ds:
+            checksums.append(
+                [ds.GetRasterBand(i + 1).Checksum() for i in range(ds.RasterCount)]
+            )
+
+    assert checksums[0] == checksums[1]
+
+
+###############################################################################
+# Test that resampled copies in chunks give the same result as reading the
+# whole source window at once, including the use of overviews when
+# downsampling
+
+
+@pytest.mark.parametrize("threads", [None, 3])
+@pytest.mark.parametrize(
+    "ps", ["", "-ps 0.013 0.011", "-ps 0.23 0.17", "-ps 0.45 0.45"]
+)
+def test_gdal_merge_chunks_resampled(script_path, tmp_path, ps, threads):
+    np = pytest.importorskip("numpy")
+    gdaltest.importorskip_gdal_array()
+
+    from osgeo_utils.gdal_merge import file_info
+
+    drv = gdal.GetDriverByName("GTiff")
+    srs = osr.SpatialReference()
+    srs.SetWellKnownGeogCS("WGS84")
+    wkt = srs.ExportToWkt()
+
+    # Inputs of different resolutions
+    input1_tif = str(tmp_path / "in1.tif")
+    with drv.Create(input1_tif, 30, 100, 1) as ds:
+        ds.SetProjection(wkt)
+        ds.SetGeoTransform([2, 0.1, 0, 49, 0, -0.1])
+        ds.GetRasterBand(1).WriteArray(
+            (np.arange(100 * 30).reshape(100, 30) % 250 + 1).astype(np.uint8)
+        )
+        ds.BuildOverviews("AVERAGE", [2, 4])
+
+    input2_tif = str(tmp_path / "in2.tif")
+    with drv.Create(input2_tif, 70, 90, 1) as ds:
+        ds.SetProjection(wkt)
+        ds.SetGeoTransform([3.5, 0.07, 0, 47.3, 0, -0.07])
+        ds.GetRasterBand(1).WriteArray(
+            (np.arange(90 * 70).reshape(90, 70) * 7 % 200).astype(np.uint8)
+        )
+        ds.BuildOverviews("AVERAGE", [2, 4])
+
+    output_tif = str(tmp_path / "out.tif")
+    options = f"{ps} -n 0 -co BLOCKYSIZE=16 -wm 0.01"
+    if threads:
+        options += f" -threads {threads}"
+    test_py_scripts.run_py_script(
+        script_path,
+        "gdal_merge",
+        f"{options} -o {output_tif} {input1_tif} {input2_tif}",
+    )
+
+    with gdal.Open(output_tif) as t_ds:
+        expected = np.zeros((t_ds.RasterYSize, t_ds.RasterXSize), dtype=np.uint8)
+        for input_tif in (input1_tif, input2_tif):
+            fi = file_info()
+            fi.init_from_name(input_tif)
+            source_window, target_window = fi.get_copy_windows(t_ds)
+            tw_xoff, tw_yoff, tw_xsize, tw_ysize = target_window
+            with gdal.Open(input_tif) as s_ds:
+                data = s_ds.GetRasterBand(1).ReadAsArray(
+                    *source_window, buf_xsize=tw_xsize, buf_ysize=tw_ysize
+                )
+            np.copyto(
+                expected[tw_yoff : tw_yoff + tw_ysize, tw_xoff : tw_xoff + tw_xsize],
+                data,
+                where=data != 0,
+            )
+
+        np.testing.assert_array_equal(t_ds.GetRasterBand(1).ReadAsArray(), expected)
@@ -310,3 +310,88 @@ def test_gdal_polygonize_overwrite(script_path, tmp_path, format):
     lyr = ds.GetLayer(0)
     assert lyr.GetFeatureCount() == initial_value
     ds = None
+
+
+###############################################################################
+# Test tiled mode
+
+
+@pytest.mark.require_driver("GeoJSON")
+@pytest.mark.require_geos
+@pytest.mark.parametrize("connectedness", ["", "-8 "])
+@pytest.mark.parametrize("source", ["byte", "stripes", "diagonals"])
+def test_gdal_polygonize_tiled(script_path, tmp_path, connectedness, source):
+
+    # 16x16 blocks, so that tiles are 16x16 and there are seams at 16
+    src_filename = str(tmp_path / "tiled.tif")
+    creation_options = ["TILED=YES", "BLOCKXSIZE=16", "BLOCKYSIZE=16"]
+    if source == "byte":
+        gdal.Translate(
+            src_filename,
+            test_py_scripts.get_data_path("gcore") + "byte.tif",
+            creationOptions=creation_options,
+        )
+    else:
+        if source == "stripes":
+            # Staircase stripes spanning many tiles and touching by their
+            # corners, with scattered pixels
+            xsize, ysize = 100, 70
+
+            def value(x, y):
+                return (x // 5 + y // 3) % 2 * 2 + ((x * y) % 11 == 0)
+
+        else:
+            # Diagonal lines of pixels only connected by their corners, also
+            # across the corners of tiles
+            xsize, ysize = 48, 48
+
+            def value(x, y):
+                return x == y or x + y == 31
+
+        ds = gdal.GetDriverByName("GTiff").Create(
+            src_filename, xsize, ysize, options=creation_options
+        )
+        ds.GetRasterBand(1).WriteRaster(
+            0,
+            0,
+            xsize,
+            ysize,
+            bytes(value(x, y) for y in range(ysize) for x in range(xsize)),
+        )
+        ds = None
+
+    def get_polygons(filename):
+        ds = gdal.OpenEx(filename)
+        lyr = ds.GetLayer(0)
+        # Polygons connected by their corners must be merged into a single
+        # polygon in 8-connected mode, as when not tiled
+        return sorted(
+            (
+                f["DN"],
+                f.GetGeometryRef().GetGeometryName(),
+                round(f.GetGeometryRef().GetArea(), 3),
+            )
+            for f in lyr
+        )
+
+    ref_filename = str(tmp_path / "ref.geojson")
+    test_py_scripts.run_py_script(
+        script_path,
+        "gdal_polygonize",
+        "-q " + connectedness + src_filename + " " + ref_filename,
+    )
+
+    for args in ("-tile_size 10", "-tile_size 1 -threads 3"):
+        out_filename = str(tmp_path / "out.geojson")
+        test_py_scripts.run_py_script(
+            script_path,
+            "gdal_polygonize",
+            "-q -overwrite "
+            + connectedness
+            + args
+            + " "
+            + src_filename
+            + " "
+            + out_filename,
+        )
+        assert get_polygons(out_filename) == get_polygons(ref_filename)
@@ -185,6 +185,63 @@ def test_gdal_retile_non_contigous(script_path, tmp_path):
     assert os.path.exists(f"{out_dir}/1/in1_1_2.tif")
 
 
+###############################################################################
+# Test that gdal_retile.py -threads produces the same tiles as the serial path
+
+
+@pytest.mark.parametrize("threads", ["1", "4"])
+def test_gdal_retile_threads(script_path, tmp_path, threads):
+    drv = gdal.GetDriverByName("GTiff")
+    srs = osr.SpatialReference()
+    srs.SetWellKnownGeogCS("WGS84")
+    wkt = srs.ExportToWkt()
+
+    inputs = []
+    for i, (ulx, uly) in enumerate([(0, 15), (15, 30), (15, 15)]):
+        in_tif = str(tmp_path / f"in{i + 1}.tif")
+        with drv.Create(in_tif, 100, 100, 1) as ds:
+            ds.SetProjection(wkt)
+            ds.SetGeoTransform([ulx, 0.15, 0, uly, 0, -0.15])
+            ds.GetRasterBand(1).Fill(21 * i)
+        inputs.append(in_tif)
+
+    out_dirs = []
+    for extra_args in ("", f"-threads {threads}"):
+        out_dir = tmp_path / ("outretile_threads" if extra_args else "outretile")
+        out_dir.mkdir()
+        out_dirs.append(out_dir)
+
+        test_py_scripts.run_py_script(
+            script_path,
+            "gdal_retile",
+            f"-levels 2 -r bilinear -ps 20 20 -csv tiles.csv {extra_args} "
+            f"-targetDir {out_dir} " + " ".join(inputs),
+        )
+
+    def tiles(out_dir):
+        ret = {}
+        for filename in glob.glob(str(out_dir / "**" / "*.tif"), recursive=True):
+            with gdal.Open(filename) as ds:
+                ret[os.path.relpath(filename, out_dir)] = (
+                    ds.GetGeoTransform(),
+                    ds.RasterXSize,
+                    ds.RasterYSize,
+                    ds.GetRasterBand(1).Checksum(),
+                )
+        return ret
+
+    expected = tiles(out_dirs[0])
+    assert "in1_01_05.tif" in expected
+    assert os.path.join("1", "in1_1_2.tif") in expected
+    assert tiles(out_dirs[1]) == expected
+
+    for csv_dir in ("", "1", "2"):
+        with open(out_dirs[0] / csv_dir / "tiles.csv") as f:
+            expected_csv = f.read()
+        with open(out_dirs[1] / csv_dir / "tiles.csv") as f:
+            assert f.read() == expected_csv
+
+
 ###############################################################################
 # Test gdal_retile.py with input images of different pixel sizes
 
@@ -502,3 +559,75 @@ def test_gdal_retile_different_srs(script_path, tmp_path, srs1, srs2, expected_e
     )
     assert expected_err in err
     assert len(glob.glob(os.path.join(str(out_dir), "*.tif"))) == 0
+
+
+###############################################################################
+# Test the lookup of tiles in the in-memory tile index
+
+
+def test_gdal_retile_tile_index_query():
+
+    from osgeo_utils.gdal_retile import TileIndex
+
+    tileIndex = TileIndex()
+    envelopes = {}
+    for y in range(30):
+        for x in range(30):
+            location = f"tile_{y}_{x}"
+            envelopes[location] = (x, x + 1.5, -y - 1.5, -y)
+            tileIndex.add(location, envelopes[location])
+
+    def expected(minx, miny, maxx, maxy):
+        return [
+            (location, env)
+            for location, env in envelopes.items()
+            if env[0] <= maxx and env[1] >= minx and env[2] <= maxy and env[3] >= miny
+        ]
+
+    for bbox in [
+        (0, -1, 0.5, 0),
+        (2.5, -10.2, 7, -4),
+        (-5, -50, 50, 5),
+        (40, 0, 50, 5),
+    ]:
+        assert tileIndex.query(*bbox) == expected(*bbox)
+
+    # tiles added after the first queries are found too, in index order
+    tileIndex.add("first", (3, 4, -4, -3), order=-1)
+    envelopes = {"first": (3, 4, -4, -3), **envelopes}
+    assert tileIndex.query(2.5, -10.2, 7, -4) == expected(2.5, -10.2, 7, -4)
+    assert tileIndex.first() == "first"
+
+
+###############################################################################
+# Test that the cache of datasets closes the least recently used ones
+
+
+def test_gdal_retile_dataset_cache(tmp_path):
+
+    from osgeo_utils.gdal_retile import DataSetCache
+
+    filenames = []
+    for i in range(4):
+        filename = str(tmp_path / f"in{i}.tif")
+        gdal.GetDriverByName("GTiff").Create(filename, 10, 10, 2, gdal.GDT_Int16)
+        filenames.append(filename)
+
+    cache = DataSetCache(maxCount=2)
+    ds0 = cache.get(filenames[0])
+    cache.get(filenames[1])
+    assert cache.get(filenames[0]) is ds0
+    cache.get(filenames[2])
+    assert list(cache.dict) == [filenames[0], filenames[2]]
+
+    # each dataset has 10 * 10 * 2 * 2 bytes of raster data
+    cache = DataSetCache(maxCount=8, maxBytes=1000)
+    for filename in filenames:
+        cache.get(filename)
+    assert list(cache.dict) == filenames[2:]
+    assert cache.usedBytes == 800
+
+    cache = DataSetCache(maxCount=8, maxBytes=100)
+    cache.get(filenames[0])
+    cache.get(filenames[1])
+    assert list(cache.dict) == filenames[1:2]
@@ -12,6 +12,7 @@
 # SPDX-License-Identifier: MIT
 ###############################################################################
 
+import math
 import shutil
 
 import gdaltest
@@ -354,3 +355,142 @@ def test_gdalcompare_float32_only_nodata(tmp_vsimem):
         )
         == 2
     )
+
+
+###############################################################################
+
+
+def test_gdalcompare_tolerance(tmp_vsimem):
+
+    np = pytest.importorskip("numpy")
+    gdaltest.importorskip_gdal_array()
+
+    golden_filename = str(tmp_vsimem / "golden.tif")
+    filename = str(tmp_vsimem / "new.tif")
+    values = np.arange(100 * 50, dtype=np.float32).reshape(50, 100) + 1000
+    with gdal.GetDriverByName("GTiff").Create(
+        golden_filename, 100, 50, 1, gdal.GDT_Float32, options=["BLOCKYSIZE=8"]
+    ) as ds:
+        ds.GetRasterBand(1).WriteArray(values)
+    new_values = values.copy()
+    new_values[10, 20] = np.nextafter(new_values[10, 20], np.float32(np.inf))
+    new_values[40, 70] += 0.5
+    with gdal.GetDriverByName("GTiff").Create(
+        filename, 100, 50, 1, gdal.GDT_Float32
+    ) as ds:
+        ds.GetRasterBand(1).WriteArray(new_values)
+
+    lines = []
+
+    def find_diff(options):
+        del lines[:]
+        return gdalcompare.find_diff(
+            golden_filename, filename, options=["SKIP_BINARY"] + options
+        )
+
+    ori_print = gdalcompare.my_print
+    gdalcompare.my_print = lambda *args: lines.append(" ".join(args))
+    try:
+        assert find_diff([]) == 1
+        assert "  Pixels Differing: 2" in lines
+        assert "  Maximum Pixel Difference: 0.5" in lines
+        assert (
+            "  Differences Bounding Box: xoff=20, yoff=10, xsize=51, ysize=31" in lines
+        )
+        assert "    [1e-01, 1e+00): 1" in lines
+        assert "    [1e-04, 1e-03): 1" in lines
+
+        assert find_diff(["ABS_TOLERANCE=0.5"]) == 0
+        assert "  Pixels Exceeding Tolerance: 0" in lines
+        assert find_diff(["ABS_TOLERANCE=0.1"]) == 1
+        assert "  Pixels Exceeding Tolerance: 1" in lines
+        assert find_diff(["REL_TOLERANCE=1e-3"]) == 0
+        assert find_diff(["ULP_TOLERANCE=1"]) == 1
+        assert "  Pixels Exceeding Tolerance: 1" in lines
+        assert find_diff(["ULP_TOLERANCE=100000"]) == 0
+    finally:
+        gdalcompare.my_print = ori_print
+
+
+###############################################################################
+# Test that the root mean square difference does not depend on windows
+
+
+def test_gdalcompare_rms_windows(tmp_vsimem, monkeypatch):
+
+    np = pytest.importorskip("numpy")
+    gdaltest.importorskip_gdal_array()
+
+    golden_filename = str(tmp_vsimem / "golden.tif")
+    filename = str(tmp_vsimem / "new.tif")
+    values = np.arange(100 * 50, dtype=np.float32).reshape(50, 100)
+    # NaN on both sides, in a window without differences
+    values[2, :30] = np.nan
+    new_values = values.copy()
+    new_values[40, 70] += 2
+    # NaN on one side only
+    new_values[45, 10] = np.nan
+    for name, data in ((golden_filename, values), (filename, new_values)):
+        with gdal.GetDriverByName("GTiff").Create(
+            name, 100, 50, 1, gdal.GDT_Float32, options=["BLOCKYSIZE=8"]
+        ) as ds:
+            ds.GetRasterBand(1).WriteArray(data)
+
+    def get_rms_line():
+        lines = []
+        ori_print = gdalcompare.my_print
+        gdalcompare.my_print = lambda *args: lines.append(" ".join(args))
+        try:
+            gdalcompare.find_diff(golden_filename, filename, options=["SKIP_BINARY"])
+        finally:
+            gdalcompare.my_print = ori_print
+        return [line for line in lines if "Root Mean Square" in line]
+
+    expected = [
+        "  Root Mean Square Difference: " + str(math.sqrt(4 / (100 * 50 - 30 - 1)))
+    ]
+    assert get_rms_line() == expected
+    monkeypatch.setattr(gdalcompare, "COMPARE_WINDOW_PIXELS", 100 * 8)
+    assert get_rms_line() == expected
+
+
+###############################################################################
+
+
+def test_gdalcompare_threads(tmp_vsimem):
+
+    pytest.importorskip("numpy")
+    gdaltest.importorskip_gdal_array()
+
+    golden_filename = str(tmp_vsimem / "golden.tif")
+    gdal.Translate(golden_filename, "../gcore/data/rgbsmall.tif")
+    ds = gdal.Open(golden_filename, gdal.GA_Update)
+    ds.BuildOverviews("NEAR", [2])
+    ds = None
+
+    filename = str(tmp_vsimem / "new.tif")
+    gdal.Translate(filename, golden_filename, options="-scale 0 255 0 254")
+    ds = gdal.Open(filename, gdal.GA_Update)
+    ds.BuildOverviews("AVERAGE", [2])
+    ds = None
+
+    def find_diff(options):
+        lines = []
+        ori_print = gdalcompare.my_print
+        gdalcompare.my_print = lambda *args: lines.append(" ".join(args))
+        try:
+            count = gdalcompare.find_diff(
+                golden_filename, filename, options=["SKIP_BINARY"] + options
+            )
+        finally:
+            gdalcompare.my_print = ori_print
+        return count, lines
+
+    count, lines = find_diff([])
+    assert count >= 3
+    assert find_diff(["NUM_THREADS=4"]) == (count, lines)
+
+    # pixels of the next bands are not compared once the threshold is reached
+    stopped_count, lines = find_diff(["MAX_FAILURES=1"])
+    assert stopped_count == count
+    assert any(line.startswith("  Comparison stopped after") for line in lines)
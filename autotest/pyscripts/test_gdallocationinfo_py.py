@@ -201,3 +201,71 @@ def test_gdallocationinfo_py_7(tmp_path):
                 outputs = list(zip(x, y, pixels, lines, *results))
                 print(f"ovr: {ovr_idx}, srs: {srs}, x/y/pixel/line/result: {outputs}")
             assert_allclose(expected, actual, rtol=1e-4, atol=1e-3)
+
+
+@pytest.mark.parametrize(
+    "resample_alg",
+    [gdal.GRIORA_NearestNeighbour, gdal.GRIORA_Bilinear, gdal.GRIORA_Cubic],
+)
+def test_gdallocationinfo_py_batched(tmp_path, resample_alg):
+    """Test that sampling by block gives the same values as point by point"""
+
+    filename = str(tmp_path / "test_gdallocationinfo_py_batched.tif")
+    ds = gdal.GetDriverByName("GTiff").Create(
+        filename,
+        100,
+        80,
+        3,
+        gdal.GDT_Float32,
+        options=["TILED=YES", "BLOCKXSIZE=16", "BLOCKYSIZE=16"],
+    )
+    rng = np.random.default_rng(0)
+    for band_num in range(1, 4):
+        ds.GetRasterBand(band_num).WriteArray(
+            rng.uniform(0, 1000, (80, 100)).astype(np.float32)
+        )
+
+    # including points within the kernel radius of the edges, where the
+    # weights are renormalized over the pixels inside the raster
+    x = np.concatenate(([0, 0.3, 1.2, 99.7, 99.99, 50], rng.uniform(0, 100, 494)))
+    y = np.concatenate(([0, 79.99, 40, 0.2, 79.5, 1.6], rng.uniform(0, 80, 494)))
+
+    _, _, expected = gdallocationinfo.gdallocationinfo(
+        filename_or_ds=ds, x=x, y=y, resample_alg=resample_alg, batched=False
+    )
+    _, _, results = gdallocationinfo.gdallocationinfo(
+        filename_or_ds=ds, x=x, y=y, resample_alg=resample_alg
+    )
+    assert results.shape == (3, 500)
+    assert_allclose(results, expected, rtol=1e-5)
+
+    # subset of bands, points outside of the raster
+    results = gdallocationinfo.sample_points(
+        ds, np.array([-1, 0, 99.5, 100]), np.array([0, 0, 79.5, 0]), band_nums=[2]
+    )
+    band = ds.GetRasterBand(2)
+    assert results.tolist() == [
+        [
+            0,
+            band.ReadAsArray(0, 0, 1, 1)[0][0],
+            band.ReadAsArray(99, 79, 1, 1)[0][0],
+            0,
+        ]
+    ]
+
+
+def test_gdallocationinfo_py_batched_nodata(tmp_path):
+    """Test that nodata pixels are left out of the kernel"""
+
+    ds = gdal.GetDriverByName("MEM").Create("", 4, 4, 1, gdal.GDT_Byte)
+    band = ds.GetRasterBand(1)
+    band.SetNoDataValue(0)
+    band.WriteArray(np.array([[10, 20, 0, 0]] * 4, dtype=np.uint8))
+
+    results = gdallocationinfo.sample_points(
+        ds,
+        np.array([1.0, 1.5, 3.0]),
+        np.array([1.0, 1.0, 1.0]),
+        resample_alg=gdal.GRIORA_Bilinear,
+    )
+    assert results.tolist() == [[15, 20, 0]]
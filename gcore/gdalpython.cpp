@@ -110,6 +110,9 @@ int (*PyBuffer_FillInfo)(Py_buffer *view, PyObject *obj, void *buf, size_t len,
                          int readonly, int infoflags) = nullptr;
 PyObject *(*PyMemoryView_FromBuffer)(Py_buffer *view) = nullptr;
 
+int (*PyCapsule_IsValid)(PyObject *capsule, const char *name) = nullptr;
+void *(*PyCapsule_GetPointer)(PyObject *capsule, const char *name) = nullptr;
+
 PyObject *(*PyModule_Create2)(struct PyModuleDef *, int) = nullptr;
 }  // namespace GDALPy
 
@@ -700,6 +703,8 @@ static bool LoadPythonAPI()
 
     LOAD(libHandle, PyBuffer_FillInfo);
     LOAD(libHandle, PyMemoryView_FromBuffer);
+    LOAD(libHandle, PyCapsule_IsValid);
+    LOAD(libHandle, PyCapsule_GetPointer);
     LOAD(libHandle, PyObject_Type);
     LOAD(libHandle, PyObject_IsInstance);
     LOAD(libHandle, PyTuple_New);
@@ -96,6 +96,9 @@ extern int (*PyBuffer_FillInfo)(Py_buffer *view, PyObject *obj, void *buf,
                                 size_t len, int readonly, int infoflags);
 extern PyObject *(*PyMemoryView_FromBuffer)(Py_buffer *view);
 
+extern int (*PyCapsule_IsValid)(PyObject *capsule, const char *name);
+extern void *(*PyCapsule_GetPointer)(PyObject *capsule, const char *name);
+
 typedef PyObject *(*PyCFunction)(PyObject *, PyObject *, PyObject *);
 
 typedef struct PyMethodDef PyMethodDef;
@@ -15,11 +15,15 @@
 #include "cpl_string.h"
 #include "gdal_priv.h"
 #include "ogrsf_frmts.h"
+#include "ogrlayerarrow.h"
+#include "ogr_p.h"
+#include "ogr_swq.h"
 #include "gdalpython.h"
 
 #include <algorithm>
 #include <memory>
 #include <mutex>
+#include <vector>
 
 using namespace GDALPy;
 
@@ -290,6 +294,59 @@ static CPLString GetStringRes(PyObject *poObj, const char *pszFunctionName,
     return osRes;
 }
 
+/************************************************************************/
+/*                   PythonPluginArrowAdapterLayer                      */
+/************************************************************************/
+
+// Collects the features built by WriteArrowBatch() from an Arrow batch
+class PythonPluginArrowAdapterLayer final : public OGRLayer
+{
+    friend class PythonPluginLayer;
+    OGRFeatureDefn *m_poLayerDefn = nullptr;
+    std::vector<std::unique_ptr<OGRFeature>> m_apoFeatures{};
+
+    CPL_DISALLOW_COPY_ASSIGN(PythonPluginArrowAdapterLayer)
+
+  public:
+    explicit PythonPluginArrowAdapterLayer(OGRFeatureDefn *poLayerDefn)
+        : m_poLayerDefn(poLayerDefn)
+    {
+        m_poLayerDefn->Reference();
+    }
+
+    ~PythonPluginArrowAdapterLayer() override
+    {
+        m_apoFeatures.clear();
+        m_poLayerDefn->Release();
+    }
+
+    OGRFeatureDefn *GetLayerDefn() override
+    {
+        return m_poLayerDefn;
+    }
+
+    void ResetReading() override
+    {
+    }
+
+    OGRFeature *GetNextFeature() override
+    {
+        return nullptr;
+    }
+
+    int TestCapability(const char *pszCap) override
+    {
+        return EQUAL(pszCap, OLCSequentialWrite);
+    }
+
+    OGRErr ICreateFeature(OGRFeature *poFeature) override
+    {
+        m_apoFeatures.emplace_back(
+            std::unique_ptr<OGRFeature>(poFeature->Clone()));
+        return OGRERR_NONE;
+    }
+};
+
 /************************************************************************/
 /*                          PythonPluginLayer                           */
 /************************************************************************/
@@ -303,6 +360,10 @@ class PythonPluginLayer final : public OGRLayer
     bool m_bHasFIDColumn = false;
     std::map<CPLString, CPLStringList> m_oMapMD{};
     PyObject *m_pyFeatureByIdMethod = nullptr;
+    PyObject *m_pyFeaturesByIdsMethod = nullptr;
+    // Sorted FIDs of a "FID = x" or "FID IN (...)" attribute filter
+    std::vector<GIntBig> m_anFIDsFilter{};
+    bool m_bFIDsFilter = false;
     bool m_bIteratorHonourSpatialFilter = false;
     bool m_bIteratorHonourAttributeFilter = false;
     bool m_bFeatureCountHonourSpatialFilter = false;
@@ -310,13 +371,39 @@ class PythonPluginLayer final : public OGRLayer
     PyObject *m_pyIterator = nullptr;
     bool m_bStopIteration = false;
 
+    // Members used when features are built from the arrow_stream() method
+    PyObject *m_pyArrowStreamMethod = nullptr;
+    std::unique_ptr<OGRArrowArrayStream> m_poArrowStream{};
+    struct ArrowSchema m_sArrowSchema
+    {
+    };
+    std::unique_ptr<PythonPluginArrowAdapterLayer> m_poArrowAdapterLayer{};
+    size_t m_nArrowFeatureIdx = 0;
+
     void RefreshHonourFlags();
     void StoreSpatialFilter();
+    void StoreAttributeFilter();
+
+    const char *GetSWQColumnName(int nFieldIndex);
+    PyObject *SWQExprToPython(const swq_expr_node *poNode);
+    bool CollectFIDsFilter(const swq_expr_node *poNode);
+    bool UseFeaturesByIds() const
+    {
+        return m_pyFeaturesByIdsMethod != nullptr && m_bFIDsFilter;
+    }
+
+    PyObject *CallFeaturesByIds(const std::vector<GIntBig> &anFIDs);
 
     void GetFields();
     void GetGeomFields();
     OGRFeature *TranslateToOGRFeature(PyObject *poObj);
 
+    bool CanUsePythonArrowStream(CSLConstList papszOptions);
+    bool GetPythonArrowStream(struct ArrowArrayStream *out_stream,
+                              CSLConstList papszOptions);
+    void ResetArrowStreamReading();
+    OGRFeature *GetNextFeatureFromArrowStream();
+
     PythonPluginLayer(const PythonPluginLayer &) = delete;
     PythonPluginLayer &operator=(const PythonPluginLayer &) = delete;
 
@@ -340,6 +427,9 @@ class PythonPluginLayer final : public OGRLayer
     OGRErr IGetExtent(int iGeomField, OGREnvelope *psExtent,
                       bool bForce) override;
 
+    bool GetArrowStream(struct ArrowArrayStream *out_stream,
+                        CSLConstList papszOptions = nullptr) override;
+
     char **GetMetadata(const char *pszDomain = "") override;
 };
 
@@ -357,7 +447,9 @@ PythonPluginLayer::PythonPluginLayer(PyObject *poLayer)
     Py_DecRef(ptr);
     PyObject_SetAttrString(m_poLayer, "spatial_filter_extent", Py_None);
     PyObject_SetAttrString(m_poLayer, "spatial_filter", Py_None);
+    PyObject_SetAttrString(m_poLayer, "spatial_filter_geometry_field", Py_None);
     PyObject_SetAttrString(m_poLayer, "attribute_filter", Py_None);
+    PyObject_SetAttrString(m_poLayer, "attribute_filter_expr", Py_None);
     auto poFalse = PyBool_FromLong(false);
     if (!PyObject_HasAttrString(m_poLayer, "iterator_honour_attribute_filter"))
     {
@@ -389,6 +481,18 @@ PythonPluginLayer::PythonPluginLayer(PyObject *poLayer)
         m_pyFeatureByIdMethod =
             PyObject_GetAttrString(m_poLayer, "feature_by_id");
     }
+
+    if (PyObject_HasAttrString(m_poLayer, "features_by_ids"))
+    {
+        m_pyFeaturesByIdsMethod =
+            PyObject_GetAttrString(m_poLayer, "features_by_ids");
+    }
+
+    if (PyObject_HasAttrString(m_poLayer, "arrow_stream"))
+    {
+        m_pyArrowStreamMethod =
+            PyObject_GetAttrString(m_poLayer, "arrow_stream");
+    }
 }
 
 /************************************************************************/
@@ -401,8 +505,11 @@ PythonPluginLayer::~PythonPluginLayer()
     if (m_poFeatureDefn)
         m_poFeatureDefn->Release();
     Py_DecRef(m_pyFeatureByIdMethod);
+    Py_DecRef(m_pyFeaturesByIdsMethod);
+    Py_DecRef(m_pyArrowStreamMethod);
     Py_DecRef(m_poLayer);
     Py_DecRef(m_pyIterator);
+    ResetArrowStreamReading();
 }
 
 /************************************************************************/
@@ -448,13 +555,68 @@ void PythonPluginLayer::RefreshHonourFlags()
 /************************************************************************/
 
 OGRErr PythonPluginLayer::SetAttributeFilter(const char *pszFilter)
+{
+    // Compile the filter as OGRLayer::SetAttributeFilter() does, but
+    // without its ResetReading(): the plugin must be given the new filter
+    // before its iterator is created.
+    CPLFree(m_pszAttrQueryString);
+    m_pszAttrQueryString = pszFilter ? CPLStrdup(pszFilter) : nullptr;
+    OGRErr eErr = OGRERR_NONE;
+    if (pszFilter == nullptr || pszFilter[0] == '\0')
+    {
+        delete m_poAttrQuery;
+        m_poAttrQuery = nullptr;
+    }
+    else
+    {
+        if (!m_poAttrQuery)
+            m_poAttrQuery = new OGRFeatureQuery();
+        eErr = m_poAttrQuery->Compile(this, pszFilter);
+        if (eErr != OGRERR_NONE)
+        {
+            delete m_poAttrQuery;
+            m_poAttrQuery = nullptr;
+        }
+    }
+
+    StoreAttributeFilter();
+    ResetReading();
+    return eErr;
+}
+
+/************************************************************************/
+/*                        StoreAttributeFilter()                        */
+/************************************************************************/
+
+void PythonPluginLayer::StoreAttributeFilter()
 {
     GIL_Holder oHolder(false);
-    PyObject *str =
-        pszFilter ? PyUnicode_FromString(pszFilter) : IncRefAndReturn(Py_None);
+    PyObject *str = m_pszAttrQueryString
+                        ? PyUnicode_FromString(m_pszAttrQueryString)
+                        : IncRefAndReturn(Py_None);
     PyObject_SetAttrString(m_poLayer, "attribute_filter", str);
     Py_DecRef(str);
 
+    const swq_expr_node *poNode =
+        m_poAttrQuery
+            ? static_cast<const swq_expr_node *>(m_poAttrQuery->GetSWQExpr())
+            : nullptr;
+    PyObject *expr = poNode ? SWQExprToPython(poNode) : nullptr;
+    if (expr == nullptr)
+        expr = IncRefAndReturn(Py_None);
+    PyObject_SetAttrString(m_poLayer, "attribute_filter_expr", expr);
+    Py_DecRef(expr);
+
+    m_anFIDsFilter.clear();
+    m_bFIDsFilter = poNode != nullptr && CollectFIDsFilter(poNode);
+    if (m_bFIDsFilter)
+    {
+        std::sort(m_anFIDsFilter.begin(), m_anFIDsFilter.end());
+        m_anFIDsFilter.erase(
+            std::unique(m_anFIDsFilter.begin(), m_anFIDsFilter.end()),
+            m_anFIDsFilter.end());
+    }
+
     if (PyObject_HasAttrString(m_poLayer, "attribute_filter_changed"))
     {
         auto poObj =
@@ -462,8 +624,161 @@ OGRErr PythonPluginLayer::SetAttributeFilter(const char *pszFilter)
         Py_DecRef(CallPython(poObj));
         Py_DecRef(poObj);
     }
+}
+
+/************************************************************************/
+/*                          GetSWQColumnName()                          */
+/************************************************************************/
+
+const char *PythonPluginLayer::GetSWQColumnName(int nFieldIndex)
+{
+    // Field indices are the ones built by OGRFeatureQuery::Compile():
+    // regular fields, special fields, geometry fields, and finally the
+    // FID column if it has a name.
+    const int nFieldCount = GetLayerDefn()->GetFieldCount();
+    const int nGeomFieldCount = GetLayerDefn()->GetGeomFieldCount();
+    if (nFieldIndex < 0)
+        return nullptr;
+    if (nFieldIndex < nFieldCount)
+        return GetLayerDefn()->GetFieldDefn(nFieldIndex)->GetNameRef();
+    nFieldIndex -= nFieldCount;
+    if (nFieldIndex < SPECIAL_FIELD_COUNT)
+        return SpecialFieldNames[nFieldIndex];
+    nFieldIndex -= SPECIAL_FIELD_COUNT;
+    if (nFieldIndex < nGeomFieldCount)
+        return GetLayerDefn()->GetGeomFieldDefn(nFieldIndex)->GetNameRef();
+    if (nFieldIndex == nGeomFieldCount)
+        return SpecialFieldNames[SPF_FID];
+    return nullptr;
+}
+
+/************************************************************************/
+/*                          SWQExprToPython()                           */
+/************************************************************************/
+
+/** Converts an OGR SQL expression tree into nested Python tuples:
+ * ("column", name) for columns, Python values for constants, and
+ * (operator_name, arg1, ...) for operations.
+ * Returns nullptr if the expression contains unsupported nodes.
+ */
+PyObject *PythonPluginLayer::SWQExprToPython(const swq_expr_node *poNode)
+{
+    if (poNode->eNodeType == SNT_COLUMN)
+    {
+        const char *pszName = GetSWQColumnName(poNode->field_index);
+        if (pszName == nullptr || poNode->table_index != 0)
+            return nullptr;
+        PyObject *tuple = PyTuple_New(2);
+        PyTuple_SetItem(tuple, 0, PyUnicode_FromString("column"));
+        PyTuple_SetItem(tuple, 1, PyUnicode_FromString(pszName));
+        return tuple;
+    }
+
+    if (poNode->eNodeType == SNT_CONSTANT)
+    {
+        if (poNode->is_null)
+            return IncRefAndReturn(Py_None);
+        switch (poNode->field_type)
+        {
+            case SWQ_INTEGER:
+            case SWQ_INTEGER64:
+                return PyLong_FromLongLong(poNode->int_value);
+            case SWQ_BOOLEAN:
+                return PyBool_FromLong(poNode->int_value != 0);
+            case SWQ_FLOAT:
+                return PyFloat_FromDouble(poNode->float_value);
+            case SWQ_STRING:
+            case SWQ_DATE:
+            case SWQ_TIME:
+            case SWQ_TIMESTAMP:
+                return PyUnicode_FromString(
+                    poNode->string_value ? poNode->string_value : "");
+            case SWQ_GEOMETRY:
+            {
+                if (poNode->geometry_value == nullptr)
+                    return IncRefAndReturn(Py_None);
+                char *pszWKT = nullptr;
+                poNode->geometry_value->exportToWkt(&pszWKT, wkbVariantIso);
+                PyObject *str = PyUnicode_FromString(pszWKT);
+                CPLFree(pszWKT);
+                return str;
+            }
+            default:
+                return nullptr;
+        }
+    }
+
+    if (poNode->eNodeType != SNT_OPERATION)
+        return nullptr;
+
+    const char *pszOpName = nullptr;
+    if (poNode->nOperation == SWQ_CUSTOM_FUNC)
+    {
+        pszOpName = poNode->string_value;
+    }
+    else
+    {
+        const swq_operation *poOp = swq_op_registrar::GetOperator(
+            static_cast<swq_op>(poNode->nOperation));
+        if (poOp)
+            pszOpName = poOp->pszName;
+    }
+    if (pszOpName == nullptr)
+        return nullptr;
+
+    PyObject *tuple = PyTuple_New(1 + poNode->nSubExprCount);
+    PyTuple_SetItem(tuple, 0, PyUnicode_FromString(pszOpName));
+    for (int i = 0; i < poNode->nSubExprCount; ++i)
+    {
+        PyObject *arg = SWQExprToPython(poNode->papoSubExpr[i]);
+        if (arg == nullptr)
+        {
+            Py_DecRef(tuple);
+            return nullptr;
+        }
+        PyTuple_SetItem(tuple, 1 + i, arg);
+    }
+    return tuple;
+}
+
+/************************************************************************/
+/*                         CollectFIDsFilter()                          */
+/************************************************************************/
+
+/** Returns whether the expression is of the form "FID = x" or
+ * "FID IN (x, y, ...)", and stores the FIDs in m_anFIDsFilter.
+ */
+bool PythonPluginLayer::CollectFIDsFilter(const swq_expr_node *poNode)
+{
+    if (poNode->eNodeType != SNT_OPERATION ||
+        (poNode->nOperation != SWQ_EQ && poNode->nOperation != SWQ_IN) ||
+        poNode->nSubExprCount < 2)
+    {
+        return false;
+    }
+
+    const swq_expr_node *poColumn = poNode->papoSubExpr[0];
+    if (poColumn->eNodeType != SNT_COLUMN || poColumn->table_index != 0)
+        return false;
+    const int nFieldCount = GetLayerDefn()->GetFieldCount();
+    if (poColumn->field_index != nFieldCount + SPF_FID &&
+        poColumn->field_index != nFieldCount + SPECIAL_FIELD_COUNT +
+                                     GetLayerDefn()->GetGeomFieldCount())
+    {
+        return false;
+    }
 
-    return OGRLayer::SetAttributeFilter(pszFilter);
+    for (int i = 1; i < poNode->nSubExprCount; ++i)
+    {
+        const swq_expr_node *poValue = poNode->papoSubExpr[i];
+        if (poValue->eNodeType != SNT_CONSTANT || poValue->is_null ||
+            !SWQ_IS_INTEGER(poValue->field_type))
+        {
+            return false;
+        }
+        m_anFIDsFilter.push_back(poValue->int_value);
+    }
+    return true;
 }
 
 /************************************************************************/
@@ -489,11 +804,20 @@ void PythonPluginLayer::StoreSpatialFilter()
         PyObject_SetAttrString(m_poLayer, "spatial_filter", str);
         Py_DecRef(str);
         CPLFree(pszWKT);
+
+        const OGRGeomFieldDefn *poGeomFieldDefn =
+            GetLayerDefn()->GetGeomFieldDefn(m_iGeomFieldFilter);
+        str = PyUnicode_FromString(
+            poGeomFieldDefn ? poGeomFieldDefn->GetNameRef() : "");
+        PyObject_SetAttrString(m_poLayer, "spatial_filter_geometry_field", str);
+        Py_DecRef(str);
     }
     else
     {
         PyObject_SetAttrString(m_poLayer, "spatial_filter_extent", Py_None);
         PyObject_SetAttrString(m_poLayer, "spatial_filter", Py_None);
+        PyObject_SetAttrString(m_poLayer, "spatial_filter_geometry_field",
+                               Py_None);
     }
 
     if (PyObject_HasAttrString(m_poLayer, "spatial_filter_changed"))
@@ -551,6 +875,12 @@ const char *PythonPluginLayer::GetName()
 
 int PythonPluginLayer::TestCapability(const char *pszCap)
 {
+    if (EQUAL(pszCap, OLCFastGetArrowStream) &&
+        CanUsePythonArrowStream(nullptr))
+    {
+        return true;
+    }
+
     GIL_Holder oHolder(false);
     if (PyObject_HasAttrString(m_poLayer, "test_capability"))
     {
@@ -732,6 +1062,221 @@ OGRErr PythonPluginLayer::IGetExtent(int iGeomField, OGREnvelope *psExtent,
     return OGRLayer::IGetExtent(iGeomField, psExtent, bForce);
 }
 
+/************************************************************************/
+/*                      CanUsePythonArrowStream()                       */
+/************************************************************************/
+
+// Whether the stream returned by the arrow_stream() method can be directly
+// forwarded to the caller of GetArrowStream()
+bool PythonPluginLayer::CanUsePythonArrowStream(CSLConstList papszOptions)
+{
+    if (m_pyArrowStreamMethod == nullptr ||
+        (!m_bIteratorHonourSpatialFilter && m_poFilterGeom != nullptr) ||
+        (!m_bIteratorHonourAttributeFilter && m_poAttrQuery != nullptr) ||
+        !CPLFetchBool(papszOptions, "INCLUDE_FID", true) ||
+        !EQUAL(CSLFetchNameValueDef(papszOptions, "GEOMETRY_ENCODING", "WKB"),
+               "WKB") ||
+        CPLFetchBool(papszOptions, GAS_OPT_DATETIME_AS_STRING, false))
+    {
+        return false;
+    }
+
+    const auto poLayerDefn = GetLayerDefn();
+    for (int i = 0; i < poLayerDefn->GetFieldCount(); ++i)
+    {
+        if (poLayerDefn->GetFieldDefn(i)->IsIgnored())
+            return false;
+    }
+    for (int i = 0; i < poLayerDefn->GetGeomFieldCount(); ++i)
+    {
+        if (poLayerDefn->GetGeomFieldDefn(i)->IsIgnored())
+            return false;
+    }
+    return true;
+}
+
+/************************************************************************/
+/*                       GetPythonArrowStream()                         */
+/************************************************************************/
+
+// Call the arrow_stream() method and move the ArrowArrayStream it exposes,
+// through the Arrow PyCapsule interface, into out_stream.
+bool PythonPluginLayer::GetPythonArrowStream(
+    struct ArrowArrayStream *out_stream, CSLConstList papszOptions)
+{
+    GIL_Holder oHolder(false);
+
+    PyObject *poOptions = PyDict_New();
+    for (const auto &[pszKey, pszValue] : cpl::IterateNameValue(papszOptions))
+    {
+        PyObject *poValue = PyUnicode_FromString(pszValue);
+        PyDict_SetItemString(poOptions, pszKey, poValue);
+        Py_DecRef(poValue);
+    }
+    PyObject *pyArgs = PyTuple_New(1);
+    PyTuple_SetItem(pyArgs, 0, poOptions);
+    PyObject *poRet = PyObject_Call(m_pyArrowStreamMethod, pyArgs, nullptr);
+    Py_DecRef(pyArgs);
+    if (ErrOccurredEmitCPLError())
+    {
+        Py_DecRef(poRet);
+        return false;
+    }
+
+    PyObject *poCapsule = poRet;
+    if (PyObject_HasAttrString(poRet, "__arrow_c_stream__"))
+    {
+        PyObject *poMethod =
+            PyObject_GetAttrString(poRet, "__arrow_c_stream__");
+        poCapsule = CallPython(poMethod);
+        Py_DecRef(poMethod);
+        Py_DecRef(poRet);
+        if (ErrOccurredEmitCPLError())
+        {
+            Py_DecRef(poCapsule);
+            return false;
+        }
+    }
+
+    if (!PyCapsule_IsValid(poCapsule, "arrow_array_stream"))
+    {
+        CPLError(CE_Failure, CPLE_AppDefined,
+                 "arrow_stream() should return an object implementing "
+                 "__arrow_c_stream__() or an 'arrow_array_stream' PyCapsule");
+        Py_DecRef(poCapsule);
+        return false;
+    }
+
+    auto stream = static_cast<struct ArrowArrayStream *>(
+        PyCapsule_GetPointer(poCapsule, "arrow_array_stream"));
+    if (stream == nullptr || stream->release == nullptr)
+    {
+        CPLError(CE_Failure, CPLE_AppDefined,
+                 "arrow_stream() returned an already consumed stream");
+        Py_DecRef(poCapsule);
+        return false;
+    }
+
+    // Move the stream, as per
+    // https://arrow.apache.org/docs/format/CDataInterface/PyCapsuleInterface.html#lifetime-semantics
+    memcpy(out_stream, stream, sizeof(*out_stream));
+    stream->release = nullptr;
+    Py_DecRef(poCapsule);
+    return true;
+}
+
+/************************************************************************/
+/*                          GetArrowStream()                            */
+/************************************************************************/
+
+bool PythonPluginLayer::GetArrowStream(struct ArrowArrayStream *out_stream,
+                                       CSLConstList papszOptions)
+{
+    if (!CanUsePythonArrowStream(papszOptions))
+        return OGRLayer::GetArrowStream(out_stream, papszOptions);
+
+    return GetPythonArrowStream(out_stream, papszOptions);
+}
+
+/************************************************************************/
+/*                      ResetArrowStreamReading()                       */
+/************************************************************************/
+
+void PythonPluginLayer::ResetArrowStreamReading()
+{
+    if (m_poArrowAdapterLayer)
+        m_poArrowAdapterLayer->m_apoFeatures.clear();
+    m_nArrowFeatureIdx = 0;
+    m_poArrowStream.reset();
+    if (m_sArrowSchema.release)
+        m_sArrowSchema.release(&m_sArrowSchema);
+    memset(&m_sArrowSchema, 0, sizeof(m_sArrowSchema));
+}
+
+/************************************************************************/
+/*                  GetNextFeatureFromArrowStream()                     */
+/************************************************************************/
+
+// Build OGRFeatures from the record batches of the arrow_stream() method,
+// one batch at a time.
+OGRFeature *PythonPluginLayer::GetNextFeatureFromArrowStream()
+{
+    if (m_bStopIteration)
+        return nullptr;
+
+    if (!m_poArrowAdapterLayer)
+    {
+        m_poArrowAdapterLayer =
+            std::make_unique<PythonPluginArrowAdapterLayer>(GetLayerDefn());
+    }
+
+    while (m_nArrowFeatureIdx == m_poArrowAdapterLayer->m_apoFeatures.size())
+    {
+        m_nArrowFeatureIdx = 0;
+        m_poArrowAdapterLayer->m_apoFeatures.clear();
+
+        if (!m_poArrowStream)
+        {
+            auto stream = std::make_unique<OGRArrowArrayStream>();
+            if (!GetPythonArrowStream(stream->get(), nullptr))
+            {
+                m_bStopIteration = true;
+                return nullptr;
+            }
+            if (stream->get_schema(&m_sArrowSchema) != 0)
+            {
+                CPLError(CE_Failure, CPLE_AppDefined, "get_schema() failed");
+                m_bStopIteration = true;
+                return nullptr;
+            }
+            m_poArrowStream = std::move(stream);
+        }
+
+        struct ArrowArray array;
+        memset(&array, 0, sizeof(array));
+        if (m_poArrowStream->get_next(&array) != 0)
+        {
+            CPLError(CE_Failure, CPLE_AppDefined, "get_next() failed");
+            m_bStopIteration = true;
+            return nullptr;
+        }
+        if (array.release == nullptr)
+        {
+            // End of stream
+            m_bStopIteration = true;
+            return nullptr;
+        }
+
+        CPLStringList aosOptions;
+        const char *pszFIDColumn = GetFIDColumn();
+        if (pszFIDColumn[0])
+            aosOptions.SetNameValue("FID", pszFIDColumn);
+        const bool bOK =
+            array.length == 0 ||
+            m_poArrowAdapterLayer->WriteArrowBatch(&m_sArrowSchema, &array,
+                                                   aosOptions.List());
+        if (array.release)
+            array.release(&array);
+        if (!bOK)
+        {
+            m_bStopIteration = true;
+            return nullptr;
+        }
+    }
+
+    auto poFeature =
+        m_poArrowAdapterLayer->m_apoFeatures[m_nArrowFeatureIdx++].release();
+    const int nGeomFieldCount = m_poFeatureDefn->GetGeomFieldCount();
+    for (int i = 0; i < nGeomFieldCount; ++i)
+    {
+        auto poGeom = poFeature->GetGeomFieldRef(i);
+        if (poGeom)
+            poGeom->assignSpatialReference(
+                m_poFeatureDefn->GetGeomFieldDefn(i)->GetSpatialRef());
+    }
+    return poFeature;
+}
+
 /************************************************************************/
 /*                      TranslateToOGRFeature()                         */
 /************************************************************************/
@@ -956,9 +1501,67 @@ OGRFeature *PythonPluginLayer::GetFeature(GIntBig nFID)
         }
         return poFeature;
     }
+
+    if (m_pyFeaturesByIdsMethod)
+    {
+        PyObject *pyIter = CallFeaturesByIds(std::vector<GIntBig>{nFID});
+        if (pyIter == nullptr)
+            return nullptr;
+        PyObject *pRet = PyIter_Next(pyIter);
+        Py_DecRef(pyIter);
+        if (ErrOccurredEmitCPLError() || pRet == nullptr)
+        {
+            Py_DecRef(pRet);
+            return nullptr;
+        }
+        auto poFeature = TranslateToOGRFeature(pRet);
+        Py_DecRef(pRet);
+        if (ErrOccurredEmitCPLError())
+        {
+            delete poFeature;
+            return nullptr;
+        }
+        return poFeature;
+    }
+
     return OGRLayer::GetFeature(nFID);
 }
 
+/************************************************************************/
+/*                         CallFeaturesByIds()                          */
+/************************************************************************/
+
+/** Calls the features_by_ids() method and returns an iterator over its
+ * result, or nullptr in case of error. Must be called with the GIL held.
+ */
+PyObject *
+PythonPluginLayer::CallFeaturesByIds(const std::vector<GIntBig> &anFIDs)
+{
+    PyObject *list = PyList_New(static_cast<Py_ssize_t>(anFIDs.size()));
+    for (size_t i = 0; i < anFIDs.size(); ++i)
+    {
+        PyList_SetItem(list, static_cast<Py_ssize_t>(i),
+                       PyLong_FromLongLong(anFIDs[i]));
+    }
+    PyObject *pyArgs = PyTuple_New(1);
+    PyTuple_SetItem(pyArgs, 0, list);
+    PyObject *pRet = PyObject_Call(m_pyFeaturesByIdsMethod, pyArgs, nullptr);
+    Py_DecRef(pyArgs);
+    if (ErrOccurredEmitCPLError())
+    {
+        Py_DecRef(pRet);
+        return nullptr;
+    }
+    PyObject *pyIter = PyObject_GetIter(pRet);
+    Py_DecRef(pRet);
+    if (ErrOccurredEmitCPLError())
+    {
+        Py_DecRef(pyIter);
+        return nullptr;
+    }
+    return pyIter;
+}
+
 /************************************************************************/
 /*                           ResetReading()                             */
 /************************************************************************/
@@ -967,9 +1570,21 @@ void PythonPluginLayer::ResetReading()
 {
     m_bStopIteration = false;
 
+    if (m_pyArrowStreamMethod && !UseFeaturesByIds())
+    {
+        ResetArrowStreamReading();
+        return;
+    }
+
     GIL_Holder oHolder(false);
 
     Py_DecRef(m_pyIterator);
+    if (UseFeaturesByIds())
+    {
+        // Only fetch the features selected by the FID attribute filter
+        m_pyIterator = CallFeaturesByIds(m_anFIDsFilter);
+        return;
+    }
     m_pyIterator = PyObject_GetIter(m_poLayer);
     CPL_IGNORE_RET_VAL(ErrOccurredEmitCPLError());
 }
@@ -980,6 +1595,29 @@ void PythonPluginLayer::ResetReading()
 
 OGRFeature *PythonPluginLayer::GetNextFeature()
 {
+    if (m_pyArrowStreamMethod && !UseFeaturesByIds())
+    {
+        // The GIL is only taken when calling the arrow_stream() method, and
+        // by the stream callbacks themselves if they need it.
+        while (true)
+        {
+            auto poFeature = GetNextFeatureFromArrowStream();
+            if (poFeature == nullptr)
+                return nullptr;
+
+            if ((m_bIteratorHonourSpatialFilter || m_poFilterGeom == nullptr ||
+                 FilterGeometry(
+                     poFeature->GetGeomFieldRef(m_iGeomFieldFilter))) &&
+                (m_bIteratorHonourAttributeFilter || m_poAttrQuery == nullptr ||
+                 m_poAttrQuery->Evaluate(poFeature)))
+            {
+                return poFeature;
+            }
+
+            delete poFeature;
+        }
+    }
+
     GIL_Holder oHolder(false);
 
     if (m_bStopIteration)
@@ -1004,6 +1642,13 @@ OGRFeature *PythonPluginLayer::GetNextFeature()
             return nullptr;
         }
 
+        // features_by_ids() may return None for missing FIDs
+        if (poRet == Py_None && UseFeaturesByIds())
+        {
+            Py_DecRef(poRet);
+            continue;
+        }
+
         auto poFeature = TranslateToOGRFeature(poRet);
         Py_DecRef(poRet);
         if (poFeature == nullptr)
@@ -1408,11 +2053,21 @@ char **PythonPluginLayer::GetMetadata(const char *pszDomain)
 
 class PythonPluginDataset final : public GDALDataset
 {
+    friend class PythonPluginRasterBand;
+
     PyObject *m_poDataset = nullptr;
     std::map<int, std::unique_ptr<OGRLayer>> m_oMapLayer{};
     std::map<CPLString, CPLStringList> m_oMapMD{};
     bool m_bHasLayersMember = false;
 
+    // Raster related members
+    PyObject *m_pyReadBlockMethod = nullptr;
+    bool m_bHasGeoTransform = false;
+    GDALGeoTransform m_gt{};
+    OGRSpatialReference m_oSRS{};
+
+    bool InitRaster(GDALOpenInfo *poOpenInfo);
+
     PythonPluginDataset(const PythonPluginDataset &) = delete;
     PythonPluginDataset &operator=(const PythonPluginDataset &) = delete;
 
@@ -1420,9 +2075,36 @@ class PythonPluginDataset final : public GDALDataset
     PythonPluginDataset(GDALOpenInfo *poOpenInfo, PyObject *poDataset);
     ~PythonPluginDataset();
 
+    bool IsRaster() const
+    {
+        return m_pyReadBlockMethod != nullptr;
+    }
+
     int GetLayerCount() override;
     OGRLayer *GetLayer(int) override;
     char **GetMetadata(const char *pszDomain = "") override;
+
+    CPLErr GetGeoTransform(GDALGeoTransform &gt) const override;
+    const OGRSpatialReference *GetSpatialRef() const override;
+};
+
+/************************************************************************/
+/*                        PythonPluginRasterBand                        */
+/************************************************************************/
+
+class PythonPluginRasterBand final : public GDALRasterBand
+{
+    bool m_bHasNoData = false;
+    double m_dfNoData = 0;
+
+  public:
+    PythonPluginRasterBand(PythonPluginDataset *poDSIn, int nBandIn,
+                           GDALDataType eDataTypeIn, int nBlockXSizeIn,
+                           int nBlockYSizeIn, bool bHasNoData,
+                           double dfNoData);
+
+    CPLErr IReadBlock(int nBlockXOff, int nBlockYOff, void *pImage) override;
+    double GetNoDataValue(int *pbSuccess = nullptr) override;
 };
 
 /************************************************************************/
@@ -1455,6 +2137,217 @@ PythonPluginDataset::PythonPluginDataset(GDALOpenInfo *poOpenInfo,
         }
         Py_DecRef(poLayers);
     }
+
+    if (PyObject_HasAttrString(m_poDataset, "read_block"))
+    {
+        m_pyReadBlockMethod = PyObject_GetAttrString(m_poDataset, "read_block");
+        if (!InitRaster(poOpenInfo))
+        {
+            Py_DecRef(m_pyReadBlockMethod);
+            m_pyReadBlockMethod = nullptr;
+        }
+    }
+}
+
+/************************************************************************/
+/*                           GetAttrValue()                             */
+/************************************************************************/
+
+// Return a new reference to the value of an attribute of poObj, or to the
+// result of calling it if it is a method. Return nullptr if the attribute
+// does not exist, or if the call failed.
+static PyObject *GetAttrValue(PyObject *poObj, const char *pszName)
+{
+    if (!PyObject_HasAttrString(poObj, pszName))
+        return nullptr;
+    PyObject *poAttr = PyObject_GetAttrString(poObj, pszName);
+    if (ErrOccurredEmitCPLError())
+        return nullptr;
+    if (PyCallable_Check(poAttr))
+    {
+        PyObject *poRes = CallPython(poAttr);
+        Py_DecRef(poAttr);
+        if (ErrOccurredEmitCPLError())
+        {
+            Py_DecRef(poRes);
+            return nullptr;
+        }
+        return poRes;
+    }
+    return poAttr;
+}
+
+/************************************************************************/
+/*                          GetIntAttrValue()                           */
+/************************************************************************/
+
+static bool GetIntAttrValue(PyObject *poObj, const char *pszName, int &nVal)
+{
+    PyObject *poVal = GetAttrValue(poObj, pszName);
+    if (poVal == nullptr)
+        return false;
+    const long nRes = PyLong_AsLong(poVal);
+    Py_DecRef(poVal);
+    if (ErrOccurredEmitCPLError())
+        return false;
+    if (nRes < INT_MIN || nRes > INT_MAX)
+    {
+        CPLError(CE_Failure, CPLE_AppDefined, "Invalid value for %s",
+                 pszName);
+        return false;
+    }
+    nVal = static_cast<int>(nRes);
+    return true;
+}
+
+/************************************************************************/
+/*                            InitRaster()                              */
+/************************************************************************/
+
+bool PythonPluginDataset::InitRaster(GDALOpenInfo *poOpenInfo)
+{
+    if (!GetIntAttrValue(m_poDataset, "width", nRasterXSize) ||
+        !GetIntAttrValue(m_poDataset, "height", nRasterYSize))
+    {
+        CPLError(CE_Failure, CPLE_AppDefined,
+                 "width and height must be defined when read_block() is");
+        return false;
+    }
+    if (!GDALCheckDatasetDimensions(nRasterXSize, nRasterYSize))
+        return false;
+
+    int nBands = 1;
+    if (PyObject_HasAttrString(m_poDataset, "band_count") &&
+        !GetIntAttrValue(m_poDataset, "band_count", nBands))
+        return false;
+    if (!GDALCheckBandCount(nBands, FALSE))
+        return false;
+
+    int nBlockXSize = nRasterXSize;
+    int nBlockYSize = 1;
+    if ((PyObject_HasAttrString(m_poDataset, "block_width") &&
+         !GetIntAttrValue(m_poDataset, "block_width", nBlockXSize)) ||
+        (PyObject_HasAttrString(m_poDataset, "block_height") &&
+         !GetIntAttrValue(m_poDataset, "block_height", nBlockYSize)))
+        return false;
+    if (nBlockXSize <= 0 || nBlockYSize <= 0)
+    {
+        CPLError(CE_Failure, CPLE_AppDefined, "Invalid block size");
+        return false;
+    }
+
+    GDALDataType eDT = GDT_Byte;
+    if (PyObject_HasAttrString(m_poDataset, "data_type"))
+    {
+        PyObject *poVal = GetAttrValue(m_poDataset, "data_type");
+        if (poVal == nullptr)
+            return false;
+        const long nType = PyLong_AsLong(poVal);
+        if (PyErr_Occurred())
+        {
+            PyErr_Clear();
+            const CPLString osType = GetString(poVal);
+            Py_DecRef(poVal);
+            if (ErrOccurredEmitCPLError())
+                return false;
+            eDT = GDALGetDataTypeByName(osType);
+        }
+        else
+        {
+            Py_DecRef(poVal);
+            eDT = nType > GDT_Unknown && nType < GDT_TypeCount
+                      ? static_cast<GDALDataType>(nType)
+                      : GDT_Unknown;
+        }
+        if (eDT == GDT_Unknown)
+        {
+            CPLError(CE_Failure, CPLE_AppDefined, "Invalid data_type");
+            return false;
+        }
+    }
+
+    bool bHasNoData = false;
+    double dfNoData = 0;
+    if (PyObject_HasAttrString(m_poDataset, "nodata"))
+    {
+        PyObject *poVal = GetAttrValue(m_poDataset, "nodata");
+        if (poVal == nullptr)
+            return false;
+        if (poVal != Py_None)
+        {
+            dfNoData = PyFloat_AsDouble(poVal);
+            bHasNoData = true;
+        }
+        Py_DecRef(poVal);
+        if (ErrOccurredEmitCPLError())
+            return false;
+    }
+
+    if (PyObject_HasAttrString(m_poDataset, "geotransform"))
+    {
+        PyObject *poVal = GetAttrValue(m_poDataset, "geotransform");
+        if (poVal == nullptr)
+            return false;
+        if (poVal != Py_None)
+        {
+            if (PySequence_Size(poVal) != 6)
+            {
+                PyErr_Clear();
+                Py_DecRef(poVal);
+                CPLError(CE_Failure, CPLE_AppDefined,
+                         "geotransform should have 6 values");
+                return false;
+            }
+            for (int i = 0; i < 6; ++i)
+            {
+                PyObject *poItem = PySequence_GetItem(poVal, i);
+                m_gt[i] = PyFloat_AsDouble(poItem);
+                Py_DecRef(poItem);
+            }
+            m_bHasGeoTransform = true;
+        }
+        Py_DecRef(poVal);
+        if (ErrOccurredEmitCPLError())
+            return false;
+    }
+
+    if (PyObject_HasAttrString(m_poDataset, "srs"))
+    {
+        PyObject *poVal = GetAttrValue(m_poDataset, "srs");
+        if (poVal == nullptr)
+            return false;
+        if (poVal != Py_None)
+        {
+            const CPLString osSRS = GetString(poVal);
+            if (!osSRS.empty())
+            {
+                m_oSRS.SetAxisMappingStrategy(OAMS_TRADITIONAL_GIS_ORDER);
+                if (m_oSRS.SetFromUserInput(
+                        osSRS,
+                        OGRSpatialReference::
+                            SET_FROM_USER_INPUT_LIMITATIONS_get()) !=
+                    OGRERR_NONE)
+                {
+                    m_oSRS.Clear();
+                }
+            }
+        }
+        Py_DecRef(poVal);
+        if (ErrOccurredEmitCPLError())
+            return false;
+    }
+
+    for (int i = 0; i < nBands; ++i)
+    {
+        SetBand(i + 1,
+                new PythonPluginRasterBand(this, i + 1, eDT, nBlockXSize,
+                                           nBlockYSize, bHasNoData, dfNoData));
+    }
+
+    // Support for external overviews and masks
+    oOvManager.Initialize(this, poOpenInfo);
+
+    return true;
 }
 
 /************************************************************************/
@@ -1475,6 +2368,7 @@ PythonPluginDataset::~PythonPluginDataset()
 
         CPL_IGNORE_RET_VAL(ErrOccurredEmitCPLError());
     }
+    Py_DecRef(m_pyReadBlockMethod);
     Py_DecRef(m_poDataset);
 }
 
@@ -1488,6 +2382,8 @@ int PythonPluginDataset::GetLayerCount()
         return static_cast<int>(m_oMapLayer.size());
 
     GIL_Holder oHolder(false);
+    if (IsRaster() && !PyObject_HasAttrString(m_poDataset, "layer_count"))
+        return 0;
     return GetIntRes(m_poDataset, "layer_count");
 }
 
@@ -1549,6 +2445,132 @@ char **PythonPluginDataset::GetMetadata(const char *pszDomain)
     return m_oMapMD[pszDomain].List();
 }
 
+/************************************************************************/
+/*                          GetGeoTransform()                           */
+/************************************************************************/
+
+CPLErr PythonPluginDataset::GetGeoTransform(GDALGeoTransform &gt) const
+{
+    if (!m_bHasGeoTransform)
+        return GDALDataset::GetGeoTransform(gt);
+    gt = m_gt;
+    return CE_None;
+}
+
+/************************************************************************/
+/*                           GetSpatialRef()                            */
+/************************************************************************/
+
+const OGRSpatialReference *PythonPluginDataset::GetSpatialRef() const
+{
+    return m_oSRS.IsEmpty() ? nullptr : &m_oSRS;
+}
+
+/************************************************************************/
+/*                        PythonPluginRasterBand()                      */
+/************************************************************************/
+
+PythonPluginRasterBand::PythonPluginRasterBand(
+    PythonPluginDataset *poDSIn, int nBandIn, GDALDataType eDataTypeIn,
+    int nBlockXSizeIn, int nBlockYSizeIn, bool bHasNoData, double dfNoData)
+    : m_bHasNoData(bHasNoData), m_dfNoData(dfNoData)
+{
+    poDS = poDSIn;
+    nBand = nBandIn;
+    eDataType = eDataTypeIn;
+    nBlockXSize = nBlockXSizeIn;
+    nBlockYSize = nBlockYSizeIn;
+}
+
+/************************************************************************/
+/*                          GetNoDataValue()                            */
+/************************************************************************/
+
+double PythonPluginRasterBand::GetNoDataValue(int *pbSuccess)
+{
+    if (pbSuccess)
+        *pbSuccess = m_bHasNoData;
+    return m_dfNoData;
+}
+
+/************************************************************************/
+/*                            IReadBlock()                              */
+/************************************************************************/
+
+CPLErr PythonPluginRasterBand::IReadBlock(int nBlockXOff, int nBlockYOff,
+                                          void *pImage)
+{
+    auto poGDS = cpl::down_cast<PythonPluginDataset *>(poDS);
+    const size_t nDTSize = GDALGetDataTypeSizeBytes(eDataType);
+    int nXValid = 0;
+    int nYValid = 0;
+    GetActualBlockSize(nBlockXOff, nBlockYOff, &nXValid, &nYValid);
+
+    // The GIL is only held for the duration of the read_block() call, so
+    // that other threads can run Python code between blocks.
+    GIL_Holder oHolder(false);
+
+    PyObject *pyArgs = PyTuple_New(3);
+    PyTuple_SetItem(pyArgs, 0, PyLong_FromLong(nBand));
+    PyTuple_SetItem(pyArgs, 1, PyLong_FromLong(nBlockXOff));
+    PyTuple_SetItem(pyArgs, 2, PyLong_FromLong(nBlockYOff));
+    PyObject *poRet =
+        PyObject_Call(poGDS->m_pyReadBlockMethod, pyArgs, nullptr);
+    Py_DecRef(pyArgs);
+    if (ErrOccurredEmitCPLError())
+    {
+        Py_DecRef(poRet);
+        return CE_Failure;
+    }
+
+    // Accepts bytes, bytearray, memoryview, numpy arrays, etc.
+    PyObject *poBytes = PyBytes_FromObject(poRet);
+    Py_DecRef(poRet);
+    if (ErrOccurredEmitCPLError())
+    {
+        Py_DecRef(poBytes);
+        return CE_Failure;
+    }
+    char *pabyData = nullptr;
+    Py_ssize_t nSize = 0;
+    PyBytes_AsStringAndSize(poBytes, &pabyData, &nSize);
+    if (ErrOccurredEmitCPLError())
+    {
+        Py_DecRef(poBytes);
+        return CE_Failure;
+    }
+
+    const size_t nBlockSize =
+        static_cast<size_t>(nBlockXSize) * nBlockYSize * nDTSize;
+    const size_t nValidSize = static_cast<size_t>(nXValid) * nYValid * nDTSize;
+    CPLErr eErr = CE_None;
+    if (nSize == nBlockSize)
+    {
+        memcpy(pImage, pabyData, nBlockSize);
+    }
+    else if (nSize == nValidSize)
+    {
+        // Partial block at the right or bottom edge of the raster
+        GByte *pabyImage = static_cast<GByte *>(pImage);
+        for (int iY = 0; iY < nYValid; ++iY)
+        {
+            memcpy(pabyImage + iY * nBlockXSize * nDTSize,
+                   pabyData + iY * nXValid * nDTSize, nXValid * nDTSize);
+        }
+    }
+    else
+    {
+        CPLError(CE_Failure, CPLE_AppDefined,
+                 "read_block(%d, %d, %d) returned " CPL_FRMT_GUIB
+                 " bytes, whereas " CPL_FRMT_GUIB " were expected",
+                 nBand, nBlockXOff, nBlockYOff, static_cast<GUIntBig>(nSize),
+                 static_cast<GUIntBig>(nBlockSize));
+        eErr = CE_Failure;
+    }
+    Py_DecRef(poBytes);
+    return eErr;
+}
+
 /************************************************************************/
 /*                          PythonPluginDriver                          */
 /************************************************************************/
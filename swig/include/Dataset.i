@@ -99,6 +99,11 @@ typedef struct
 {
     GDALAsyncReaderH  hAsyncReader;
     void             *pyObject;
+#if defined(SWIGPYTHON)
+    /* Export of the buffer the reader writes into, held for its lifetime */
+    Py_buffer         view;
+    bool              viewIsValid;
+#endif
 } GDALAsyncReaderWrapper;
 
 typedef void* GDALAsyncReaderWrapperH;
@@ -119,6 +124,17 @@ static void* AsyncReaderWrapperGetPyObject(GDALAsyncReaderWrapperH hWrapper)
     GDALAsyncReaderWrapper* psWrapper = (GDALAsyncReaderWrapper*)hWrapper;
     return psWrapper->pyObject;
 }
+
+static void AsyncReaderWrapperReleaseBuffer(GDALAsyncReaderWrapper* psWrapper)
+{
+    if (psWrapper->viewIsValid)
+    {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+        PyBuffer_Release(&psWrapper->view);
+        SWIG_PYTHON_THREAD_END_BLOCK;
+        psWrapper->viewIsValid = false;
+    }
+}
 #endif
 
 static void DeleteAsyncReaderWrapper(GDALAsyncReaderWrapperH hWrapper)
@@ -129,6 +145,9 @@ static void DeleteAsyncReaderWrapper(GDALAsyncReaderWrapperH hWrapper)
         CPLError(CE_Failure, CPLE_AppDefined,
                  "Native AsyncReader object will leak. EndAsyncReader() should have been called before");
     }
+#if defined(SWIGPYTHON)
+    AsyncReaderWrapperReleaseBuffer(psWrapper);
+#endif
     CPLFree(psWrapper);
 }
 
@@ -146,16 +165,32 @@ static GDALAsyncReaderWrapper* CreateAsyncReaderWrapper(GDALAsyncReaderH  hAsync
     GDALAsyncReaderWrapper* psWrapper = (GDALAsyncReaderWrapper* )CPLMalloc(sizeof(GDALAsyncReaderWrapper));
     psWrapper->hAsyncReader = hAsyncReader;
     psWrapper->pyObject = pyObject;
+    psWrapper->viewIsValid = false;
+    SWIG_PYTHON_THREAD_BEGIN_BLOCK;
     Py_INCREF((PyObject*) psWrapper->pyObject);
+    /* The reader writes into the buffer until EndAsyncReader(): keep it */
+    /* exported until then, so that it cannot be resized or freed. */
+    if (!PyBytes_Check((PyObject*) pyObject))
+    {
+        if (PyObject_GetBuffer((PyObject*) pyObject, &psWrapper->view,
+                               PyBUF_WRITABLE | PyBUF_C_CONTIGUOUS) == 0)
+            psWrapper->viewIsValid = true;
+        else
+            PyErr_Clear();
+    }
+    SWIG_PYTHON_THREAD_END_BLOCK;
     return psWrapper;
 }
 
 static void DisableAsyncReaderWrapper(GDALAsyncReaderWrapperH hWrapper)
 {
     GDALAsyncReaderWrapper* psWrapper = (GDALAsyncReaderWrapper*)hWrapper;
+    AsyncReaderWrapperReleaseBuffer(psWrapper);
     if (psWrapper->pyObject)
     {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
         Py_XDECREF((PyObject*) psWrapper->pyObject);
+        SWIG_PYTHON_THREAD_END_BLOCK;
     }
     psWrapper->pyObject = NULL;
     psWrapper->hAsyncReader = NULL;
@@ -247,6 +247,7 @@ typedef enum
 
 %{
 #include <iostream>
+#include <vector>
 using namespace std;
 
 #define CPL_SUPRESS_CPLUSPLUS
@@ -1361,6 +1362,44 @@ public:
     return (OGRFeatureShadow*) OGR_L_GetNextFeature(self);
   }
 
+#ifdef SWIGPYTHON
+  /* Fetch several features by FID, with a single call from Python. */
+  /* Features that cannot be fetched are returned as None. */
+  PyObject* _GetFeatures(int nList, GIntBig* pList) {
+      std::vector<OGRFeatureH> ahFeatures(nList);
+      {
+          // A missing FID is not an error for this method
+          CPLErrorStateBackuper oErrorStateBackuper(CPLQuietErrorHandler);
+          for( int i = 0; i < nList; i++ )
+              ahFeatures[i] = OGR_L_GetFeature(self, pList[i]);
+      }
+
+      SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+      PyObject* ret = PyList_New(nList);
+      for( int i = 0; i < nList; i++ )
+      {
+          PyObject* item;
+          if( ahFeatures[i] == NULL )
+          {
+              Py_INCREF(Py_None);
+              item = Py_None;
+          }
+          else
+          {
+              item = SWIG_NewPointerObj(SWIG_as_voidptr(ahFeatures[i]),
+                                        SWIGTYPE_p_OGRFeatureShadow,
+                                        SWIG_POINTER_OWN);
+          }
+          if( ret != NULL )
+              PyList_SET_ITEM(ret, i, item);
+          else
+              Py_XDECREF(item);
+      }
+      SWIG_PYTHON_THREAD_END_BLOCK;
+      return ret;
+  }
+#endif
+
   OGRErr SetNextByIndex(GIntBig new_index) {
     return OGR_L_SetNextByIndex(self, new_index);
   }
@@ -1860,6 +1899,150 @@ typedef double* retDoubleArray;
 %}
 #endif
 
+#ifdef SWIGPYTHON
+%{
+/* Return the index of a field, preferring an exact match over a case */
+/* insensitive one. */
+static int OGRFeatureGetFieldIndexExactFirst(OGRFeatureH hFeat, const char* pszName)
+{
+    OGRFeatureDefnH hDefn = OGR_F_GetDefnRef(hFeat);
+    const int nFieldCount = OGR_FD_GetFieldCount(hDefn);
+    int iCaseInsensitive = -1;
+    for( int i = 0; i < nFieldCount; i++ )
+    {
+        const char* pszFieldName = OGR_Fld_GetNameRef(OGR_FD_GetFieldDefn(hDefn, i));
+        if( strcmp(pszFieldName, pszName) == 0 )
+            return i;
+        if( iCaseInsensitive < 0 && EQUAL(pszFieldName, pszName) )
+            iCaseInsensitive = i;
+    }
+    return iCaseInsensitive;
+}
+
+/* Return the value of a field as a Python object of its native type. */
+/* Must be called with the GIL held. */
+static PyObject* OGRFeatureGetFieldAsPyObject(OGRFeatureH hFeat, int iField)
+{
+    if( !OGR_F_IsFieldSetAndNotNull(hFeat, iField) )
+        Py_RETURN_NONE;
+
+    OGRFieldDefnH hFieldDefn = OGR_F_GetFieldDefnRef(hFeat, iField);
+    const bool bBoolean = OGR_Fld_GetSubType(hFieldDefn) == OFSTBoolean;
+    switch( OGR_Fld_GetType(hFieldDefn) )
+    {
+        case OFTInteger:
+        {
+            const int nVal = OGR_F_GetFieldAsInteger(hFeat, iField);
+            if( bBoolean )
+                return PyBool_FromLong(nVal);
+            return PyLong_FromLong(nVal);
+        }
+
+        case OFTInteger64:
+            return PyLong_FromLongLong(OGR_F_GetFieldAsInteger64(hFeat, iField));
+
+        case OFTReal:
+            return PyFloat_FromDouble(OGR_F_GetFieldAsDouble(hFeat, iField));
+
+        case OFTStringList:
+        {
+            char** papszList = OGR_F_GetFieldAsStringList(hFeat, iField);
+            const int nCount = CSLCount(papszList);
+            PyObject* poList = PyList_New(nCount);
+            if( poList == NULL )
+                return NULL;
+            for( int i = 0; i < nCount; i++ )
+                PyList_SET_ITEM(poList, i, GDALPythonObjectFromCStr(papszList[i]));
+            return poList;
+        }
+
+        case OFTIntegerList:
+        {
+            int nCount = 0;
+            const int* panList = OGR_F_GetFieldAsIntegerList(hFeat, iField, &nCount);
+            PyObject* poList = PyList_New(nCount);
+            if( poList == NULL )
+                return NULL;
+            for( int i = 0; i < nCount; i++ )
+                PyList_SET_ITEM(poList, i, bBoolean ? PyBool_FromLong(panList[i]) :
+                                                      PyLong_FromLong(panList[i]));
+            return poList;
+        }
+
+        case OFTInteger64List:
+        {
+            int nCount = 0;
+            const GIntBig* panList = OGR_F_GetFieldAsInteger64List(hFeat, iField, &nCount);
+            PyObject* poList = PyList_New(nCount);
+            if( poList == NULL )
+                return NULL;
+            for( int i = 0; i < nCount; i++ )
+                PyList_SET_ITEM(poList, i, PyLong_FromLongLong(panList[i]));
+            return poList;
+        }
+
+        case OFTRealList:
+        {
+            int nCount = 0;
+            const double* padfList = OGR_F_GetFieldAsDoubleList(hFeat, iField, &nCount);
+            PyObject* poList = PyList_New(nCount);
+            if( poList == NULL )
+                return NULL;
+            for( int i = 0; i < nCount; i++ )
+                PyList_SET_ITEM(poList, i, PyFloat_FromDouble(padfList[i]));
+            return poList;
+        }
+
+        default:
+            break;
+    }
+
+    /* Returned as bytes if not valid UTF-8 */
+    return GDALPythonObjectFromCStr(OGR_F_GetFieldAsString(hFeat, iField));
+}
+
+/* Set a field from a None, int, float or str Python object. */
+/* Returns false, without setting the field, for other types. */
+/* Must be called with the GIL held. */
+static bool OGRFeatureSetFieldFromPyObject(OGRFeatureH hFeat, int iField, PyObject* poValue)
+{
+    if( poValue == Py_None )
+    {
+        OGR_F_SetFieldNull(hFeat, iField);
+        return true;
+    }
+    if( PyLong_Check(poValue) )
+    {
+        const long long nVal = PyLong_AsLongLong(poValue);
+        if( nVal == -1 && PyErr_Occurred() )
+        {
+            PyErr_Clear();
+            return false;
+        }
+        OGR_F_SetFieldInteger64(hFeat, iField, nVal);
+        return true;
+    }
+    if( PyFloat_Check(poValue) )
+    {
+        OGR_F_SetFieldDouble(hFeat, iField, PyFloat_AS_DOUBLE(poValue));
+        return true;
+    }
+    if( PyUnicode_Check(poValue) )
+    {
+        const char* pszVal = PyUnicode_AsUTF8(poValue);
+        if( pszVal == NULL )
+        {
+            PyErr_Clear();
+            return false;
+        }
+        OGR_F_SetFieldString(hFeat, iField, pszVal);
+        return true;
+    }
+    return false;
+}
+%}
+#endif
+
 #ifdef SWIGPYTHON
 /* Applies perhaps to other bindings */
 %apply ( const char *utf8_path ) { (const char* field_name) };
@@ -2335,6 +2518,101 @@ public:
       return OGR_F_GetGeomFieldIndex(self, field_name);
   }
 
+#ifdef SWIGPYTHON
+  int _GetFieldIndexExactFirst(const char* field_name) {
+      return OGRFeatureGetFieldIndexExactFirst(self, field_name);
+  }
+
+  PyObject* _GetFieldValue(int id) {
+      PyObject* ret;
+      SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+      if( id < 0 || id >= OGR_F_GetFieldCount(self) )
+      {
+          PyErr_SetString(PyExc_KeyError, "Illegal field requested in GetField()");
+          ret = NULL;
+      }
+      else
+      {
+          ret = OGRFeatureGetFieldAsPyObject(self, id);
+      }
+      SWIG_PYTHON_THREAD_END_BLOCK;
+      return ret;
+  }
+
+  PyObject* _GetFieldValues() {
+      OGRFeatureDefnH hDefn = OGR_F_GetDefnRef(self);
+      const int nFieldCount = OGR_FD_GetFieldCount(hDefn);
+
+      SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+      PyObject* dict = PyDict_New();
+      for( int i = 0; dict != NULL && i < nFieldCount; i++ )
+      {
+          PyObject* name = GDALPythonObjectFromCStr(
+              OGR_Fld_GetNameRef(OGR_FD_GetFieldDefn(hDefn, i)));
+          // Consistent with name based access: first field of a given name wins
+          if( name != NULL && !PyDict_Contains(dict, name) )
+          {
+              PyObject* value = OGRFeatureGetFieldAsPyObject(self, i);
+              if( value == NULL || PyDict_SetItem(dict, name, value) != 0 )
+              {
+                  Py_CLEAR(dict);
+              }
+              Py_XDECREF(value);
+          }
+          else if( name == NULL )
+          {
+              Py_CLEAR(dict);
+          }
+          Py_XDECREF(name);
+      }
+      SWIG_PYTHON_THREAD_END_BLOCK;
+      return dict;
+  }
+
+  PyObject* _SetFieldsFromDict(PyObject* values) {
+      const int nFieldCount = OGR_F_GetFieldCount(self);
+
+      SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+      PyObject* remaining = PyList_New(0);
+      PyObject* key = NULL;
+      PyObject* value = NULL;
+      Py_ssize_t pos = 0;
+      while( remaining != NULL && PyDict_Next(values, &pos, &key, &value) )
+      {
+          int iField = -1;
+          if( PyUnicode_Check(key) )
+          {
+              const char* pszName = PyUnicode_AsUTF8(key);
+              if( pszName != NULL )
+                  iField = OGRFeatureGetFieldIndexExactFirst(self, pszName);
+              else
+                  PyErr_Clear();
+          }
+          else if( PyLong_Check(key) )
+          {
+              const long nIdx = PyLong_AsLong(key);
+              if( nIdx >= 0 && nIdx < nFieldCount )
+                  iField = static_cast<int>(nIdx);
+              else
+                  PyErr_Clear();
+          }
+
+          // Let the caller deal with what cannot be set here
+          if( iField < 0 || !OGRFeatureSetFieldFromPyObject(self, iField, value) )
+          {
+              PyObject* item = PyTuple_Pack(2, key, value);
+              if( item == NULL || PyList_Append(remaining, item) != 0 )
+              {
+                  Py_CLEAR(remaining);
+              }
+              Py_XDECREF(item);
+          }
+      }
+      SWIG_PYTHON_THREAD_END_BLOCK;
+      return remaining;
+  }
+#endif
+
   GIntBig GetFID() {
     return OGR_F_GetFID(self);
   }
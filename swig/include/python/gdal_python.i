@@ -388,6 +388,39 @@ static void readraster_releasebuffer(CPLErr eErr,
 
   LogicalNot = logical_not
 
+  def _get_num_threads(num_threads):
+      """Return num_threads as a number of threads, handling the ALL_CPUS value."""
+      if isinstance(num_threads, str) and num_threads.upper() == "ALL_CPUS":
+          return GetNumCPUs()
+      return max(1, int(num_threads))
+
+  import threading
+  _dataset_locks = {}
+  _dataset_locks_guard = threading.Lock()
+
+  class _DatasetLock:
+      """Lock serializing the uses of a native dataset.
+
+         Several proxies can wrap the same native dataset (for example the one
+         returned by Band.GetDataset()), so locks are keyed by the address of
+         the native object. They are dropped once no longer in use.
+      """
+      def __init__(self, ds):
+          self.key = int(ds.this)
+
+      def __enter__(self):
+          with _dataset_locks_guard:
+              self.entry = _dataset_locks.setdefault(self.key, [threading.Lock(), 0])
+              self.entry[1] += 1
+          self.entry[0].acquire()
+
+      def __exit__(self, *args):
+          self.entry[0].release()
+          with _dataset_locks_guard:
+              self.entry[1] -= 1
+              if self.entry[1] == 0:
+                  del _dataset_locks[self.key]
+
   class Window:
       def __init__(self, xoff, yoff, xsize, ysize):
           self.data = [xoff, yoff, xsize, ysize]
@@ -509,6 +542,128 @@ unsigned int wrapper_VSIFReadL( void **buf, unsigned int nMembSize, unsigned int
     return static_cast<unsigned int>(nRet);
 }
 %}
+
+/* -------------------------------------------------------------------- */
+/*      VSIFReadIntoL()                                                 */
+/* -------------------------------------------------------------------- */
+
+%rename (VSIFReadIntoL) wrapper_VSIFReadIntoL;
+
+%pythonprepend wrapper_VSIFReadIntoL %{
+    if args[1].this is None:
+        raise ValueError("I/O operation on closed file.")
+%}
+
+%apply ( void *inPythonObject ) { (void* pyBuffer) };
+%inline %{
+GIntBig wrapper_VSIFReadIntoL( void* pyBuffer, VSILFILE *fp)
+{
+    Py_buffer view;
+    SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+    if( PyObject_GetBuffer( (PyObject*)pyBuffer, &view,
+                            PyBUF_SIMPLE | PyBUF_WRITABLE) != 0 )
+    {
+        PyErr_Clear();
+        SWIG_PYTHON_THREAD_END_BLOCK;
+        CPLError(CE_Failure, CPLE_AppDefined,
+                 "buffer is not a simple writable buffer");
+        return -1;
+    }
+    SWIG_PYTHON_THREAD_END_BLOCK;
+    const size_t nRet = VSIFReadL( view.buf, 1, static_cast<size_t>(view.len), fp );
+    SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+    PyBuffer_Release(&view);
+    SWIG_PYTHON_THREAD_END_BLOCK;
+    return static_cast<GIntBig>(nRet);
+}
+%}
+%clear (void* pyBuffer);
+
+/* -------------------------------------------------------------------- */
+/*      VSIFReadMultiRangeL()                                           */
+/* -------------------------------------------------------------------- */
+
+%rename (VSIFReadMultiRangeL) wrapper_VSIFReadMultiRangeL;
+
+%pythonprepend wrapper_VSIFReadMultiRangeL %{
+    if args[1].this is None:
+        raise ValueError("I/O operation on closed file.")
+%}
+
+%apply ( void *inPythonObject ) { (void* pyRanges) };
+%inline %{
+int wrapper_VSIFReadMultiRangeL( void **buf, void* pyRanges, VSILFILE *fp)
+{
+    *buf = NULL;
+
+    SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+    PyObject* poSeq = PySequence_Fast( (PyObject*)pyRanges, "not a sequence" );
+    if( poSeq == NULL || PySequence_Fast_GET_SIZE(poSeq) > INT_MAX )
+    {
+        PyErr_Clear();
+        Py_XDECREF(poSeq);
+        SWIG_PYTHON_THREAD_END_BLOCK;
+        CPLError(CE_Failure, CPLE_AppDefined,
+                 "ranges should be a sequence of (offset, size) tuples");
+        return -1;
+    }
+    const int nRanges = static_cast<int>(PySequence_Fast_GET_SIZE(poSeq));
+    std::vector<vsi_l_offset> anOffsets(nRanges);
+    std::vector<size_t> anSizes(nRanges);
+    std::vector<void*> apData(nRanges);
+    PyObject* poList = PyList_New(nRanges);
+    for( int i = 0; poList != NULL && i < nRanges; i++ )
+    {
+        long long nOffset = 0;
+        Py_ssize_t nSize = 0;
+        if( !PyArg_ParseTuple( PySequence_Fast_GET_ITEM(poSeq, i), "Ln",
+                               &nOffset, &nSize ) || nOffset < 0 || nSize < 0 )
+        {
+            PyErr_Clear();
+            Py_DECREF(poList);
+            Py_DECREF(poSeq);
+            SWIG_PYTHON_THREAD_END_BLOCK;
+            CPLError(CE_Failure, CPLE_AppDefined,
+                     "ranges should be a sequence of (offset, size) tuples");
+            return -1;
+        }
+        PyObject* poBuf = PyByteArray_FromStringAndSize( NULL, nSize );
+        if( poBuf == NULL )
+        {
+            PyErr_Clear();
+            Py_DECREF(poList);
+            Py_DECREF(poSeq);
+            SWIG_PYTHON_THREAD_END_BLOCK;
+            CPLError(CE_Failure, CPLE_OutOfMemory, "Cannot allocate result buffer");
+            return -1;
+        }
+        PyList_SET_ITEM(poList, i, poBuf);
+        anOffsets[i] = static_cast<vsi_l_offset>(nOffset);
+        anSizes[i] = static_cast<size_t>(nSize);
+        apData[i] = PyByteArray_AsString(poBuf);
+    }
+    Py_DECREF(poSeq);
+    SWIG_PYTHON_THREAD_END_BLOCK;
+    if( poList == NULL )
+    {
+        CPLError(CE_Failure, CPLE_OutOfMemory, "Cannot allocate result list");
+        return -1;
+    }
+
+    const int nRet = nRanges == 0 ? 0 :
+        VSIFReadMultiRangeL( nRanges, apData.data(), anOffsets.data(),
+                             anSizes.data(), fp );
+
+    SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+    if( nRet != 0 )
+        Py_DECREF(poList);
+    else
+        *buf = poList;
+    SWIG_PYTHON_THREAD_END_BLOCK;
+    return nRet;
+}
+%}
+%clear (void* pyRanges);
 %clear (void **buf );
 %clear VSILFILE* fp;
 
@@ -1245,6 +1400,161 @@ void wrapper_VSIGetMemFileBuffer(const char *utf8_path, GByte **out, vsi_l_offse
                xSize = min(blockXSize, self.XSize - xOff)
                yield Window(xOff, yOff, xSize, ySize)
 
+  def map_blocks(self, func, dst_band=None, num_threads=None, window_size=None,
+                 prefetch=None, buf_type=None, callback=None, callback_data=None):
+       """Apply a function to the content of each block of this ``Band``.
+
+       Windows are read, and ``func`` is called, by a pool of threads, while
+       results are written to ``dst_band`` in window order, from the calling
+       thread. NumPy releases the GIL during most computations, so this can
+       make per-pixel NumPy code use several CPU cores.
+
+       Reading from several threads requires the dataset of this band to
+       support :py:meth:`Dataset.GetThreadSafeDataset`. Otherwise windows are
+       read by the calling thread, and only ``func`` runs in parallel.
+
+       .. versionadded:: 3.12
+
+       Parameters
+       ----------
+       func : callable
+           Called as ``func(array, window)`` with the NumPy array of a window,
+           and its :py:class:`Window`. It may modify ``array`` and return it.
+           Arrays are reused for the next windows once the result has been
+           written.
+       dst_band : Band, optional
+           Band into which the array returned by ``func`` is written, at the
+           position of the window. If None, the results of ``func`` are returned.
+       num_threads : int or str, optional
+           Number of threads, or ``ALL_CPUS``. Defaults to the value of the
+           GDAL_NUM_THREADS configuration option, or 1.
+       window_size : tuple, optional
+           ``(xsize, ysize)`` of the windows. Defaults to the block size.
+       prefetch : int, optional
+           Maximum number of windows being read or processed while waiting for
+           the oldest one to be written. Defaults to twice the number of threads.
+       buf_type : int, optional
+           Data type of the arrays passed to ``func``. Defaults to the data
+           type of this band.
+       callback : function, optional
+           A progress callback function
+       callback_data: optional
+           Optional data to be passed to callback function
+
+       Returns
+       -------
+       list or None:
+           The results of ``func`` in window order if ``dst_band`` is None,
+           otherwise None.
+
+       Examples
+       --------
+       >>> src_band.map_blocks(lambda a, w: a + 20, dst_band, num_threads=4)
+       """
+       import collections
+       import threading
+       from concurrent.futures import ThreadPoolExecutor
+
+       import numpy
+
+       if num_threads is None:
+           num_threads = GetConfigOption("GDAL_NUM_THREADS", "1")
+       num_threads = _get_num_threads(num_threads)
+       if prefetch is None:
+           prefetch = 2 * num_threads
+       prefetch = max(1, prefetch)
+
+       if window_size is None:
+           windows = list(self.BlockWindows())
+       else:
+           win_xsize, win_ysize = window_size
+           windows = [Window(xoff, yoff, min(win_xsize, self.XSize - xoff), min(win_ysize, self.YSize - yoff))
+                      for yoff in range(0, self.YSize, win_ysize)
+                      for xoff in range(0, self.XSize, win_xsize)]
+
+       # Band used to read from worker threads, if possible
+       read_band = None
+       src_ds = self.GetDataset()
+       if num_threads > 1 and src_ds is not None and self.GetBand() > 0 and \
+          (dst_band is None or dst_band.GetDataset() is None or dst_band.GetDataset().this != src_ds.this):
+           try:
+               with quiet_errors():
+                   thread_safe_ds = src_ds.GetThreadSafeDataset(gdalconst.OF_RASTER)
+           except Exception:
+               thread_safe_ds = None
+           if thread_safe_ds is not None:
+               read_band = thread_safe_ds.GetRasterBand(self.GetBand())
+
+       free_buffers = collections.defaultdict(list)
+       free_buffers_lock = threading.Lock()
+
+       def read(band, window):
+           with free_buffers_lock:
+               buffers = free_buffers[(window.ysize, window.xsize)]
+               buf = buffers.pop() if buffers else None
+           if buf is None:
+               array = band.ReadAsArray(*window, buf_type=buf_type)
+           else:
+               array = band.ReadAsArray(*window, buf_obj=buf)
+           if array is None:
+               raise RuntimeError("Cannot read window %s" % str(window))
+           return array
+
+       def read_and_compute(window):
+           array = read(read_band, window)
+           return array, func(array, window)
+
+       def compute(window, array):
+           return array, func(array, window)
+
+       results = [] if dst_band is None else None
+       count = [0]
+
+       def finish(window, array, result):
+           if dst_band is not None:
+               if dst_band.WriteArray(result, window.xoff, window.yoff) != CE_None:
+                   raise RuntimeError("Cannot write window %s" % str(window))
+               reusable = True
+           else:
+               results.append(result)
+               reusable = not (isinstance(result, numpy.ndarray) and numpy.shares_memory(result, array))
+           if reusable:
+               with free_buffers_lock:
+                   free_buffers[array.shape].append(array)
+           count[0] += 1
+           if callback and not callback(count[0] / len(windows), "", callback_data):
+               raise RuntimeError("Interrupted by user")
+
+       if num_threads == 1:
+           for window in windows:
+               array = read(self, window)
+               finish(window, array, func(array, window))
+           return results
+
+       pending = collections.deque()
+
+       def write_oldest():
+           window, future = pending.popleft()
+           finish(window, *future.result())
+
+       with ThreadPoolExecutor(max_workers=num_threads) as executor:
+           try:
+               for window in windows:
+                   if len(pending) >= prefetch:
+                       write_oldest()
+                   if read_band is not None:
+                       future = executor.submit(read_and_compute, window)
+                   else:
+                       future = executor.submit(compute, window, read(self, window))
+                   pending.append((window, future))
+               while pending:
+                   write_oldest()
+           finally:
+               for _, future in pending:
+                   future.cancel()
+
+       return results
+
 
 %}
 
@@ -1908,14 +2218,70 @@ CPLErr ReadRaster1( double xoff, double yoff, double xsize, double ysize,
         return sd_list
 
     def BeginAsyncReader(self, xoff, yoff, xsize, ysize, buf_obj=None, buf_xsize=None, buf_ysize=None, buf_type=None, band_list=None, options=None):
+        """
+        Start an asynchronous read of a window into a buffer.
+
+        The returned :py:class:`AsyncReader` can be iterated over: each
+        iteration yields a :py:class:`Window` of the buffer that has been
+        updated, until the request is complete. It can also be iterated with
+        ``async for``, in which case waiting for updates happens in a worker
+        thread and does not block the event loop.
+
+        The buffer is band-sequential (band, line, pixel).
+        :py:meth:`EndAsyncReader` must be called once the reader is no longer
+        needed.
+
+        Parameters
+        ----------
+        xoff : int
+            The pixel offset to left side of the region of the band to be read.
+        yoff : int
+            The line offset to top side of the region of the band to be read.
+        xsize : int
+            The number of pixels to read in the X direction.
+        ysize : int
+            The number of lines to read in the Y direction.
+        buf_obj : bytes, bytearray or numpy.ndarray, optional
+            Writable C-contiguous buffer into which the data is read.
+            When it is a NumPy array and buf_type is not specified, the data
+            type is deduced from its dtype. If not specified, a bytearray
+            of the required size is allocated.
+        buf_xsize : int, optional
+            Width of the buffer. Defaults to xsize.
+        buf_ysize : int, optional
+            Height of the buffer. Defaults to ysize.
+        buf_type : int, optional
+            Data type of the buffer. Defaults to :py:const:`GDT_Byte`.
+        band_list : list, optional
+            List of 1-based band numbers. Defaults to all bands.
+        options : list, optional
+            Driver specific options.
+
+        Returns
+        -------
+        AsyncReader
+
+        Examples
+        --------
+        >>> ds = gdal.Open("byte.tif")
+        >>> reader = ds.BeginAsyncReader(0, 0, ds.RasterXSize, ds.RasterYSize)
+        >>> for window in reader:
+        ...     pass
+        >>> ds.EndAsyncReader(reader)
+        """
         if band_list is None:
             band_list = list(range(1, self.RasterCount + 1))
         if buf_xsize is None:
-            buf_xsize = 0;
+            buf_xsize = 0
         if buf_ysize is None:
-            buf_ysize = 0;
+            buf_ysize = 0
         if buf_type is None:
             buf_type = gdalconst.GDT_Byte
+            if buf_obj is not None and hasattr(buf_obj, 'dtype'):
+                from osgeo import gdal_array
+                buf_type = gdal_array.NumericTypeCodeToGDALTypeCode(buf_obj.dtype)
+                if buf_type is None:
+                    raise ValueError("data type of buf_obj not supported")
 
         if buf_xsize <= 0:
             buf_xsize = xsize
@@ -1923,17 +2289,67 @@ CPLErr ReadRaster1( double xoff, double yoff, double xsize, double ysize,
             buf_ysize = ysize
         options = [] if options is None else options
 
+        nRequiredSize = int(buf_xsize * buf_ysize * len(band_list) * _gdal.GetDataTypeSizeBytes(buf_type))
         if buf_obj is None:
-            from sys import version_info
-            nRequiredSize = int(buf_xsize * buf_ysize * len(band_list) * _gdal.GetDataTypeSizeBytes(buf_type))
-            if version_info >= (3, 0, 0):
-                buf_obj_ar = [None]
-                exec("buf_obj_ar[0] = b' ' * nRequiredSize")
-                buf_obj = buf_obj_ar[0]
-            else:
-                buf_obj = ' ' * nRequiredSize
+            buf_obj = bytearray(nRequiredSize)
         return _gdal.Dataset_BeginAsyncReader(self, xoff, yoff, xsize, ysize, buf_obj, buf_xsize, buf_ysize, buf_type, band_list,  0, 0, 0, options)
 
+    async def read_async(self, xoff=0, yoff=0, xsize=None, ysize=None, buf_obj=None,
+                         buf_xsize=None, buf_ysize=None, buf_type=None,
+                         resample_alg=gdalconst.GRIORA_NearestNeighbour,
+                         interleave='band',
+                         band_list=None,
+                         executor=None):
+        """
+        Coroutine reading a window from raster bands into a NumPy array.
+
+        This is the asynchronous counterpart of :py:meth:`ReadAsArray`. The
+        read is run in ``executor`` (or the default executor of the running
+        event loop), so that it does not block the event loop.
+
+        Reads on a dataset opened with :py:const:`OF_THREAD_SAFE` run
+        concurrently. Reads on other datasets are serialized, since a
+        regular dataset must not be used from several threads at the same
+        time.
+
+        .. versionadded:: 3.12
+
+        Parameters
+        ----------
+        xoff, yoff, xsize, ysize, buf_obj, buf_xsize, buf_ysize, buf_type, resample_alg, interleave, band_list :
+            See :py:meth:`ReadAsArray`.
+        executor : concurrent.futures.Executor, optional
+            Executor in which the read is run.
+
+        Returns
+        -------
+        numpy.ndarray
+
+        Examples
+        --------
+        >>> async def read_all(ds, windows):
+        ...     return await asyncio.gather(*[ds.read_async(*w) for w in windows])
+        """
+        import asyncio
+
+        def read():
+            return self.ReadAsArray(xoff=xoff, yoff=yoff, xsize=xsize, ysize=ysize,
+                                    buf_obj=buf_obj, buf_xsize=buf_xsize,
+                                    buf_ysize=buf_ysize, buf_type=buf_type,
+                                    resample_alg=resample_alg,
+                                    interleave=interleave,
+                                    band_list=band_list)
+
+        if self.IsThreadSafe(gdalconst.OF_RASTER):
+            func = read
+        else:
+            def func():
+                with _DatasetLock(self):
+                    return read()
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, func)
+
     def GetLayer(self, iLayer=0):
         """
         Get the indicated layer from the Dataset
@@ -2274,6 +2690,50 @@ def ReleaseResultSet(self, sql_lyr):
 
 }
 
+%extend GDALAsyncReaderShadow {
+%pythoncode %{
+
+  def __iter__(self):
+      """
+      Iterate over the regions of the buffer as they are updated.
+
+      Each iteration yields a :py:class:`Window`, in buffer coordinates,
+      of the region that has been updated, until the request is complete.
+
+      .. versionadded:: 3.12
+      """
+      while True:
+          status, xoff, yoff, xsize, ysize = self.GetNextUpdatedRegion(-1)
+          if status == GARIO_ERROR:
+              raise RuntimeError("Asynchronous read failed")
+          if status != GARIO_PENDING and xsize > 0 and ysize > 0:
+              yield Window(xoff, yoff, xsize, ysize)
+          if status == GARIO_COMPLETE:
+              return
+
+  async def __aiter__(self):
+      """
+      Asynchronously iterate over the regions of the buffer as they are updated.
+
+      Waiting for updates happens in the default executor of the running
+      event loop, so that it does not block it.
+
+      .. versionadded:: 3.12
+      """
+      import asyncio
+      loop = asyncio.get_running_loop()
+      while True:
+          status, xoff, yoff, xsize, ysize = await loop.run_in_executor(
+              None, self.GetNextUpdatedRegion, -1)
+          if status == GARIO_ERROR:
+              raise RuntimeError("Asynchronous read failed")
+          if status != GARIO_PENDING and xsize > 0 and ysize > 0:
+              yield Window(xoff, yoff, xsize, ysize)
+          if status == GARIO_COMPLETE:
+              return
+%}
+}
+
 %extend GDALMajorObjectShadow {
 %pythoncode %{
   def GetMetadata(self, domain=''):
@@ -5966,24 +6426,54 @@ def ComputeMinMaxLocation(self, *args, **kwargs):
 
 # VSIFile: Copyright (c) 2024, Dan Baston <dbaston at gmail.com>
 
-from io import BytesIO
+import io
+
+class VSIFile(io.RawIOBase):
+    """Class wrapping a GDAL VSILFILE instance as a Python raw I/O object
 
-class VSIFile(BytesIO):
-    """Class wrapping a GDAL VSILFILE instance as a Python BytesIO instance
+       It can be wrapped in a :py:class:`io.BufferedReader`, and read directly
+       into caller buffers with :py:meth:`readinto`.
 
        :since: GDAL 3.11
+
+       Parameters
+       ----------
+       path: str
+           Path of the file
+       mode: str
+           Opening mode, as for :py:func:`VSIFOpenL`. Without "b", read() returns
+           and write() accepts str.
+       encoding: str
+           Encoding used in text mode
+       read_ahead: int
+           Minimum number of bytes read from the underlying file at once. Smaller
+           reads are served from an internal buffer, which avoids issuing many
+           small requests on network file systems. 0 (the default) disables
+           the buffer.
+
+           .. versionadded:: 3.12
     """
 
-    def __init__(self, path, mode, encoding="utf-8"):
+    def __init__(self, path, mode, encoding="utf-8", read_ahead=0):
+        super().__init__()
+
+        self._closed = True
         self._path = path
         self._mode = mode
 
         self._binary = "b" in mode
         self._encoding = encoding
 
+        # Data read ahead: self._buffer[self._buffer_pos:self._buffer_end] is
+        # the data following the current position, and the position of the
+        # underlying file is at its end.
+        self._read_ahead = read_ahead
+        self._buffer = bytearray(read_ahead) if read_ahead > 0 else None
+        self._buffer_pos = 0
+        self._buffer_end = 0
+
         self._fp = VSIFOpenExL(self._path, self._mode, True)
         if self._fp is None:
-            self._closed = True
             raise OSError(VSIGetLastErrorMsg())
 
         self._closed = False
@@ -5998,6 +6488,7 @@ class VSIFile(BytesIO):
         return self
 
     def __next__(self):
+        self._discard_buffer()
         line = CPLReadLineL(self._fp)
         if line is None:
             raise StopIteration
@@ -6005,6 +6496,10 @@ class VSIFile(BytesIO):
             return line.encode()
         return line
 
+    @property
+    def closed(self):
+        return self._closed
+
     def close(self):
         if self._closed:
             return
@@ -6012,20 +6507,141 @@ class VSIFile(BytesIO):
         self._closed = True
         VSIFCloseL(self._fp)
 
-    def read(self, size=-1):
-        if size == -1:
-            pos = self.tell()
-            self.seek(0, 2)
-            size = self.tell()
-            self.seek(pos)
+    def readable(self):
+        return "r" in self._mode or "+" in self._mode
 
-        raw = VSIFReadL(1, size, self._fp)
+    def writable(self):
+        return "w" in self._mode or "a" in self._mode or "+" in self._mode
+
+    def seekable(self):
+        return True
+
+    def _discard_buffer(self):
+        """Drop the data read ahead and move back the underlying file"""
+        if self._buffer_pos < self._buffer_end:
+            offset = VSIFTellL(self._fp) - (self._buffer_end - self._buffer_pos)
+            if VSIFSeekL(self._fp, offset, 0) != 0:
+                raise OSError(VSIGetLastErrorMsg())
+        self._buffer_pos = self._buffer_end = 0
+
+    def _read_into(self, buffer):
+        n = VSIFReadIntoL(buffer, self._fp)
+        if n < 0:
+            raise OSError(VSIGetLastErrorMsg())
+        return n
+
+    def readinto(self, buffer):
+        """Read bytes into a pre-allocated writable bytes-like object.
+
+           Returns the number of bytes read, 0 at end of file.
+        """
+
+        view = memoryview(buffer).cast("B")
+        size = len(view)
+
+        # Data already read ahead
+        copied = min(size, self._buffer_end - self._buffer_pos)
+        if copied:
+            view[:copied] = self._buffer[self._buffer_pos : self._buffer_pos + copied]
+            self._buffer_pos += copied
+        if copied == size:
+            return copied
+
+        remaining = size - copied
+        # The data read ahead is consumed, or about to be replaced
+        self._buffer_pos = self._buffer_end = 0
+        if remaining >= self._read_ahead:
+            # Large enough request: read directly into the caller buffer
+            return copied + self._read_into(view[copied:])
+
+        self._buffer_end = self._read_into(self._buffer)
+        n = min(remaining, self._buffer_end)
+        view[copied : copied + n] = self._buffer[:n]
+        self._buffer_pos = n
+        return copied + n
+
+    def readall(self):
+        pos = self.tell()
+        self._discard_buffer()
+        if VSIFSeekL(self._fp, 0, 2) != 0:
+            raise OSError(VSIGetLastErrorMsg())
+        size = max(0, self.tell() - pos)
+        if VSIFSeekL(self._fp, pos, 0) != 0:
+            raise OSError(VSIGetLastErrorMsg())
+
+        data = bytearray(size)
+        n = self._read_into(data) if size else 0
+        del data[n:]
+        return bytes(data)
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            raw = self.readall()
+        else:
+            raw = bytearray(size)
+            n = self.readinto(raw)
+            del raw[n:]
 
         if self._binary:
             return bytes(raw)
         else:
             return raw.decode(self._encoding)
 
+    def read_ranges(self, ranges):
+        """Read several ranges of bytes at once.
+
+           On network file systems, ranges are fetched in parallel and
+           neighbouring ranges may be merged into a single request. The current
+           position of the file is not modified.
+
+           .. versionadded:: 3.12
+
+           Parameters
+           ----------
+           ranges: list[tuple[int, int]]
+               (offset, size) of the ranges to read, in any order
+
+           Returns
+           -------
+           list[bytearray]
+               Content of each range, in the order of ranges
+        """
+
+        ranges = [(int(offset), int(size)) for offset, size in ranges]
+        if not ranges:
+            return []
+
+        # VSIFReadMultiRangeL() needs sorted, non overlapping ranges:
+        # merge overlapping ones
+        order = sorted(range(len(ranges)), key=lambda i: ranges[i])
+        merged = []
+        merged_idx = [None] * len(ranges)
+        for i in order:
+            offset, size = ranges[i]
+            if merged and offset < merged[-1][0] + merged[-1][1]:
+                start, merged_size = merged[-1]
+                merged[-1] = (start, max(merged_size, offset + size - start))
+            else:
+                merged.append((offset, size))
+            merged_idx[i] = len(merged) - 1
+
+        pos = self.tell()
+        self._discard_buffer()
+        data = VSIFReadMultiRangeL(merged, self._fp)
+        if VSIFSeekL(self._fp, pos, 0) != 0:
+            raise OSError(VSIGetLastErrorMsg())
+        if data is None:
+            raise OSError(VSIGetLastErrorMsg())
+
+        if len(merged) == len(ranges):
+            return [data[merged_idx[i]] for i in range(len(ranges))]
+
+        result = []
+        for i, (offset, size) in enumerate(ranges):
+            start = offset - merged[merged_idx[i]][0]
+            result.append(data[merged_idx[i]][start : start + size])
+        return result
+
     def write(self, x):
 
         if self._binary:
@@ -6034,6 +6650,8 @@ class VSIFile(BytesIO):
             assert type(x) is str
             x = x.encode(self._encoding)
 
+        self._discard_buffer()
+
         planned_write = len(x)
         actual_write = VSIFWriteL(x, 1, planned_write, self._fp)
 
@@ -6042,8 +6660,14 @@ class VSIFile(BytesIO):
                 f"Expected to write {planned_write} bytes but {actual_write} were written"
             )
 
+        return actual_write
+
+    def flush(self):
+        if not self._closed:
+            VSIFFlushL(self._fp)
+
     def seek(self, offset, whence=0):
-        # We redefine the docstring since otherwise breathe would complain on the one coming from BytesIO.seek()
+        # We redefine the docstring since otherwise breathe would complain on the one coming from RawIOBase.seek()
         """Change stream position.
 
            Seek to byte offset pos relative to position indicated by whence:
@@ -6055,11 +6679,23 @@ class VSIFile(BytesIO):
            Returns the new absolute position.
         """
 
+        if whence == 1:
+            offset += self.tell()
+            whence = 0
+        if whence == 0:
+            # Stay in the data read ahead if possible
+            buffer_start = VSIFTellL(self._fp) - self._buffer_end
+            if buffer_start <= offset <= buffer_start + self._buffer_end:
+                self._buffer_pos = offset - buffer_start
+                return offset
+
+        self._buffer_pos = self._buffer_end = 0
         if VSIFSeekL(self._fp, offset, whence) != 0:
             raise OSError(VSIGetLastErrorMsg())
+        return VSIFTellL(self._fp)
 
     def tell(self):
-        return VSIFTellL(self._fp)
+        return VSIFTellL(self._fp) - (self._buffer_end - self._buffer_pos)
 %}
 
 
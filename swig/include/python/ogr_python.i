@@ -122,23 +122,29 @@ def _WarnIfUserHasNotSpecifiedIfUsingExceptions():
     def __getitem__(self, value):
         """Support list and slice -like access to the layer.
         layer[0] would return the first feature on the layer.
-        layer[0:4] would return a list of the first four features."""
+        layer[0:4] would return a list of the first four features.
+
+        Indices are used as feature ids. A slice stops at the first
+        feature id that does not exist."""
         if isinstance(value, slice):
             import sys
+            #for an unending slice, sys.maxsize may be used
+            stop = None if value.stop == sys.maxsize else value.stop
+            step = 1 if value.step is None else value.step
+            start = 0 if value.start is None and step > 0 else value.start
+            # Only get the feature count when needed
+            if start is None or stop is None or start < 0 or stop < 0:
+                start, stop, step = slice(start, stop, step).indices(len(self))
             output = []
-            if value.stop == sys.maxsize:
-                #for an unending slice, sys.maxsize is used
-                #We need to stop before that or GDAL will write an
-                ##error to stdout
-                stop = len(self) - 1
-            else:
-                stop = value.stop
-            for i in range(value.start, stop, value.step):
-                feature = self.GetFeature(i)
-                if feature:
+            # Fetch features by batches, to avoid a round-trip per feature,
+            # without fetching many features past the first missing one.
+            fids = range(start, stop, step)
+            batch_size = 1000
+            for batch_start in range(0, len(fids), batch_size):
+                for feature in self._GetFeatures(fids[batch_start:batch_start + batch_size]):
+                    if feature is None:
+                        return output
                     output.append(feature)
-                else:
-                    return output
             return output
         if isinstance(value, int):
             if value > len(self) - 1:
@@ -147,6 +153,52 @@ def _WarnIfUserHasNotSpecifiedIfUsingExceptions():
         else:
             raise TypeError("Input %s is not of IntType or SliceType" % type(value))
 
+    def GetFeatures(self, fids, as_pyarrow=False):
+        """
+        Fetch several features from their feature id.
+
+        This is faster than calling :py:meth:`GetFeature` for each feature id,
+        since all features are fetched in a single call.
+
+        .. versionadded:: 3.12
+
+        Parameters
+        ----------
+        fids : list[int]
+            Feature ids
+        as_pyarrow : bool, default = False
+            Whether to return a pyarrow.Table (with the features that exist, in
+            the order of fids) instead of a list of features. Requires pyarrow.
+
+        Returns
+        -------
+        list[Feature] / pyarrow.Table:
+            Features, in the order of fids, with None for feature ids that do
+            not exist.
+        """
+        features = self._GetFeatures([int(fid) for fid in fids])
+        if not as_pyarrow:
+            return features
+
+        import pyarrow as pa
+
+        mem_ds = GetDriverByName("MEM").CreateDataSource("")
+        defn = self.GetLayerDefn()
+        mem_lyr = mem_ds.CreateLayer(self.GetName(), geom_type=wkbNone)
+        for i in range(defn.GetGeomFieldCount()):
+            mem_lyr.CreateGeomField(defn.GetGeomFieldDefn(i))
+        for i in range(defn.GetFieldCount()):
+            mem_lyr.CreateField(defn.GetFieldDefn(i))
+        for feature in features:
+            if feature is not None:
+                mem_feature = Feature(mem_lyr.GetLayerDefn())
+                mem_feature.SetFrom(feature)
+                mem_feature.SetFID(feature.GetFID())
+                mem_lyr.CreateFeature(mem_feature)
+        fid_column = self.GetFIDColumn()
+        options = ["FID=" + fid_column] if fid_column else []
+        return pa.table(mem_lyr.GetArrowArrayStreamInterface(options))
+
     def CreateFields(self, fields):
         """Create a list of fields on the Layer"""
         for i in fields:
@@ -525,15 +577,7 @@ def _WarnIfUserHasNotSpecifiedIfUsingExceptions():
         return self.Clone()
 
     def _getfieldindex(self, fieldname):
-        case_insensitive_idx = -1
-        fdefn = _ogr.Feature_GetDefnRef(self)
-        for i in range(fdefn.GetFieldCount()):
-            name = fdefn.GetFieldDefn(i).GetName()
-            if name == fieldname:
-                return i
-            elif case_insensitive_idx < 0 and name.lower() == fieldname.lower():
-                case_insensitive_idx = i
-        return case_insensitive_idx
+        return _ogr.Feature__GetFieldIndexExactFirst(self, fieldname)
 
     # This makes it possible to fetch fields in the form "feature.area".
     # This has some risk of name collisions.
@@ -640,38 +684,7 @@ def _WarnIfUserHasNotSpecifiedIfUsingExceptions():
         """
         if isinstance(fld_index, str):
             fld_index = self._getfieldindex(fld_index)
-        if (fld_index < 0) or (fld_index > self.GetFieldCount()):
-            raise KeyError("Illegal field requested in GetField()")
-        if not (self.IsFieldSet(fld_index)) or self.IsFieldNull(fld_index):
-            return None
-        fld_type = self.GetFieldType(fld_index)
-        if fld_type == OFTInteger:
-            if self.GetFieldDefnRef(fld_index).GetSubType() == OFSTBoolean:
-                return bool(self.GetFieldAsInteger(fld_index))
-            return self.GetFieldAsInteger(fld_index)
-        if fld_type == OFTInteger64:
-            return self.GetFieldAsInteger64(fld_index)
-        if fld_type == OFTReal:
-            return self.GetFieldAsDouble(fld_index)
-        if fld_type == OFTStringList:
-            return self.GetFieldAsStringList(fld_index)
-        if fld_type == OFTIntegerList:
-            ret = self.GetFieldAsIntegerList(fld_index)
-            if self.GetFieldDefnRef(fld_index).GetSubType() == OFSTBoolean:
-                 ret = [bool(x) for x in ret]
-            return ret
-        if fld_type == OFTInteger64List:
-            return self.GetFieldAsInteger64List(fld_index)
-        if fld_type == OFTRealList:
-            return self.GetFieldAsDoubleList(fld_index)
-        ## if fld_type == OFTDateTime or fld_type == OFTDate or fld_type == OFTTime:
-        #     return self.GetFieldAsDate(fld_index)
-        # default to returning as a string.  Should we add more types?
-        try:
-            return self.GetFieldAsString(fld_index)
-        except:
-            # For Python3 on non-UTF8 strings
-            return self.GetFieldAsBinary(fld_index)
+        return _ogr.Feature__GetFieldValue(self, fld_index)
 
     def SetFieldBinary(self, field_index_or_name, value):
         """
@@ -741,11 +754,42 @@ def _WarnIfUserHasNotSpecifiedIfUsingExceptions():
 
     def items(self):
         """Return a dictionary with the field names as key, and their value in the feature"""
-        keys = self.keys()
-        output = {}
-        for key in keys:
-            output[key] = self.GetField(key)
-        return output
+        return self.to_dict()
+
+    def to_dict(self):
+        """
+        Return a dictionary with the field names as key, and their value in the feature.
+
+        Values are converted as in :py:meth:`GetField`, in a single call. If several
+        fields have the same name, the value of the first one is returned.
+
+        .. versionadded:: 3.12
+
+        Returns
+        -------
+        dict
+        """
+        return _ogr.Feature__GetFieldValues(self)
+
+    def set_from_dict(self, values):
+        """
+        Set several fields from a dictionary.
+
+        None, int, float and str values are set in a single call. Other values
+        are set as with the ``[]`` operator.
+
+        .. versionadded:: 3.12
+
+        Parameters
+        ----------
+        values : dict
+            Values indexed by field name or 0-based numeric index. Geometry field
+            names are also accepted.
+        """
+        if not isinstance(values, dict):
+            values = dict(values)
+        for key, value in _ogr.Feature__SetFieldsFromDict(self, values):
+            self[key] = value
 
     def geometry(self):
         """ Return the feature geometry
@@ -813,12 +857,7 @@ def _WarnIfUserHasNotSpecifiedIfUsingExceptions():
         if fid != NullFID:
             output['id'] = fid
 
-        for key in self.keys():
-            fld_defn = self.GetFieldDefnRef(self.GetFieldIndex(key))
-            if fld_defn.GetType() == _ogr.OFTInteger and fld_defn.GetSubType() == _ogr.OFSTBoolean:
-                output['properties'][key] = bool(self.GetField(key))
-            else:
-                output['properties'][key] = self.GetField(key)
+        output['properties'] = self.to_dict()
 
         if not as_object:
             output = simplejson.dumps(output)
@@ -945,7 +945,7 @@ GetBufferAsCharPtrGIntBigSize( PyObject* input, GIntBig *nLen, char **pBuf, int
 
 /* required for GDALAsyncReader */
 
-%typemap(in,numinputs=1) (size_t nLenKeepObject, char *pBufKeepObject, void* pyObject)
+%typemap(in,numinputs=1) (size_t nLenKeepObject, char *pBufKeepObject, void* pyObject) (bool viewIsValid = false, Py_buffer view)
 {
   /* %typemap(in,numinputs=1) (size_t nLenKeepObject, char *pBufKeepObject, void* pyObject) */
   if (PyBytes_Check($input))
@@ -955,13 +955,34 @@ GetBufferAsCharPtrGIntBigSize( PyObject* input, GIntBig *nLen, char **pBuf, int
     $1 = safeLen;
     $3 = $input;
   }
+  else if (PyObject_CheckBuffer($input))
+  {
+    /* Writable contiguous buffer, such as a bytearray or a NumPy array. */
+    /* It stays exported until the async reader wrapper holds its own export. */
+    if (PyObject_GetBuffer($input, &view, PyBUF_WRITABLE | PyBUF_C_CONTIGUOUS) != 0)
+    {
+      SWIG_fail;
+    }
+    viewIsValid = true;
+    $2 = (char*) view.buf;
+    $1 = view.len;
+    $3 = $input;
+  }
   else
   {
-    PyErr_SetString(PyExc_TypeError, "not a bytes");
+    PyErr_SetString(PyExc_TypeError, "not a bytes or a writable buffer");
     SWIG_fail;
   }
 }
 
+%typemap(freearg) (size_t nLenKeepObject, char *pBufKeepObject, void* pyObject)
+{
+  /* %typemap(freearg) (size_t nLenKeepObject, char *pBufKeepObject, void* pyObject) */
+  if( viewIsValid$argnum ) {
+    PyBuffer_Release(&view$argnum);
+  }
+}
+
 /* end of required for GDALAsyncReader */
 
 /*
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ******************************************************************************
+#
+#  Project:  GDAL utils.auxiliary
+#  Purpose:  apply a raster algorithm tile by tile, on a pool of threads
+#
+# ******************************************************************************
+#
+# SPDX-License-Identifier: MIT
+# ******************************************************************************
+import collections
+import concurrent.futures
+import threading
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from osgeo import gdal
+
+# Default size, in pixels, of the tiles processed in tiled mode
+DEFAULT_TILE_SIZE = 4096
+
+# Default maximum amount of memory, in bytes, used by copy_band()
+DEFAULT_MAX_CHUNK_MEMORY = 64 * 1024 * 1024
+
+
+def get_tile_size(
+    block_size: Sequence[int], tile_size: Optional[int] = None
+) -> Tuple[int, int]:
+    """Return the size of tiles of about tile_size pixels (DEFAULT_TILE_SIZE
+    if None), made of whole blocks of block_size."""
+    if tile_size is None:
+        tile_size = DEFAULT_TILE_SIZE
+    block_xsize, block_ysize = block_size
+    return (
+        -(-tile_size // block_xsize) * block_xsize,
+        -(-tile_size // block_ysize) * block_ysize,
+    )
+
+
+def get_tile_edges(size: int, tile_size: int) -> List[Tuple[int, int]]:
+    """Split [0, size[ in (offset, size) intervals of at most tile_size."""
+    return [(off, min(tile_size, size - off)) for off in range(0, size, tile_size)]
+
+
+def run_ordered(
+    process: Callable, tiles: Sequence[tuple], consume: Callable, threads: int = 1
+):
+    """
+    Call process(*tile) for each of tiles on a pool of threads, and
+    consume(tile, result) in the calling thread, in the order of tiles.
+
+    At most 2 * threads tiles are processed ahead of the last consumed one,
+    so as to bound the number of results kept in memory.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        pending_tiles = collections.deque()
+
+        def consume_pending_tile():
+            tile, future = pending_tiles.popleft()
+            consume(tile, future.result())
+
+        try:
+            for tile in tiles:
+                pending_tiles.append((tile, executor.submit(process, *tile)))
+
+                # Bound the number of tiles in memory
+                while len(pending_tiles) >= 2 * threads:
+                    consume_pending_tile()
+
+            while pending_tiles:
+                consume_pending_tile()
+        finally:
+            for _, future in pending_tiles:
+                future.cancel()
+
+
+def copy_band(srcband, dstband, max_memory: Optional[int] = None):
+    """
+    Copy srcband into dstband, in chunks made of whole blocks of dstband,
+    using at most max_memory bytes (DEFAULT_MAX_CHUNK_MEMORY if None).
+    """
+    if max_memory is None:
+        max_memory = DEFAULT_MAX_CHUNK_MEMORY
+    xsize = srcband.XSize
+    ysize = srcband.YSize
+    block_xsize, block_ysize = dstband.GetBlockSize()
+    max_pixels = max(1, max_memory // gdal.GetDataTypeSizeBytes(srcband.DataType))
+    if xsize * block_ysize <= max_pixels:
+        # Whole rows of blocks
+        chunk_xsize = xsize
+        chunk_ysize = max(1, max_pixels // (xsize * block_ysize)) * block_ysize
+    else:
+        # Part of a single row of blocks
+        chunk_xsize = max(1, max_pixels // (block_xsize * block_ysize)) * block_xsize
+        chunk_ysize = block_ysize
+
+    for yoff, chunk_h in get_tile_edges(ysize, chunk_ysize):
+        for xoff, chunk_w in get_tile_edges(xsize, chunk_xsize):
+            data = srcband.ReadRaster(xoff, yoff, chunk_w, chunk_h)
+            dstband.WriteRaster(
+                xoff, yoff, chunk_w, chunk_h, data, buf_type=srcband.DataType
+            )
+
+
+def run_tiled(
+    open_bands: Callable,
+    dstband,
+    halo: int,
+    process_tile: Callable,
+    threads: int = 1,
+    tile_size: Optional[int] = None,
+    callback: Optional[Callable] = None,
+):
+    """
+    Apply an algorithm to a band tile by tile, on a pool of threads.
+
+    dstband is partitioned into tiles aligned on its blocks. Each tile is
+    extended by halo pixels on each side, copied from the source band to a
+    MEM dataset and processed in memory. Only the tile itself, without its
+    halo, is then written into dstband. The result is the same as processing
+    the whole band at once if the value of each pixel only depends on the
+    pixels at a distance of at most halo pixels.
+
+    open_bands -- function returning a (source band, mask band) tuple, with
+    a mask band that may be None. It is called once in each thread, as
+    datasets cannot be shared between threads. dstband must not be a band of
+    the same dataset as the source band.
+
+    dstband -- band in which the result is written.
+
+    halo -- number of pixels added on each side of tiles.
+
+    process_tile -- function called with the band and the mask band, in a
+    MEM dataset, of a tile and its halo, that updates the band in place. The
+    mask band is None if open_bands() returned no mask band. The band has
+    the data type and nodata value of the source band.
+
+    threads -- number of threads processing tiles.
+
+    tile_size -- size of tiles in pixels, rounded up to a multiple of the
+    block size (DEFAULT_TILE_SIZE if None).
+
+    callback -- optional function called with the completion ratio after
+    each tile is written.
+    """
+    xsize = dstband.XSize
+    ysize = dstband.YSize
+    tile_xsize, tile_ysize = get_tile_size(dstband.GetBlockSize(), tile_size)
+    x_tiles = get_tile_edges(xsize, tile_xsize)
+    y_tiles = get_tile_edges(ysize, tile_ysize)
+
+    thread_local = threading.local()
+
+    def process(xoff, yoff, tile_w, tile_h):
+        if not hasattr(thread_local, "bands"):
+            thread_local.bands = open_bands()
+        srcband, maskband = thread_local.bands
+
+        # Tile extended by its halo, clamped to the raster
+        win_x = max(0, xoff - halo)
+        win_y = max(0, yoff - halo)
+        win_w = min(xsize, xoff + tile_w + halo) - win_x
+        win_h = min(ysize, yoff + tile_h + halo) - win_y
+
+        mem_drv = gdal.GetDriverByName("MEM")
+        tile_ds = mem_drv.Create("", win_w, win_h, 1, srcband.DataType)
+        tile_band = tile_ds.GetRasterBand(1)
+        nodata = srcband.GetNoDataValue()
+        if nodata is not None:
+            tile_band.SetNoDataValue(nodata)
+        tile_band.WriteRaster(
+            0, 0, win_w, win_h, srcband.ReadRaster(win_x, win_y, win_w, win_h)
+        )
+        tile_maskband = None
+        if maskband is not None:
+            mask_ds = mem_drv.Create("", win_w, win_h, 1, gdal.GDT_Byte)
+            tile_maskband = mask_ds.GetRasterBand(1)
+            tile_maskband.WriteRaster(
+                0,
+                0,
+                win_w,
+                win_h,
+                maskband.ReadRaster(
+                    win_x, win_y, win_w, win_h, buf_type=gdal.GDT_Byte
+                ),
+            )
+
+        process_tile(tile_band, tile_maskband)
+        data = tile_band.ReadRaster(xoff - win_x, yoff - win_y, tile_w, tile_h)
+        return data, tile_band.DataType
+
+    tiles = [
+        (xoff, yoff, tile_w, tile_h)
+        for yoff, tile_h in y_tiles
+        for xoff, tile_w in x_tiles
+    ]
+    tiles_written = 0
+
+    def write_tile(tile, result):
+        nonlocal tiles_written
+        data, data_type = result
+        # The destination band is only written by this thread
+        dstband.WriteRaster(*tile, data, buf_type=data_type)
+        tiles_written += 1
+        if callback is not None:
+            callback(tiles_written / len(tiles))
+
+    run_ordered(process, tiles, write_tile, threads)
@@ -48,6 +48,15 @@ def enable_gdal_exceptions(fun):
     return enable_exceptions_wrapper
 
 
+def get_num_threads(threads: Optional[Union[int, str]]) -> Optional[int]:
+    """Return threads as a number of threads, handling the ALL_CPUS value."""
+    if isinstance(threads, str):
+        if threads.upper() == "ALL_CPUS":
+            return gdal.GetNumCPUs()
+        return max(1, int(threads))
+    return threads
+
+
 def DoesDriverHandleExtension(drv: gdal.Driver, ext: str) -> bool:
     exts = drv.GetMetadataItem(gdal.DMD_EXTENSIONS)
     return exts is not None and ext.lower() in exts.lower().split(" ")
@@ -19,14 +19,17 @@
 # SPDX-License-Identifier: MIT
 # ******************************************************************************
 
+import collections
 import contextlib
 import glob
+import hashlib
 import json
 import logging
 import math
 import optparse
 import os
 import shutil
+import sqlite3
 import stat
 import sys
 import tempfile
@@ -111,6 +114,140 @@ def my_open(filename, mode):
         yield open(filename, mode)
 
 
+class MBTilesArchive:
+    """
+    Single-file MBTiles tile archive.
+
+    Identical encoded tiles (typically empty or uniform ones) are stored only
+    once in the images table, and referenced by their hash from the map table,
+    following the deduplicating layout commonly used by MBTiles producers.
+    Tile rows are in TMS numbering, as mandated by the MBTiles specification.
+    """
+
+    def __init__(self, filename: str, create: bool = True) -> None:
+        self.filename = filename
+        self.conn = sqlite3.connect(filename, timeout=600)
+        if not create:
+            return
+        with self.conn:
+            self.conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS metadata (name TEXT, value TEXT);
+                CREATE UNIQUE INDEX IF NOT EXISTS metadata_name ON metadata (name);
+                CREATE TABLE IF NOT EXISTS map (
+                    zoom_level INTEGER,
+                    tile_column INTEGER,
+                    tile_row INTEGER,
+                    tile_id TEXT);
+                CREATE UNIQUE INDEX IF NOT EXISTS map_index
+                    ON map (zoom_level, tile_column, tile_row);
+                CREATE TABLE IF NOT EXISTS images (tile_data BLOB, tile_id TEXT);
+                CREATE UNIQUE INDEX IF NOT EXISTS images_id ON images (tile_id);
+                CREATE VIEW IF NOT EXISTS tiles AS
+                    SELECT map.zoom_level AS zoom_level,
+                           map.tile_column AS tile_column,
+                           map.tile_row AS tile_row,
+                           images.tile_data AS tile_data
+                    FROM map JOIN images ON images.tile_id = map.tile_id;
+                """
+            )
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def set_metadata(self, metadata: dict) -> None:
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO metadata (name, value) VALUES (?, ?)",
+                [(k, str(v)) for k, v in metadata.items()],
+            )
+
+    def write_tiles(self, tiles: List[Tuple[int, int, int, bytes]]) -> None:
+        """Write (tz, tx, ty, data) tiles in a single transaction"""
+        images = {}
+        map_rows = []
+        for tz, tx, ty, data in tiles:
+            tile_id = hashlib.sha1(data).hexdigest()
+            images[tile_id] = data
+            map_rows.append((tz, tx, ty, tile_id))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO images (tile_data, tile_id) VALUES (?, ?)",
+                [(sqlite3.Binary(data), tile_id) for tile_id, data in images.items()],
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO map (zoom_level, tile_column, tile_row, "
+                "tile_id) VALUES (?, ?, ?, ?)",
+                map_rows,
+            )
+
+    def read_tile(self, tz: int, tx: int, ty: int) -> Optional[bytes]:
+        row = self.conn.execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? "
+            "AND tile_row = ?",
+            (tz, tx, ty),
+        ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def has_tile(self, tz: int, tx: int, ty: int) -> bool:
+        return (
+            self.conn.execute(
+                "SELECT 1 FROM map WHERE zoom_level = ? AND tile_column = ? "
+                "AND tile_row = ?",
+                (tz, tx, ty),
+            ).fetchone()
+            is not None
+        )
+
+    def get_tile_index(self, tz: int) -> set:
+        """Return the set of (tx, ty) tiles present at zoom level tz"""
+        return set(
+            self.conn.execute(
+                "SELECT tile_column, tile_row FROM map WHERE zoom_level = ?", (tz,)
+            ).fetchall()
+        )
+
+
+class MBTilesArchiveWriter:
+    """Accumulate encoded tiles and write them into a MBTilesArchive by batches
+
+    pending_tiles maps the (tz, tx, ty) of the tiles not written yet to their
+    encoded data. If archive is specified, tiles are written into it instead
+    of into a new connection to filename.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        batch_size: int = 1000,
+        archive: Optional[MBTilesArchive] = None,
+    ) -> None:
+        self.archive = archive if archive is not None else MBTilesArchive(filename)
+        self.batch_size = batch_size
+        self.pending_tiles = {}
+
+    def add(self, tiles: List[Tuple[int, int, int, bytes]]) -> None:
+        for tz, tx, ty, data in tiles:
+            self.pending_tiles[(tz, tx, ty)] = data
+        if len(self.pending_tiles) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.pending_tiles:
+            self.archive.write_tiles(
+                [
+                    (tz, tx, ty, data)
+                    for (tz, tx, ty), data in self.pending_tiles.items()
+                ]
+            )
+            # Cleared in place, as it may be shared with pending_archive_tiles
+            self.pending_tiles.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self.archive.close()
+
+
 class UnsupportedTileMatrixSet(Exception):
     pass
 
@@ -1280,9 +1417,239 @@ def _get_creation_options(options):
     return copts
 
 
+def get_tile_archive(tile_job_info: "TileJobInfo") -> Optional[MBTilesArchive]:
+    """Return the per-worker connection used to read tiles back from the
+    MBTiles output, or None if tiles are written as individual files"""
+
+    if not tile_job_info.options.mbtiles:
+        return None
+    archive = getattr(threadLocal, "tile_archive", None)
+    if archive is None or archive.filename != tile_job_info.output_file_path:
+        archive = MBTilesArchive(tile_job_info.output_file_path, create=False)
+        threadLocal.tile_archive = archive
+    return archive
+
+
+def tile_exists(
+    tile_job_info: "TileJobInfo", tilefilename: str, tz: int, tx: int, ty_tms: int
+) -> bool:
+    """Check if a tile has already been written, as a file or into the archive"""
+
+    archive = get_tile_archive(tile_job_info)
+    if archive is None:
+        return isfile(tilefilename)
+    pending_tiles = getattr(threadLocal, "pending_archive_tiles", None)
+    if pending_tiles and (tz, tx, ty_tms) in pending_tiles:
+        return True
+    return archive.has_tile(tz, tx, ty_tms)
+
+
+def open_tile(
+    tile_job_info: "TileJobInfo", tilefilename: str, tz: int, tx: int, ty_tms: int
+) -> Optional[gdal.Dataset]:
+    """Open an already written tile, as a file or from the archive"""
+
+    archive = get_tile_archive(tile_job_info)
+    if archive is None:
+        if not isfile(tilefilename):
+            return None
+        return gdal.Open(tilefilename, gdal.GA_ReadOnly)
+
+    data = None
+    pending_tiles = getattr(threadLocal, "pending_archive_tiles", None)
+    if pending_tiles:
+        data = pending_tiles.get((tz, tx, ty_tms))
+    if data is None:
+        data = archive.read_tile(tz, tx, ty_tms)
+    if data is None:
+        return None
+    mem_filename = "/vsimem/gdal2tiles_%s.%s" % (uuid4(), tile_job_info.tile_extension)
+    gdal.FileFromMemBuffer(mem_filename, data)
+    try:
+        return gdal.GetDriverByName("MEM").CreateCopy(
+            "", gdal.Open(mem_filename, gdal.GA_ReadOnly)
+        )
+    finally:
+        gdal.Unlink(mem_filename)
+
+
+def encode_tile(tile_job_info: "TileJobInfo", dstile: gdal.Dataset) -> bytes:
+    """Encode a tile in memory and return its content"""
+
+    out_drv = gdal.GetDriverByName(tile_job_info.tile_driver)
+    mem_filename = "/vsimem/gdal2tiles_%s.%s" % (uuid4(), tile_job_info.tile_extension)
+    try:
+        out_drv.CreateCopy(
+            mem_filename,
+            (
+                dstile
+                if tile_job_info.tile_driver != "JPEG"
+                else remove_alpha_band(dstile)
+            ),
+            strict=0,
+            options=_get_creation_options(tile_job_info.options),
+        )
+        f = gdal.VSIFOpenL(mem_filename, "rb")
+        try:
+            return gdal.VSIFReadL(1, gdal.VSIStatL(mem_filename).size, f)
+        finally:
+            gdal.VSIFCloseL(f)
+    finally:
+        gdal.Unlink(mem_filename)
+        if gdal.VSIStatL(mem_filename + ".aux.xml") is not None:
+            gdal.Unlink(mem_filename + ".aux.xml")
+
+
+def get_uniform_colour(
+    data: bytes, alpha: bytes, nb_data_bands: int
+) -> Optional[Tuple[int, ...]]:
+    """Return the (band values..., alpha) colour of a fully opaque window whose
+    bands are each set to a single value, or None if it is not uniform.
+
+    data is the band-sequential Byte buffer of the data bands, and alpha the
+    buffer of the alpha band, as returned by ReadRaster().
+    """
+
+    band_size = len(alpha)
+    if len(data) != nb_data_bands * band_size:
+        return None
+    if alpha.count(b"\xff") != band_size:
+        return None
+    colour = []
+    for i in range(nb_data_bands):
+        band = data[i * band_size : (i + 1) * band_size]
+        if band.count(band[0:1]) != band_size:
+            return None
+        colour.append(band[0])
+    colour.append(255)
+    return tuple(colour)
+
+
+def get_uniform_tiles_state():
+    """Return the per-worker state of --uniform-tiles, that is a dictionary
+    mapping each colour to its [encoded tile, first written file] and a
+    dictionary mapping (tz, tx, ty) of uniform tiles to their colour"""
+
+    state = getattr(threadLocal, "uniform_tiles_state", None)
+    if state is None:
+        state = ({}, {})
+        threadLocal.uniform_tiles_state = state
+    return state
+
+
+def _remove_linked_tile(tilefilename: str) -> None:
+    """Remove an existing tile that may be a hard or symbolic link created by
+    --uniform-tiles, so that writing it does not alter the tiles it is linked to"""
+
+    if not tilefilename.startswith("/vsi") and os.path.lexists(tilefilename):
+        os.unlink(tilefilename)
+
+
+def write_uniform_tile(
+    tile_job_info: "TileJobInfo",
+    dstile: gdal.Dataset,
+    tilefilename: str,
+    tz: int,
+    tx: int,
+    ty_tms: int,
+    colour: Tuple[int, ...],
+) -> Optional[Tuple[int, int, int, bytes]]:
+    """Write a uniform tile, encoding it only once per colour"""
+
+    options = tile_job_info.options
+    encoded_tiles, uniform_tiles = get_uniform_tiles_state()
+
+    # Remember the colour of the tile for the generation of its parent, if it
+    # is generated by this worker, so that entries are always consumed
+    min_tz = getattr(threadLocal, "uniform_tiles_min_tz", None)
+    if min_tz is not None and tz > min_tz:
+        uniform_tiles[(tz, tx, ty_tms)] = colour
+
+    entry = encoded_tiles.get(colour)
+    if entry is None:
+        entry = [encode_tile(tile_job_info, dstile), None]
+        encoded_tiles[colour] = entry
+    data, first_tilefilename = entry
+
+    if options.mbtiles:
+        return (tz, tx, ty_tms, data)
+
+    if options.uniform_tiles in ("hardlink", "symlink") and not tilefilename.startswith(
+        "/vsi"
+    ):
+        _remove_linked_tile(tilefilename)
+        if first_tilefilename is not None:
+            try:
+                if options.uniform_tiles == "hardlink":
+                    os.link(first_tilefilename, tilefilename)
+                else:
+                    os.symlink(
+                        os.path.relpath(
+                            first_tilefilename, os.path.dirname(tilefilename)
+                        ),
+                        tilefilename,
+                    )
+                return None
+            except OSError:
+                # e.g. file system not supporting links: fallback to a copy
+                pass
+
+    with my_open(tilefilename, "wb") as f:
+        f.write(data)
+    if first_tilefilename is None:
+        entry[1] = tilefilename
+    return None
+
+
+def write_tile(
+    tile_job_info: "TileJobInfo",
+    dstile: gdal.Dataset,
+    tilefilename: str,
+    tz: int,
+    tx: int,
+    ty_tms: int,
+    uniform_colour: Optional[Tuple[int, ...]] = None,
+) -> Optional[Tuple[int, int, int, bytes]]:
+    """Encode a tile and write it as a file.
+
+    When writing into a MBTiles archive, the tile is encoded in memory and
+    returned as a (tz, tx, ty_tms, data) tuple, so that the process that
+    owns the archive writes it.
+    """
+
+    options = tile_job_info.options
+
+    if uniform_colour is not None:
+        return write_uniform_tile(
+            tile_job_info, dstile, tilefilename, tz, tx, ty_tms, uniform_colour
+        )
+
+    if options.mbtiles:
+        return (tz, tx, ty_tms, encode_tile(tile_job_info, dstile))
+
+    if options.uniform_tiles in ("hardlink", "symlink"):
+        _remove_linked_tile(tilefilename)
+
+    # Write a copy of tile to png/jpg
+    out_drv = gdal.GetDriverByName(tile_job_info.tile_driver)
+    out_drv.CreateCopy(
+        tilefilename,
+        dstile if tile_job_info.tile_driver != "JPEG" else remove_alpha_band(dstile),
+        strict=0,
+        options=_get_creation_options(options),
+    )
+
+    # Remove useless side car file
+    aux_xml = tilefilename + ".aux.xml"
+    if gdal.VSIStatL(aux_xml) is not None:
+        gdal.Unlink(aux_xml)
+
+    return None
+
+
 def create_base_tile(
     tile_job_info: "TileJobInfo", tmsMap: dict, tile_detail: "TileDetail"
-) -> None:
+) -> Optional[Tuple[int, int, int, bytes]]:
 
     if tmsMap is None:
         _, tmsMap = get_profile_list_and_tmsMap()
@@ -1353,9 +1720,25 @@ def create_base_tile(
             band_list=list(range(1, dataBandsCount + 1)),
         )
 
+    # Detect tiles fully covered by a single opaque colour, for which
+    # resampling and encoding can be skipped
+    uniform_colour = None
+    if (
+        options.uniform_tiles
+        and data
+        and wx == 0
+        and wy == 0
+        and wxsize == querysize
+        and wysize == querysize
+    ):
+        uniform_colour = get_uniform_colour(data, alpha, dataBandsCount)
+
     # The tile in memory is a transparent file by default. Write pixel values into it if
     # any
-    if data:
+    if uniform_colour is not None:
+        for i, value in enumerate(uniform_colour):
+            dstile.GetRasterBand(i + 1).Fill(value)
+    elif data:
         if tile_size == querysize:
             # Use the ReadRaster result directly in tiles ('nearest neighbour' query)
             dstile.WriteRaster(
@@ -1395,19 +1778,22 @@ def create_base_tile(
 
     del data
 
-    # Write a copy of tile to png/jpg
-    out_drv.CreateCopy(
+    # Keep the raw pixels of the tile for the generation of its parent, if it
+    # is generated by this worker
+    tile_buffer_cache = get_tile_buffer_cache(options)
+    if tile_buffer_cache is not None and tz > threadLocal.uniform_tiles_min_tz:
+        tile_buffer_cache.put(tz, tx, tile_detail.ty_tms, dstile.ReadRaster())
+
+    archived_tile = write_tile(
+        tile_job_info,
+        dstile,
         tilefilename,
-        dstile if tile_job_info.tile_driver != "JPEG" else remove_alpha_band(dstile),
-        strict=0,
-        options=_get_creation_options(options),
+        tz,
+        tx,
+        tile_detail.ty_tms,
+        uniform_colour=uniform_colour,
     )
 
-    # Remove useless side car file
-    aux_xml = tilefilename + ".aux.xml"
-    if gdal.VSIStatL(aux_xml) is not None:
-        gdal.Unlink(aux_xml)
-
     del dstile
 
     # Create a KML file for this tile.
@@ -1435,6 +1821,8 @@ def create_base_tile(
                         ).encode("utf-8")
                     )
 
+    return archived_tile
+
 
 def remove_alpha_band(src_ds):
     if (
@@ -1468,6 +1856,74 @@ def remove_alpha_band(src_ds):
     return dst_ds
 
 
+class TileBufferCache:
+    """
+    Bounded cache of the raw (decoded) pixel buffers of already generated
+    tiles, keyed by (tz, tx, ty) in TMS numbering.
+
+    It is used by the in-memory pyramid mode so that overview tiles can be
+    built from the pixels of their children without re-opening and decoding
+    the encoded tiles written on disk. When the memory budget is exceeded,
+    the tiles of the lowest zoom level, that are the ones needed last, are
+    evicted first. Evicted or missing tiles are read back from disk.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.zoom_levels = {}
+
+    def put(self, tz: int, tx: int, ty: int, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        tiles = self.zoom_levels.setdefault(tz, collections.OrderedDict())
+        old_data = tiles.pop((tx, ty), None)
+        if old_data is not None:
+            self.size -= len(old_data)
+        tiles[(tx, ty)] = data
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            min_tz = min(self.zoom_levels)
+            _, evicted_data = self.zoom_levels[min_tz].popitem(last=False)
+            self.size -= len(evicted_data)
+            if not self.zoom_levels[min_tz]:
+                del self.zoom_levels[min_tz]
+
+    def pop(self, tz: int, tx: int, ty: int) -> Optional[bytes]:
+        tiles = self.zoom_levels.get(tz)
+        if tiles is None:
+            return None
+        data = tiles.pop((tx, ty), None)
+        if data is not None:
+            self.size -= len(data)
+            if not tiles:
+                del self.zoom_levels[tz]
+        return data
+
+    def clear(self) -> None:
+        self.zoom_levels = {}
+        self.size = 0
+
+
+def get_tile_buffer_cache(options: Options) -> Optional[TileBufferCache]:
+    """Return the per-worker tile buffer cache, or None if the in-memory
+    pyramid mode is not enabled, or if this worker does not generate overview
+    tiles from the tiles it generates"""
+
+    if not getattr(options, "in_memory_pyramid", False):
+        return None
+    # Set when parent tiles are generated by the same worker as their
+    # children: in a single process, or in a sub-pyramid job. Otherwise,
+    # parents would mostly be built by other workers, from the encoded tiles.
+    if getattr(threadLocal, "uniform_tiles_min_tz", None) is None:
+        return None
+    cache = getattr(threadLocal, "tile_buffer_cache", None)
+    if cache is None:
+        cache = TileBufferCache(options.in_memory_pyramid_max_size * 1024 * 1024)
+        threadLocal.tile_buffer_cache = cache
+    return cache
+
+
 def create_overview_tile(
     base_tz: int,
     base_tiles: List[Tuple[int, int]],
@@ -1475,7 +1931,7 @@ def create_overview_tile(
     tile_job_info: "TileJobInfo",
     options: Options,
     tmsMap: dict,
-):
+) -> Optional[Tuple[int, int, int, bytes]]:
     """Generating an overview tile from no more than 4 underlying tiles(base tiles)"""
 
     if tmsMap is None:
@@ -1494,14 +1950,18 @@ def create_overview_tile(
     )
     if options.verbose:
         logger.debug(tilefilename)
-    if options.resume and isfile(tilefilename):
+    if options.resume and tile_exists(
+        tile_job_info, tilefilename, overview_tz, overview_tx, overview_ty
+    ):
+        if options.uniform_tiles:
+            _, uniform_tiles = get_uniform_tiles_state()
+            for base_tile in base_tiles:
+                uniform_tiles.pop((base_tz, base_tile[0], base_tile[1]), None)
         if options.verbose:
             logger.debug("Tile generation skipped because of --resume")
-        return
+        return None
 
     mem_driver = gdal.GetDriverByName("MEM")
-    tile_driver = tile_job_info.tile_driver
-    out_driver = gdal.GetDriverByName(tile_driver)
 
     tilebands = tile_job_info.nb_data_bands + 1
 
@@ -1517,21 +1977,32 @@ def create_overview_tile(
 
     usable_base_tiles = []
 
-    for base_tile in base_tiles:
+    tile_buffer_cache = get_tile_buffer_cache(options)
+
+    # If the four underlying tiles are known to be uniform with the same
+    # colour, so is the overview tile, and they do not need to be read.
+    uniform_colour = None
+    if options.uniform_tiles:
+        _, uniform_tiles = get_uniform_tiles_state()
+        colours = [
+            uniform_tiles.pop((base_tz, base_tile[0], base_tile[1]), None)
+            for base_tile in base_tiles
+        ]
+        if len(colours) == 4 and colours[0] is not None:
+            if colours.count(colours[0]) == 4:
+                uniform_colour = colours[0]
+
+    if uniform_colour is not None:
+        for i, value in enumerate(uniform_colour):
+            dstile.GetRasterBand(i + 1).Fill(value)
+        if tile_buffer_cache is not None:
+            for base_tile in base_tiles:
+                tile_buffer_cache.pop(base_tz, base_tile[0], base_tile[1])
+        usable_base_tiles = list(base_tiles)
+
+    for base_tile in base_tiles if uniform_colour is None else []:
         base_tx = base_tile[0]
         base_ty = base_tile[1]
-        base_ty_real = GDAL2Tiles.getYTile(base_ty, base_tz, options, tmsMap)
-
-        base_tile_path = os.path.join(
-            output_folder,
-            str(base_tz),
-            str(base_tx),
-            "%s.%s" % (base_ty_real, tile_job_info.tile_extension),
-        )
-        if not isfile(base_tile_path):
-            continue
-
-        dsquerytile = gdal.Open(base_tile_path, gdal.GA_ReadOnly)
 
         if base_tx % 2 == 0:
             tileposx = 0
@@ -1549,6 +2020,34 @@ def create_overview_tile(
             else:
                 tileposy = 0
 
+        if tile_buffer_cache is not None:
+            base_data = tile_buffer_cache.pop(base_tz, base_tx, base_ty)
+            if base_data is not None:
+                dsquery.WriteRaster(
+                    tileposx,
+                    tileposy,
+                    tile_job_info.tile_size,
+                    tile_job_info.tile_size,
+                    base_data,
+                    band_list=list(range(1, tilebands + 1)),
+                )
+                usable_base_tiles.append(base_tile)
+                continue
+
+        base_ty_real = GDAL2Tiles.getYTile(base_ty, base_tz, options, tmsMap)
+
+        base_tile_path = os.path.join(
+            output_folder,
+            str(base_tz),
+            str(base_tx),
+            "%s.%s" % (base_ty_real, tile_job_info.tile_extension),
+        )
+        dsquerytile = open_tile(
+            tile_job_info, base_tile_path, base_tz, base_tx, base_ty
+        )
+        if dsquerytile is None:
+            continue
+
         if (
             tile_job_info.tile_driver == "JPEG"
             and dsquerytile.RasterCount == 3
@@ -1615,21 +2114,27 @@ def create_overview_tile(
         usable_base_tiles.append(base_tile)
 
     if not usable_base_tiles:
-        return
+        return None
 
-    scale_query_to_tile(dsquery, dstile, options, tilefilename=tilefilename)
+    if uniform_colour is None:
+        scale_query_to_tile(dsquery, dstile, options, tilefilename=tilefilename)
 
-    # Write a copy of tile to png/jpg
-    out_driver.CreateCopy(
+    # Keep the raw pixels of the tile for the generation of its parent, if it
+    # is generated by this worker
+    if tile_buffer_cache is not None and overview_tz > threadLocal.uniform_tiles_min_tz:
+        tile_buffer_cache.put(
+            overview_tz, overview_tx, overview_ty, dstile.ReadRaster()
+        )
+
+    archived_tile = write_tile(
+        tile_job_info,
+        dstile,
         tilefilename,
-        dstile if tile_job_info.tile_driver != "JPEG" else remove_alpha_band(dstile),
-        strict=0,
-        options=_get_creation_options(options),
+        overview_tz,
+        overview_tx,
+        overview_ty,
+        uniform_colour=uniform_colour,
     )
-    # Remove useless side car file
-    aux_xml = tilefilename + ".aux.xml"
-    if gdal.VSIStatL(aux_xml) is not None:
-        gdal.Unlink(aux_xml)
 
     if options.verbose:
         logger.debug(
@@ -1662,14 +2167,28 @@ def create_overview_tile(
                     ).encode("utf-8")
                 )
 
+    return archived_tile
+
 
 def group_overview_base_tiles(
-    base_tz: int, output_folder: str, tile_job_info: "TileJobInfo"
+    base_tz: int,
+    output_folder: str,
+    tile_job_info: "TileJobInfo",
+    bounds: Optional[Tuple[int, int, int, int]] = None,
 ) -> List[List[Tuple[int, int]]]:
-    """Group base tiles that belong to the same overview tile"""
+    """Group base tiles that belong to the same overview tile
+
+    If bounds (tminx, tminy, tmaxx, tmaxy) is specified, only the base tiles
+    within those bounds are considered.
+    """
 
     overview_to_bases = {}
     tminx, tminy, tmaxx, tmaxy = tile_job_info.tminmax[base_tz]
+    if bounds is not None:
+        tminx = max(tminx, bounds[0])
+        tminy = max(tminy, bounds[1])
+        tmaxx = min(tmaxx, bounds[2])
+        tmaxy = min(tmaxy, bounds[3])
     for ty in range(tmaxy, tminy - 1, -1):
         overview_ty = ty >> 1
         for tx in range(tminx, tmaxx + 1):
@@ -1683,18 +2202,171 @@ def group_overview_base_tiles(
             overview_to_bases[overview_tile].append(base_tile)
 
     # Create directories for the tiles
-    overview_tz = base_tz - 1
-    for tx in range(tminx, tmaxx + 1):
-        overview_tx = tx >> 1
-        tiledirname = os.path.join(output_folder, str(overview_tz), str(overview_tx))
-        makedirs(tiledirname)
+    if not tile_job_info.options.mbtiles:
+        overview_tz = base_tz - 1
+        for tx in range(tminx, tmaxx + 1):
+            overview_tx = tx >> 1
+            tiledirname = os.path.join(
+                output_folder, str(overview_tz), str(overview_tx)
+            )
+            makedirs(tiledirname)
 
     return list(overview_to_bases.values())
 
 
-def count_overview_tiles(tile_job_info: "TileJobInfo") -> int:
+def get_subtree_zoom(tile_job_info: "TileJobInfo", nb_processes: int) -> int:
+    """Return the zoom level at which the pyramid is split into sub-pyramids
+    for --subtree-partitioning.
+
+    This is the lowest zoom level that has enough tiles to keep all processes
+    busy, so that as few overview levels as possible remain to be generated
+    once all the sub-pyramids have been completed.
+    """
+
+    for tz in range(tile_job_info.tminz, tile_job_info.tmaxz + 1):
+        tminx, tminy, tmaxx, tmaxy = tile_job_info.tminmax[tz]
+        if (1 + tmaxx - tminx) * (1 + tmaxy - tminy) >= 4 * nb_processes:
+            return tz
+    return tile_job_info.tmaxz
+
+
+def get_subtree_bounds(
+    subtree_tz: int, subtree_tx: int, subtree_ty: int, tz: int
+) -> Tuple[int, int, int, int]:
+    """Return the (tminx, tminy, tmaxx, tmaxy) bounds at zoom level tz of the
+    tiles that are under the (subtree_tx, subtree_ty) tile at zoom level subtree_tz
+    """
+
+    shift = tz - subtree_tz
+    return (
+        subtree_tx << shift,
+        subtree_ty << shift,
+        ((subtree_tx + 1) << shift) - 1,
+        ((subtree_ty + 1) << shift) - 1,
+    )
+
+
+def get_subtree_jobs(
+    tile_job_info: "TileJobInfo", tile_details: List["TileDetail"], subtree_tz: int
+) -> List[Tuple[int, int, int, List["TileDetail"]]]:
+    """Distribute the base tiles among the sub-pyramids rooted at the tiles
+    of zoom level subtree_tz.
+
+    Sub-pyramids are returned in the same row order as base tiles are
+    generated, and each of them carries the details of its base tiles.
+    """
+
+    shift = tile_job_info.tmaxz - subtree_tz
+    subtree_to_details = {}
+    tminx, tminy, tmaxx, tmaxy = tile_job_info.tminmax[subtree_tz]
+    for ty in range(tmaxy, tminy - 1, -1):
+        for tx in range(tminx, tmaxx + 1):
+            subtree_to_details[(tx, ty)] = []
+
+    for tile_detail in tile_details:
+        subtree_to_details[
+            (tile_detail.tx >> shift, tile_detail.ty_tms >> shift)
+        ].append(tile_detail)
+
+    return [
+        (subtree_tz, tx, ty, details)
+        for (tx, ty), details in subtree_to_details.items()
+    ]
+
+
+def count_subtree_tiles(
+    tile_job_info: "TileJobInfo", subtree_job: Tuple[int, int, int, List["TileDetail"]]
+) -> int:
+    """Count the base and overview tiles that are processed for a sub-pyramid"""
+
+    subtree_tz, subtree_tx, subtree_ty, tile_details = subtree_job
+    tile_number = len(tile_details)
+    for tz in range(tile_job_info.tmaxz - 1, subtree_tz - 1, -1):
+        tminx, tminy, tmaxx, tmaxy = tile_job_info.tminmax[tz]
+        bounds = get_subtree_bounds(subtree_tz, subtree_tx, subtree_ty, tz)
+        tile_number += max(0, 1 + min(tmaxx, bounds[2]) - max(tminx, bounds[0])) * max(
+            0, 1 + min(tmaxy, bounds[3]) - max(tminy, bounds[1])
+        )
+    return tile_number
+
+
+def create_subtree_tiles(
+    tile_job_info: "TileJobInfo",
+    tmsMap: dict,
+    subtree_job: Tuple[int, int, int, List["TileDetail"]],
+) -> int:
+    """Generate all the base tiles and overview tiles of a sub-pyramid, down
+    to (and including) its root tile.
+
+    When writing into a MBTiles archive, tiles are written by this worker,
+    by batches, so that its memory use does not depend on the size of the
+    sub-pyramid.
+
+    Returns the number of processed tiles.
+    """
+
+    if tmsMap is None:
+        _, tmsMap = get_profile_list_and_tmsMap()
+
+    subtree_tz, subtree_tx, subtree_ty, tile_details = subtree_job
+    output_folder = tile_job_info.output_file_path
+    options = tile_job_info.options
+
+    # Overview tiles of the sub-pyramid are generated by this worker, but not
+    # the parent of its root tile, unless this is the only worker
+    uniform_tiles_min_tz = getattr(threadLocal, "uniform_tiles_min_tz", None)
+    if uniform_tiles_min_tz is None:
+        threadLocal.uniform_tiles_min_tz = subtree_tz
+
+    archive_writer = None
+    if options.mbtiles:
+        archive_writer = MBTilesArchiveWriter(
+            output_folder, archive=get_tile_archive(tile_job_info)
+        )
+        # Tiles of the sub-pyramid that are not written into the archive yet,
+        # but may be needed to build overview tiles
+        threadLocal.pending_archive_tiles = archive_writer.pending_tiles
+    try:
+        for tile_detail in tile_details:
+            archived_tile = create_base_tile(tile_job_info, tmsMap, tile_detail)
+            if archive_writer and archived_tile:
+                archive_writer.add([archived_tile])
+
+        for base_tz in range(tile_job_info.tmaxz, subtree_tz, -1):
+            base_tile_groups = group_overview_base_tiles(
+                base_tz,
+                output_folder,
+                tile_job_info,
+                bounds=get_subtree_bounds(subtree_tz, subtree_tx, subtree_ty, base_tz),
+            )
+            for base_tiles in base_tile_groups:
+                archived_tile = create_overview_tile(
+                    base_tz, base_tiles, output_folder, tile_job_info, options, tmsMap
+                )
+                if archive_writer and archived_tile:
+                    archive_writer.add([archived_tile])
+
+        if archive_writer:
+            archive_writer.flush()
+    finally:
+        if archive_writer:
+            del threadLocal.pending_archive_tiles
+        if uniform_tiles_min_tz is None:
+            del threadLocal.uniform_tiles_min_tz
+
+    return count_subtree_tiles(tile_job_info, subtree_job)
+
+
+def count_overview_tiles(
+    tile_job_info: "TileJobInfo", base_tz: Optional[int] = None
+) -> int:
+    """Count the overview tiles generated from base_tz (defaults to the
+    maximum zoom level) down to the minimum zoom level"""
+
+    if base_tz is None:
+        base_tz = tile_job_info.tmaxz
     tile_number = 0
-    for tz in range(tile_job_info.tmaxz - 1, tile_job_info.tminz - 1, -1):
+    for tz in range(base_tz - 1, tile_job_info.tminz - 1, -1):
         tminx, tminy, tmaxx, tmaxy = tile_job_info.tminmax[tz]
         tile_number += (1 + abs(tmaxx - tminx)) * (1 + abs(tmaxy - tminy))
 
@@ -1798,6 +2470,47 @@ def optparse_init() -> optparse.OptionParser:
         type="int",
         help="Number of processes to use for tiling",
     )
+    p.add_option(
+        "--uniform-tiles",
+        dest="uniform_tiles",
+        type="choice",
+        choices=["copy", "hardlink", "symlink"],
+        help="Detect tiles filled with a single opaque colour, skip their "
+        "resampling, and encode them only once per colour. Copies of the "
+        "encoded tile are written (copy), or hard links (hardlink) or symbolic "
+        "links (symlink) to the first tile of the same colour are created.",
+    )
+    p.add_option(
+        "--mbtiles",
+        action="store_true",
+        dest="mbtiles",
+        help="Write the tiles into a single MBTiles file, whose name is given as "
+        "output, instead of one file per tile. Only for the mercator profile.",
+    )
+    p.add_option(
+        "--subtree-partitioning",
+        action="store_true",
+        dest="subtree_partitioning",
+        help="Distribute whole sub-pyramids to processes, that generate both "
+        "their base and overview tiles, instead of synchronizing all processes "
+        "after each zoom level.",
+    )
+    p.add_option(
+        "--in-memory-pyramid",
+        action="store_true",
+        dest="in_memory_pyramid",
+        help="Build overview tiles from the in-memory pixels of their children, "
+        "instead of reading back the encoded tiles written on disk.",
+    )
+    p.add_option(
+        "--in-memory-pyramid-max-size",
+        dest="in_memory_pyramid_max_size",
+        metavar="MB",
+        type="int",
+        default=256,
+        help="Maximum size in megabytes of the tile cache, per process, used by "
+        "--in-memory-pyramid. Default is 256",
+    )
     p.add_option(
         "--mpi",
         action="store_true",
@@ -1994,6 +2707,8 @@ def process_args(argv: List[str], called_from_main=False) -> Tuple[str, str, Opt
     else:
         # Directory with input filename without extension in actual directory
         output_folder = os.path.splitext(os.path.basename(input_file))[0]
+        if options.mbtiles:
+            output_folder += ".mbtiles"
 
     if options.webviewer == "mapml":
         options.xyz = True
@@ -2071,6 +2786,26 @@ def options_post_processing(
             exit_with_error("jpeg_quality should be in the range [1-100]")
         options.jpeg_quality = int(options.jpeg_quality)
 
+    if getattr(options, "mbtiles", False):
+        if options.profile != "mercator":
+            exit_with_error("--mbtiles is only supported with the mercator profile")
+        if options.xyz:
+            exit_with_error(
+                "--xyz is not compatible with --mbtiles, whose tile rows "
+                "are always in TMS numbering"
+            )
+        if options.kml:
+            exit_with_error("--force-kml is not compatible with --mbtiles")
+        if output_folder.startswith("/vsi"):
+            exit_with_error("--mbtiles does not support /vsi output")
+        options.webviewer = "none"
+
+    if (
+        getattr(options, "in_memory_pyramid", False)
+        and options.in_memory_pyramid_max_size <= 0
+    ):
+        exit_with_error("in_memory_pyramid_max_size should be strictly positive")
+
     # Output the results
     if options.verbose:
         logger.debug("Options: %s" % str(options))
@@ -2193,8 +2928,11 @@ class GDAL2Tiles:
         else:
             self.tileext = "jpg"
         if options.mpi:
-            makedirs(output_folder)
-            self.tmp_dir = tempfile.mkdtemp(dir=output_folder)
+            tmp_parent_dir = output_folder
+            if options.mbtiles:
+                tmp_parent_dir = os.path.dirname(os.path.abspath(output_folder))
+            makedirs(tmp_parent_dir)
+            self.tmp_dir = tempfile.mkdtemp(dir=tmp_parent_dir)
         else:
             self.tmp_dir = tempfile.mkdtemp()
         self.tmp_vrt_filename = os.path.join(self.tmp_dir, str(uuid4()) + ".vrt")
@@ -2673,6 +3411,10 @@ class GDAL2Tiles:
         tiles are generated during the tile processing).
         """
 
+        if self.options.mbtiles:
+            self.generate_mbtiles_metadata()
+            return
+
         makedirs(self.output_folder)
 
         if self.options.profile == "mercator":
@@ -2792,6 +3534,36 @@ class GDAL2Tiles:
                             ).encode("utf-8")
                         )
 
+    def generate_mbtiles_metadata(self) -> None:
+        """
+        Creation of the MBTiles archive and of its metadata table
+        """
+
+        output_dir = os.path.dirname(self.output_folder)
+        if output_dir:
+            makedirs(output_dir)
+
+        south, west = self.mercator.MetersToLatLon(self.ominx, self.ominy)
+        north, east = self.mercator.MetersToLatLon(self.omaxx, self.omaxy)
+        south, west = max(-85.05112878, south), max(-180.0, west)
+        north, east = min(85.05112878, north), min(180.0, east)
+        self.swne = (south, west, north, east)
+
+        archive = MBTilesArchive(self.output_folder)
+        archive.set_metadata(
+            {
+                "name": self.options.title,
+                "type": "overlay",
+                "version": "1.1",
+                "description": self.options.title,
+                "format": self.tileext,
+                "bounds": "%.17g,%.17g,%.17g,%.17g" % (west, south, east, north),
+                "minzoom": self.tminz,
+                "maxzoom": self.tmaxz,
+            }
+        )
+        archive.close()
+
     def generate_base_tiles(self) -> Tuple[TileJobInfo, List[TileDetail]]:
         """
         Generation of the base tiles (the lowest in the pyramid) directly from the input raster
@@ -2824,10 +3596,17 @@ class GDAL2Tiles:
 
         tz = self.tmaxz
 
-        # Create directories for the tiles
-        for tx in range(tminx, tmaxx + 1):
-            tiledirname = os.path.join(self.output_folder, str(tz), str(tx))
-            makedirs(tiledirname)
+        archived_tiles = None
+        if self.options.mbtiles:
+            if self.options.resume:
+                archive = MBTilesArchive(self.output_folder, create=False)
+                archived_tiles = archive.get_tile_index(tz)
+                archive.close()
+        else:
+            # Create directories for the tiles
+            for tx in range(tminx, tmaxx + 1):
+                tiledirname = os.path.join(self.output_folder, str(tz), str(tx))
+                makedirs(tiledirname)
 
         for ty in range(tmaxy, tminy - 1, -1):
             for tx in range(tminx, tmaxx + 1):
@@ -2843,7 +3622,11 @@ class GDAL2Tiles:
                 if self.options.verbose:
                     logger.debug("%d / %d, %s" % (ti, tcount, tilefilename))
 
-                if self.options.resume and isfile(tilefilename):
+                if self.options.resume and (
+                    (tx, ty) in archived_tiles
+                    if archived_tiles is not None
+                    else isfile(tilefilename)
+                ):
                     if self.options.verbose:
                         logger.debug("Tile generation skipped because of --resume")
                     continue
@@ -4508,21 +5291,50 @@ def single_threaded_tiling(
     if options.verbose:
         logger.debug("Tiles details calc complete.")
 
-    if not options.verbose and not options.quiet:
-        base_progress_bar = ProgressBar(len(tile_details))
-        base_progress_bar.start()
+    archive_writer = MBTilesArchiveWriter(output_folder) if options.mbtiles else None
 
-    for tile_detail in tile_details:
-        create_base_tile(conf, tmsMap, tile_detail)
+    # All overview tiles are generated by this process
+    threadLocal.uniform_tiles_min_tz = conf.tminz
+
+    if options.subtree_partitioning:
+        subtree_tz = get_subtree_zoom(conf, 1)
+        subtree_jobs = get_subtree_jobs(conf, tile_details, subtree_tz)
+
+        if not options.verbose and not options.quiet:
+            base_progress_bar = ProgressBar(
+                sum(count_subtree_tiles(conf, job) for job in subtree_jobs)
+            )
+            base_progress_bar.start()
+
+        for subtree_job in subtree_jobs:
+            nb_tiles = create_subtree_tiles(conf, tmsMap, subtree_job)
+
+            if not options.verbose and not options.quiet:
+                base_progress_bar.log_progress(nb_tiles)
+
+    else:
+        subtree_tz = conf.tmaxz
 
         if not options.verbose and not options.quiet:
-            base_progress_bar.log_progress()
+            base_progress_bar = ProgressBar(len(tile_details))
+            base_progress_bar.start()
+
+        for tile_detail in tile_details:
+            archived_tile = create_base_tile(conf, tmsMap, tile_detail)
+            if archive_writer and archived_tile:
+                archive_writer.add([archived_tile])
+
+            if not options.verbose and not options.quiet:
+                base_progress_bar.log_progress()
 
     if getattr(threadLocal, "cached_ds", None):
         del threadLocal.cached_ds
 
+    if archive_writer:
+        archive_writer.flush()
+
     if not options.quiet:
-        count = count_overview_tiles(conf)
+        count = count_overview_tiles(conf, subtree_tz)
         if count:
             logger.info("Generating Overview Tiles:")
 
@@ -4530,14 +5342,30 @@ def single_threaded_tiling(
                 overview_progress_bar = ProgressBar(count)
                 overview_progress_bar.start()
 
-    for base_tz in range(conf.tmaxz, conf.tminz, -1):
+    for base_tz in range(subtree_tz, conf.tminz, -1):
         base_tile_groups = group_overview_base_tiles(base_tz, output_folder, conf)
         for base_tiles in base_tile_groups:
-            create_overview_tile(
+            archived_tile = create_overview_tile(
                 base_tz, base_tiles, output_folder, conf, options, tmsMap
             )
+            if archive_writer and archived_tile:
+                archive_writer.add([archived_tile])
             if not options.verbose and not options.quiet:
                 overview_progress_bar.log_progress()
+        if archive_writer:
+            archive_writer.flush()
+
+    if archive_writer:
+        archive_writer.close()
+    if getattr(threadLocal, "tile_archive", None):
+        threadLocal.tile_archive.close()
+        del threadLocal.tile_archive
+
+    if getattr(threadLocal, "tile_buffer_cache", None):
+        del threadLocal.tile_buffer_cache
+    if getattr(threadLocal, "uniform_tiles_state", None):
+        del threadLocal.uniform_tiles_state
+    del threadLocal.uniform_tiles_min_tz
 
     shutil.rmtree(os.path.dirname(conf.src_file))
 
@@ -4556,21 +5384,62 @@ def multi_threaded_tiling(
     if options.verbose:
         logger.debug("Tiles details calc complete.")
 
-    if not options.verbose and not options.quiet:
-        base_progress_bar = ProgressBar(len(tile_details))
-        base_progress_bar.start()
+    # Tiles are encoded by the worker processes, and written into the
+    # archive by this process only, which avoids contention on database locks.
+    # With --subtree-partitioning, workers write their tiles by batches.
+    archive_writer = MBTilesArchiveWriter(output_folder) if options.mbtiles else None
+
+    if options.subtree_partitioning:
+        # Each job is a whole sub-pyramid, whose base and overview tiles are
+        # generated by a single process, which improves the locality of source
+        # reads, and avoids synchronizing all processes after each zoom level.
+        subtree_tz = get_subtree_zoom(conf, nb_processes)
+        subtree_jobs = get_subtree_jobs(conf, tile_details, subtree_tz)
+
+        if options.verbose:
+            logger.debug(
+                "%d sub-pyramids rooted at zoom level %d"
+                % (len(subtree_jobs), subtree_tz)
+            )
 
-    # TODO: gbataille - check the confs for which each element is an array... one useless level?
-    # TODO: gbataille - assign an ID to each job for print in verbose mode "ReadRaster Extent ..."
-    chunksize = max(1, min(128, len(tile_details) // nb_processes))
-    for _ in pool.imap_unordered(
-        partial(create_base_tile, conf, None), tile_details, chunksize=chunksize
-    ):
         if not options.verbose and not options.quiet:
-            base_progress_bar.log_progress()
+            base_progress_bar = ProgressBar(
+                sum(count_subtree_tiles(conf, job) for job in subtree_jobs)
+            )
+            base_progress_bar.start()
+
+        # Workers write the tiles of their sub-pyramids into the archive
+        # themselves, by batches, rather than sending them to this process
+        for nb_tiles in pool.imap_unordered(
+            partial(create_subtree_tiles, conf, None), subtree_jobs, chunksize=1
+        ):
+            if not options.verbose and not options.quiet:
+                base_progress_bar.log_progress(nb_tiles)
+
+    else:
+        subtree_tz = conf.tmaxz
+
+        if not options.verbose and not options.quiet:
+            base_progress_bar = ProgressBar(len(tile_details))
+            base_progress_bar.start()
+
+        # TODO: gbataille - check the confs for which each element is an array... one useless level?
+        # TODO: gbataille - assign an ID to each job for print in verbose mode "ReadRaster Extent ..."
+        chunksize = max(1, min(128, len(tile_details) // nb_processes))
+        for archived_tile in pool.imap_unordered(
+            partial(create_base_tile, conf, None), tile_details, chunksize=chunksize
+        ):
+            if archive_writer and archived_tile:
+                archive_writer.add([archived_tile])
+
+            if not options.verbose and not options.quiet:
+                base_progress_bar.log_progress()
+
+    if archive_writer:
+        archive_writer.flush()
 
     if not options.quiet:
-        count = count_overview_tiles(conf)
+        count = count_overview_tiles(conf, subtree_tz)
         if count:
             logger.info("Generating Overview Tiles:")
 
@@ -4578,10 +5447,10 @@ def multi_threaded_tiling(
                 overview_progress_bar = ProgressBar(count)
                 overview_progress_bar.start()
 
-    for base_tz in range(conf.tmaxz, conf.tminz, -1):
+    for base_tz in range(subtree_tz, conf.tminz, -1):
         base_tile_groups = group_overview_base_tiles(base_tz, output_folder, conf)
         chunksize = max(1, min(128, len(base_tile_groups) // nb_processes))
-        for _ in pool.imap_unordered(
+        for archived_tile in pool.imap_unordered(
             partial(
                 create_overview_tile,
                 base_tz,
@@ -4593,8 +5462,15 @@ def multi_threaded_tiling(
             base_tile_groups,
             chunksize=chunksize,
         ):
+            if archive_writer and archived_tile:
+                archive_writer.add([archived_tile])
             if not options.verbose and not options.quiet:
                 overview_progress_bar.log_progress()
+        if archive_writer:
+            archive_writer.flush()
+
+    if archive_writer:
+        archive_writer.close()
 
     shutil.rmtree(os.path.dirname(conf.src_file))
 
@@ -49,6 +49,7 @@ def gdal2xyz(
     return_np_arrays: bool = False,
     pre_allocate_np_arrays: bool = True,
     progress_callback: OptionalProgressCallback = ...,
+    window_pixels: int = 1 << 20,
 ) -> Optional[Tuple]:
     """
     translates a raster file (or dataset) into xyz format
@@ -69,7 +70,10 @@ def gdal2xyz(
     return_np_arrays - return numpy arrays of the result, otherwise returns None
     pre_allocate_np_arrays - pre-allocated result arrays.
         Should be faster unless skip_nodata and the input is very sparse thus most data points will be skipped.
+        Otherwise, the results of each window are concatenated at the end.
     progress_callback - progress callback function. use None for quiet or Ellipsis for using the default callback
+    window_pixels - approximate number of source pixels read, processed and written at once,
+        by windows of whole rows.
     """
 
     result = None
@@ -120,6 +124,9 @@ def gdal2xyz(
         else:
             frmt = "%.3f" + delim + "%.3f" + delim + "%s"
 
+        # Format of a whole line: coordinates followed by band values
+        line_format = frmt[: -len("%s")] + band_format
+
     if isinstance(src_nodata, Number):
         src_nodata = [src_nodata] * band_count
     elif src_nodata is None:
@@ -146,76 +153,103 @@ def gdal2xyz(
         x_skip = y_skip = skip
 
     x_off, y_off, x_size, y_size = srcwin
-    bands_count = len(bands)
 
-    nXBlocks = (x_size - x_off) // x_skip
-    nYBlocks = (y_size - y_off) // y_skip
-    progress_end = nXBlocks * nYBlocks
+    # Columns and rows of the emitted pixels
+    x_indices = np.arange(0, x_size, x_skip)
+    y_indices = np.arange(y_off, y_off + y_size, y_skip)
+    progress_end = len(x_indices) * len(y_indices)
     progress_curr = 0
-    progress_prev = -1
-    progress_parts = 100
+
+    if len(x_indices) == 0:
+        y_indices = y_indices[:0]
+
+    # Emitted rows are read and processed by windows of about
+    # window_pixels source pixels.
+    rows_per_window = max(1, window_pixels // max(1, x_size))
 
     if return_np_arrays:
-        size = progress_end if pre_allocate_np_arrays else 0
-        all_geo_x = np.empty(size)
-        all_geo_y = np.empty(size)
-        all_data = np.empty((size, band_count), dtype=np_dt)
+        if pre_allocate_np_arrays:
+            all_geo_x = np.empty(progress_end)
+            all_geo_y = np.empty(progress_end)
+            all_data = np.empty((progress_end, band_count), dtype=np_dt)
+        else:
+            # Results of each window, concatenated at the end
+            geo_x_list = []
+            geo_y_list = []
+            data_list = []
 
     # Loop emitting data.
     idx = 0
-    for y in range(y_off, y_off + y_size, y_skip):
+    for window_start in range(0, len(y_indices), rows_per_window):
+        window_y = y_indices[window_start : window_start + rows_per_window]
 
-        size = bands_count if pre_allocate_np_arrays else 0
-        data = np.empty((size, x_size), dtype=np_dt)  # dims: (bands_count, x_size)
+        # dims: (bands, rows, columns) of the emitted pixels of the window
+        data = np.empty((band_count, len(window_y), len(x_indices)), dtype=np_dt)
         for i_bnd, band in enumerate(bands):
-            band_data = band.ReadAsArray(x_off, y, x_size, 1)  # read one band line
+            if y_skip == 1:
+                band_data = band.ReadAsArray(
+                    x_off, int(window_y[0]), x_size, len(window_y)
+                )
+                data[i_bnd] = band_data[:, ::x_skip]
+            else:
+                # Only read the emitted rows
+                for i_row, y in enumerate(window_y.tolist()):
+                    band_data = band.ReadAsArray(x_off, y, x_size, 1)
+                    data[i_bnd, i_row] = band_data[0, ::x_skip]
+        data = data.reshape(band_count, -1)  # dims: (bands, pixels)
+
+        # Coordinates of the pixel centers, broadcast over the window
+        x = (x_indices + x_off)[np.newaxis, :]
+        y = window_y[:, np.newaxis]
+        geo_x = (gt[0] + (x + 0.5) * gt[1] + (y + 0.5) * gt[2]).ravel()
+        geo_y = (gt[3] + (x + 0.5) * gt[4] + (y + 0.5) * gt[5]).ravel()
+
+        if process_nodata:
+            # Pixels where all the bands are nodata
+            is_nodata = np.all(data == src_nodata[:, np.newaxis], axis=0)
+            if skip_nodata:
+                is_valid = ~is_nodata
+                data = data[:, is_valid]
+                geo_x = geo_x[is_valid]
+                geo_y = geo_y[is_valid]
+            elif replace_nodata:
+                data[:, is_nodata] = dst_nodata[:, np.newaxis]
+
+        if dst_fh:
+            lines = "".join(
+                line_format % (pixel_x, pixel_y, *pixel_data)
+                for pixel_x, pixel_y, pixel_data in zip(
+                    geo_x.tolist(), geo_y.tolist(), data.T.tolist()
+                )
+            ).encode("UTF-8")
+            if lines and gdal.VSIFWriteL(lines, len(lines), 1, dst_fh) != 1:
+                gdal.VSIFCloseL(dst_fh)
+                raise IOError("Cannot write into destination file")
+        if return_np_arrays:
+            count = len(geo_x)
             if pre_allocate_np_arrays:
-                data[i_bnd] = band_data[0]
+                all_geo_x[idx : idx + count] = geo_x
+                all_geo_y[idx : idx + count] = geo_y
+                all_data[idx : idx + count] = data.T
             else:
-                data = np.append(data, band_data, axis=0)
-
-        for x_i in range(0, x_size, x_skip):
-
-            progress_curr += 1
-            if progress_callback:
-                progress_frac = progress_curr / progress_end
-                progress = int(progress_frac * progress_parts)
-                if progress > progress_prev:
-                    progress_prev = progress
-                    progress_callback(progress_frac)
-
-            x_i_data = data[:, x_i]  # single pixel, dims: (bands)
-            if process_nodata and np.array_equal(src_nodata, x_i_data):
-                if skip_nodata:
-                    continue
-                elif replace_nodata:
-                    x_i_data = dst_nodata
-
-            x = x_i + x_off
-
-            geo_x = gt[0] + (x + 0.5) * gt[1] + (y + 0.5) * gt[2]
-            geo_y = gt[3] + (x + 0.5) * gt[4] + (y + 0.5) * gt[5]
-
-            if dst_fh:
-                band_str = band_format % tuple(x_i_data)
-                line = (frmt % (float(geo_x), float(geo_y), band_str)).encode("UTF-8")
-                if gdal.VSIFWriteL(line, len(line), 1, dst_fh) != 1:
-                    gdal.VSIFCloseL(dst_fh)
-                    raise IOError("Cannot write into destination file")
-            if return_np_arrays:
-                if pre_allocate_np_arrays:
-                    all_geo_x[idx] = geo_x
-                    all_geo_y[idx] = geo_y
-                    all_data[idx] = x_i_data
-                else:
-                    all_geo_x = np.append(all_geo_x, geo_x)
-                    all_geo_y = np.append(all_geo_y, geo_y)
-                    all_data = np.append(all_data, [x_i_data], axis=0)
-            idx += 1
+                geo_x_list.append(geo_x)
+                geo_y_list.append(geo_y)
+                data_list.append(data.T)
+        idx += len(geo_x)
+
+        progress_curr += len(window_y) * len(x_indices)
+        if progress_callback:
+            progress_callback(progress_curr / progress_end)
 
     if return_np_arrays:
         nodata = None if skip_nodata else dst_nodata if replace_nodata else src_nodata
-        if idx != progress_curr:
+        if not pre_allocate_np_arrays:
+            all_geo_x = np.concatenate([np.empty(0)] + geo_x_list)
+            all_geo_y = np.concatenate([np.empty(0)] + geo_y_list)
+            all_data = np.concatenate(
+                [np.empty((0, band_count), dtype=np_dt)] + data_list
+            )
+        elif idx != progress_curr:
             all_geo_x = all_geo_x[:idx]
             all_geo_y = all_geo_y[:idx]
             all_data = all_data[:idx, :]
@@ -16,12 +16,16 @@
 # ******************************************************************************
 
 import argparse
+import collections
+import concurrent.futures
 import glob
+import math
 import os
 import os.path
 import string
 import sys
 import textwrap
+import threading
 from numbers import Number
 from typing import Dict, Optional, Sequence, Tuple, Union
 
@@ -94,6 +98,76 @@ sum all files with hidden noDataValue
 """
 
 
+class _ArrayPool:
+    """Thread-safe pool of numpy arrays, reused from one block to another"""
+
+    def __init__(self):
+        self._free_arrays = collections.defaultdict(list)
+        self._lock = threading.Lock()
+
+    def get(self, shape: Tuple[int, ...], dtype) -> numpy.ndarray:
+        key = (tuple(shape), numpy.dtype(dtype))
+        with self._lock:
+            if self._free_arrays[key]:
+                return self._free_arrays[key].pop()
+        return numpy.empty(shape, dtype=dtype)
+
+    def release(self, arrays: Sequence[numpy.ndarray]) -> None:
+        released = set()
+        with self._lock:
+            for array in arrays:
+                if id(array) not in released:
+                    released.add(id(array))
+                    self._free_arrays[(array.shape, array.dtype)].append(array)
+
+
+def _get_result_dtype(result_dtype, out_dtype, ndv) -> numpy.dtype:
+    """Return the type of the buffer in which nodata values are propagated:
+    the type of the output file if it holds both the result and the nodata
+    value exactly, or otherwise a type able to hold both of them"""
+
+    if out_dtype is not None and numpy.can_cast(result_dtype, out_dtype, "safe"):
+        with numpy.errstate(all="ignore"):
+            if numpy.array(ndv).astype(out_dtype) == ndv:
+                return numpy.dtype(out_dtype)
+    return numpy.result_type(result_dtype, numpy.asarray(ndv).dtype)
+
+
+def _lcm(values: Sequence[int]) -> int:
+    result = 1
+    for value in values:
+        result = result * value // math.gcd(result, value)
+    return result
+
+
+def get_window_size(
+    block_sizes: Sequence[Tuple[int, int]],
+    raster_size: Sequence[int],
+    bytes_per_pixel: int,
+    max_memory: float,
+) -> Tuple[int, int]:
+    """Return the (xsize, ysize) of the processing windows.
+
+    Windows are aligned on the block grids of all inputs, and span the whole
+    width of the raster, over as many rows of blocks as possible, as long as
+    bytes_per_pixel * xsize * ysize does not exceed max_memory. If a single
+    row of blocks does not fit, windows are narrowed to a multiple of the
+    block widths instead."""
+
+    raster_xsize, raster_ysize = raster_size
+    lcm_x = min(_lcm([block_size[0] for block_size in block_sizes]), raster_xsize)
+    lcm_y = min(_lcm([block_size[1] for block_size in block_sizes]), raster_ysize)
+    max_pixels = max(1, int(max_memory // bytes_per_pixel))
+
+    if raster_xsize * lcm_y <= max_pixels:
+        xsize = raster_xsize
+        ysize = (max_pixels // (raster_xsize * lcm_y)) * lcm_y
+    else:
+        ysize = lcm_y
+        xsize = max(1, max_pixels // (lcm_y * lcm_x)) * lcm_x
+    return min(xsize, raster_xsize), min(ysize, raster_ysize)
+
+
 @enable_gdal_exceptions
 def Calc(
     calc: MaybeSequence[str],
@@ -113,6 +187,8 @@ def Calc(
     debug: bool = False,
     quiet: bool = False,
     progress_callback: Optional = gdal.TermProgress_nocb,
+    threads: int = 0,
+    window_memory: Optional[float] = None,
     **input_files,
 ):
 
@@ -132,6 +208,15 @@ def Calc(
         calc = [calc]
     calc = [c.strip('"') for c in calc]
 
+    # compile the calculations once, rather than parsing them for each block
+    compiled_calc = []
+    for this_calc in calc:
+        try:
+            compiled_calc.append(compile(this_calc, "<calc>", "eval"))
+        except SyntaxError:
+            print(f"evaluation of calculation {this_calc} failed")
+            raise
+
     creation_options = creation_options or []
 
     # set up global namespace for eval with all functions of gdal_array, numpy
@@ -468,6 +553,24 @@ def Calc(
 
     # use the block size of the first layer to read efficiently
     myBlockSize = myFiles[0].GetRasterBand(myBands[0]).GetBlockSize()
+    if window_memory:
+        # or windows made of whole blocks of all inputs, as large as allowed
+        # by the memory budget
+        input_bands = [
+            myFiles[i].GetRasterBand(
+                1 if allBandsIndex is not None and allBandsIndex == i else myBands[i]
+            )
+            for i in range(len(myFiles))
+        ]
+        bytes_per_pixel = gdal.GetDataTypeSizeBytes(myOutType) + sum(
+            gdal.GetDataTypeSizeBytes(band.DataType) for band in input_bands
+        )
+        myBlockSize = get_window_size(
+            [band.GetBlockSize() for band in input_bands],
+            DimensionsCheck,
+            bytes_per_pixel,
+            window_memory * 1024 * 1024,
+        )
     # find total x and y blocks to be read
     nXBlocks = (int)((DimensionsCheck[0] + myBlockSize[0] - 1) / myBlockSize[0])
     nYBlocks = (int)((DimensionsCheck[1] + myBlockSize[1] - 1) / myBlockSize[1])
@@ -481,19 +584,12 @@ def Calc(
     ProgressEnd = nXBlocks * nYBlocks * allBandsCount
 
     ################################################################
-    # start looping through each band in allBandsCount
+    # find the files gathered under each alpha for each output band
     ################################################################
 
+    count_file_per_alpha_per_band = {}
+    largest_datatype_per_alpha_per_band = {}
     for bandNo in range(1, allBandsCount + 1):
-
-        ################################################################
-        # start looping through blocks of data
-        ################################################################
-
-        # store these numbers in variables that may change later
-        nXValid = myBlockSize[0]
-        nYValid = myBlockSize[1]
-
         count_file_per_alpha = {}
         largest_datatype_per_alpha = {}
         for i, Alpha in enumerate(myAlphaList):
@@ -513,139 +609,239 @@ def Calc(
                         largest_datatype_per_alpha[Alpha] = gdal.DataTypeUnion(
                             largest_datatype_per_alpha[Alpha], band.DataType
                         )
+        count_file_per_alpha_per_band[bandNo] = count_file_per_alpha
+        largest_datatype_per_alpha_per_band[bandNo] = largest_datatype_per_alpha
 
-        # loop through X-lines
-        for X in range(0, nXBlocks):
+    def iter_blocks():
+        """Yield the (bandNo, myX, myY, nXValid, nYValid) blocks to process"""
 
-            # in case the blocks don't fit perfectly
-            # change the block size of the final piece
-            if X == nXBlocks - 1:
-                nXValid = DimensionsCheck[0] - X * myBlockSize[0]
+        for bandNo in range(1, allBandsCount + 1):
+            # loop through Y lines, so that blocks are traversed in
+            # row-major order, matching the layout of strip and tiled rasters
+            for Y in range(0, nYBlocks):
+                # find Y offset
+                myY = Y * myBlockSize[1]
+                # in case the blocks don't fit perfectly
+                # change the block size of the final piece
+                nYValid = min(myBlockSize[1], DimensionsCheck[1] - myY)
 
-            # find X offset
-            myX = X * myBlockSize[0]
+                # loop through X-lines
+                for X in range(0, nXBlocks):
+                    # find X offset
+                    myX = X * myBlockSize[0]
+                    # change the block size of the final piece
+                    nXValid = min(myBlockSize[0], DimensionsCheck[0] - myX)
 
-            # reset buffer size for start of Y loop
-            nYValid = myBlockSize[1]
-            myBufSize = nXValid * nYValid
+                    yield bandNo, myX, myY, nXValid, nYValid
 
-            # loop through Y lines
-            for Y in range(0, nYBlocks):
-                ProgressCt += 1
-                if not quiet:
-                    progress_callback(float(ProgressCt) / ProgressEnd, "", None)
+    # numpy type of the output file, used for the result buffers
+    myOutNumericType = gdal_array.GDALTypeCodeToNumericTypeCode(myOutType)
 
-                # change the block size of the final piece
-                if Y == nYBlocks - 1:
-                    nYValid = DimensionsCheck[1] - Y * myBlockSize[1]
-                    myBufSize = nXValid * nYValid
+    # buffers reused from one block to another
+    array_pool = _ArrayPool()
 
-                # find Y offset
-                myY = Y * myBlockSize[1]
+    def read_block(bandNo, myX, myY, nXValid, nYValid):
+        """Read the inputs of a block.
 
-                # create empty buffer to mark where nodata occurs
-                myNDVs = None
+        Returns the namespace of the calculation, the nodata mask, and the list
+        of buffers to give back to the pool once the block is written"""
 
-                # make local namespace for calculation
-                local_namespace = {}
+        count_file_per_alpha = count_file_per_alpha_per_band[bandNo]
+        largest_datatype_per_alpha = largest_datatype_per_alpha_per_band[bandNo]
+        buffers = []
 
-                # Create destination numpy arrays for each alpha
-                numpy_arrays = {}
-                counter_per_alpha = {}
-                for Alpha in count_file_per_alpha:
-                    dtype = gdal_array.GDALTypeCodeToNumericTypeCode(
-                        largest_datatype_per_alpha[Alpha]
-                    )
-                    if count_file_per_alpha[Alpha] == 1:
-                        numpy_arrays[Alpha] = numpy.empty(
-                            (nYValid, nXValid), dtype=dtype
-                        )
-                    else:
-                        numpy_arrays[Alpha] = numpy.empty(
-                            (count_file_per_alpha[Alpha], nYValid, nXValid), dtype=dtype
-                        )
-                    counter_per_alpha[Alpha] = 0
+        # boolean buffer marking where nodata occurs
+        myNDVs = None
 
-                # fetch data for each input layer
-                for i, Alpha in enumerate(myAlphaList):
+        # make local namespace for calculation
+        local_namespace = {}
 
-                    # populate lettered arrays with values
-                    if allBandsIndex is not None and allBandsIndex == i:
-                        myBandNo = bandNo
-                    else:
-                        myBandNo = myBands[i]
+        # Create destination numpy arrays for each alpha
+        numpy_arrays = {}
+        counter_per_alpha = {}
+        for Alpha in count_file_per_alpha:
+            dtype = gdal_array.GDALTypeCodeToNumericTypeCode(
+                largest_datatype_per_alpha[Alpha]
+            )
+            if count_file_per_alpha[Alpha] == 1:
+                numpy_arrays[Alpha] = array_pool.get((nYValid, nXValid), dtype)
+            else:
+                numpy_arrays[Alpha] = array_pool.get(
+                    (count_file_per_alpha[Alpha], nYValid, nXValid), dtype
+                )
+            buffers.append(numpy_arrays[Alpha])
+            counter_per_alpha[Alpha] = 0
 
-                    if Alpha in myAlphaFileLists:
-                        if count_file_per_alpha[Alpha] == 1:
-                            buf_obj = numpy_arrays[Alpha]
-                        else:
-                            buf_obj = numpy_arrays[Alpha][counter_per_alpha[Alpha]]
-                        myval = gdal_array.BandReadAsArray(
-                            myFiles[i].GetRasterBand(myBandNo),
-                            xoff=myX,
-                            yoff=myY,
-                            win_xsize=nXValid,
-                            win_ysize=nYValid,
-                            buf_obj=buf_obj,
-                        )
-                        counter_per_alpha[Alpha] += 1
-                    else:
-                        myval = gdal_array.BandReadAsArray(
-                            myFiles[i].GetRasterBand(myBandNo),
-                            xoff=myX,
-                            yoff=myY,
-                            win_xsize=nXValid,
-                            win_ysize=nYValid,
-                        )
-                    if myval is None:
-                        raise Exception(
-                            f"Input block reading failed from filename {filename[i]}"
-                        )
+        # fetch data for each input layer
+        for i, Alpha in enumerate(myAlphaList):
 
-                    # fill in nodata values
-                    if myNDV[i] is not None:
-                        # myNDVs is a boolean buffer.
-                        # a cell equals to 1 if there is NDV in any of the corresponding cells in input raster bands.
-                        if myNDVs is None:
-                            # this is the first band that has NDV set. we initializes myNDVs to a zero buffer
-                            # as we didn't see any NDV value yet.
-                            myNDVs = numpy.zeros(myBufSize)
-                            myNDVs.shape = (nYValid, nXValid)
-                        myNDVs = 1 * numpy.logical_or(myNDVs == 1, myval == myNDV[i])
-
-                    # add an array of values for this block to the eval namespace
-                    if Alpha not in myAlphaFileLists:
-                        local_namespace[Alpha] = myval
-                    myval = None
-
-                for lst in myAlphaFileLists:
-                    local_namespace[lst] = numpy_arrays[lst]
-
-                # try the calculation on the array blocks
-                this_calc = calc[bandNo - 1 if len(calc) > 1 else 0]
-                try:
-                    myResult = eval(this_calc, global_namespace, local_namespace)
-                except Exception:
-                    print(f"evaluation of calculation {this_calc} failed")
-                    raise
-
-                # Propagate nodata values (set nodata cells to zero
-                # then add nodata value to these cells).
-                if myNDVs is not None and myOutNDV is not None:
-                    myResult = ((1 * (myNDVs == 0)) * myResult) + (myOutNDV * myNDVs)
-                elif not isinstance(myResult, numpy.ndarray):
-                    myResult = numpy.ones((nYValid, nXValid)) * myResult
-
-                # Convert float16 to float32 if necessary
-                # (While numpy probably supports float16, GDAL may not)
-                if myResult.dtype == "float16":
-                    myResult = numpy.float32(myResult)
-
-                # write data block to the output file
-                myOutB = myOut.GetRasterBand(bandNo)
-                if gdal_array.BandWriteArray(myOutB, myResult, xoff=myX, yoff=myY) != 0:
-                    raise Exception("Block writing failed")
-                myOutB = None  # write to band
+            # populate lettered arrays with values
+            if allBandsIndex is not None and allBandsIndex == i:
+                myBandNo = bandNo
+            else:
+                myBandNo = myBands[i]
+            myBand = myFiles[i].GetRasterBand(myBandNo)
+
+            if Alpha in myAlphaFileLists:
+                if count_file_per_alpha[Alpha] == 1:
+                    buf_obj = numpy_arrays[Alpha]
+                else:
+                    buf_obj = numpy_arrays[Alpha][counter_per_alpha[Alpha]]
+                counter_per_alpha[Alpha] += 1
+            else:
+                buf_obj = array_pool.get(
+                    (nYValid, nXValid),
+                    gdal_array.GDALTypeCodeToNumericTypeCode(myBand.DataType),
+                )
+                buffers.append(buf_obj)
+            myval = gdal_array.BandReadAsArray(
+                myBand,
+                xoff=myX,
+                yoff=myY,
+                win_xsize=nXValid,
+                win_ysize=nYValid,
+                buf_obj=buf_obj,
+            )
+            if myval is None:
+                raise Exception(
+                    f"Input block reading failed from filename {filename[i]}"
+                )
+
+            # fill in nodata values
+            if myNDV[i] is not None:
+                # myNDVs is a boolean buffer.
+                # a cell is True if there is NDV in any of the corresponding cells in input raster bands.
+                if myNDVs is None:
+                    # this is the first band that has NDV set
+                    myNDVs = array_pool.get((nYValid, nXValid), numpy.bool_)
+                    buffers.append(myNDVs)
+                    numpy.equal(myval, myNDV[i], out=myNDVs)
+                else:
+                    is_ndv = array_pool.get((nYValid, nXValid), numpy.bool_)
+                    numpy.equal(myval, myNDV[i], out=is_ndv)
+                    numpy.logical_or(myNDVs, is_ndv, out=myNDVs)
+                    array_pool.release([is_ndv])
+
+            # add an array of values for this block to the eval namespace
+            if Alpha not in myAlphaFileLists:
+                local_namespace[Alpha] = myval
+            myval = None
+
+        for lst in myAlphaFileLists:
+            local_namespace[lst] = numpy_arrays[lst]
+
+        return local_namespace, myNDVs, buffers
+
+    def calc_block(bandNo, nXValid, nYValid, local_namespace, myNDVs, buffers):
+        """Evaluate the calculation on a block.
+
+        Returns its result, and the list of buffers to give back to the pool
+        once the block is written"""
+
+        # try the calculation on the array blocks
+        calc_index = bandNo - 1 if len(calc) > 1 else 0
+        try:
+            myResult = eval(
+                compiled_calc[calc_index], global_namespace, local_namespace
+            )
+        except Exception:
+            print(f"evaluation of calculation {calc[calc_index]} failed")
+            raise
+
+        # Propagate nodata values into a buffer of the output type, when it
+        # can hold the result exactly.
+        if myNDVs is not None and myOutNDV is not None:
+            result_dtype = _get_result_dtype(
+                numpy.result_type(myResult), myOutNumericType, myOutNDV
+            )
+            result_buffer = array_pool.get((nYValid, nXValid), result_dtype)
+            buffers.append(result_buffer)
+            numpy.copyto(result_buffer, myResult, casting="unsafe")
+            numpy.putmask(result_buffer, myNDVs, myOutNDV)
+            myResult = result_buffer
+        elif not isinstance(myResult, numpy.ndarray):
+            myResult = numpy.ones((nYValid, nXValid)) * myResult
+
+        # Convert float16 to float32 if necessary
+        # (While numpy probably supports float16, GDAL may not)
+        if myResult.dtype == "float16":
+            myResult = numpy.float32(myResult)
+
+        return myResult, buffers
+
+    def read_and_calc_block(bandNo, myX, myY, nXValid, nYValid):
+        return calc_block(
+            bandNo, nXValid, nYValid, *read_block(bandNo, myX, myY, nXValid, nYValid)
+        )
+
+    def write_block(bandNo, myX, myY, result_and_buffers):
+        myResult, buffers = result_and_buffers
+        # write data block to the output file
+        myOutB = myOut.GetRasterBand(bandNo)
+        if gdal_array.BandWriteArray(myOutB, myResult, xoff=myX, yoff=myY) != 0:
+            raise Exception("Block writing failed")
+        myOutB = None  # write to band
+        array_pool.release(buffers)
+
+    ################################################################
+    # start looping through blocks of data
+    ################################################################
+
+    if threads > 1:
+        # Blocks are read in order by a single thread, as GDAL datasets
+        # must not be used concurrently, while calculations, during which
+        # numpy releases the GIL, are evaluated by a pool of threads.
+        # Results are written in order by this thread, and at most
+        # 2 * threads blocks are in flight to bound memory usage.
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=1
+        ) as reader, concurrent.futures.ThreadPoolExecutor(
+            max_workers=threads
+        ) as evaluator:
+
+            def submit(block):
+                read_future = reader.submit(read_block, *block)
+                bandNo, _, _, nXValid, nYValid = block
+                return evaluator.submit(
+                    lambda: calc_block(
+                        bandNo, nXValid, nYValid, *read_future.result()
+                    )
+                )
+
+            pending_blocks = collections.deque()
+            blocks = iter_blocks()
+            try:
+                for block in blocks:
+                    pending_blocks.append((block, submit(block)))
+                    if len(pending_blocks) < 2 * threads:
+                        continue
+                    block, calc_future = pending_blocks.popleft()
+                    ProgressCt += 1
+                    if not quiet:
+                        progress_callback(float(ProgressCt) / ProgressEnd, "", None)
+                    write_block(block[0], block[1], block[2], calc_future.result())
+
+                while pending_blocks:
+                    block, calc_future = pending_blocks.popleft()
+                    ProgressCt += 1
+                    if not quiet:
+                        progress_callback(float(ProgressCt) / ProgressEnd, "", None)
+                    write_block(block[0], block[1], block[2], calc_future.result())
+            finally:
+                for _, calc_future in pending_blocks:
+                    calc_future.cancel()
+    else:
+        for bandNo, myX, myY, nXValid, nYValid in iter_blocks():
+            ProgressCt += 1
+            if not quiet:
+                progress_callback(float(ProgressCt) / ProgressEnd, "", None)
+
+            write_block(
+                bandNo,
+                myX,
+                myY,
+                read_and_calc_block(bandNo, myX, myY, nXValid, nYValid),
+            )
 
     # remove temp files
     for idx, tempFile in enumerate(myTempFileNames):
@@ -852,6 +1048,26 @@ class GDALCalc(GDALScript):
             "--color-table", type=str, dest="color_table", help="color table file name"
         )
 
+        parser.add_argument(
+            "--threads",
+            dest="threads",
+            type=int,
+            default=0,
+            metavar="n",
+            help="number of threads evaluating the calculation, while blocks are "
+            "read ahead and written in order by other threads (default: no threading)",
+        )
+        parser.add_argument(
+            "--window-memory",
+            dest="window_memory",
+            type=float,
+            metavar="MB",
+            help="process windows made of several blocks, aligned on the block "
+            "grids of all inputs, whose input and output arrays take at most this "
+            "amount of memory in megabytes (default: process one block of the first "
+            "input at a time)",
+        )
+
         group = parser.add_mutually_exclusive_group()
         group.add_argument(
             "--extent",
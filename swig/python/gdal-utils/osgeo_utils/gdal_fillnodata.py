@@ -13,22 +13,20 @@
 # SPDX-License-Identifier: MIT
 # ******************************************************************************
 
+import math
 import sys
 import textwrap
 from numbers import Real
-from typing import Optional
+from typing import Optional, Union
 
 from osgeo import gdal
+from osgeo_utils.auxiliary import tiling
 from osgeo_utils.auxiliary.gdal_argparse import GDALArgumentParser, GDALScript
-from osgeo_utils.auxiliary.util import enable_gdal_exceptions
+from osgeo_utils.auxiliary.util import enable_gdal_exceptions, get_num_threads
 
 
 def CopyBand(srcband, dstband):
-    for line in range(srcband.YSize):
-        line_data = srcband.ReadRaster(0, line, srcband.XSize, 1)
-        dstband.WriteRaster(
-            0, line, srcband.XSize, 1, line_data, buf_type=srcband.DataType
-        )
+    tiling.copy_band(srcband, dstband)
 
 
 @enable_gdal_exceptions
@@ -44,6 +42,8 @@ def gdal_fillnodata(
     smoothing_iterations: int = 0,
     interpolation: Optional[str] = None,
     options: Optional[list] = None,
+    threads: Optional[Union[int, str]] = None,
+    tile_size: Optional[int] = None,
 ):
     options = options or []
     creation_options = creation_options or []
@@ -111,8 +111,6 @@ def gdal_fillnodata(
             color_table = srcband.GetColorTable()
             dstband.SetColorTable(color_table)
 
-        CopyBand(srcband, dstband)
-
     else:
         dstband = srcband
 
@@ -125,6 +123,74 @@ def gdal_fillnodata(
     else:
         prog_func = gdal.TermProgress_nocb
 
+    threads = get_num_threads(threads)
+    if threads is not None or tile_size is not None:
+        # Filled values only depend on the valid pixels at most max_distance
+        # pixels away, and each smoothing iteration on the adjacent pixels.
+        halo = int(math.ceil(max_distance)) + smoothing_iterations
+        tile_xsize, tile_ysize = tiling.get_tile_size(
+            dstband.GetBlockSize(), tile_size
+        )
+        if dst_filename is None:
+            if not quiet:
+                print(
+                    "Tiled mode is not available when updating the source file "
+                    "in place. Processing the whole band at once."
+                )
+        elif max_distance <= 0:
+            if not quiet:
+                print(
+                    "Tiled mode is not available with an unbounded search "
+                    "distance. Processing the whole band at once."
+                )
+        elif halo > min(tile_xsize, tile_ysize):
+            if not quiet:
+                print(
+                    "Tiles are too small for -md %g and -si %d. "
+                    "Processing the whole band at once."
+                    % (max_distance, smoothing_iterations)
+                )
+        elif dstband.XSize > tile_xsize or dstband.YSize > tile_ysize:
+
+            def open_bands():
+                ds = gdal.Open(src_filename)
+                band = ds.GetRasterBand(band_number)
+                # Keep the dataset alive as long as the band
+                band._hard_ref_to_parent = ds
+                if mask == "default":
+                    # The mask band of tiles is derived from the nodata value
+                    return band, None
+                mask_ds = gdal.Open(mask)
+                mask_band = mask_ds.GetRasterBand(1)
+                mask_band._hard_ref_to_parent = mask_ds
+                return band, mask_band
+
+            def fill_tile(band, maskband):
+                gdal.FillNodata(
+                    band,
+                    maskband if maskband is not None else band.GetMaskBand(),
+                    max_distance,
+                    smoothing_iterations,
+                    options,
+                )
+
+            tiling.run_tiled(
+                open_bands,
+                dstband,
+                halo,
+                fill_tile,
+                threads=threads if threads is not None else 1,
+                tile_size=tile_size,
+                callback=prog_func,
+            )
+
+            src_ds = None
+            dst_ds = None
+            return 0
+
+    if dst_filename is not None:
+        CopyBand(srcband, dstband)
+
     if mask == "default":
         maskband = dstband.GetMaskBand()
     else:
@@ -191,6 +257,24 @@ class GDALFillNoData(GDALScript):
             "to dampen artifacts. The default is zero smoothing iterations.",
         )
 
+        parser.add_argument(
+            "-threads",
+            dest="threads",
+            type=str,
+            metavar="<num_threads>|ALL_CPUS",
+            help="Process tiles of the raster on this number of threads.",
+        )
+
+        parser.add_argument(
+            "-tile_size",
+            dest="tile_size",
+            type=int,
+            metavar="pixels",
+            help="Process tiles of the raster of this size, rounded up to "
+            "a multiple of the block size of the output file (default: %d)."
+            % tiling.DEFAULT_TILE_SIZE,
+        )
+
         parser.add_argument(
             "-o",
             dest="options",
@@ -29,17 +29,28 @@
 # building the stack.
 # anssi.pekkarinen@fao.org
 
+import bisect
+import collections
+import concurrent.futures
 import math
 import sys
+import threading
 import time
 
 from osgeo import gdal
-from osgeo_utils.auxiliary.util import GetOutputDriverFor
+from osgeo_utils.auxiliary.util import GetOutputDriverFor, get_num_threads
 
 progress = gdal.TermProgress_nocb
 
 __version__ = "$id$"[5:-1]
 
+# Default amount of memory, in bytes, used by the chunks of a copy
+DEFAULT_MAX_CHUNK_MEMORY = 64 * 1024 * 1024
+
+# Maximum number of source files kept open by each thread when compositing
+# tiles
+MAX_OPEN_DATASETS_PER_THREAD = 64
+
 
 # =============================================================================
 def raster_copy(
@@ -57,6 +68,8 @@ def raster_copy(
     t_band_n,
     nodata=None,
     verbose=0,
+    max_memory=None,
+    buffers=None,
 ):
 
     if verbose != 0:
@@ -80,16 +93,12 @@ def raster_copy(
             t_ysize,
             t_band_n,
             nodata,
+            max_memory,
+            buffers,
         )
 
     s_band = s_fh.GetRasterBand(s_band_n)
-    m_band = None
-    # Works only in binary mode and doesn't take into account
-    # intermediate transparency values for compositing.
-    if s_band.GetMaskFlags() != gdal.GMF_ALL_VALID:
-        m_band = s_band.GetMaskBand()
-    elif s_band.GetColorInterpretation() == gdal.GCI_AlphaBand:
-        m_band = s_band
+    m_band = get_mask_band(s_band)
     if m_band is not None:
         return raster_copy_with_mask(
             s_fh,
@@ -105,19 +114,261 @@ def raster_copy(
             t_ysize,
             t_band_n,
             m_band,
+            max_memory,
+            buffers,
         )
 
     s_band = s_fh.GetRasterBand(s_band_n)
     t_band = t_fh.GetRasterBand(t_band_n)
 
-    data = s_band.ReadRaster(
-        s_xoff, s_yoff, s_xsize, s_ysize, t_xsize, t_ysize, t_band.DataType
+    if buffers is None:
+        buffers = ChunkBuffers()
+    data_type_size = gdal.GetDataTypeSizeBytes(t_band.DataType)
+
+    for (t_x, t_y, t_w, t_h), s_window, indices in iter_chunks(
+        s_xoff,
+        s_yoff,
+        s_xsize,
+        s_ysize,
+        t_band,
+        t_xoff,
+        t_yoff,
+        t_xsize,
+        t_ysize,
+        data_type_size,
+        max_memory,
+    ):
+        if indices[0] is None and indices[1] is None:
+            data = s_band.ReadRaster(
+                *s_window,
+                t_w,
+                t_h,
+                t_band.DataType,
+                buf_obj=buffers.get_bytes(t_w * t_h * data_type_size),
+            )
+            t_band.WriteRaster(t_x, t_y, t_w, t_h, data, t_w, t_h, t_band.DataType)
+        else:
+            data = read_chunk(
+                s_band,
+                s_window,
+                indices,
+                buffers.get_array("src", (t_h, t_w), get_numeric_type(t_band.DataType)),
+                buffers,
+            )
+            t_band.WriteArray(data, t_x, t_y)
+
+    return 0
+
+
+# =============================================================================
+
+
+def get_mask_band(s_band):
+    """Return the band whose zero values mark the pixels of s_band that must
+    not be copied, or None if all its pixels are valid."""
+    # Works only in binary mode and doesn't take into account
+    # intermediate transparency values for compositing.
+    if s_band.GetMaskFlags() != gdal.GMF_ALL_VALID:
+        return s_band.GetMaskBand()
+    if s_band.GetColorInterpretation() == gdal.GCI_AlphaBand:
+        return s_band
+    return None
+
+
+# =============================================================================
+
+
+class ChunkBuffers:
+    """Buffers reused from one chunk to another, and from one file to another,
+    so that the memory used by a copy does not depend on the size of the
+    files."""
+
+    def __init__(self):
+        self.arrays = {}
+        self.data = None
+
+    def get_array(self, name, shape, dtype):
+        """Return a C-contiguous array of the given shape and type, that is
+        valid until the next call with the same name and type."""
+        import numpy as np
+
+        dtype = np.dtype(dtype)
+        size = shape[0] * shape[1]
+        array = self.arrays.get((name, dtype))
+        if array is None or array.size < size:
+            array = np.empty(size, dtype=dtype)
+            self.arrays[(name, dtype)] = array
+        return array[:size].reshape(shape)
+
+    def get_bytes(self, size):
+        """Return a writable buffer of the given size, that is valid until
+        the next call."""
+        if self.data is None or len(self.data) < size:
+            self.data = bytearray(size)
+        return memoryview(self.data)[:size]
+
+
+def get_chunk_edges(offset, size, chunk_size):
+    """
+    Split [offset, offset + size[ in intervals of at most chunk_size,
+    whose edges are multiples of chunk_size.
+
+    Returns a list of (offset, size) tuples.
+    """
+    if chunk_size >= size:
+        return [(offset, size)]
+
+    edges = [offset]
+    edge = (offset // chunk_size + 1) * chunk_size
+    while edge < offset + size:
+        edges.append(edge)
+        edge += chunk_size
+    edges.append(offset + size)
+    return [(start, end - start) for start, end in zip(edges[:-1], edges[1:])]
+
+
+def iter_chunks(
+    s_xoff,
+    s_yoff,
+    s_xsize,
+    s_ysize,
+    t_band,
+    t_xoff,
+    t_yoff,
+    t_xsize,
+    t_ysize,
+    bytes_per_pixel,
+    max_memory=None,
+):
+    """
+    Split a copy in chunks aligned on the blocks of the target band, using
+    at most max_memory bytes when each pixel takes bytes_per_pixel bytes.
+
+    Yields ((t_xoff, t_yoff, t_xsize, t_ysize),
+            (s_xoff, s_yoff, s_xsize, s_ysize),
+            (x_indices, y_indices)) tuples, where the indices are those
+    returned by get_source_window() along each axis.
+
+    When downsampling, the whole window is yielded as a single chunk with
+    None indices, to be read with a RasterIO() resampling it to the target
+    size, so that GDAL selects the overviews of the source.
+    """
+    if is_downsampling(s_xsize, s_ysize, t_xsize, t_ysize):
+        yield (
+            (t_xoff, t_yoff, t_xsize, t_ysize),
+            (s_xoff, s_yoff, s_xsize, s_ysize),
+            (None, None),
+        )
+        return
+
+    chunk_xsize, chunk_ysize = get_chunk_size(
+        t_band.GetBlockSize(), t_xsize, bytes_per_pixel, max_memory
     )
-    t_band.WriteRaster(
-        t_xoff, t_yoff, t_xsize, t_ysize, data, t_xsize, t_ysize, t_band.DataType
+
+    for t_y, t_h in get_chunk_edges(t_yoff, t_ysize, chunk_ysize):
+        s_y, s_h, y_indices = get_source_window(
+            s_yoff, s_ysize, t_yoff, t_ysize, t_y, t_h
+        )
+        for t_x, t_w in get_chunk_edges(t_xoff, t_xsize, chunk_xsize):
+            s_x, s_w, x_indices = get_source_window(
+                s_xoff, s_xsize, t_xoff, t_xsize, t_x, t_w
+            )
+            yield (t_x, t_y, t_w, t_h), (s_x, s_y, s_w, s_h), (x_indices, y_indices)
+
+
+def get_chunk_size(block_size, xsize, bytes_per_pixel, max_memory=None):
+    """
+    Return the size of chunks made of whole blocks of block_size, no wider
+    than xsize, and using at most max_memory bytes when each pixel takes
+    bytes_per_pixel bytes.
+    """
+    if max_memory is None:
+        max_memory = DEFAULT_MAX_CHUNK_MEMORY
+
+    block_xsize, block_ysize = block_size
+    max_pixels = max(1, int(max_memory // bytes_per_pixel))
+
+    if xsize * block_ysize <= max_pixels:
+        # Whole rows of blocks
+        return xsize, max(1, max_pixels // (xsize * block_ysize)) * block_ysize
+
+    # Part of a single row of blocks
+    return (
+        max(1, max_pixels // (block_xsize * block_ysize)) * block_xsize,
+        block_ysize,
     )
 
-    return 0
+
+def is_downsampling(s_xsize, s_ysize, t_xsize, t_ysize):
+    """Return whether a source window is larger than its target window
+    along any axis."""
+    return s_xsize > t_xsize or s_ysize > t_ysize
+
+
+def get_source_window(s_off, s_size, t_off, t_size, t_chunk_off, t_chunk_size):
+    """
+    Return the offset and size, along one axis, of the part of the source
+    window [s_off, s_off + s_size[ that is copied into the part
+    [t_chunk_off, t_chunk_off + t_chunk_size[ of the target window
+    [t_off, t_off + t_size[, in whole source pixels.
+
+    This is meant for upsampling, as chunks are read at the native resolution
+    of the source. The third value is None if the source and target
+    resolutions are the same. Otherwise, it is a numpy array with, for each
+    target pixel, the index relative to the returned offset of the source
+    pixel copied into it, so that chunks are sampled exactly as the whole
+    window would be by the nearest neighbour RasterIO() of GDAL.
+    """
+    if s_size == t_size:
+        return s_off + t_chunk_off - t_off, t_chunk_size, None
+
+    import numpy as np
+
+    # Same computation, and epsilon, as GDALRasterBand::IRasterIO()
+    ratio = s_size / t_size
+    t_pixels = np.arange(t_chunk_off - t_off, t_chunk_off - t_off + t_chunk_size)
+    indices = ((t_pixels + 0.5) * ratio + s_off + 1e-10).astype(np.int64)
+    np.clip(indices, s_off, s_off + s_size - 1, out=indices)
+    start = int(indices[0])
+    indices -= start
+    return start, int(indices[-1]) + 1, indices
+
+
+def read_chunk(s_band, s_window, indices, out, buffers):
+    """
+    Read the s_window window of s_band into the out numpy array, sampled
+    with the (x_indices, y_indices) returned by get_source_window() if the
+    source and target resolutions differ, or resampled by GDAL to the size of
+    out if the indices are None.
+
+    Returns out.
+    """
+    x_indices, y_indices = indices
+    if x_indices is None and y_indices is None:
+        return s_band.ReadAsArray(*s_window, buf_obj=out)
+
+    import numpy as np
+
+    s_x, s_y, s_w, s_h = s_window
+    data = s_band.ReadAsArray(
+        s_x,
+        s_y,
+        s_w,
+        s_h,
+        buf_obj=buffers.get_array("native", (s_h, s_w), out.dtype),
+    )
+    if y_indices is not None:
+        data = np.take(
+            data,
+            y_indices,
+            axis=0,
+            out=buffers.get_array("rows", (out.shape[0], s_w), out.dtype),
+        )
+    if x_indices is not None:
+        np.take(data, x_indices, axis=1, out=out)
+    else:
+        np.copyto(out, data)
+    return out
 
 
 # =============================================================================
@@ -137,23 +388,51 @@ def raster_copy_with_nodata(
     t_ysize,
     t_band_n,
     nodata,
+    max_memory=None,
+    buffers=None,
 ):
     import numpy as np
 
     s_band = s_fh.GetRasterBand(s_band_n)
     t_band = t_fh.GetRasterBand(t_band_n)
 
-    data_src = s_band.ReadAsArray(s_xoff, s_yoff, s_xsize, s_ysize, t_xsize, t_ysize)
-    data_dst = t_band.ReadAsArray(t_xoff, t_yoff, t_xsize, t_ysize)
+    if buffers is None:
+        buffers = ChunkBuffers()
+    dst_type, src_type = get_copy_types(s_band, t_band)
+
+    for (t_x, t_y, t_w, t_h), s_window, indices in iter_chunks(
+        s_xoff,
+        s_yoff,
+        s_xsize,
+        s_ysize,
+        t_band,
+        t_xoff,
+        t_yoff,
+        t_xsize,
+        t_ysize,
+        src_type.itemsize + dst_type.itemsize + 1,
+        max_memory,
+    ):
+        data_src = read_chunk(
+            s_band,
+            s_window,
+            indices,
+            buffers.get_array("src", (t_h, t_w), src_type),
+            buffers,
+        )
+        data_dst = t_band.ReadAsArray(
+            t_x, t_y, t_w, t_h, buf_obj=buffers.get_array("dst", (t_h, t_w), dst_type)
+        )
 
-    if not np.isnan(nodata):
-        nodata_test = np.equal(data_src, nodata)
-    else:
-        nodata_test = np.isnan(data_src)
+        nodata_test = buffers.get_array("test", (t_h, t_w), np.bool_)
+        if not np.isnan(nodata):
+            np.equal(data_src, nodata, out=nodata_test)
+        else:
+            np.isnan(data_src, out=nodata_test)
 
-    to_write = np.choose(nodata_test, (data_src, data_dst))
+        np.copyto(data_src, data_dst, where=nodata_test)
 
-    t_band.WriteArray(to_write, t_xoff, t_yoff)
+        t_band.WriteArray(data_src, t_x, t_y)
 
     return 0
 
@@ -175,20 +454,55 @@ def raster_copy_with_mask(
     t_ysize,
     t_band_n,
     m_band,
+    max_memory=None,
+    buffers=None,
 ):
     import numpy as np
 
     s_band = s_fh.GetRasterBand(s_band_n)
     t_band = t_fh.GetRasterBand(t_band_n)
 
-    data_src = s_band.ReadAsArray(s_xoff, s_yoff, s_xsize, s_ysize, t_xsize, t_ysize)
-    data_mask = m_band.ReadAsArray(s_xoff, s_yoff, s_xsize, s_ysize, t_xsize, t_ysize)
-    data_dst = t_band.ReadAsArray(t_xoff, t_yoff, t_xsize, t_ysize)
+    if buffers is None:
+        buffers = ChunkBuffers()
+    dst_type, src_type = get_copy_types(s_band, t_band)
+    mask_type = get_numeric_type(m_band.DataType)
+
+    for (t_x, t_y, t_w, t_h), s_window, indices in iter_chunks(
+        s_xoff,
+        s_yoff,
+        s_xsize,
+        s_ysize,
+        t_band,
+        t_xoff,
+        t_yoff,
+        t_xsize,
+        t_ysize,
+        src_type.itemsize + dst_type.itemsize + mask_type.itemsize + 1,
+        max_memory,
+    ):
+        data_src = read_chunk(
+            s_band,
+            s_window,
+            indices,
+            buffers.get_array("src", (t_h, t_w), src_type),
+            buffers,
+        )
+        data_mask = read_chunk(
+            m_band,
+            s_window,
+            indices,
+            buffers.get_array("mask", (t_h, t_w), mask_type),
+            buffers,
+        )
+        data_dst = t_band.ReadAsArray(
+            t_x, t_y, t_w, t_h, buf_obj=buffers.get_array("dst", (t_h, t_w), dst_type)
+        )
 
-    mask_test = np.equal(data_mask, 0)
-    to_write = np.choose(mask_test, (data_src, data_dst))
+        mask_test = buffers.get_array("test", (t_h, t_w), np.bool_)
+        np.equal(data_mask, 0, out=mask_test)
+        np.copyto(data_src, data_dst, where=mask_test)
 
-    t_band.WriteArray(to_write, t_xoff, t_yoff)
+        t_band.WriteArray(data_src, t_x, t_y)
 
     return 0
 
@@ -196,6 +510,30 @@ def raster_copy_with_mask(
 # =============================================================================
 
 
+def get_numeric_type(data_type):
+    """Return the numpy type corresponding to a GDAL data type."""
+    import numpy as np
+    from osgeo import gdal_array
+
+    return np.dtype(gdal_array.GDALTypeCodeToNumericTypeCode(data_type))
+
+
+def get_copy_types(s_band, t_band):
+    """
+    Return the numpy types of the target band, and of the buffer into which
+    the source band is read: a type able to hold both source and target
+    values, so that masked pixels can be restored from the target.
+    """
+    import numpy as np
+
+    dst_type = get_numeric_type(t_band.DataType)
+    src_type = np.result_type(get_numeric_type(s_band.DataType), dst_type)
+    return dst_type, src_type
+
+
+# =============================================================================
+
+
 def names_to_fileinfos(names):
     """
     Translate a list of GDAL filenames, into file_info objects.
@@ -273,23 +611,15 @@ class file_info:
         print("Pixel Size: %f x %f" % (self.geotransform[1], self.geotransform[5]))
         print("UL:(%f,%f)   LR:(%f,%f)" % (self.ulx, self.uly, self.lrx, self.lry))
 
-    def copy_into(self, t_fh, s_band=1, t_band=1, nodata_arg=None, verbose=0):
+    def get_copy_windows(self, t_fh):
         """
-        Copy this files image into target file.
-
-        This method will compute the overlap area of the file_info objects
-        file, and the target gdal.Dataset object, and copy the image data
-        for the common window area.  It is assumed that the files are in
-        a compatible projection ... no checking or warping is done.  However,
-        if the destination file is a different resolution, or different
-        image pixel type, the appropriate resampling and conversions will
-        be done (using normal GDAL promotion/demotion rules).
+        Compute the overlap area of this file and of the target gdal.Dataset
+        object.
 
-        t_fh -- gdal.Dataset object for the file into which some or all
-        of this file may be copied.
-
-        Returns 1 on success (or if nothing needs to be copied), and zero one
-        failure.
+        Returns None if they do not overlap, or the
+        ((sw_xoff, sw_yoff, sw_xsize, sw_ysize),
+         (tw_xoff, tw_yoff, tw_xsize, tw_ysize)) source and target windows
+        in pixel coordinates.
         """
         t_geotransform = t_fh.GetGeoTransform()
         t_ulx = t_geotransform[0]
@@ -309,11 +639,11 @@ class file_info:
 
         # do they even intersect?
         if tgw_ulx >= tgw_lrx:
-            return 1
+            return None
         if t_geotransform[5] < 0 and tgw_uly <= tgw_lry:
-            return 1
+            return None
         if t_geotransform[5] > 0 and tgw_uly >= tgw_lry:
-            return 1
+            return None
 
         # compute target window in pixel coordinates.
         tw_xoff = int((tgw_ulx - t_geotransform[0]) / t_geotransform[1] + 0.1)
@@ -326,7 +656,7 @@ class file_info:
         )
 
         if tw_xsize < 1 or tw_ysize < 1:
-            return 1
+            return None
 
         # Compute source window in pixel coordinates.
         sw_xoff = int((tgw_ulx - self.geotransform[0]) / self.geotransform[1] + 0.1)
@@ -339,7 +669,52 @@ class file_info:
         )
 
         if sw_xsize < 1 or sw_ysize < 1:
+            return None
+
+        return (
+            (sw_xoff, sw_yoff, sw_xsize, sw_ysize),
+            (tw_xoff, tw_yoff, tw_xsize, tw_ysize),
+        )
+
+    def copy_into(
+        self,
+        t_fh,
+        s_band=1,
+        t_band=1,
+        nodata_arg=None,
+        verbose=0,
+        max_memory=None,
+        buffers=None,
+    ):
+        """
+        Copy this files image into target file.
+
+        This method will compute the overlap area of the file_info objects
+        file, and the target gdal.Dataset object, and copy the image data
+        for the common window area.  It is assumed that the files are in
+        a compatible projection ... no checking or warping is done.  However,
+        if the destination file is a different resolution, or different
+        image pixel type, the appropriate resampling and conversions will
+        be done (using normal GDAL promotion/demotion rules).
+
+        t_fh -- gdal.Dataset object for the file into which some or all
+        of this file may be copied.
+
+        max_memory -- maximum amount of memory, in bytes, used for the chunks
+        in which the copy is done (DEFAULT_MAX_CHUNK_MEMORY if None).
+
+        buffers -- optional ChunkBuffers object, to reuse buffers from one
+        copy to another.
+
+        Returns 1 on success (or if nothing needs to be copied), and zero one
+        failure.
+        """
+        windows = self.get_copy_windows(t_fh)
+        if windows is None:
             return 1
+        source_window, target_window = windows
+        sw_xoff, sw_yoff, sw_xsize, sw_ysize = source_window
+        tw_xoff, tw_yoff, tw_xsize, tw_ysize = target_window
 
         # Open the source file, and copy the selected region.
         s_fh = gdal.Open(self.filename)
@@ -359,9 +734,290 @@ class file_info:
             t_band,
             nodata_arg,
             verbose,
+            max_memory,
+            buffers,
         )
 
 
+# =============================================================================
+
+
+def copy_words(src, dst, where=True):
+    """
+    Copy the src numpy array into dst where where is True, converting values
+    as GDALCopyWords() does: rounded half away from zero and clamped to the
+    range of dst if it has an integer type.
+    """
+    import numpy as np
+
+    if src.dtype != dst.dtype and np.issubdtype(dst.dtype, np.integer):
+        if not np.issubdtype(src.dtype, np.integer):
+            src = np.nan_to_num(np.trunc(src + np.copysign(0.5, src)))
+        info = np.iinfo(dst.dtype)
+        src = np.clip(src, info.min, info.max)
+    np.copyto(dst, src, where=where, casting="unsafe")
+
+
+def composite_into(s_band, read, dst, nodata, buffers):
+    """
+    Copy a window of a source band over the dst numpy array, except for its
+    pixels that are nodata or masked, with the same rules as raster_copy().
+
+    read -- function called with a band, a numpy data type and a name,
+    returning the window of the band, with the shape of dst, in that type.
+    Arrays returned with different names must not share memory.
+    """
+    import numpy as np
+
+    shape = dst.shape
+    m_band = None
+    if nodata is None:
+        m_band = get_mask_band(s_band)
+        if m_band is None:
+            np.copyto(dst, read(s_band, dst.dtype, "values"))
+            return
+
+    valid = buffers.get_array("test", shape, np.bool_)
+    if nodata is not None:
+        # Test nodata on values of a type able to hold the source values,
+        # read once and converted to the type of dst
+        src_type = np.result_type(get_numeric_type(s_band.DataType), dst.dtype)
+        values = read(s_band, src_type, "values")
+        if not np.isnan(nodata):
+            np.not_equal(values, nodata, out=valid)
+        else:
+            np.isnan(values, out=valid)
+            np.logical_not(valid, out=valid)
+    else:
+        values = read(s_band, dst.dtype, "values")
+        data_mask = read(m_band, get_numeric_type(m_band.DataType), "mask")
+        np.not_equal(data_mask, 0, out=valid)
+
+    copy_words(values, dst, where=valid)
+
+
+def merge_tiles(
+    t_fh,
+    file_infos,
+    band_maps,
+    nodata=None,
+    threads=1,
+    max_memory=None,
+    callback=None,
+):
+    """
+    Copy file_infos into the target file, tile by tile.
+
+    The target file is partitioned into tiles aligned on its blocks, and the
+    footprints of the files are indexed over these tiles. Each tile is then
+    composited in memory on a pool of threads, from the files overlapping it
+    taken in input order, so that the result is the same as calling
+    copy_into() on each file in turn. Tiles are read and written once each,
+    and tiles that no file overlaps are left untouched.
+
+    t_fh -- gdal.Dataset object for the target file.
+
+    file_infos -- list of file_info objects.
+
+    band_maps -- for each file_info, list of (source band, target band)
+    tuples of the bands to copy.
+
+    threads -- number of threads compositing tiles.
+
+    max_memory -- maximum amount of memory, in bytes, of each tile
+    (DEFAULT_MAX_CHUNK_MEMORY if None). Files that are downsampled are
+    read over their whole target window, so that GDAL uses their overviews.
+
+    callback -- optional function called with the completion ratio after
+    each tile is written.
+    """
+    import numpy as np
+
+    t_bands = sorted({t_band for band_map in band_maps for _, t_band in band_map})
+    if not t_bands:
+        return
+    bytes_per_pixel = sum(
+        gdal.GetDataTypeSizeBytes(t_fh.GetRasterBand(t_band).DataType)
+        for t_band in t_bands
+    )
+    tile_xsize, tile_ysize = get_chunk_size(
+        t_fh.GetRasterBand(1).GetBlockSize(),
+        t_fh.RasterXSize,
+        bytes_per_pixel,
+        max_memory,
+    )
+    x_tiles = get_chunk_edges(0, t_fh.RasterXSize, tile_xsize)
+    y_tiles = get_chunk_edges(0, t_fh.RasterYSize, tile_ysize)
+    x_starts = [x for x, _ in x_tiles]
+    y_starts = [y for y, _ in y_tiles]
+
+    # Index the footprints of the files over the grid of tiles, in input order
+    windows = [fi.get_copy_windows(t_fh) for fi in file_infos]
+    tile_files = collections.defaultdict(list)
+    for i, file_windows in enumerate(windows):
+        if file_windows is None or not band_maps[i]:
+            continue
+        tw_xoff, tw_yoff, tw_xsize, tw_ysize = file_windows[1]
+        for row in range(
+            bisect.bisect_right(y_starts, tw_yoff) - 1,
+            bisect.bisect_left(y_starts, tw_yoff + tw_ysize),
+        ):
+            for col in range(
+                bisect.bisect_right(x_starts, tw_xoff) - 1,
+                bisect.bisect_left(x_starts, tw_xoff + tw_xsize),
+            ):
+                tile_files[(row, col)].append(i)
+
+    thread_local = threading.local()
+
+    def open_source(filename):
+        # Datasets cannot be shared between threads: each one keeps its own
+        # most recently used ones open.
+        if not hasattr(thread_local, "datasets"):
+            thread_local.datasets = collections.OrderedDict()
+            thread_local.buffers = ChunkBuffers()
+        datasets = thread_local.datasets
+        if filename in datasets:
+            datasets.move_to_end(filename)
+        else:
+            datasets[filename] = gdal.Open(filename)
+            if len(datasets) > MAX_OPEN_DATASETS_PER_THREAD:
+                datasets.popitem(last=False)
+        return datasets[filename]
+
+    # Downsampled files are resampled by GDAL over their whole target window,
+    # so that overviews are used, and kept until their last tile is done
+    resampled = {}
+    resampled_lock = threading.Lock()
+    tiles_left = collections.Counter(i for files in tile_files.values() for i in files)
+
+    def read_resampled(i, s_band_n, band, dtype, name):
+        with resampled_lock:
+            entry = resampled.setdefault((i, s_band_n, name), [threading.Lock()])
+        with entry[0]:
+            if len(entry) == 1:
+                source_window, target_window = windows[i]
+                shape = (target_window[3], target_window[2])
+                entry.append(
+                    band.ReadAsArray(
+                        *source_window, buf_obj=np.empty(shape, dtype=dtype)
+                    )
+                )
+            return entry[1]
+
+    def release_resampled(i):
+        with resampled_lock:
+            tiles_left[i] -= 1
+            if tiles_left[i] == 0:
+                for key in [key for key in resampled if key[0] == i]:
+                    del resampled[key]
+
+    def composite_tile(t_x, t_y, t_w, t_h, arrays, indices):
+        for i in indices:
+            source_window, target_window = windows[i]
+            sw_xoff, sw_yoff, sw_xsize, sw_ysize = source_window
+            tw_xoff, tw_yoff, tw_xsize, tw_ysize = target_window
+
+            # Part of the tile covered by the file
+            x0 = max(t_x, tw_xoff)
+            x1 = min(t_x + t_w, tw_xoff + tw_xsize)
+            y0 = max(t_y, tw_yoff)
+            y1 = min(t_y + t_h, tw_yoff + tw_ysize)
+            downsampling = is_downsampling(sw_xsize, sw_ysize, tw_xsize, tw_ysize)
+            if not downsampling:
+                s_x, s_w, x_indices = get_source_window(
+                    sw_xoff, sw_xsize, tw_xoff, tw_xsize, x0, x1 - x0
+                )
+                s_y, s_h, y_indices = get_source_window(
+                    sw_yoff, sw_ysize, tw_yoff, tw_ysize, y0, y1 - y0
+                )
+
+            s_fh = open_source(file_infos[i].filename)
+            buffers = thread_local.buffers
+            try:
+                for s_band_n, t_band_n in band_maps[i]:
+                    if downsampling:
+
+                        def read(band, dtype, name):
+                            return read_resampled(i, s_band_n, band, dtype, name)[
+                                y0 - tw_yoff : y1 - tw_yoff,
+                                x0 - tw_xoff : x1 - tw_xoff,
+                            ]
+
+                    else:
+
+                        def read(band, dtype, name):
+                            return read_chunk(
+                                band,
+                                (s_x, s_y, s_w, s_h),
+                                (x_indices, y_indices),
+                                buffers.get_array(name, (y1 - y0, x1 - x0), dtype),
+                                buffers,
+                            )
+
+                    composite_into(
+                        s_fh.GetRasterBand(s_band_n),
+                        read,
+                        arrays[t_band_n][y0 - t_y : y1 - t_y, x0 - t_x : x1 - t_x],
+                        nodata,
+                        buffers,
+                    )
+            finally:
+                release_resampled(i)
+
+    def write_tile(t_x, t_y, arrays):
+        for t_band_n, array in arrays.items():
+            t_fh.GetRasterBand(t_band_n).WriteArray(array, t_x, t_y)
+
+    tiles = sorted(tile_files)
+    if not tiles:
+        if callback is not None:
+            callback(1.0)
+        return
+
+    tiles_written = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        pending_tiles = collections.deque()
+
+        def write_pending_tile():
+            nonlocal tiles_written
+            t_x, t_y, arrays, future = pending_tiles.popleft()
+            future.result()
+            write_tile(t_x, t_y, arrays)
+            tiles_written += 1
+            if callback is not None:
+                callback(tiles_written / len(tiles))
+
+        try:
+            for row, col in tiles:
+                t_x, t_w = x_tiles[col]
+                t_y, t_h = y_tiles[row]
+                indices = tile_files[(row, col)]
+                # The target file is only read and written by this thread
+                arrays = {
+                    t_band_n: t_fh.GetRasterBand(t_band_n).ReadAsArray(
+                        t_x, t_y, t_w, t_h
+                    )
+                    for t_band_n in sorted(
+                        {t_band_n for i in indices for _, t_band_n in band_maps[i]}
+                    )
+                }
+                future = executor.submit(
+                    composite_tile, t_x, t_y, t_w, t_h, arrays, indices
+                )
+                pending_tiles.append((t_x, t_y, arrays, future))
+
+                # Bound the number of tiles in memory
+                while len(pending_tiles) >= 2 * threads:
+                    write_pending_tile()
+
+            while pending_tiles:
+                write_pending_tile()
+        finally:
+            for _, _, _, future in pending_tiles:
+                future.cancel()
+
+
 # =============================================================================
 def Usage(isError):
     f = sys.stderr if isError else sys.stdout
@@ -383,7 +1039,15 @@ def Usage(isError):
         file=f,
     )
     print(
-        "                     [-ot <datatype>] [-createonly] <input_file> [<input_file>]...",
+        "                     [-ot <datatype>] [-createonly] [-wm <memory_in_mb>]",
+        file=f,
+    )
+    print(
+        "                     [-threads <num_threads>|ALL_CPUS]",
+        file=f,
+    )
+    print(
+        "                     <input_file> [<input_file>]...",
         file=f,
     )
     print("                     [--help-general]", file=f)
@@ -413,6 +1077,8 @@ def _gdal_merge(argv=None):
     pre_init = []
     band_type = None
     createonly = 0
+    max_memory = None
+    threads = None
     bTargetAlignedPixels = False
     start_time = time.time()
 
@@ -473,6 +1139,14 @@ def _gdal_merge(argv=None):
             i = i + 1
             a_nodata = float(argv[i])
 
+        elif arg == "-wm":
+            i = i + 1
+            max_memory = float(argv[i]) * 1024 * 1024
+
+        elif arg == "-threads":
+            i = i + 1
+            threads = get_num_threads(argv[i])
+
         elif arg == "-f" or arg == "-of":
             i = i + 1
             driver_name = argv[i]
@@ -618,35 +1292,62 @@ def _gdal_merge(argv=None):
     if quiet == 0 and verbose == 0:
         progress(0.0)
     fi_processed = 0
+    buffers = ChunkBuffers()
 
-    for fi in file_infos:
-        if createonly != 0:
-            continue
+    if threads is not None and createonly == 0:
+        band_maps = []
+        for fi in file_infos:
+            if separate == 0:
+                band_maps.append([(band, band) for band in range(1, bands + 1)])
+            else:
+                band_maps.append(
+                    [(band, t_band + band - 1) for band in range(1, fi.bands + 1)]
+                )
+                t_band = t_band + fi.bands
 
         if verbose != 0:
-            print("")
-            print(
-                "Processing file %5d of %5d, %6.3f%% completed in %d minutes."
-                % (
-                    fi_processed + 1,
-                    len(file_infos),
-                    fi_processed * 100.0 / len(file_infos),
-                    int(round((time.time() - start_time) / 60.0)),
-                )
-            )
-            fi.report()
+            print("Compositing %d files with %d threads." % (len(file_infos), threads))
 
-        if separate == 0:
-            for band in range(1, bands + 1):
-                fi.copy_into(t_fh, band, band, nodata, verbose)
-        else:
-            for band in range(1, fi.bands + 1):
-                fi.copy_into(t_fh, band, t_band, nodata, verbose)
-                t_band = t_band + 1
+        merge_tiles(
+            t_fh,
+            file_infos,
+            band_maps,
+            nodata,
+            threads,
+            max_memory,
+            progress if quiet == 0 and verbose == 0 else None,
+        )
+    else:
+        for fi in file_infos:
+            if createonly != 0:
+                continue
 
-        fi_processed = fi_processed + 1
-        if quiet == 0 and verbose == 0:
-            progress(fi_processed / float(len(file_infos)))
+            if verbose != 0:
+                print("")
+                print(
+                    "Processing file %5d of %5d, %6.3f%% completed in %d minutes."
+                    % (
+                        fi_processed + 1,
+                        len(file_infos),
+                        fi_processed * 100.0 / len(file_infos),
+                        int(round((time.time() - start_time) / 60.0)),
+                    )
+                )
+                fi.report()
+
+            if separate == 0:
+                for band in range(1, bands + 1):
+                    fi.copy_into(t_fh, band, band, nodata, verbose, max_memory, buffers)
+            else:
+                for band in range(1, fi.bands + 1):
+                    fi.copy_into(
+                        t_fh, band, t_band, nodata, verbose, max_memory, buffers
+                    )
+                    t_band = t_band + 1
+
+            fi_processed = fi_processed + 1
+            if quiet == 0 and verbose == 0:
+                progress(fi_processed / float(len(file_infos)))
 
     # Force file to be closed.
     t_fh = None
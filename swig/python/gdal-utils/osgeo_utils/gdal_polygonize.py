@@ -14,13 +14,438 @@
 # SPDX-License-Identifier: MIT
 # ******************************************************************************
 
+import collections
+import heapq
 import sys
 import textwrap
+import threading
 from typing import Optional, Union
 
-from osgeo import gdal, ogr
+from osgeo import gdal, ogr, osr
+from osgeo_utils.auxiliary import tiling
 from osgeo_utils.auxiliary.gdal_argparse import GDALArgumentParser, GDALScript
-from osgeo_utils.auxiliary.util import GetOutputDriverFor, enable_gdal_exceptions
+from osgeo_utils.auxiliary.util import (
+    GetOutputDriverFor,
+    enable_gdal_exceptions,
+    get_num_threads,
+)
+
+# Number of features written in each transaction in tiled mode
+FEATURES_PER_TRANSACTION = 100000
+
+
+def get_src_band(src_ds, band_number):
+    """Return the band of src_ds designated by band_number, which is either
+    a band number, "mask" or "mask,<band_number>"."""
+    if band_number == "mask":
+        return src_ds.GetRasterBand(1).GetMaskBand()
+    if isinstance(band_number, str) and band_number.startswith("mask,"):
+        return src_ds.GetRasterBand(int(band_number[len("mask,") :])).GetMaskBand()
+    return src_ds.GetRasterBand(band_number)
+
+
+def get_geotransform_ct(gt):
+    """Return a coordinate transformation from pixel/line coordinates to
+    georeferenced coordinates, or None if gt is the identity."""
+    if list(gt) == [0, 1, 0, 0, 0, 1]:
+        return None
+    options = osr.CoordinateTransformationOptions()
+    options.SetOperation(
+        "+proj=affine +xoff=%.17g +s11=%.17g +s12=%.17g "
+        "+yoff=%.17g +s21=%.17g +s22=%.17g" % tuple(gt)
+    )
+    return osr.CreateCoordinateTransformation(None, None, options)
+
+
+class _FeatureWriter:
+    """Write polygons to a layer, in transactions of FEATURES_PER_TRANSACTION
+    features."""
+
+    def __init__(self, layer, field):
+        self.layer = layer
+        self.field = field
+        self.count = 0
+        self.layer.StartTransaction()
+
+    def write(self, geom, dn):
+        feature = ogr.Feature(self.layer.GetLayerDefn())
+        feature.SetGeometryDirectly(geom)
+        if self.field >= 0:
+            feature.SetField(self.field, dn)
+        self.layer.CreateFeature(feature)
+        self.count += 1
+        if self.count % FEATURES_PER_TRANSACTION == 0:
+            self.layer.CommitTransaction()
+            self.layer.StartTransaction()
+
+    def commit(self):
+        self.layer.CommitTransaction()
+
+    def rollback(self):
+        self.layer.RollbackTransaction()
+
+
+def _overlapping_intervals(a, b):
+    """Yield the (i, j) pairs of the (lo, hi, i) intervals of a and (lo, hi, j)
+    intervals of b that overlap, sweeping over them sorted by lower bound."""
+    events = sorted(
+        [(lo, hi, 0, i) for lo, hi, i in a] + [(lo, hi, 1, j) for lo, hi, j in b]
+    )
+    active = ([], [])
+    for lo, hi, side, k in events:
+        # Drop the intervals of the other list ending before this one
+        other = [(other_hi, m) for other_hi, m in active[1 - side] if other_hi >= lo]
+        active[1 - side][:] = other
+        for _, m in other:
+            yield (k, m) if side == 0 else (m, k)
+        active[side].append((hi, k))
+
+
+def _polygonize_8connected(geom):
+    """Return the polygon made of the 8-connected polygons of geom, in
+    pixel/line coordinates, as GDALPolygonize() builds it, by polygonizing
+    them again over their envelope."""
+    minx, maxx, miny, maxy = (int(v) for v in geom.GetEnvelope())
+    ds = gdal.GetDriverByName("MEM").Create("", maxx - minx, maxy - miny)
+    ds.SetGeoTransform([minx, 1, 0, miny, 0, 1])
+    vector_ds = ogr.GetDriverByName("MEM").CreateDataSource("")
+    layer = vector_ds.CreateLayer("poly", None, ogr.wkbPolygon)
+    feature = ogr.Feature(layer.GetLayerDefn())
+    feature.SetGeometry(geom)
+    layer.CreateFeature(feature)
+    gdal.RasterizeLayer(ds, [1], layer, burn_values=[1])
+
+    out_layer = vector_ds.CreateLayer("out", None, ogr.wkbPolygon)
+    band = ds.GetRasterBand(1)
+    gdal.Polygonize(band, band, out_layer, -1, ["8CONNECTED=8"])
+    return out_layer.GetNextFeature().GetGeometryRef().Clone()
+
+
+class _SeamPolygonMerger:
+    """
+    Merge the polygons of adjacent tiles that are connected across tile seams.
+
+    Tiles must be added in row-major order. The polygons touching an edge of
+    their tile that is not an edge of the raster are indexed by tile, edge and
+    DN, with the interval they cover along the edge. They are compared with
+    the polygons of the neighbouring tiles already added by sweeping over
+    these intervals. Groups of connected polygons are returned as soon as no
+    tile still to be added can touch them, merged into a single polygon.
+    """
+
+    def __init__(self, x_tiles, y_tiles, connectedness8):
+        """
+        x_tiles, y_tiles -- (offset, size) intervals of the tile columns and
+        rows, in pixels.
+
+        connectedness8 -- whether pixels touching by a corner are connected.
+        """
+        self.x_tiles = x_tiles
+        self.y_tiles = y_tiles
+        self.connectedness8 = connectedness8
+        self.next_index = 0
+        # (row, col, edge) -> dn -> list of (lo, hi, index) intervals
+        self.edges = {}
+        self.polygons = {}
+        self.parent = {}
+        self.members = {}
+        # Index of the last tile that can touch a group, by group root
+        self.last_tile = {}
+        self.last_tile_heap = []
+
+    def get_seams(self, row, col):
+        """Return the left, right, top and bottom coordinates of the edges
+        of a tile that are seams with other tiles, or None for the edges of
+        the raster."""
+        xoff, tile_w = self.x_tiles[col]
+        yoff, tile_h = self.y_tiles[row]
+        return (
+            xoff if col > 0 else None,
+            xoff + tile_w if col + 1 < len(self.x_tiles) else None,
+            yoff if row > 0 else None,
+            yoff + tile_h if row + 1 < len(self.y_tiles) else None,
+        )
+
+    def _get_last_tile(self, row, col):
+        # Index of the last of the neighbours of a tile, in row-major order
+        return min(row + 1, len(self.y_tiles) - 1) * len(self.x_tiles) + min(
+            col + 1, len(self.x_tiles) - 1
+        )
+
+    def _find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def _union(self, i, j):
+        i = self._find(i)
+        j = self._find(j)
+        if i == j:
+            return
+        if len(self.members[i]) < len(self.members[j]):
+            i, j = j, i
+        self.parent[j] = i
+        self.members[i].extend(self.members.pop(j))
+        last_tile = max(self.last_tile[i], self.last_tile.pop(j))
+        if last_tile != self.last_tile[i]:
+            self.last_tile[i] = last_tile
+            heapq.heappush(self.last_tile_heap, (last_tile, i))
+
+    def _connect(self, intervals, neighbour_intervals):
+        for dn, dn_intervals in intervals.items():
+            neighbour_dn_intervals = neighbour_intervals.get(dn)
+            if not neighbour_dn_intervals:
+                continue
+            for i, j in _overlapping_intervals(dn_intervals, neighbour_dn_intervals):
+                if self._find(i) == self._find(j):
+                    continue
+                a = self.polygons[i][1]
+                b = self.polygons[j][1]
+                if self.connectedness8:
+                    connected = a.Intersects(b)
+                else:
+                    # Polygons touching only by a corner are not connected
+                    intersection = a.Intersection(b)
+                    connected = (
+                        intersection is not None and intersection.GetDimension() >= 1
+                    )
+                if connected:
+                    self._union(i, j)
+
+    def add_tile(self, row, col, seam_polygons):
+        """
+        Add the (dn, geometry) seam polygons of a tile, in pixel/line
+        coordinates.
+
+        Returns the list of (dn, geometry) tuples of the merged polygons
+        that no tile still to be added can touch.
+        """
+        left, right, top, bottom = self.get_seams(row, col)
+        tile_edges = {}
+        last_tile = self._get_last_tile(row, col)
+        for dn, geom in seam_polygons:
+            i = self.next_index
+            self.next_index += 1
+            self.polygons[i] = (dn, geom)
+            self.parent[i] = i
+            self.members[i] = [i]
+            self.last_tile[i] = last_tile
+            heapq.heappush(self.last_tile_heap, (last_tile, i))
+            minx, maxx, miny, maxy = geom.GetEnvelope()
+            for edge, on_edge, lo, hi in (
+                ("left", minx == left, miny, maxy),
+                ("right", maxx == right, miny, maxy),
+                ("top", miny == top, minx, maxx),
+                ("bottom", maxy == bottom, minx, maxx),
+            ):
+                if on_edge:
+                    tile_edges.setdefault(edge, collections.defaultdict(list))[
+                        dn
+                    ].append((lo, hi, i))
+        for edge, intervals in tile_edges.items():
+            self.edges[(row, col, edge)] = intervals
+
+        # Edges shared with the neighbours already added, along which
+        # polygons can be connected
+        neighbour_edges = [
+            ("left", (row, col - 1, "right")),
+            ("top", (row - 1, col, "bottom")),
+        ]
+        if self.connectedness8:
+            neighbour_edges += [
+                ("left", (row - 1, col - 1, "right")),
+                ("right", (row - 1, col + 1, "left")),
+            ]
+        for edge, neighbour_edge in neighbour_edges:
+            if edge in tile_edges and neighbour_edge in self.edges:
+                self._connect(tile_edges[edge], self.edges[neighbour_edge])
+
+        tile_index = row * len(self.x_tiles) + col
+        # Forget the edges of the tiles whose neighbours have all been added
+        for r, c in ((row - 1, col - 1), (row - 1, col), (row, col - 1), (row, col)):
+            if r >= 0 and c >= 0 and self._get_last_tile(r, c) <= tile_index:
+                for edge in ("left", "right", "top", "bottom"):
+                    self.edges.pop((r, c, edge), None)
+
+        merged = []
+        while self.last_tile_heap and self.last_tile_heap[0][0] <= tile_index:
+            last_tile, root = heapq.heappop(self.last_tile_heap)
+            if self.last_tile.get(root) != last_tile:
+                # The group was merged in another one since
+                continue
+            del self.last_tile[root]
+            indices = self.members.pop(root)
+            dn = self.polygons[root][0]
+            if len(indices) == 1:
+                merged.append(self.polygons.pop(root))
+            else:
+                multi = ogr.Geometry(ogr.wkbMultiPolygon)
+                for i in indices:
+                    multi.AddGeometry(self.polygons.pop(i)[1])
+                # Remove the vertices left by the seams on straight edges
+                geom = multi.UnionCascaded().Simplify(0)
+                if geom.GetGeometryType() != ogr.wkbPolygon:
+                    # Pieces connected only by their corners, which are
+                    # parts of a single polygon in 8-connected mode
+                    geom = _polygonize_8connected(multi)
+                merged.append((dn, geom))
+            for i in indices:
+                del self.parent[i]
+        return merged
+
+
+def polygonize_tiled(
+    src_filename,
+    band_number,
+    mask,
+    dst_layer,
+    dst_field,
+    options,
+    threads=1,
+    tile_size=None,
+    callback=None,
+):
+    """
+    Polygonize a band tile by tile, on a pool of threads.
+
+    The band is partitioned into tiles aligned on its blocks, that are each
+    polygonized in memory. Polygons touching the seams between tiles are
+    then merged with their neighbours of the same value, so that the result
+    is the same as polygonizing the whole band at once, apart from the order
+    of features and vertices. They are written as soon as no tile still to be
+    polygonized can touch them. Features are written in transactions of
+    FEATURES_PER_TRANSACTION features.
+
+    src_filename -- name of the source raster.
+
+    band_number -- band number, "mask" or "mask,<band_number>".
+
+    mask -- "default", "none" or name of a mask raster.
+
+    dst_layer, dst_field -- destination layer and index of its DN field.
+
+    options -- options of gdal.Polygonize().
+
+    threads -- number of threads polygonizing tiles.
+
+    tile_size -- size of tiles in pixels, rounded up to a multiple of the
+    block size (tiling.DEFAULT_TILE_SIZE if None).
+
+    callback -- optional function called with the completion ratio after
+    each tile is polygonized.
+    """
+    options = [
+        opt for opt in options if not opt.upper().startswith("DATASET_FOR_GEOREF=")
+    ]
+    connectedness8 = "8CONNECTED=8" in [opt.upper() for opt in options]
+
+    src_ds = gdal.Open(src_filename)
+    srcband = get_src_band(src_ds, band_number)
+    xsize = srcband.XSize
+    ysize = srcband.YSize
+    data_type = srcband.DataType
+    tile_xsize, tile_ysize = tiling.get_tile_size(srcband.GetBlockSize(), tile_size)
+    gt = src_ds.GetGeoTransform()
+    srcband = None
+    src_ds = None
+
+    x_tiles = tiling.get_tile_edges(xsize, tile_xsize)
+    y_tiles = tiling.get_tile_edges(ysize, tile_ysize)
+    field_type = ogr.OFTInteger
+    if data_type in (gdal.GDT_Int64, gdal.GDT_UInt64):
+        field_type = ogr.OFTInteger64
+
+    thread_local = threading.local()
+
+    def open_bands():
+        # Datasets cannot be shared between threads
+        if not hasattr(thread_local, "srcband"):
+            thread_local.src_ds = gdal.Open(src_filename)
+            thread_local.srcband = get_src_band(thread_local.src_ds, band_number)
+            if mask == "default":
+                thread_local.maskband = thread_local.srcband.GetMaskBand()
+            elif mask == "none":
+                thread_local.maskband = None
+            else:
+                thread_local.mask_ds = gdal.Open(mask)
+                thread_local.maskband = thread_local.mask_ds.GetRasterBand(1)
+            thread_local.ct = get_geotransform_ct(gt)
+        return thread_local.srcband, thread_local.maskband, thread_local.ct
+
+    def polygonize_tile(row, col):
+        xoff, tile_w = x_tiles[col]
+        yoff, tile_h = y_tiles[row]
+        srcband, maskband, ct = open_bands()
+
+        mem_drv = gdal.GetDriverByName("MEM")
+        tile_ds = mem_drv.Create("", tile_w, tile_h, 1, data_type)
+        # Polygonize in pixel/line coordinates, so that seams are at the
+        # same, exact, coordinates in adjacent tiles.
+        tile_ds.SetGeoTransform([xoff, 1, 0, yoff, 0, 1])
+        tile_ds.GetRasterBand(1).WriteRaster(
+            0, 0, tile_w, tile_h, srcband.ReadRaster(xoff, yoff, tile_w, tile_h)
+        )
+        tile_maskband = None
+        if maskband is not None:
+            mask_tile_ds = mem_drv.Create("", tile_w, tile_h, 1, gdal.GDT_Byte)
+            tile_maskband = mask_tile_ds.GetRasterBand(1)
+            tile_maskband.WriteRaster(
+                0,
+                0,
+                tile_w,
+                tile_h,
+                maskband.ReadRaster(xoff, yoff, tile_w, tile_h, buf_type=gdal.GDT_Byte),
+            )
+
+        out_ds = ogr.GetDriverByName("MEM").CreateDataSource("")
+        out_layer = out_ds.CreateLayer("poly", None, ogr.wkbPolygon)
+        out_layer.CreateField(ogr.FieldDefn("DN", field_type))
+        gdal.Polygonize(tile_ds.GetRasterBand(1), tile_maskband, out_layer, 0, options)
+
+        left, right, top, bottom = merger.get_seams(row, col)
+
+        polygons = []
+        seam_polygons = []
+        for feature in out_layer:
+            dn = feature.GetFieldAsInteger64(0)
+            geom = feature.GetGeometryRef().Clone()
+            minx, maxx, miny, maxy = geom.GetEnvelope()
+            if minx == left or maxx == right or miny == top or maxy == bottom:
+                seam_polygons.append((dn, geom))
+            else:
+                if ct is not None:
+                    geom.Transform(ct)
+                polygons.append((dn, geom))
+        return polygons, seam_polygons
+
+    tiles = [(row, col) for row in range(len(y_tiles)) for col in range(len(x_tiles))]
+    merger = _SeamPolygonMerger(x_tiles, y_tiles, connectedness8)
+    ct = get_geotransform_ct(gt)
+    writer = _FeatureWriter(dst_layer, dst_field)
+    tiles_done = 0
+
+    def write_tile(tile, result):
+        nonlocal tiles_done
+        polygons, seam_polygons = result
+        for dn, geom in polygons:
+            writer.write(geom, dn)
+        for dn, geom in merger.add_tile(*tile, seam_polygons):
+            if ct is not None:
+                geom.Transform(ct)
+            writer.write(geom, dn)
+        tiles_done += 1
+        if callback is not None:
+            callback(tiles_done / len(tiles))
+
+    try:
+        tiling.run_ordered(polygonize_tile, tiles, write_tile, threads)
+    except Exception:
+        writer.rollback()
+        raise
+    writer.commit()
+    return gdal.CE_None
 
 
 @enable_gdal_exceptions
@@ -37,6 +462,8 @@ def gdal_polygonize(
     options: Optional[list] = None,
     layer_creation_options: Optional[list] = None,
     connectedness8: bool = False,
+    threads: Optional[Union[int, str]] = None,
+    tile_size: Optional[int] = None,
 ):
 
     if isinstance(band_number, str) and not band_number.startswith("mask"):
@@ -63,16 +490,10 @@ def gdal_polygonize(
         print("Unable to open %s" % src_filename)
         return 1
 
-    if band_number == "mask":
-        srcband = src_ds.GetRasterBand(1).GetMaskBand()
-        # Workaround the fact that most source bands have no dataset attached
-        options.append("DATASET_FOR_GEOREF=" + src_filename)
-    elif isinstance(band_number, str) and band_number.startswith("mask,"):
-        srcband = src_ds.GetRasterBand(int(band_number[len("mask,") :])).GetMaskBand()
+    srcband = get_src_band(src_ds, band_number)
+    if isinstance(band_number, str):
         # Workaround the fact that most source bands have no dataset attached
         options.append("DATASET_FOR_GEOREF=" + src_filename)
-    else:
-        srcband = src_ds.GetRasterBand(band_number)
 
     if mask == "default":
         maskband = srcband.GetMaskBand()
@@ -186,6 +607,29 @@ def gdal_polygonize(
     else:
         prog_func = gdal.TermProgress_nocb
 
+    threads = get_num_threads(threads)
+    if threads is not None or tile_size is not None:
+        tile_xsize, tile_ysize = tiling.get_tile_size(srcband.GetBlockSize(), tile_size)
+        # Tiled mode is not needed if the band fits in a single tile
+        if srcband.XSize > tile_xsize or srcband.YSize > tile_ysize:
+            srcband = None
+            maskband = None
+            mask_ds = None
+            src_ds = None
+            result = polygonize_tiled(
+                src_filename,
+                band_number,
+                mask,
+                dst_layer,
+                dst_field,
+                options,
+                threads=threads if threads is not None else 1,
+                tile_size=tile_size,
+                callback=prog_func,
+            )
+            dst_ds = None
+            return result
+
     dst_layer.StartTransaction()
     result = gdal.Polygonize(
         srcband, maskband, dst_layer, dst_field, options, callback=prog_func
@@ -238,6 +682,26 @@ class GDALPolygonize(GDALScript):
             help="Use 8 connectedness. Default is 4 connectedness.",
         )
 
+        parser.add_argument(
+            "-threads",
+            dest="threads",
+            type=str,
+            metavar="<num_threads>|ALL_CPUS",
+            help="Polygonize tiles of the raster on this number of threads, "
+            "and merge the polygons crossing tile boundaries.",
+        )
+
+        parser.add_argument(
+            "-tile_size",
+            dest="tile_size",
+            type=int,
+            metavar="pixels",
+            help="Polygonize tiles of the raster of this size, rounded up to "
+            "a multiple of the block size (default: %d), "
+            "and merge the polygons crossing tile boundaries."
+            % tiling.DEFAULT_TILE_SIZE,
+        )
+
         parser.add_argument(
             "-o",
             dest="options",
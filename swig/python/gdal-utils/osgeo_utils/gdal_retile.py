@@ -11,11 +11,15 @@
 #
 # SPDX-License-Identifier: MIT
 ###############################################################################
+import bisect
+import collections
+import concurrent.futures
 import os
 import sys
+import threading
 
 from osgeo import gdal, ogr, osr
-from osgeo_utils.auxiliary.util import enable_gdal_exceptions
+from osgeo_utils.auxiliary.util import enable_gdal_exceptions, get_num_threads
 
 progress = gdal.TermProgress_nocb
 
@@ -52,33 +56,226 @@ class AffineTransformDecorator:
 
 
 class DataSetCache:
-    """A class for caching source tiles"""
+    """
+    A class for caching source tiles, which closes the least recently used
+    ones when more than maxCount are open, or when their raster data would
+    take more than maxBytes bytes.
 
-    def __init__(self):
-        self.cacheSize = 8
-        self.queue = []
-        self.dict = {}
+    The size of a dataset is the uncompressed size of its whole raster data,
+    which bounds the size of its blocks in the GDAL block cache. maxBytes is
+    thus a heuristic: most of the time, only some of these blocks are cached.
+    """
+
+    def __init__(self, maxCount=8, maxBytes=None):
+        self.maxCount = maxCount
+        self.maxBytes = maxBytes
+        self.usedBytes = 0
+        # name -> (dataset, size in bytes), from least to most recently used
+        self.dict = collections.OrderedDict()
+
+    @staticmethod
+    def getDataSetBytes(dataset):
+        """Return the uncompressed size of the raster data of a dataset, in
+        bytes"""
+        if dataset.RasterCount == 0:
+            return 0
+        return (
+            dataset.RasterXSize
+            * dataset.RasterYSize
+            * sum(
+                gdal.GetDataTypeSize(dataset.GetRasterBand(i + 1).DataType) // 8
+                for i in range(dataset.RasterCount)
+            )
+        )
 
     def get(self, name):
 
         if name in self.dict:
-            return self.dict[name]
+            self.dict.move_to_end(name)
+            return self.dict[name][0]
         result = gdal.Open(name)
         if result is None:
             print("Error opening: %s" % NameError, file=sys.stderr)
             return 1
-        if len(self.queue) == self.cacheSize:
-            toRemove = self.queue.pop(0)
-            del self.dict[toRemove]
-        self.queue.append(name)
-        self.dict[name] = result
+        size = self.getDataSetBytes(result)
+        self.dict[name] = (result, size)
+        self.usedBytes += size
+        # evict least recently used datasets, but keep the requested one
+        while len(self.dict) > 1 and (
+            len(self.dict) > self.maxCount
+            or (self.maxBytes is not None and self.usedBytes > self.maxBytes)
+        ):
+            _, (_, removedSize) = self.dict.popitem(last=False)
+            self.usedBytes -= removedSize
         return result
 
+    def __len__(self):
+        return len(self.dict)
+
     def __del__(self):
-        for dataset in self.dict.values():
-            del dataset
-        del self.queue
-        del self.dict
+        self.dict.clear()
+
+
+class TileIndex:
+    """
+    A class holding the locations and envelopes of the tiles of a mosaic in
+    memory, that can be queried from several threads.
+
+    Queries go through a packed R-tree built with the Sort-Tile-Recursive
+    algorithm. Tiles added after the tree was built are scanned linearly,
+    until there are enough of them to rebuild it.
+    """
+
+    # number of entries of a node of the R-tree
+    NODE_SIZE = 16
+
+    def __init__(self):
+        self.locations = []
+        self.envelopes = []
+        self.orders = []
+        self.lock = threading.Lock()
+        # tiles sorted by the R-tree, and (minx, maxx, miny, maxy) of its
+        # nodes from the leaves to the root: node i of a level covers the
+        # entries NODE_SIZE * i to NODE_SIZE * (i + 1) - 1 of the level below
+        self.treeItems = []
+        self.treeLevels = []
+
+    @classmethod
+    def fromDataSource(cls, ogrTileIndexDS):
+        """Read the features of an OGR tile index, in their order"""
+        tileIndex = cls()
+        layer = ogrTileIndexDS.GetLayer()
+        layer.ResetReading()
+        for feature in layer:
+            tileIndex.add(feature.GetField(0), feature.GetGeometryRef().GetEnvelope())
+        layer.ResetReading()
+        return tileIndex
+
+    def add(self, location, envelope, order=None):
+        """
+        Add a tile.
+
+        envelope -- (minx, maxx, miny, maxy) envelope of the tile
+        order -- rank of the tile in the index, which defaults to the order of
+        addition.
+        """
+        with self.lock:
+            if order is None:
+                order = len(self.orders)
+            self.locations.append(location)
+            self.envelopes.append(envelope)
+            self.orders.append(order)
+
+    def __len__(self):
+        return len(self.locations)
+
+    def first(self):
+        """Return the location of the first tile"""
+        with self.lock:
+            return self.locations[self.orders.index(min(self.orders))]
+
+    def getExtent(self):
+        """Return the (minx, maxx, miny, maxy) extent of the tiles"""
+        with self.lock:
+            return (
+                min(env[0] for env in self.envelopes),
+                max(env[1] for env in self.envelopes),
+                min(env[2] for env in self.envelopes),
+                max(env[3] for env in self.envelopes),
+            )
+
+    def buildTree(self):
+        """Build the R-tree over all the tiles. Must be called with the lock"""
+        envelopes = self.envelopes
+        nodeSize = self.NODE_SIZE
+        count = len(envelopes)
+
+        # Sort the tiles in vertical slices of sliceSize tiles by the x of
+        # their center, then each slice by the y of their center
+        items = sorted(range(count), key=lambda i: envelopes[i][0] + envelopes[i][1])
+        leafCount = -(-count // nodeSize)
+        sliceCount = max(1, int(leafCount**0.5 + 0.5))
+        sliceSize = nodeSize * -(-leafCount // sliceCount)
+        treeItems = []
+        for start in range(0, count, sliceSize):
+            treeItems += sorted(
+                items[start : start + sliceSize],
+                key=lambda i: envelopes[i][2] + envelopes[i][3],
+            )
+
+        # Pack the nodes level by level
+        treeLevels = []
+        boxes = [envelopes[i] for i in treeItems]
+        while len(boxes) > 1 or not treeLevels:
+            nodes = []
+            for start in range(0, len(boxes), nodeSize):
+                children = boxes[start : start + nodeSize]
+                nodes.append(
+                    (
+                        min(box[0] for box in children),
+                        max(box[1] for box in children),
+                        min(box[2] for box in children),
+                        max(box[3] for box in children),
+                    )
+                )
+            treeLevels.append(nodes)
+            boxes = nodes
+
+        self.treeItems = treeItems
+        self.treeLevels = treeLevels
+
+    def query(self, minx, miny, maxx, maxy):
+        """
+        Return the list of (location, envelope) of the tiles whose envelope
+        intersects or touches the given bounding box, in index order
+        """
+        with self.lock:
+            pending = len(self.envelopes) - len(self.treeItems)
+            # rebuilding costs O(n log n): only do it once the linear scan
+            # of the tiles added since the last build costs O(sqrt(n))
+            if pending and pending * pending >= len(self.envelopes):
+                self.buildTree()
+                pending = 0
+
+            envelopes = self.envelopes
+            nodeSize = self.NODE_SIZE
+            found = []
+            if self.treeItems:
+                # depth-first traversal, from the root
+                stack = [(len(self.treeLevels) - 1, 0)]
+                while stack:
+                    level, node = stack.pop()
+                    start = node * nodeSize
+                    if level == 0:
+                        children = self.treeItems[start : start + nodeSize]
+                        boxes = [envelopes[i] for i in children]
+                    else:
+                        children = range(start, start + nodeSize)
+                        boxes = self.treeLevels[level - 1][start : start + nodeSize]
+                    for child, env in zip(children, boxes):
+                        if (
+                            env[0] <= maxx
+                            and env[1] >= minx
+                            and env[2] <= maxy
+                            and env[3] >= miny
+                        ):
+                            if level == 0:
+                                found.append(child)
+                            else:
+                                stack.append((level - 1, child))
+
+            for i in range(len(envelopes) - pending, len(envelopes)):
+                env = envelopes[i]
+                if (
+                    env[0] <= maxx
+                    and env[1] >= minx
+                    and env[2] <= maxy
+                    and env[3] >= miny
+                ):
+                    found.append(i)
+
+            found.sort(key=lambda i: self.orders[i])
+            return [(self.locations[i], envelopes[i]) for i in found]
 
 
 class tile_info:
@@ -113,27 +310,39 @@ class tile_info:
 class mosaic_info:
     """A class holding information about a GDAL file or a GDAL fileset"""
 
-    def __init__(self, filename, inputDS):
+    def __init__(
+        self, filename, inputDS, extent=None, cacheMaxCount=8, cacheMaxBytes=None
+    ):
         """
         Initialize mosaic_info from filename
 
         filename -- Name of file to read.
-        inputDS -- OGR DataSet representing the tile index
+        inputDS -- OGR DataSet representing the tile index, or TileIndex object
+        extent -- (minx, maxx, miny, maxy) extent of the mosaic, if it is not
+        the extent of the tiles currently in the index.
+        cacheMaxCount -- maximum number of source tiles kept open per thread
+        cacheMaxBytes -- maximum size of the raster data of the source tiles
+        kept open per thread, or None for no limit
 
         """
         self.TempDriver = gdal.GetDriverByName("MEM")
         self.filename = filename
-        self.cache = DataSetCache()
-        self.ogrTileIndexDS = inputDS
+        self.cacheMaxCount = cacheMaxCount
+        self.cacheMaxBytes = cacheMaxBytes
+        # datasets cannot be shared between threads: each one has its cache
+        self.threadData = threading.local()
+        if isinstance(inputDS, TileIndex):
+            self.ogrTileIndexDS = None
+            self.tileIndex = inputDS
+        else:
+            self.ogrTileIndexDS = inputDS
+            self.tileIndex = TileIndex.fromDataSource(inputDS)
 
-        self.ogrTileIndexDS.GetLayer().ResetReading()
-        # grab the first feature of the temporary tile index created
-        feature = self.ogrTileIndexDS.GetLayer().GetNextFeature()
-        # the first field is the filename
-        imgLocation = feature.GetField(0)
+        # grab the first tile of the index, the first field is the filename
+        imgLocation = self.tileIndex.first()
 
         # get the first tile that exists, extract metadata abut mosaic
-        fhInputTile = self.cache.get(imgLocation)
+        fhInputTile = self.getCache().get(imgLocation)
 
         self.bands = fhInputTile.RasterCount
         self.band_type = fhInputTile.GetRasterBand(1).DataType
@@ -154,7 +363,8 @@ class mosaic_info:
                 iband + 1
             ).GetRasterColorInterpretation()
 
-        extent = self.ogrTileIndexDS.GetLayer().GetExtent()
+        if extent is None:
+            extent = self.tileIndex.getExtent()
         self.ulx = extent[0]
         self.uly = extent[3]
         self.lrx = extent[1]
@@ -164,30 +374,31 @@ class mosaic_info:
         self.ysize = abs(int(round((self.uly - self.lry) / self.scaleY)))
 
     def __del__(self):
-        del self.cache
+        del self.threadData
         del self.ogrTileIndexDS
 
+    def getCache(self):
+        """Return the cache of source tiles of the calling thread"""
+        cache = getattr(self.threadData, "cache", None)
+        if cache is None:
+            cache = DataSetCache(self.cacheMaxCount, self.cacheMaxBytes)
+            self.threadData.cache = cache
+        return cache
+
     def getDataSet(self, minx, miny, maxx, maxy):
         """
         Find a gdal dataset representing a subset of a mosaic, based on a bounding box. Might overlap multiple tiles of the mosaic
 
         returns GDALDataset or None
         """
-        self.ogrTileIndexDS.GetLayer().ResetReading()
-        self.ogrTileIndexDS.GetLayer().SetSpatialFilterRect(minx, miny, maxx, maxy)
-        features = []
+        features = self.tileIndex.query(minx, miny, maxx, maxy)
         envelope = None
         # Find the envelope of all features in the dataset
-        while True:
-            feature = self.ogrTileIndexDS.GetLayer().GetNextFeature()
-            if feature is None:
-                break
-            features.append(feature)
+        for _, featureEnv in features:
             # on first iteration get envelope of the first feature
             if envelope is None:
-                envelope = feature.GetGeometryRef().GetEnvelope()
+                envelope = featureEnv
             else:
-                featureEnv = feature.GetGeometryRef().GetEnvelope()
                 # then expand the envelop as needed based on other features
                 envelope = (
                     min(featureEnv[0], envelope[0]),
@@ -207,8 +418,6 @@ class mosaic_info:
             max(maxy, envelope[3]),
         )
 
-        self.ogrTileIndexDS.GetLayer().SetSpatialFilter(None)
-
         # merge tiles
 
         resultSizeX = int((maxx - minx) / self.scaleX + 0.5)
@@ -226,9 +435,9 @@ class mosaic_info:
                 t_band.SetNoDataValue(self.nodata)
 
         # for each tile in the index, find its overlap (if any) with the requested bbox, then add it to the returned GDAL dataset if needed.
-        for feature in features:
-            featureName = feature.GetField(0)
-            sourceDS = self.cache.get(featureName)
+        cache = self.getCache()
+        for featureName, _ in features:
+            sourceDS = cache.get(featureName)
             dec = AffineTransformDecorator(sourceDS.GetGeoTransform())
 
             dec.lrx = dec.ulx + sourceDS.RasterXSize * dec.scaleX
@@ -392,7 +601,6 @@ def tileImage(g, minfo, ti):
 
     """
 
-    g.LastRowIndx = -1
     OGRDS = createTileIndex(
         g.Verbose,
         "TileResult_0",
@@ -401,54 +609,84 @@ def tileImage(g, minfo, ti):
         g.TileIndexDriverTyp,
     )
 
-    yRange = list(range(1, ti.countTilesY + 1))
-    xRange = list(range(1, ti.countTilesX + 1))
+    tiles = getTiles(g, minfo, ti, getTileNameLevel(g, 0))
 
     if not g.Quiet and not g.Verbose:
         progress(0.0)
         processed = 0
-        total = len(xRange) * len(yRange)
+        total = len(tiles)
+
+    features = []
+    for _, _, offsetX, offsetY, width, height, tilename in tiles:
+        feature_only = g.Resume and os.path.exists(tilename)
+        createTile(
+            g,
+            minfo,
+            offsetX,
+            offsetY,
+            width,
+            height,
+            tilename,
+            OGRDS,
+            feature_only,
+            features,
+        )
+
+        if not g.Quiet and not g.Verbose:
+            processed += 1
+            progress(processed / float(total))
 
-    for yIndex in yRange:
-        for xIndex in xRange:
+    addFeatures(g.TileIndexFieldName, OGRDS, features)
+    saveTileIndex(g, OGRDS, 0)
+
+    return OGRDS
+
+
+def getTileNameLevel(g, level):
+    """Return the level argument of getTileName() for the tiles of a level"""
+    if level == 0 and not g.UseDirForEachRow:
+        return -1
+    return level
+
+
+def getTiles(g, minfo, ti, level=-1):
+    """
+    Compute the tiles of a level, and create their directories if needed.
+
+    returns list of (xIndex, yIndex, offsetX, offsetY, width, height, tileName)
+    tuples, in the order of the tile index
+    """
+    g.LastRowIndx = -1
+    tiles = []
+    for yIndex in range(1, ti.countTilesY + 1):
+        for xIndex in range(1, ti.countTilesX + 1):
             offsetY = (yIndex - 1) * (ti.tileHeight - ti.overlap)
             offsetX = (xIndex - 1) * (ti.tileWidth - ti.overlap)
             height = ti.tileHeight
             width = ti.tileWidth
-            if g.UseDirForEachRow:
-                tilename = getTileName(g, minfo, ti, xIndex, yIndex, 0)
-            else:
-                tilename = getTileName(g, minfo, ti, xIndex, yIndex)
 
             if offsetX + width > ti.width:
                 width = ti.width - offsetX
             if offsetY + height > ti.height:
                 height = ti.height - offsetY
 
-            feature_only = g.Resume and os.path.exists(tilename)
-            createTile(
-                g, minfo, offsetX, offsetY, width, height, tilename, OGRDS, feature_only
-            )
+            tilename = getTileName(g, minfo, ti, xIndex, yIndex, level)
+            tiles.append((xIndex, yIndex, offsetX, offsetY, width, height, tilename))
+    return tiles
+
 
-            if not g.Quiet and not g.Verbose:
-                processed += 1
-                progress(processed / float(total))
+def saveTileIndex(g, OGRDS, level):
+    """Write the tile index of a level as shapefile and/or CSV file if asked"""
+    if level == 0 and not (g.UseDirForEachRow and not g.PyramidOnly):
+        targetDir = getTargetDir(g)
+    else:
+        targetDir = getTargetDir(g, level)
 
     if g.TileIndexName is not None:
-        if g.UseDirForEachRow and not g.PyramidOnly:
-            shapeName = getTargetDir(g, 0) + g.TileIndexName
-        else:
-            shapeName = getTargetDir(g) + g.TileIndexName
-        copyTileIndexToDisk(g, OGRDS, shapeName)
+        copyTileIndexToDisk(g, OGRDS, targetDir + g.TileIndexName)
 
     if g.CsvFileName is not None:
-        if g.UseDirForEachRow and not g.PyramidOnly:
-            csvName = getTargetDir(g, 0) + g.CsvFileName
-        else:
-            csvName = getTargetDir(g) + g.CsvFileName
-        copyTileIndexToCSV(g, OGRDS, csvName)
-
-    return OGRDS
+        copyTileIndexToCSV(g, OGRDS, targetDir + g.CsvFileName)
 
 
 def copyTileIndexToDisk(g, OGRDS, fileName):
@@ -520,13 +758,25 @@ def _renameDataset(g, oldName, newName):
 
 
 def createPyramidTile(
-    g, levelMosaicInfo, offsetX, offsetY, width, height, tileName, OGRDS, feature_only
+    g,
+    levelMosaicInfo,
+    offsetX,
+    offsetY,
+    width,
+    height,
+    tileName,
+    OGRDS,
+    feature_only,
+    features=None,
 ):
     """
     Create an individual tile for the pyramids.
 
     The levelMosaicInfo object contains data about the mosaic at a given pyramid level.
 
+    If features is a list, the feature of the tile is appended to it as a
+    (location, xlist, ylist) tuple, instead of being added to OGRDS.
+
     Returns None if successful and return 1 if there is an error
     """
     temp_tilename = _createTempFileName(tileName)
@@ -547,7 +797,7 @@ def createPyramidTile(
     # if -resume flag and the tile is present, add it to the index and exit function
     if feature_only:
         points = dec.pointsFor(width, height)
-        addFeature(g.TileIndexFieldName, OGRDS, tileName, points[0], points[1])
+        recordFeature(g, OGRDS, features, tileName, points)
         return
 
     s_fh = levelMosaicInfo.getDataSet(
@@ -558,7 +808,7 @@ def createPyramidTile(
         return
     # add the new pyramid tile to the index
     points = dec.pointsFor(width, height)
-    addFeature(g.TileIndexFieldName, OGRDS, tileName, points[0], points[1])
+    recordFeature(g, OGRDS, features, tileName, points)
 
     if g.BandType is None:
         bt = levelMosaicInfo.band_type
@@ -631,7 +881,16 @@ def createPyramidTile(
 
 
 def createTile(
-    g, minfo, offsetX, offsetY, width, height, tilename, OGRDS, feature_only
+    g,
+    minfo,
+    offsetX,
+    offsetY,
+    width,
+    height,
+    tilename,
+    OGRDS,
+    feature_only,
+    features=None,
 ):
     """
     Create add a vector feature representing the tile to the index, then recreate the
@@ -646,6 +905,9 @@ def createTile(
         tilename (str): The name of the tile.
         OGRDS (DataSource): The OGR DataSource object containing the tile index
         feature_only (bool): Whether to only generate features.
+        features (list): If not None, list to which the feature of the tile is
+            appended as a (location, xlist, ylist) tuple, instead of adding it
+            to OGRDS.
 
     """
     temp_tilename = _createTempFileName(tilename)
@@ -672,7 +934,7 @@ def createTile(
     if feature_only:
         dec2 = AffineTransformDecorator(geotransform)
         points = dec2.pointsFor(width, height)
-        addFeature(g.TileIndexFieldName, OGRDS, tilename, points[0], points[1])
+        recordFeature(g, OGRDS, features, tilename, points)
         return
 
     s_fh = minfo.getDataSet(
@@ -688,7 +950,7 @@ def createTile(
     # add the tile to the tile index
     dec2 = AffineTransformDecorator(geotransform)
     points = dec2.pointsFor(width, height)
-    addFeature(g.TileIndexFieldName, OGRDS, tilename, points[0], points[1])
+    recordFeature(g, OGRDS, features, tilename, points)
 
     bands = minfo.bands
 
@@ -813,6 +1075,33 @@ def addFeature(TileIndexFieldName, OGRDataSource, location, xlist, ylist):
     OGRLayer.CreateFeature(OGRFeature)
 
 
+def addFeatures(TileIndexFieldName, OGRDataSource, features):
+    """Add a list of (location, xlist, ylist) features in a single transaction"""
+    OGRLayer = OGRDataSource.GetLayer()
+    OGRLayer.StartTransaction()
+    for location, xlist, ylist in features:
+        addFeature(TileIndexFieldName, OGRDataSource, location, xlist, ylist)
+    OGRLayer.CommitTransaction()
+
+
+def recordFeature(g, OGRDataSource, features, location, points):
+    """Add the feature of a tile to the index, or to the features list"""
+    if features is None:
+        addFeature(g.TileIndexFieldName, OGRDataSource, location, points[0], points[1])
+    else:
+        features.append((location, points[0], points[1]))
+
+
+def getFeatureEnvelope(xlist, ylist):
+    """
+    Return the (minx, maxx, miny, maxy) envelope of the feature added by
+    addFeature() for these points, whose coordinates are rounded by WKT.
+    """
+    xlist = [float("%f" % x) for x in xlist]
+    ylist = [float("%f" % y) for y in ylist]
+    return (min(xlist), max(xlist), min(ylist), max(ylist))
+
+
 def closeTileIndex(OGRDataSource):
     OGRDataSource.Close()
 
@@ -821,7 +1110,12 @@ def buildPyramid(g, minfo, createdTileIndexDS, tileWidth, tileHeight, overlap):
     inputDS = createdTileIndexDS
     for level in range(1, g.Levels + 1):
         g.LastRowIndx = -1
-        levelMosaicInfo = mosaic_info(minfo.filename, inputDS)
+        levelMosaicInfo = mosaic_info(
+            minfo.filename,
+            inputDS,
+            cacheMaxCount=g.CacheMaxCount,
+            cacheMaxBytes=g.CacheMaxBytes,
+        )
         levelOutputTileInfo = tile_info(
             int(levelMosaicInfo.xsize / 2),
             int(levelMosaicInfo.ysize / 2),
@@ -836,9 +1130,6 @@ def buildPyramidLevel(g, levelMosaicInfo, levelOutputTileInfo, level):
     """
     Build the pyramids at level N and returns an OGR dataset of the tile index at that level
     """
-    yRange = list(range(1, levelOutputTileInfo.countTilesY + 1))
-    xRange = list(range(1, levelOutputTileInfo.countTilesX + 1))
-
     OGRDS = createTileIndex(
         g.Verbose,
         "TileResult_" + str(level),
@@ -847,48 +1138,292 @@ def buildPyramidLevel(g, levelMosaicInfo, levelOutputTileInfo, level):
         g.TileIndexDriverTyp,
     )
 
-    for yIndex in yRange:
-        for xIndex in xRange:
-            offsetY = (yIndex - 1) * (
-                levelOutputTileInfo.tileHeight - levelOutputTileInfo.overlap
-            )
-            offsetX = (xIndex - 1) * (
-                levelOutputTileInfo.tileWidth - levelOutputTileInfo.overlap
-            )
-            height = levelOutputTileInfo.tileHeight
-            width = levelOutputTileInfo.tileWidth
+    features = []
+    for _, _, offsetX, offsetY, width, height, tilename in getTiles(
+        g, levelMosaicInfo, levelOutputTileInfo, level
+    ):
+        feature_only = g.Resume and os.path.exists(tilename)
+        createPyramidTile(
+            g,
+            levelMosaicInfo,
+            offsetX,
+            offsetY,
+            width,
+            height,
+            tilename,
+            OGRDS,
+            feature_only,
+            features,
+        )
 
-            if offsetX + width > levelOutputTileInfo.width:
-                width = levelOutputTileInfo.width - offsetX
-            if offsetY + height > levelOutputTileInfo.height:
-                height = levelOutputTileInfo.height - offsetY
+    addFeatures(g.TileIndexFieldName, OGRDS, features)
+    saveTileIndex(g, OGRDS, level)
 
-            tilename = getTileName(
-                g, levelMosaicInfo, levelOutputTileInfo, xIndex, yIndex, level
-            )
+    return OGRDS
 
-            feature_only = g.Resume and os.path.exists(tilename)
-            createPyramidTile(
-                g,
-                levelMosaicInfo,
-                offsetX,
-                offsetY,
-                width,
-                height,
-                tilename,
-                OGRDS,
-                feature_only,
+
+class TileLevel:
+    """A level of tiles created by tileInParallel()"""
+
+    def __init__(self, g, level, minfo, ti, sourceGeometry, factor):
+        """
+        level -- number of the level, 0 for the tiles of the source mosaic
+        minfo -- mosaic_info object of the source mosaic, used for tile names
+        ti -- tile_info object of the level
+        sourceGeometry -- (ulx, uly, scaleX, scaleY) of the mosaic from which
+        the tiles are created
+        factor -- ratio between the pixel size of the tiles and of this mosaic
+        """
+        self.level = level
+        self.factor = factor
+        self.tiles = getTiles(g, minfo, ti, getTileNameLevel(g, level))
+        self.remaining = len(self.tiles)
+        self.features = [None] * len(self.tiles)
+
+        # mosaic_info object from which the tiles are created, and the index
+        # it is built on, filled as the tiles of the previous level are done
+        self.sourceInfo = None
+        self.sourceIndex = None
+        self.sourceExtent = None
+
+        # for each tile, the number of tiles of the previous level it waits
+        # for, and the tiles of the next level waiting for it
+        self.pendingParents = [0] * len(self.tiles)
+        self.children = [[] for _ in self.tiles]
+
+        ulx, uly, scaleX, scaleY = sourceGeometry
+        sx = scaleX * factor
+        sy = scaleY * factor
+        self.scaleX = sx
+        self.scaleY = sy
+
+        # envelopes of the tiles, as they will be in the tile index
+        self.envelopes = []
+        for _, _, offsetX, offsetY, width, height, _ in self.tiles:
+            dec = AffineTransformDecorator(
+                [ulx + offsetX * sx, sx, 0, uly + offsetY * sy, 0, sy]
             )
+            points = dec.pointsFor(width, height)
+            self.envelopes.append(getFeatureEnvelope(points[0], points[1]))
+
+    def getExtent(self):
+        """Return the (minx, maxx, miny, maxy) extent of the tiles"""
+        return (
+            min(env[0] for env in self.envelopes),
+            max(env[1] for env in self.envelopes),
+            min(env[2] for env in self.envelopes),
+            max(env[3] for env in self.envelopes),
+        )
 
-    if g.TileIndexName is not None:
-        shapeName = getTargetDir(g, level) + g.TileIndexName
-        copyTileIndexToDisk(g, OGRDS, shapeName)
+    def getSourceGeometry(self):
+        """
+        Return the geometry of the mosaic made of the tiles of this level, as
+        built by mosaic_info, and its (xsize, ysize)
+        """
+        extent = self.getExtent()
+        xsize = int(round((extent[1] - extent[0]) / self.scaleX))
+        ysize = abs(int(round((extent[3] - extent[2]) / self.scaleY)))
+        return (extent[0], extent[3], self.scaleX, self.scaleY), (xsize, ysize)
 
-    if g.CsvFileName is not None:
-        csvName = getTargetDir(g, level) + g.CsvFileName
-        copyTileIndexToCSV(g, OGRDS, csvName)
+    def linkChildren(self, childLevel):
+        """
+        Make each tile of childLevel wait for the tiles of this level that
+        getDataSet() will read to create it.
+        """
+        # Envelopes of the columns and rows of tiles of this level
+        countTilesX = max(tile[0] for tile in self.tiles)
+        columns = self.envelopes[:countTilesX]
+        rows = self.envelopes[::countTilesX]
+        columnMinX = [env[0] for env in columns]
+        columnMaxX = [env[1] for env in columns]
+        # rows go southward: negate ordinates to sort them increasingly
+        rowMaxY = [-env[3] for env in rows]
+        rowMinY = [-env[2] for env in rows]
+
+        for child, (_, _, offsetX, offsetY, width, height, _) in enumerate(
+            childLevel.tiles
+        ):
+            minx = childLevel.sourceUlx + offsetX * childLevel.scaleX
+            maxy = childLevel.sourceUly + offsetY * childLevel.scaleY
+            maxx = minx + width * childLevel.scaleX
+            miny = maxy + height * childLevel.scaleY
+            for row in range(
+                bisect.bisect_left(rowMinY, -maxy), bisect.bisect_right(rowMaxY, -miny)
+            ):
+                for col in range(
+                    bisect.bisect_left(columnMaxX, minx),
+                    bisect.bisect_right(columnMinX, maxx),
+                ):
+                    self.children[row * countTilesX + col].append(child)
+                    childLevel.pendingParents[child] += 1
 
-    return OGRDS
+
+def createLevelTile(g, tileLevel, index):
+    """
+    Create a tile of a TileLevel.
+
+    returns the list of the features of the created tile
+    """
+    _, _, offsetX, offsetY, width, height, tilename = tileLevel.tiles[index]
+    feature_only = g.Resume and os.path.exists(tilename)
+    features = []
+    if tileLevel.factor == 1:
+        createTile(
+            g,
+            tileLevel.sourceInfo,
+            offsetX,
+            offsetY,
+            width,
+            height,
+            tilename,
+            None,
+            feature_only,
+            features,
+        )
+    else:
+        createPyramidTile(
+            g,
+            tileLevel.sourceInfo,
+            offsetX,
+            offsetY,
+            width,
+            height,
+            tilename,
+            None,
+            feature_only,
+            features,
+        )
+    return features
+
+
+def tileInParallel(g, minfo, ti):
+    """
+    Create the tiles of mosaic minfo based on tileinfo ti, unless
+    g.PyramidOnly is set, and the g.Levels pyramid levels, with g.Threads
+    threads.
+
+    Each tile of a pyramid level is created as soon as the tiles of the
+    previous level it overlaps are done, without waiting for the whole level.
+    The tile indexes of the levels are written once all their tiles are done.
+    """
+
+    # Plan the tiles of all the levels
+    levels = []
+    if not g.PyramidOnly:
+        tileLevel = TileLevel(
+            g, 0, minfo, ti, (minfo.ulx, minfo.uly, minfo.scaleX, minfo.scaleY), 1
+        )
+        tileLevel.sourceInfo = minfo
+        levels.append(tileLevel)
+
+    for level in range(1, g.Levels + 1):
+        if not levels:
+            # first pyramid level, built on the source mosaic
+            sourceGeometry = (minfo.ulx, minfo.uly, minfo.scaleX, minfo.scaleY)
+            xsize, ysize = minfo.xsize, minfo.ysize
+        else:
+            sourceGeometry, (xsize, ysize) = levels[-1].getSourceGeometry()
+        levelOutputTileInfo = tile_info(
+            int(xsize / 2), int(ysize / 2), g.TileWidth, g.TileHeight, g.Overlap
+        )
+        tileLevel = TileLevel(g, level, minfo, levelOutputTileInfo, sourceGeometry, 2)
+        tileLevel.sourceUlx, tileLevel.sourceUly = sourceGeometry[0:2]
+        if not levels:
+            tileLevel.sourceInfo = minfo
+        else:
+            tileLevel.sourceIndex = TileIndex()
+            tileLevel.sourceExtent = levels[-1].getExtent()
+            levels[-1].linkChildren(tileLevel)
+        levels.append(tileLevel)
+
+    total = sum(len(tileLevel.tiles) for tileLevel in levels)
+    processed = 0
+    if not g.Quiet and not g.Verbose:
+        progress(0.0)
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=g.Threads)
+    futures = {}
+
+    def schedule(levelIndex, index):
+        tileLevel = levels[levelIndex]
+        if tileLevel.sourceInfo is None:
+            # none of the tiles it overlaps has data
+            complete(levelIndex, index, [])
+        else:
+            future = executor.submit(createLevelTile, g, tileLevel, index)
+            futures[future] = (levelIndex, index)
+
+    def complete(levelIndex, index, features):
+        nonlocal processed
+        tileLevel = levels[levelIndex]
+        nextLevel = levels[levelIndex + 1] if levelIndex + 1 < len(levels) else None
+
+        if features:
+            tileLevel.features[index] = features[0]
+            if nextLevel is not None:
+                location = features[0][0]
+                nextLevel.sourceIndex.add(
+                    location, getFeatureEnvelope(*features[0][1:]), index
+                )
+                if nextLevel.sourceInfo is None:
+                    nextLevel.sourceInfo = mosaic_info(
+                        minfo.filename,
+                        nextLevel.sourceIndex,
+                        nextLevel.sourceExtent,
+                        g.CacheMaxCount,
+                        g.CacheMaxBytes,
+                    )
+
+        if nextLevel is not None:
+            for child in tileLevel.children[index]:
+                nextLevel.pendingParents[child] -= 1
+                if nextLevel.pendingParents[child] == 0:
+                    schedule(levelIndex + 1, child)
+
+        tileLevel.remaining -= 1
+        if tileLevel.remaining == 0:
+            # write the tile index of the level
+            OGRDS = createTileIndex(
+                g.Verbose,
+                "TileResult_" + str(tileLevel.level),
+                g.TileIndexFieldName,
+                g.Source_SRS,
+                g.TileIndexDriverTyp,
+            )
+            addFeatures(
+                g.TileIndexFieldName,
+                OGRDS,
+                [feature for feature in tileLevel.features if feature is not None],
+            )
+            saveTileIndex(g, OGRDS, tileLevel.level)
+            closeTileIndex(OGRDS)
+
+        if not g.Quiet and not g.Verbose:
+            processed += 1
+            progress(processed / float(total))
+
+    try:
+        # tiles that do not wait for any other one
+        initialTiles = [
+            (levelIndex, index)
+            for levelIndex, tileLevel in enumerate(levels)
+            for index, pendingParents in enumerate(tileLevel.pendingParents)
+            if pendingParents == 0
+        ]
+        for levelIndex, index in initialTiles:
+            schedule(levelIndex, index)
+
+        while futures:
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                levelIndex, index = futures.pop(future)
+                complete(levelIndex, index, future.result())
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
 
 
 def getTileName(g, minfo, ti, xIndex, yIndex, level=-1):
@@ -957,6 +1492,8 @@ def Usage(isError):
     print("        [-s_srs <srs_def>]  [-pyramidOnly] -levels <numberoflevels>", file=f)
     print("        [-r {near|bilinear|cubic|cubicspline|lanczos}]", file=f)
     print("        [-useDirForEachRow] [-resume]", file=f)
+    print("        [-threads <num_threads>|ALL_CPUS]", file=f)
+    print("        [-cacheCount <count>] [-cacheMem <megabytes>]", file=f)
     print("        -targetDir <TileDirectory> <input_file> [<input_file>]...", file=f)
     return 2 if isError else 0
 
@@ -1072,6 +1609,27 @@ def main(args=None, g=None):
             g.UseDirForEachRow = True
         elif arg == "-resume":
             g.Resume = True
+        elif arg == "-cacheCount":
+            i += 1
+            g.CacheMaxCount = int(argv[i])
+            if g.CacheMaxCount < 1:
+                print(
+                    "Invalid number of cached datasets : %d" % g.CacheMaxCount,
+                    file=sys.stderr,
+                )
+                return 1
+        elif arg == "-cacheMem":
+            i += 1
+            g.CacheMaxBytes = int(float(argv[i]) * 1024 * 1024)
+            if g.CacheMaxBytes <= 0:
+                print(
+                    "Invalid size of cached datasets : %s" % argv[i],
+                    file=sys.stderr,
+                )
+                return 1
+        elif arg == "-threads":
+            i += 1
+            g.Threads = get_num_threads(argv[i])
         elif arg[:1] == "-":
             print("Unrecognized command option: %s" % arg, file=sys.stderr)
             return Usage(isError=True)
@@ -1134,7 +1692,12 @@ def main(args=None, g=None):
     if tileIndexDS is None:
         print("Error building tile index", file=sys.stderr)
         return 1
-    minfo = mosaic_info(g.Names[0], tileIndexDS)
+    minfo = mosaic_info(
+        g.Names[0],
+        tileIndexDS,
+        cacheMaxCount=g.CacheMaxCount,
+        cacheMaxBytes=g.CacheMaxBytes,
+    )
     ti = tile_info(minfo.xsize, minfo.ysize, g.TileWidth, g.TileHeight, g.Overlap)
 
     if g.Source_SRS is None and minfo.projection:
@@ -1147,14 +1710,20 @@ def main(args=None, g=None):
         minfo.report()
         ti.report()
 
-    if not g.PyramidOnly:
-        dsCreatedTileIndex = tileImage(g, minfo, ti)
+    if g.Threads is not None:
+        tileInParallel(g, minfo, ti)
         tileIndexDS.Close()
     else:
-        dsCreatedTileIndex = tileIndexDS
+        if not g.PyramidOnly:
+            dsCreatedTileIndex = tileImage(g, minfo, ti)
+            tileIndexDS.Close()
+        else:
+            dsCreatedTileIndex = tileIndexDS
 
-    if g.Levels > 0:
-        buildPyramid(g, minfo, dsCreatedTileIndex, g.TileWidth, g.TileHeight, g.Overlap)
+        if g.Levels > 0:
+            buildPyramid(
+                g, minfo, dsCreatedTileIndex, g.TileWidth, g.TileHeight, g.Overlap
+            )
 
     if g.Verbose:
         print("FINISHED")
@@ -1188,6 +1757,9 @@ class RetileGlobals:
         "LastRowIndx",
         "UseDirForEachRow",
         "Resume",
+        "Threads",
+        "CacheMaxCount",
+        "CacheMaxBytes",
     ]
 
     def __init__(self):
@@ -1218,6 +1790,9 @@ class RetileGlobals:
         self.LastRowIndx = -1
         self.UseDirForEachRow = False
         self.Resume = False
+        self.Threads = None
+        self.CacheMaxCount = 8
+        self.CacheMaxBytes = None
 
 
 if __name__ == "__main__":
@@ -14,16 +14,19 @@
 # ******************************************************************************
 
 import array
+import concurrent.futures
 import filecmp
+import functools
 import math
 import os
 import sys
+import threading
 
 from osgeo import gdal, osr
 
 #######################################################
 from osgeo_utils.auxiliary.base import PathLikeOrStr
-from osgeo_utils.auxiliary.util import enable_gdal_exceptions
+from osgeo_utils.auxiliary.util import enable_gdal_exceptions, get_num_threads
 
 my_print = print
 
@@ -46,48 +49,296 @@ def compare_metadata(golden_md, new_md, md_id, options=None):
             new_keys.remove(key)
 
     if len(golden_keys) != len(new_keys):
-        my_print("Difference in %s metadata key count" % md_id)
-        my_print("  Golden Keys: " + str(golden_keys))
-        my_print("  New Keys: " + str(new_keys))
+        _print("Difference in %s metadata key count" % md_id)
+        _print("  Golden Keys: " + str(golden_keys))
+        _print("  New Keys: " + str(new_keys))
         found_diff += 1
 
     for key in golden_keys:
         if key not in new_keys:
-            my_print('New %s metadata lacks key "%s"' % (md_id, key))
+            _print('New %s metadata lacks key "%s"' % (md_id, key))
             found_diff += 1
         elif md_id == "RPC" and new_md[key].strip() != golden_md[key].strip():
             # The strip above is because _RPC.TXT files and in-file have a difference
             # in white space that is not otherwise meaningful.
-            my_print('RPC Metadata value difference for key "' + key + '"')
-            my_print('  Golden: "' + golden_md[key] + '"')
-            my_print('  New:    "' + new_md[key] + '"')
+            _print('RPC Metadata value difference for key "' + key + '"')
+            _print('  Golden: "' + golden_md[key] + '"')
+            _print('  New:    "' + new_md[key] + '"')
             found_diff += 1
         elif md_id != "RPC" and new_md[key] != golden_md[key]:
             if key == "NITF_FDT":
                 # this will always have the current date set
                 continue
-            my_print('Metadata value difference for key "' + key + '"')
-            my_print('  Golden: "' + golden_md[key] + '"')
-            my_print('  New:    "' + new_md[key] + '"')
+            _print('Metadata value difference for key "' + key + '"')
+            _print('  Golden: "' + golden_md[key] + '"')
+            _print('  New:    "' + new_md[key] + '"')
             found_diff += 1
 
     return found_diff
 
 
+#######################################################
+# Output of the comparisons, captured per thread when they run in parallel.
+_output = threading.local()
+
+
+def _print(*args):
+    lines = getattr(_output, "lines", None)
+    if lines is None:
+        my_print(*args)
+    else:
+        lines.append(args)
+
+
+def _capture_output(func):
+    _output.lines = []
+    try:
+        return func(), _output.lines
+    finally:
+        _output.lines = None
+
+
+def _get_option(options, name, default=None):
+    prefix = name + "="
+    for opt in options:
+        if opt.startswith(prefix):
+            return opt[len(prefix) :]
+    return default
+
+
+def _has_tolerance(options):
+    return any(
+        _get_option(options, name) is not None
+        for name in ("ABS_TOLERANCE", "REL_TOLERANCE", "ULP_TOLERANCE")
+    )
+
+
+class _FailureCounter:
+    """Count the pixels exceeding the tolerance, across threads"""
+
+    def __init__(self, options):
+        max_failures = _get_option(options, "MAX_FAILURES")
+        self.max_failures = None if max_failures is None else int(max_failures)
+        self.failures = 0
+        self.lock = threading.Lock()
+
+    def add(self, count):
+        with self.lock:
+            self.failures += count
+
+    def reached(self):
+        return self.max_failures is not None and self.failures >= self.max_failures
+
+
+# Number of pixels compared at once
+COMPARE_WINDOW_PIXELS = 1 << 20
+
+
 #######################################################
 # Review and report on the actual image pixels that differ.
-def compare_image_pixels(golden_band, new_band, id, options=None):
+def compare_image_pixels(golden_band, new_band, id, options=None, failures=None):
+    """
+    Compare the pixels of two bands, by windows of whole blocks, and report
+    statistics on their differences.
+
+    Returns the number of pixels whose difference exceeds the tolerance
+    given by the ABS_TOLERANCE, REL_TOLERANCE and ULP_TOLERANCE options, or
+    that differ if none is given.
+    """
+    options = [] if options is None else options
+    try:
+        import numpy as np
+        from osgeo import gdal_array  # noqa: F401
+    except ImportError:
+        if _has_tolerance(options):
+            raise
+        return _compare_image_pixels_by_line(golden_band, new_band, id, options)
+
+    if failures is None:
+        failures = _FailureCounter(options)
+    abs_tolerance = float(_get_option(options, "ABS_TOLERANCE", 0))
+    rel_tolerance = float(_get_option(options, "REL_TOLERANCE", 0))
+    ulp_tolerance = _get_option(options, "ULP_TOLERANCE")
+    has_tolerance = _has_tolerance(options)
+
+    # Floating point types, and the integer types of the same size used to
+    # count units in the last place between values
+    ulp_types = {
+        gdal.GDT_Float32: (np.float32, np.int32),
+        gdal.GDT_CFloat32: (np.float32, np.int32),
+        gdal.GDT_Float64: (np.float64, np.int64),
+        gdal.GDT_CFloat64: (np.float64, np.int64),
+    }
+    if hasattr(gdal, "GDT_Float16"):
+        ulp_types[gdal.GDT_Float16] = (np.float16, np.int16)
+        ulp_types[gdal.GDT_CFloat16] = (np.float16, np.int16)
+    ulp_type = ulp_types.get(golden_band.DataType)
+
+    def get_ordered_bits(values):
+        # reinterpret floats as integers that sort in the same order
+        float_type, int_type = ulp_type
+        bits = values.astype(float_type).view(int_type).astype(np.int64)
+        return np.where(bits < 0, np.iinfo(int_type).min - bits, bits)
+
+    diff_count = 0
+    exceeding_count = 0
+    nan_count = 0
+    max_diff = 0.0
+    sum_square_diff = 0.0
+    valid_count = 0
+    histogram = {}
+    bbox = None
+    stopped = False
+
+    out_db = None
+    if "DUMP_DIFFS" in options:
+        prefix = _get_option(options, "DUMP_DIFFS_PREFIX", "")
+        diff_fn = prefix + id.replace(" ", "_") + ".tif"
+        out_db = gdal.GetDriverByName("GTiff").Create(
+            diff_fn, golden_band.XSize, golden_band.YSize, 1, gdal.GDT_Float32
+        )
+
+    # Compare whole rows of blocks at once
+    xsize = golden_band.XSize
+    block_ysize = golden_band.GetBlockSize()[1]
+    window_ysize = max(
+        block_ysize, COMPARE_WINDOW_PIXELS // max(xsize, 1) // block_ysize * block_ysize
+    )
+    window_ysize = min(window_ysize, golden_band.YSize)
+    golden_buf = np.empty((window_ysize, xsize), dtype=np.float64)
+    new_buf = np.empty((window_ysize, xsize), dtype=np.float64)
+
+    for yoff in range(0, golden_band.YSize, window_ysize):
+        if failures.reached():
+            stopped = True
+            break
+        ysize = min(window_ysize, golden_band.YSize - yoff)
+        golden = golden_band.ReadAsArray(
+            0, yoff, xsize, ysize, buf_obj=golden_buf[:ysize]
+        )
+        new = new_band.ReadAsArray(0, yoff, xsize, ysize, buf_obj=new_buf[:ysize])
+
+        with np.errstate(invalid="ignore"):
+            diff = golden - new
+        golden_nan = np.isnan(golden)
+        new_nan = np.isnan(new)
+        # equal infinities and NaN on both sides are no difference
+        equal = (golden == new) | (golden_nan & new_nan)
+        diff[equal] = 0
+
+        if out_db is not None:
+            out_db.GetRasterBand(1).WriteArray(diff, 0, yoff)
+
+        # Pixels that are not NaN on either side, over which the root mean
+        # square difference is computed
+        valid = ~(golden_nan | new_nan)
+        valid_count += int(np.count_nonzero(valid))
+
+        differs = ~equal
+        window_diff_count = int(np.count_nonzero(differs))
+        if not window_diff_count:
+            continue
+        diff_count += window_diff_count
+
+        # NaN on one side only
+        nan_mismatch = golden_nan ^ new_nan
+        nan_count += int(np.count_nonzero(nan_mismatch))
+        valid_diff = np.abs(diff[valid & differs])
+        if valid_diff.size:
+            max_diff = max(max_diff, float(valid_diff.max()))
+            finite_diff = valid_diff[np.isfinite(valid_diff)]
+            sum_square_diff += float(np.dot(finite_diff, finite_diff))
+            infinite_count = valid_diff.size - finite_diff.size
+            if infinite_count:
+                histogram[math.inf] = histogram.get(math.inf, 0) + infinite_count
+            decades, counts = np.unique(
+                np.floor(np.log10(finite_diff)), return_counts=True
+            )
+            for decade, count in zip(decades.tolist(), counts.tolist()):
+                histogram[decade] = histogram.get(decade, 0) + count
+
+        rows = np.flatnonzero(differs.any(axis=1))
+        cols = np.flatnonzero(differs.any(axis=0))
+        window_bbox = (
+            int(cols[0]),
+            yoff + int(rows[0]),
+            int(cols[-1]),
+            yoff + int(rows[-1]),
+        )
+        if bbox is None:
+            bbox = window_bbox
+        else:
+            bbox = (
+                min(bbox[0], window_bbox[0]),
+                min(bbox[1], window_bbox[1]),
+                max(bbox[2], window_bbox[2]),
+                max(bbox[3], window_bbox[3]),
+            )
+
+        if has_tolerance:
+            with np.errstate(invalid="ignore"):
+                exceeding = differs & ~(
+                    np.abs(diff) <= abs_tolerance + rel_tolerance * np.abs(golden)
+                )
+            if ulp_tolerance is not None:
+                if ulp_type is None:
+                    # integer values are one unit in the last place apart
+                    ulp_diff = np.abs(diff)
+                else:
+                    ulp_diff = np.abs(
+                        get_ordered_bits(golden).astype(np.float64)
+                        - get_ordered_bits(new).astype(np.float64)
+                    )
+                exceeding &= ~(ulp_diff <= float(ulp_tolerance))
+            window_exceeding_count = int(np.count_nonzero(exceeding))
+        else:
+            window_exceeding_count = window_diff_count
+        exceeding_count += window_exceeding_count
+        failures.add(window_exceeding_count)
+
+    _print("  Pixels Differing: " + str(diff_count))
+    _print("  Maximum Pixel Difference: " + str(max_diff))
+    if diff_count:
+        if nan_count:
+            _print("  Pixels Differing by NaN: " + str(nan_count))
+        if valid_count:
+            _print(
+                "  Root Mean Square Difference: "
+                + str(math.sqrt(sum_square_diff / valid_count))
+            )
+        _print(
+            "  Differences Bounding Box: xoff=%d, yoff=%d, xsize=%d, ysize=%d"
+            % (bbox[0], bbox[1], bbox[2] - bbox[0] + 1, bbox[3] - bbox[1] + 1)
+        )
+        if histogram:
+            _print("  Difference Histogram:")
+            for decade in sorted(histogram):
+                if decade == math.inf:
+                    _print("    inf: %d" % histogram[decade])
+                else:
+                    _print(
+                        "    [1e%+03d, 1e%+03d): %d"
+                        % (decade, decade + 1, histogram[decade])
+                    )
+    if has_tolerance:
+        _print("  Pixels Exceeding Tolerance: " + str(exceeding_count))
+    if stopped:
+        _print("  Comparison stopped after %d failures" % failures.failures)
+    if out_db is not None:
+        _print("  Wrote Diffs to: %s" % diff_fn)
+
+    return exceeding_count
+
+
+def _compare_image_pixels_by_line(golden_band, new_band, id, options):
+    """Compare the pixels of two bands line by line, without numpy"""
 
     diff_count = 0
     max_diff = 0
 
     out_db = None
     if "DUMP_DIFFS" in options:
-        prefix = ""
-        for opt in options:
-            if opt.startswith("DUMP_DIFFS_PREFIX="):
-                prefix = opt[len("DUMP_DIFFS_PREFIX=") :]
-                break
+        prefix = _get_option(options, "DUMP_DIFFS_PREFIX", "")
         diff_fn = prefix + id.replace(" ", "_") + ".tif"
         out_db = gdal.GetDriverByName("GTiff").Create(
             diff_fn, golden_band.XSize, golden_band.YSize, 1, gdal.GDT_Float32
@@ -116,31 +367,93 @@ def compare_image_pixels(golden_band, new_band, id, options=None):
                 buf_type=gdal.GDT_Float64,
             )
 
-    my_print("  Pixels Differing: " + str(diff_count))
-    my_print("  Maximum Pixel Difference: " + str(max_diff))
+    _print("  Pixels Differing: " + str(diff_count))
+    _print("  Maximum Pixel Difference: " + str(max_diff))
     if out_db is not None:
-        my_print("  Wrote Diffs to: %s" % diff_fn)
+        _print("  Wrote Diffs to: %s" % diff_fn)
+
+    return diff_count
 
 
 #######################################################
 
 
-def compare_band(golden_band, new_band, id, options=None):
+def _run_comparisons(comparisons, num_threads=1):
+    """
+    Run functions returning a difference count and printing their report,
+    on a thread pool if num_threads > 1, and return the total count.
+
+    The reports are printed in the order of the functions.
+    """
+    if num_threads <= 1 or len(comparisons) <= 1:
+        return sum(comparison() for comparison in comparisons)
+
     found_diff = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
+        futures = [
+            executor.submit(_capture_output, comparison) for comparison in comparisons
+        ]
+        for future in futures:
+            count, lines = future.result()
+            for args in lines:
+                my_print(*args)
+            found_diff += count
+    return found_diff
 
-    options = [] if options is None else options
+
+def _band_comparisons(golden_band, new_band, id, options, failures):
+    """
+    Yield the functions comparing a band, its overviews and mask band, that
+    can run independently of each other.
+    """
+    yield functools.partial(
+        _compare_band_content, golden_band, new_band, id, options, failures
+    )
+
+    # Check overviews
+    if "SKIP_OVERVIEWS" not in options:
+        if golden_band.GetOverviewCount() != new_band.GetOverviewCount():
+            yield functools.partial(_compare_overview_count, golden_band, new_band, id)
+        else:
+            for i in range(golden_band.GetOverviewCount()):
+                yield from _band_comparisons(
+                    golden_band.GetOverview(i),
+                    new_band.GetOverview(i),
+                    id + " overview " + str(i),
+                    options,
+                    failures,
+                )
+
+    # Mask band
+    if golden_band.GetMaskFlags() != new_band.GetMaskFlags():
+        yield functools.partial(_compare_mask_flags, golden_band, new_band, id)
+    elif golden_band.GetMaskFlags() == gdal.GMF_PER_DATASET:
+        # Check mask band if it's GMF_PER_DATASET
+        yield from _band_comparisons(
+            golden_band.GetMaskBand(),
+            new_band.GetMaskBand(),
+            id + " mask band",
+            options,
+            failures,
+        )
+
+    yield functools.partial(_compare_band_metadata, golden_band, new_band, id, options)
+
+
+def _compare_band_content(golden_band, new_band, id, options, failures):
+    found_diff = 0
 
     if golden_band.XSize != new_band.XSize or golden_band.YSize != new_band.YSize:
-        my_print(
+        _print(
             "Band size mismatch (band=%s golden=[%d,%d], new=[%d,%d])"
             % (id, golden_band.XSize, golden_band.YSize, new_band.XSize, new_band.YSize)
         )
         found_diff += 1
 
     if golden_band.DataType != new_band.DataType:
-        my_print("Band %s pixel types differ." % id)
-        my_print("  Golden: " + gdal.GetDataTypeName(golden_band.DataType))
-        my_print("  New:    " + gdal.GetDataTypeName(new_band.DataType))
+        _print("Band %s pixel types differ." % id)
+        _print("  Golden: " + gdal.GetDataTypeName(golden_band.DataType))
+        _print("  New:    " + gdal.GetDataTypeName(new_band.DataType))
         found_diff += 1
 
     golden_nodata = golden_band.GetNoDataValue()
@@ -161,18 +474,18 @@ def compare_band(golden_band, new_band, id, options=None):
     ):
         pass
     elif golden_nodata != new_nodata:
-        my_print("Band %s nodata values differ." % id)
-        my_print("  Golden: " + str(golden_nodata))
-        my_print("  New:    " + str(new_nodata))
+        _print("Band %s nodata values differ." % id)
+        _print("  Golden: " + str(golden_nodata))
+        _print("  New:    " + str(new_nodata))
         found_diff += 1
 
     if golden_band.GetColorInterpretation() != new_band.GetColorInterpretation():
-        my_print("Band %s color interpretation values differ." % id)
-        my_print(
+        _print("Band %s color interpretation values differ." % id)
+        _print(
             "  Golden: "
             + gdal.GetColorInterpretationName(golden_band.GetColorInterpretation())
         )
-        my_print(
+        _print(
             "  New:    "
             + gdal.GetColorInterpretationName(new_band.GetColorInterpretation())
         )
@@ -181,53 +494,48 @@ def compare_band(golden_band, new_band, id, options=None):
     golden_band_checksum = golden_band.Checksum()
     new_band_checksum = new_band.Checksum()
     if golden_band_checksum != new_band_checksum:
-        my_print("Band %s checksum difference:" % id)
-        my_print("  Golden: " + str(golden_band_checksum))
-        my_print("  New:    " + str(new_band_checksum))
+        _print("Band %s checksum difference:" % id)
+        _print("  Golden: " + str(golden_band_checksum))
+        _print("  New:    " + str(new_band_checksum))
         if found_diff == 0:
-            compare_image_pixels(golden_band, new_band, id, options)
-        found_diff += 1
+            exceeding_count = compare_image_pixels(
+                golden_band, new_band, id, options, failures
+            )
+            # differences within the tolerance are not counted
+            if not _has_tolerance(options) or exceeding_count:
+                found_diff += 1
+        else:
+            found_diff += 1
     else:
         # check a bit deeper in case of Float data type for which the Checksum() function is not reliable
         if golden_band.DataType in (gdal.GDT_Float32, gdal.GDT_Float64):
             if golden_band.ComputeRasterMinMax(
                 can_return_none=True
             ) != new_band.ComputeRasterMinMax(can_return_none=True):
-                my_print("Band %s statistics difference:" % 1)
-                my_print("  Golden: " + str(golden_band.ComputeBandStats()))
-                my_print("  New:    " + str(new_band.ComputeBandStats()))
+                _print("Band %s statistics difference:" % 1)
+                _print("  Golden: " + str(golden_band.ComputeBandStats()))
+                _print("  New:    " + str(new_band.ComputeBandStats()))
                 compare_image_pixels(golden_band, new_band, id, {})
 
-    # Check overviews
-    if "SKIP_OVERVIEWS" not in options:
-        if golden_band.GetOverviewCount() != new_band.GetOverviewCount():
-            my_print("Band %s overview count difference:" % id)
-            my_print("  Golden: " + str(golden_band.GetOverviewCount()))
-            my_print("  New:    " + str(new_band.GetOverviewCount()))
-            found_diff += 1
-        else:
-            for i in range(golden_band.GetOverviewCount()):
-                found_diff += compare_band(
-                    golden_band.GetOverview(i),
-                    new_band.GetOverview(i),
-                    id + " overview " + str(i),
-                    options,
-                )
+    return found_diff
 
-    # Mask band
-    if golden_band.GetMaskFlags() != new_band.GetMaskFlags():
-        my_print("Band %s mask flags difference:" % id)
-        my_print("  Golden: " + str(golden_band.GetMaskFlags()))
-        my_print("  New:    " + str(new_band.GetMaskFlags()))
-        found_diff += 1
-    elif golden_band.GetMaskFlags() == gdal.GMF_PER_DATASET:
-        # Check mask band if it's GMF_PER_DATASET
-        found_diff += compare_band(
-            golden_band.GetMaskBand(),
-            new_band.GetMaskBand(),
-            id + " mask band",
-            options,
-        )
+
+def _compare_overview_count(golden_band, new_band, id):
+    _print("Band %s overview count difference:" % id)
+    _print("  Golden: " + str(golden_band.GetOverviewCount()))
+    _print("  New:    " + str(new_band.GetOverviewCount()))
+    return 1
+
+
+def _compare_mask_flags(golden_band, new_band, id):
+    _print("Band %s mask flags difference:" % id)
+    _print("  Golden: " + str(golden_band.GetMaskFlags()))
+    _print("  New:    " + str(new_band.GetMaskFlags()))
+    return 1
+
+
+def _compare_band_metadata(golden_band, new_band, id, options):
+    found_diff = 0
 
     # Metadata
     if "SKIP_METADATA" not in options:
@@ -240,9 +548,9 @@ def compare_band(golden_band, new_band, id, options=None):
     # default at some point.
     if "CHECK_BAND_DESC" in options:
         if golden_band.GetDescription() != new_band.GetDescription():
-            my_print("Band %s descriptions difference:" % id)
-            my_print("  Golden: " + str(golden_band.GetDescription()))
-            my_print("  New:    " + str(new_band.GetDescription()))
+            _print("Band %s descriptions difference:" % id)
+            _print("  Golden: " + str(golden_band.GetDescription()))
+            _print("  New:    " + str(new_band.GetDescription()))
             found_diff += 1
 
     # TODO: Color Table, gain/bias, units, blocksize, mask, min/max
@@ -250,6 +558,15 @@ def compare_band(golden_band, new_band, id, options=None):
     return found_diff
 
 
+def compare_band(golden_band, new_band, id, options=None):
+    options = [] if options is None else options
+
+    failures = _FailureCounter(options)
+    return _run_comparisons(
+        list(_band_comparisons(golden_band, new_band, id, options, failures))
+    )
+
+
 #######################################################
 
 
@@ -278,6 +595,22 @@ def compare_srs(golden_wkt, new_wkt):
 #######################################################
 
 
+def _get_thread_safe_datasets(golden_db, new_db):
+    """
+    Return thread-safe versions of the datasets, or None if one of them
+    cannot be made thread-safe.
+    """
+    try:
+        with gdal.quiet_errors():
+            golden_ts = golden_db.GetThreadSafeDataset(gdal.OF_RASTER)
+            new_ts = new_db.GetThreadSafeDataset(gdal.OF_RASTER)
+    except RuntimeError:
+        return None
+    if golden_ts is None or new_ts is None:
+        return None
+    return golden_ts, new_ts
+
+
 def compare_db(golden_db, new_db, options=None):
     found_diff = 0
 
@@ -356,13 +689,26 @@ def compare_db(golden_db, new_db, options=None):
 
     # If so-far-so-good, then compare pixels
     if found_diff == 0:
+        num_threads = get_num_threads(_get_option(options, "NUM_THREADS", "1"))
+        if num_threads > 1:
+            # bands of a dataset cannot be read concurrently from threads
+            thread_safe_dbs = _get_thread_safe_datasets(golden_db, new_db)
+            if thread_safe_dbs is None:
+                num_threads = 1
+            else:
+                golden_db, new_db = thread_safe_dbs
+
+        failures = _FailureCounter(options)
+        comparisons = []
         for i in range(golden_db.RasterCount):
-            found_diff += compare_band(
+            comparisons += _band_comparisons(
                 golden_db.GetRasterBand(i + 1),
                 new_db.GetRasterBand(i + 1),
                 str(i + 1),
                 options,
+                failures,
             )
+        found_diff += _run_comparisons(comparisons, num_threads)
 
     return found_diff
 
@@ -479,6 +825,9 @@ def Usage(isError=True):
     print("                      [-dumpdiffs] [-skip_binary] [-skip_overviews]", file=f)
     print("                      [-skip_geolocation] [-skip_geotransform]", file=f)
     print("                      [-skip_metadata] [-skip_rpc] [-skip_srs]", file=f)
+    print("                      [-abs_tol <val>] [-rel_tol <val>]", file=f)
+    print("                      [-ulp_tol <val>] [-max_failures <count>]", file=f)
+    print("                      [-threads <num_threads>|ALL_CPUS]", file=f)
     print("                      [-sds] <golden_file> <new_file>", file=f)
     return 2 if isError else 0
 
@@ -536,6 +885,26 @@ def main(argv=sys.argv):
         elif argv[i] == "-skip_srs":
             options.append("SKIP_SRS")
 
+        elif argv[i] == "-abs_tol" and i < len(argv) - 1:
+            i += 1
+            options.append("ABS_TOLERANCE=" + argv[i])
+
+        elif argv[i] == "-rel_tol" and i < len(argv) - 1:
+            i += 1
+            options.append("REL_TOLERANCE=" + argv[i])
+
+        elif argv[i] == "-ulp_tol" and i < len(argv) - 1:
+            i += 1
+            options.append("ULP_TOLERANCE=" + argv[i])
+
+        elif argv[i] == "-max_failures" and i < len(argv) - 1:
+            i += 1
+            options.append("MAX_FAILURES=" + argv[i])
+
+        elif argv[i] == "-threads" and i < len(argv) - 1:
+            i += 1
+            options.append("NUM_THREADS=" + argv[i])
+
         elif golden_file is None:
             golden_file = argv[i]
 
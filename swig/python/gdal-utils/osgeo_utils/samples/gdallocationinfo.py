@@ -38,6 +38,7 @@ from osgeo_utils.auxiliary.util import (
     PathOrDS,
     get_band_nums,
     get_bands,
+    get_ovr_idx,
     get_scales_and_offsets,
     open_ds,
 )
@@ -62,6 +63,202 @@ CoordinateTransformationOrSRS = Optional[
     Union[osr.CoordinateTransformation, LocationInfoSRS, AnySRS]
 ]
 
+# Resampling algorithms supported by sample_points()
+BATCHED_RESAMPLE_ALGS = (
+    gdalconst.GRIORA_NearestNeighbour,
+    gdalconst.GRIORA_Bilinear,
+    gdalconst.GRIORA_Cubic,
+)
+
+
+def get_kernel(
+    coords: np.ndarray, resample_alg=gdalconst.GRIORA_NearestNeighbour
+) -> Tuple[np.ndarray, Optional[Sequence[np.ndarray]]]:
+    """
+    returns the index of the first pixel of the resampling kernel for each
+    coordinate along an axis, and the weights of the successive pixels of the
+    kernel (None for nearest neighbour, which has a single pixel)
+    """
+    if resample_alg == gdalconst.GRIORA_NearestNeighbour:
+        return np.floor(coords + 1e-10).astype(np.int64), None
+
+    # distance from the center of the pixel before the coordinate
+    centers = coords - 0.5
+    first = np.floor(centers)
+    t = centers - first
+    first = first.astype(np.int64)
+    if resample_alg == gdalconst.GRIORA_Bilinear:
+        return first, (1 - t, t)
+    if resample_alg == gdalconst.GRIORA_Cubic:
+        # cubic convolution kernel with a = -0.5, as used by GDAL
+        t2 = t * t
+        t3 = t2 * t
+        return first - 1, (
+            -0.5 * t3 + t2 - 0.5 * t,
+            1.5 * t3 - 2.5 * t2 + 1,
+            -1.5 * t3 + 2 * t2 + 0.5 * t,
+            0.5 * t3 - 0.5 * t2,
+        )
+    raise Exception(f"Unsupported resampling algorithm {resample_alg}")
+
+
+def sample_points(
+    ds: gdal.Dataset,
+    pixels: np.ndarray,
+    lines: np.ndarray,
+    band_nums: Optional[Sequence[int]] = None,
+    ovr_idx: Optional[int] = None,
+    resample_alg=gdalconst.GRIORA_NearestNeighbour,
+    results: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Sample bands at pixel/line locations, by block instead of point by point.
+
+    The points are sorted by the block containing them, and the window of each
+    touched block (extended by the resampling kernel) is read once for all the
+    bands. The values are then gathered with numpy indexing, and combined with
+    the bilinear or cubic kernel weights. As GDAL does, pixels outside of the
+    raster, and pixels equal to the nodata value of a band, are left out of
+    the kernel, whose weights are renormalized over the remaining pixels.
+
+    :param pixels, lines: pixel/line coordinates, of the overview if ovr_idx is set
+    :param resample_alg: one of BATCHED_RESAMPLE_ALGS
+    :param results: array of shape (band count, point count) to fill
+    :return: array of shape (band count, point count). Points outside the
+           raster extent get the nodata value of the band, or 0.
+    """
+    band_nums = get_band_nums(ds, band_nums)
+    bands = get_bands(ds, band_nums, ovr_idx=ovr_idx)
+    bnd_count = len(bands)
+    xsize, ysize = bands[0].XSize, bands[0].YSize
+    buf_type, typecode = GDALTypeCodeAndNumericTypeCodeFromDataSet(ds)
+    pixels = np.asarray(pixels, dtype=np.float64)
+    lines = np.asarray(lines, dtype=np.float64)
+    if results is None:
+        results = np.empty(shape=(bnd_count, len(pixels)), dtype=typecode)
+
+    nodata = [band.GetNoDataValue() for band in bands]
+    for bnd_idx, nodata_value in enumerate(nodata):
+        results[bnd_idx] = 0 if nodata_value is None else nodata_value
+    has_nodata = any(nodata_value is not None for nodata_value in nodata)
+    if has_nodata:
+        nodata_values = np.array(
+            [np.nan if v is None else v for v in nodata], dtype=np.float64
+        )[:, np.newaxis]
+        nodata_is_set = np.array([v is not None for v in nodata])[:, np.newaxis]
+        nodata_is_nan = np.isnan(nodata_values) & nodata_is_set
+
+    if ovr_idx and get_ovr_idx(ds, ovr_idx) != 0:
+
+        def read_window(xoff, yoff, win_xsize, win_ysize):
+            return np.stack(
+                [
+                    band.ReadAsArray(
+                        xoff, yoff, win_xsize, win_ysize, buf_type=buf_type
+                    )
+                    for band in bands
+                ]
+            )
+
+    else:
+
+        def read_window(xoff, yoff, win_xsize, win_ysize):
+            # a single dataset level request for all the bands
+            return ds.ReadAsArray(
+                xoff, yoff, win_xsize, win_ysize, band_list=band_nums, buf_type=buf_type
+            ).reshape(bnd_count, win_ysize, win_xsize)
+
+    x_first, x_weights = get_kernel(pixels, resample_alg)
+    y_first, y_weights = get_kernel(lines, resample_alg)
+    x_taps = 1 if x_weights is None else len(x_weights)
+    y_taps = 1 if y_weights is None else len(y_weights)
+    if x_weights is None:
+        # the nearest pixel of a point just before the right or bottom edge
+        x_first = np.minimum(x_first, xsize - 1)
+        y_first = np.minimum(y_first, ysize - 1)
+
+    with np.errstate(invalid="ignore"):
+        inside = (pixels >= 0) & (pixels < xsize) & (lines >= 0) & (lines < ysize)
+    point_idx = np.flatnonzero(inside)
+    if not point_idx.size:
+        return results
+
+    # Sort the points by the block that contains them
+    block_xsize, block_ysize = bands[0].GetBlockSize()
+    blocks_per_row = (xsize + block_xsize - 1) // block_xsize
+    block_keys = (lines[point_idx].astype(np.int64) // block_ysize) * blocks_per_row + (
+        pixels[point_idx].astype(np.int64) // block_xsize
+    )
+    order = np.argsort(block_keys, kind="stable")
+    point_idx = point_idx[order]
+    block_keys = block_keys[order]
+    bounds = np.concatenate(
+        ([0], np.flatnonzero(np.diff(block_keys)) + 1, [len(block_keys)])
+    )
+
+    if np.issubdtype(results.dtype, np.integer):
+        info = np.iinfo(results.dtype)
+    else:
+        info = None
+
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        idx = point_idx[start:end]
+        xf = x_first[idx]
+        yf = y_first[idx]
+        xoff = max(0, int(xf.min()))
+        yoff = max(0, int(yf.min()))
+        win_xsize = min(xsize, int(xf.max()) + x_taps) - xoff
+        win_ysize = min(ysize, int(yf.max()) + y_taps) - yoff
+        window = read_window(xoff, yoff, win_xsize, win_ysize)
+
+        if x_weights is None:
+            results[:, idx] = window[:, yf - yoff, xf - xoff]
+            continue
+
+        values = np.zeros((bnd_count, len(idx)), dtype=np.float64)
+        weight_sums = np.zeros((bnd_count, len(idx)), dtype=np.float64)
+        for j in range(y_taps):
+            ty = yf + j
+            ly = np.clip(ty, 0, ysize - 1) - yoff
+            y_inside = (ty >= 0) & (ty < ysize)
+            for i in range(x_taps):
+                tx = xf + i
+                lx = np.clip(tx, 0, xsize - 1) - xoff
+                taps = window[:, ly, lx].astype(np.float64)
+                # taps outside of the raster are left out of the kernel
+                weights = (
+                    y_weights[j][idx]
+                    * x_weights[i][idx]
+                    * (y_inside & (tx >= 0) & (tx < xsize))
+                )
+                if has_nodata:
+                    valid = ~(
+                        (nodata_is_set & (taps == nodata_values))
+                        | (nodata_is_nan & np.isnan(taps))
+                    )
+                    weights = weights * valid
+                    taps[~valid] = 0
+                weight_sums += weights
+                values += taps * weights
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if has_nodata:
+                values = np.where(
+                    weight_sums != 0,
+                    values / weight_sums,
+                    np.broadcast_to(nodata_values, values.shape),
+                )
+            else:
+                values /= weight_sums
+        if info is not None:
+            # round half away from zero, as GDAL does
+            values = np.clip(
+                np.trunc(values + np.copysign(0.5, values)), info.min, info.max
+            )
+        results[:, idx] = values
+
+    return results
+
+
 
 def gdallocationinfo(
     filename_or_ds: PathOrDS,
@@ -80,6 +277,7 @@ def gdallocationinfo(
     line_offset: Real = -0.5,
     resample_alg=gdalconst.GRIORA_NearestNeighbour,
     quiet_mode: bool = True,
+    batched: bool = True,
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     ds = open_ds(filename_or_ds, open_options=open_options)
     filename = filename_or_ds if is_path_like(filename_or_ds) else ""
@@ -175,29 +373,47 @@ def gdallocationinfo(
     else:
         lines_q = y * line_fact
 
-    buf_xsize = buf_ysize = 1
-    buf_type, typecode = GDALTypeCodeAndNumericTypeCodeFromDataSet(ds)
-    buf_obj = np.empty([buf_ysize, buf_xsize], dtype=typecode)
-
-    for idx, (pixel, line) in enumerate(zip(pixels_q, lines_q)):
-        for bnd_idx, band in enumerate(bands):
-            if (
-                BandRasterIONumPy(
-                    band,
-                    0,
-                    pixel - 0.5,
-                    line - 0.5,
-                    1,
-                    1,
-                    buf_obj,
-                    buf_type,
-                    resample_alg,
-                    None,
-                    None,
-                )
-                == 0
-            ):
-                results[bnd_idx][idx] = buf_obj[0][0]
+    if (
+        batched
+        and resample_alg in BATCHED_RESAMPLE_ALGS
+        and (
+            resample_alg == gdalconst.GRIORA_NearestNeighbour
+            or not np.issubdtype(results.dtype, np.complexfloating)
+        )
+    ):
+        sample_points(
+            ds,
+            pixels_q,
+            lines_q,
+            band_nums=band_nums,
+            ovr_idx=ovr_idx,
+            resample_alg=resample_alg,
+            results=results,
+        )
+    else:
+        buf_xsize = buf_ysize = 1
+        buf_type, typecode = GDALTypeCodeAndNumericTypeCodeFromDataSet(ds)
+        buf_obj = np.empty([buf_ysize, buf_xsize], dtype=typecode)
+
+        for idx, (pixel, line) in enumerate(zip(pixels_q, lines_q)):
+            for bnd_idx, band in enumerate(bands):
+                if (
+                    BandRasterIONumPy(
+                        band,
+                        0,
+                        pixel - 0.5,
+                        line - 0.5,
+                        1,
+                        1,
+                        buf_obj,
+                        buf_type,
+                        resample_alg,
+                        None,
+                        None,
+                    )
+                    == 0
+                ):
+                    results[bnd_idx][idx] = buf_obj[0][0]
 
     is_scaled, scales, offsets = get_scales_and_offsets(bands)
     if is_scaled:
@@ -17,17 +17,37 @@
    :since: GDAL 3.11
 """
 
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import PurePath
 
+from fsspec.callbacks import DEFAULT_CALLBACK
 from fsspec.registry import register_implementation
 from fsspec.spec import AbstractFileSystem
-from fsspec.utils import stringify_path
+from fsspec.utils import isfilelike, stringify_path
 
 from osgeo import gdal
 
 
 class VSIFileSystem(AbstractFileSystem):
-    """Implementation of AbstractFileSystem for a GDAL Virtual File System"""
+    """Implementation of AbstractFileSystem for a GDAL Virtual File System
+
+    Directory listings returned by ls() and find() can be cached, and then
+    used by info(), by passing use_listings_cache=True as a storage option.
+    The cache is disabled by default, since files may be modified by other
+    GDAL users.
+    """
+
+    # Default number of parallel transfers of get(), put() and cat_ranges().
+    # Same default as VSISync() on network file systems.
+    DEFAULT_NUM_THREADS = 10
+
+    def __init__(self, *args, **storage_options):
+        storage_options.setdefault("use_listings_cache", False)
+        super().__init__(*args, **storage_options)
+        # File copies collected by get_file() / put_file() during get() / put()
+        self._pending_transfers = threading.local()
 
     @classmethod
     def _get_gdal_path(cls, path):
@@ -58,12 +78,86 @@ class VSIFileSystem(AbstractFileSystem):
     ):
         """Implements AbstractFileSystem._open()"""
 
+        if "r" not in mode:
+            self._invalidate(path)
         path = self._get_gdal_path(path)
         return gdal.VSIFile(path, mode)
 
+    @classmethod
+    def _get_num_threads(cls, num_threads):
+        if num_threads is None:
+            return cls.DEFAULT_NUM_THREADS
+        return gdal._get_num_threads(num_threads)
+
+    @staticmethod
+    def _entry_type(entry):
+        if (entry.mode & 32768) != 0:
+            return "file"
+        if (entry.mode & 16384) != 0:
+            return "directory"
+        return None
+
+    def _entry_info(self, name, entry):
+        """Return a fsspec info dict from a gdal.DirEntry"""
+
+        ret = {"name": name, "type": self._entry_type(entry)}
+        if ret["type"] == "file":
+            ret["size"] = entry.size if entry.sizeKnown else None
+        if entry.mtimeKnown:
+            ret["mtime"] = entry.mtime
+        return ret
+
+    def _scan_dir(self, path, recurse_depth=0):
+        """Return the info of the entries of a directory, from a single scan
+
+        Returns None if path is not a directory.
+        """
+
+        fs_path = self._strip_protocol(path).rstrip("/")
+        gdal_path = self._get_gdal_path(path)
+        directory = gdal.OpenDir(gdal_path, recurse_depth)
+        if directory is None:
+            return None
+
+        ret = []
+        try:
+            while True:
+                entry = gdal.GetNextDirEntry(directory)
+                if entry is None:
+                    break
+                ret.append(self._entry_info(fs_path + "/" + entry.name, entry))
+        finally:
+            gdal.CloseDir(directory)
+        return ret
+
+    def _invalidate(self, *paths):
+        if self.dircache.use_listings_cache:
+            for path in paths:
+                self.invalidate_cache(self._strip_protocol(path))
+
+    def invalidate_cache(self, path=None):
+        """Implements AbstractFileSystem.invalidate_cache()"""
+
+        if path is None:
+            self.dircache.clear()
+            return
+        path = self._strip_protocol(path).rstrip("/")
+        while True:
+            self.dircache.pop(path, None)
+            parent = self._parent(path)
+            if not parent or parent == path:
+                break
+            path = parent
+
     def info(self, path, **kwargs):
         """Implements AbstractFileSystem.info()"""
 
+        if self.dircache.use_listings_cache:
+            fs_path = self._strip_protocol(path).rstrip("/")
+            for entry in self._ls_from_cache(fs_path) or []:
+                if entry["name"].rstrip("/") == fs_path:
+                    return dict(entry)
+
         gdal_path = self._get_gdal_path(path)
         stat = gdal.VSIStatL(gdal_path)
         if stat is None:
@@ -97,42 +191,73 @@ class VSIFileSystem(AbstractFileSystem):
         return datetime.datetime.fromtimestamp(stat.mtime)
 
     def ls(self, path, detail=True, **kwargs):
-        """Implements AbstractFileSystem.ls()"""
+        """Implements AbstractFileSystem.ls()
+
+        Sizes and modification times come from the directory scan, without
+        stat'ing each entry.
+        """
 
         fs_path = self._strip_protocol(path)
-        gdal_path = self._get_gdal_path(path)
-        ret = []
-        directory = gdal.OpenDir(gdal_path)
-        if directory is None:
-            stat = gdal.VSIStatL(gdal_path)
-            if stat is None:
-                raise FileNotFoundError(path)
-            return [fs_path]
+        ret = None
+        if self.dircache.use_listings_cache:
+            try:
+                ret = self.dircache[fs_path.rstrip("/")]
+            except KeyError:
+                pass
+        if ret is None:
+            ret = self._scan_dir(path)
+            if ret is None:
+                gdal_path = self._get_gdal_path(path)
+                stat = gdal.VSIStatL(gdal_path)
+                if stat is None:
+                    raise FileNotFoundError(path)
+                return [fs_path]
+            self.dircache[fs_path.rstrip("/")] = ret
+
+        if detail:
+            return ret
+        return [entry["name"] for entry in ret]
+
+    def find(self, path, maxdepth=None, withdirs=False, detail=False, **kwargs):
+        """Implements AbstractFileSystem.find()
+
+        The whole hierarchy is listed with a single recursive directory scan,
+        which on cloud object storage uses a non-delimited listing.
+        """
 
-        try:
-            while True:
-                entry = gdal.GetNextDirEntry(directory)
-                if entry is None:
-                    break
+        if maxdepth is not None and maxdepth < 1:
+            raise ValueError("maxdepth must be at least 1")
 
-                ret_entry = {
-                    "name": fs_path + "/" + entry.name,
-                    "type": (
-                        "file"
-                        if (entry.mode & 32768) != 0
-                        else "directory"
-                        if (entry.mode & 16384) != 0
-                        else None
-                    ),
-                }
-                if ret_entry["type"] == "file":
-                    ret_entry["size"] = entry.size if entry.sizeKnown else None
-                if entry.mtimeKnown:
-                    ret_entry["mtime"] = entry.mtime
-                ret.append(ret_entry)
-        finally:
-            gdal.CloseDir(directory)
-        return ret
+        fs_path = self._strip_protocol(path).rstrip("/")
+        entries = self._scan_dir(path, -1 if maxdepth is None else maxdepth - 1)
+        out = {}
+        if entries is None:
+            if gdal.VSIStatL(self._get_gdal_path(path)) is not None:
+                out[fs_path] = self.info(path)
+        else:
+            if withdirs and fs_path:
+                out[fs_path] = self.info(path)
+            listings = {}
+            for entry in entries:
+                listings.setdefault(self._parent(entry["name"]), []).append(entry)
+                if withdirs or entry["type"] != "directory":
+                    out[entry["name"]] = entry
+            if self.dircache.use_listings_cache:
+                for entry in entries:
+                    if entry["type"] == "directory":
+                        listings.setdefault(entry["name"], [])
+                if maxdepth is not None:
+                    # deepest directories have not been scanned
+                    for entry in entries:
+                        if entry["name"].count("/") - fs_path.count("/") == maxdepth:
+                            listings.pop(entry["name"], None)
+                for name, listing in listings.items():
+                    self.dircache[name] = listing
+
+        names = sorted(out)
+        if not detail:
+            return names
+        return {name: out[name] for name in names}
 
     def mkdir(self, path, create_parents=True, **kwargs):
         """Implements AbstractFileSystem.mkdir()"""
@@ -147,6 +272,7 @@ class VSIFileSystem(AbstractFileSystem):
         gdal_path = self._get_gdal_path(path)
         if gdal.VSIStatL(gdal_path):
             raise FileExistsError(path)
+        self._invalidate(path)
         if create_parents:
             ret = gdal.MkdirRecursive(gdal_path, 0o755)
         else:
@@ -169,6 +295,7 @@ class VSIFileSystem(AbstractFileSystem):
         """Implements AbstractFileSystem._rm()"""
 
         gdal_path = self._get_gdal_path(path)
+        self._invalidate(path)
         ret = -1
         try:
             ret = gdal.Unlink(gdal_path)
@@ -183,6 +310,7 @@ class VSIFileSystem(AbstractFileSystem):
         """Implements AbstractFileSystem.rmdir()"""
 
         gdal_path = self._get_gdal_path(path)
+        self._invalidate(path)
         ret = -1
         try:
             ret = gdal.Rmdir(gdal_path)
@@ -198,6 +326,7 @@ class VSIFileSystem(AbstractFileSystem):
 
         old_path = self._get_gdal_path(path1)
         new_path = self._get_gdal_path(path2)
+        self._invalidate(path1, path2)
         try:
             if gdal.MoveFile(old_path, new_path) != 0:
                 if gdal.VSIStatL(old_path) is None:
@@ -215,6 +344,7 @@ class VSIFileSystem(AbstractFileSystem):
 
         old_path = self._get_gdal_path(path1)
         new_path = self._get_gdal_path(path2)
+        self._invalidate(path2)
         try:
             if gdal.CopyFile(old_path, new_path) != 0:
                 if gdal.VSIStatL(old_path) is None:
@@ -225,6 +355,230 @@ class VSIFileSystem(AbstractFileSystem):
                 raise FileNotFoundError(path1)
             raise
 
+    def cat_file(self, path, start=None, end=None, **kwargs):
+        """Implements AbstractFileSystem.cat_file()"""
+
+        gdal_path = self._get_gdal_path(path)
+        try:
+            f = gdal.VSIFile(gdal_path, "rb")
+        except Exception:
+            if gdal.VSIStatL(gdal_path) is None:
+                raise FileNotFoundError(path)
+            raise
+        with f:
+            if (start is not None and start < 0) or (end is not None and end < 0):
+                size = f.seek(0, 2)
+                if start is not None and start < 0:
+                    start = max(0, size + start)
+                if end is not None and end < 0:
+                    end = max(0, size + end)
+            start = start or 0
+            f.seek(start)
+            if end is None:
+                return f.read()
+            return f.read(max(0, end - start))
+
+    def _cat_ranges_of_file(self, path, starts, ends):
+        """Read several ranges of a single file with one multi-range read"""
+
+        gdal_path = self._get_gdal_path(path)
+        try:
+            f = gdal.VSIFile(gdal_path, "rb")
+        except Exception:
+            if gdal.VSIStatL(gdal_path) is None:
+                raise FileNotFoundError(path)
+            raise
+        with f:
+            # Ranges are clamped to the size of the file, and empty ones are
+            # not read, as a multi-range read fails if one of them is short
+            size = f.seek(0, 2)
+            ranges = []
+            for start, end in zip(starts, ends):
+                start = 0 if start is None else start
+                end = size if end is None else end
+                if start < 0:
+                    start = max(0, size + start)
+                if end < 0:
+                    end = max(0, size + end)
+                end = min(end, size)
+                ranges.append((start, max(0, end - start)))
+            out = [b""] * len(ranges)
+            nonempty = [i for i, (_, length) in enumerate(ranges) if length]
+            data = f.read_ranges([ranges[i] for i in nonempty])
+            for i, x in zip(nonempty, data):
+                out[i] = bytes(x)
+            return out
+
+    def cat_ranges(
+        self,
+        paths,
+        starts,
+        ends,
+        max_gap=None,
+        on_error="return",
+        num_threads=None,
+        **kwargs,
+    ):
+        """Implements AbstractFileSystem.cat_ranges()
+
+        Ranges of a same file are read with a single multi-range read
+        (fetched in parallel, and merged if close enough, by network file
+        systems), and files are processed by num_threads threads.
+        """
+
+        if not isinstance(paths, list):
+            raise TypeError
+        if not isinstance(starts, list):
+            starts = [starts] * len(paths)
+        if not isinstance(ends, list):
+            ends = [ends] * len(paths)
+        if len(starts) != len(paths) or len(ends) != len(paths):
+            raise ValueError
+
+        indices_per_path = {}
+        for i, path in enumerate(paths):
+            indices_per_path.setdefault(path, []).append(i)
+
+        def read_file(item):
+            path, indices = item
+            try:
+                return self._cat_ranges_of_file(
+                    path, [starts[i] for i in indices], [ends[i] for i in indices]
+                )
+            except Exception as e:
+                if on_error == "return":
+                    return [e] * len(indices)
+                raise
+
+        items = list(indices_per_path.items())
+        num_threads = min(self._get_num_threads(num_threads), len(items))
+        if num_threads > 1:
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                results = list(executor.map(read_file, items))
+        else:
+            results = [read_file(item) for item in items]
+
+        out = [None] * len(paths)
+        for (path, indices), data in zip(items, results):
+            for i, x in zip(indices, data):
+                out[i] = x
+        return out
+
+    def get_file(
+        self, rpath, lpath=None, callback=DEFAULT_CALLBACK, outfile=None, **kwargs
+    ):
+        """Implements AbstractFileSystem.get_file()"""
+
+        if outfile is not None or isfilelike(lpath):
+            return super().get_file(rpath, lpath, callback, outfile, **kwargs)
+        if self.isdir(rpath):
+            os.makedirs(lpath, exist_ok=True)
+            return None
+
+        parent = os.path.dirname(lpath)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        transfer = (rpath, self._get_gdal_path(rpath), lpath)
+        transfers = getattr(self._pending_transfers, "transfers", None)
+        if transfers is not None:
+            transfers.append(transfer)
+        else:
+            self._copy_file(*transfer)
+
+    def put_file(
+        self, lpath, rpath, callback=DEFAULT_CALLBACK, mode="overwrite", **kwargs
+    ):
+        """Implements AbstractFileSystem.put_file()"""
+
+        if mode == "create" and self.exists(rpath):
+            raise FileExistsError(rpath)
+        if os.path.isdir(lpath):
+            self.makedirs(rpath, exist_ok=True)
+            return None
+
+        self._invalidate(rpath)
+        self.mkdirs(self._parent(os.fspath(rpath)), exist_ok=True)
+        transfer = (lpath, lpath, self._get_gdal_path(rpath))
+        transfers = getattr(self._pending_transfers, "transfers", None)
+        if transfers is not None:
+            transfers.append(transfer)
+        else:
+            self._copy_file(*transfer)
+
+    @staticmethod
+    def _copy_file(path, src_gdal_path, dst_gdal_path):
+        try:
+            ret = gdal.CopyFile(src_gdal_path, dst_gdal_path)
+        except Exception:
+            ret = -1
+        if ret != 0:
+            if gdal.VSIStatL(src_gdal_path) is None:
+                raise FileNotFoundError(path)
+            raise IOError(f"Cannot copy from {src_gdal_path} to {dst_gdal_path}")
+
+    def _run_transfers(self, transfers, callback, num_threads):
+        callback.set_size(len(transfers))
+
+        def copy(transfer):
+            self._copy_file(*transfer)
+            callback.relative_update(1)
+
+        num_threads = min(self._get_num_threads(num_threads), len(transfers))
+        if num_threads > 1:
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                list(executor.map(copy, transfers))
+        else:
+            for transfer in transfers:
+                copy(transfer)
+
+    def get(
+        self,
+        rpath,
+        lpath,
+        recursive=False,
+        callback=DEFAULT_CALLBACK,
+        maxdepth=None,
+        num_threads=None,
+        **kwargs,
+    ):
+        """Implements AbstractFileSystem.get()
+
+        Files are copied with gdal.CopyFile() by num_threads threads.
+        """
+
+        # Let the base implementation resolve source and destination paths,
+        # and collect the file copies, which are then run in parallel.
+        self._pending_transfers.transfers = []
+        try:
+            super().get(rpath, lpath, recursive=recursive, maxdepth=maxdepth, **kwargs)
+            transfers = self._pending_transfers.transfers
+        finally:
+            self._pending_transfers.transfers = None
+        self._run_transfers(transfers, callback, num_threads)
+
+    def put(
+        self,
+        lpath,
+        rpath,
+        recursive=False,
+        callback=DEFAULT_CALLBACK,
+        maxdepth=None,
+        num_threads=None,
+        **kwargs,
+    ):
+        """Implements AbstractFileSystem.put()
+
+        Files are copied with gdal.CopyFile() by num_threads threads.
+        """
+
+        self._pending_transfers.transfers = []
+        try:
+            super().put(lpath, rpath, recursive=recursive, maxdepth=maxdepth, **kwargs)
+            transfers = self._pending_transfers.transfers
+        finally:
+            self._pending_transfers.transfers = None
+        self._run_transfers(transfers, callback, num_threads)
+
 
 def register_vsi_implementations():
     """Register a generic "gdalvsi" protocol.